@@ -10,6 +10,7 @@
 #
 # Usage:
 #   python Launcher_V3.py [--profile TAT] [--port 5000] [--no-browser]
+#                         [--server production] [--threads 8]
 # ─────────────────────────────────────────────────────────────────────────────
 
 from __future__ import annotations
@@ -258,6 +259,9 @@ def main() -> None:
     parser.add_argument('--host',       default='127.0.0.1', help='Bind host (default 127.0.0.1)')
     parser.add_argument('--no-browser', action='store_true', help='Do not open browser after start')
     parser.add_argument('--debug',      action='store_true', help='Enable Flask debug mode')
+    parser.add_argument('--server',     choices=('development', 'production'), default=None,
+                        help='Serving mode (default: SERVER_MODE in settings.json, else development)')
+    parser.add_argument('--threads',    type=int, default=None, help='Production server worker threads')
     args = parser.parse_args()
 
     log = _setup_log()
@@ -281,6 +285,9 @@ def main() -> None:
         _log("No profile detected — running without profile context", log)
 
     # 4. Dependency check (non-fatal)
+    # waitress is only needed for production serving — install it on demand
+    if args.server == 'production':
+        REQUIRED_PACKAGES.append(('waitress', 'waitress>=3.0'))
     _check_deps(log)
 
     # 5. Port check
@@ -295,6 +302,11 @@ def main() -> None:
     os.environ['FLASK_HOST']  = args.host
     os.environ['FLASK_PORT']  = str(port)
     os.environ['FLASK_DEBUG'] = '1' if args.debug else '0'
+    if args.server:
+        os.environ['FLASK_SERVER_MODE'] = args.server
+        _log(f"Server mode: {args.server}", log)
+    if args.threads:
+        os.environ['WSGI_THREADS'] = str(args.threads)
 
     url = f"http://{args.host}:{port}"
     _log(f"Starting Flask server: {url}", log)
@@ -335,15 +347,24 @@ def main() -> None:
     # 8. Launch Flask (blocks until shutdown)
     # NOTE: os.execv replaces the process on Unix but behaves differently on Windows
     # and kills daemon threads before they fire. subprocess.run is cross-platform safe.
+    # Popen + wait (not subprocess.run) so Ctrl+C does not hard-kill the server:
+    # the child receives the same SIGINT and gets time to drain in-flight requests.
     run_py = PROJECT_ROOT / 'run.py'
     try:
-        proc = subprocess.run(
+        proc = subprocess.Popen(
             [sys.executable, str(run_py)],
             env=os.environ.copy(),
         )
-        sys.exit(proc.returncode)
-    except KeyboardInterrupt:
-        _log("Shutting down.", log)
+        try:
+            sys.exit(proc.wait())
+        except KeyboardInterrupt:
+            _log("Shutting down (waiting for server to drain)...", log)
+            grace = float(os.environ.get('WSGI_SHUTDOWN_TIMEOUT', 10)) + 5
+            try:
+                proc.wait(timeout=grace)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+            _log("Shutting down.", log)
     except Exception as e:
         _log(f"ERROR launching run.py: {e}", log)
         sys.exit(1)
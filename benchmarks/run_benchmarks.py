@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# benchmarks/run_benchmarks.py
+# ─────────────────────────────────────────────────────────────────────────────
+# Time the core engines against seeded synthetic data at several scales and
+# write the results as JSON so runs can be diffed between commits.
+#
+# Usage:
+#   python -m benchmarks.run_benchmarks                       # 1× / 10× / 100×
+#   python -m benchmarks.run_benchmarks --scales 1 10 --repeat 5
+#   python -m benchmarks.run_benchmarks --only enhanced_match_mis_ids run_maudit
+#   python -m benchmarks.run_benchmarks --compare reports/BENCHMARKS/old.json
+#
+# 1× = --base-rows rows per sheet section and 3 × base MIS rows.
+# Engine console output ([MATCHER-DEBUG] etc.) is silenced while timing.
+# The per-row result cache (src/core/row_cache.py) is cleared before every
+# timed call, so each repeat measures the engines, not cache hits.
+# Output: reports/BENCHMARKS/bench_<timestamp>.json (or --out PATH).
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.synthetic import SyntheticSheet, make_mis_csv, make_sheet_sections, to_sheet_values
+
+DEFAULT_OUT_DIR = PROJECT_ROOT / 'reports' / 'BENCHMARKS'
+DEFAULT_SCALES  = (1, 10, 100)
+
+# Engine name → fn(sheet, mis_df) → Any.  Setup cost (data generation) is
+# excluded; only the call itself is timed.
+Case = Callable[[SyntheticSheet, Any], Any]
+
+
+def _cases() -> dict[str, Case]:
+    from src.core.auditor import run_conflict_audit_sheet_vs_mis, run_maudit
+    from src.core.matcher import enhanced_match_mis_ids, generate_mis_csv_with_multiday
+    from src.core.updown_planner import build_split_plan, verify_gap_closure
+    from src.integrations.google_sheets import split_sheet_sections
+    from src.utils.fuzzy import generate_fuzzy_suggestions
+    from src.utils.location_helpers import (
+        calculate_location_conflict,
+        normalize_location_string,
+        parse_locations,
+    )
+
+    def weekly(s: SyntheticSheet):
+        return s.sections['weekly']
+
+    def match(s, mis):
+        return [enhanced_match_mis_ids(s.sections[sec], mis, section_type=sec,
+                                       bracket_map=s.bracket_map, prefix_map=s.prefix_map,
+                                       tab_name=s.tab_name)
+                for sec in ('weekly', 'monthly', 'sale')]
+
+    def gen_csv(s, mis):
+        return generate_mis_csv_with_multiday(weekly(s), 'weekly', '', s.bracket_map, s.prefix_map)
+
+    def maudit(s, mis):
+        return [run_maudit(s.sections[sec], mis, sec, s.bracket_map, s.prefix_map)
+                for sec in ('weekly', 'monthly', 'sale')]
+
+    def conflict(s, mis):
+        return run_conflict_audit_sheet_vs_mis(s.sections, s.month, s.year,
+                                               s.bracket_map, s.prefix_map)
+
+    def split_plan(s, mis):
+        return build_split_plan(s.sections, s.month, s.year, s.bracket_map, s.prefix_map)
+
+    def gap_check(s, mis):
+        # The plan is built once per sheet (first repeat) and reused after that.
+        if '_plan' not in s.meta:
+            s.meta['_plan'] = build_split_plan(s.sections, s.month, s.year,
+                                               s.bracket_map, s.prefix_map)
+        return verify_gap_closure(s.meta['_plan'], mis)
+
+    def fuzzy(s, mis):
+        df = weekly(s)
+        brand_col = s.bracket_map.get('[Brand]', 'Brand')
+        disc_col  = s.bracket_map.get('[Daily Deal Discount]', 'Deal Discount')
+        return [generate_fuzzy_suggestions({'brand': b, 'discount': d}, mis)
+                for b, d in zip(df[brand_col].head(25), df[disc_col].head(25))]
+
+    def split_sections(s, mis):
+        # Raw values are rendered once per sheet (first repeat) and reused.
+        if '_values' not in s.meta:
+            s.meta['_values'] = to_sheet_values(s)
+        return split_sheet_sections(s.meta['_values'], scan_brackets=False)
+
+    def locations(s, mis):
+        col = 'Locations (Discount Applies at)'
+        values = [v for df in s.sections.values() for v in df[col].tolist()]
+        values += mis['Store'].tolist()
+        for v in values:
+            normalize_location_string(v)
+            parse_locations(v)
+        for a, b in zip(values, values[1:]):
+            calculate_location_conflict(a, b)
+        return len(values)
+
+    return {
+        'enhanced_match_mis_ids':           match,
+        'generate_mis_csv_with_multiday':   gen_csv,
+        'run_maudit':                       maudit,
+        'run_conflict_audit_sheet_vs_mis':  conflict,
+        'build_split_plan':                 split_plan,
+        'verify_gap_closure':               gap_check,
+        'generate_fuzzy_suggestions':       fuzzy,
+        'location_helpers':                 locations,
+        'split_sheet_sections':             split_sections,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, timeout=5).stdout.strip()
+    except Exception:
+        return ''
+
+
+def _ensure_session() -> None:
+    """Engines fall back to the session singleton for alias maps; give them a scratch one."""
+    import tempfile
+    import src.session as session_pkg
+    if session_pkg.session is None:
+        from src.session.manager import SessionManager
+        tmp = Path(tempfile.mkdtemp(prefix='tat_bench_')) / 'session.db'
+        session_pkg.session = SessionManager(db_path=tmp)
+
+
+def run_benchmarks(
+    scales: tuple[int, ...] = DEFAULT_SCALES,
+    base_rows: int = 10,
+    repeat: int = 3,
+    seed: int = 42,
+    only: list[str] | None = None,
+    quiet_engines: bool = True,
+) -> dict[str, Any]:
+    """Run every case at every scale. Returns the JSON-ready report dict."""
+    from src.core.row_cache import get_row_cache
+
+    _ensure_session()
+    cases = _cases()
+    if only:
+        unknown = set(only) - set(cases)
+        if unknown:
+            raise ValueError(f"Unknown benchmark(s): {', '.join(sorted(unknown))}")
+        cases = {k: v for k, v in cases.items() if k in only}
+
+    results: list[dict[str, Any]] = []
+    for scale in scales:
+        sheet = make_sheet_sections(rows_per_section=base_rows * scale, seed=seed)
+        mis   = make_mis_csv(sheet, mis_rows=base_rows * scale * 3, seed=seed + 1)
+        print(f"[BENCH] scale {scale}× — sheet rows={sheet.total_rows} mis rows={len(mis)}")
+
+        for name, case in cases.items():
+            timings: list[float] = []
+            error: str | None = None
+            for _ in range(max(repeat, 1)):
+                sink = open(os.devnull, 'w') if quiet_engines else None
+                get_row_cache().clear()
+                try:
+                    with contextlib.redirect_stdout(sink) if sink else contextlib.nullcontext():
+                        t0 = time.perf_counter()
+                        case(sheet, mis)
+                        timings.append(time.perf_counter() - t0)
+                except Exception as e:
+                    error = f'{type(e).__name__}: {e}'
+                    break
+                finally:
+                    if sink:
+                        sink.close()
+
+            entry: dict[str, Any] = {
+                'engine':     name,
+                'scale':      scale,
+                'sheet_rows': sheet.total_rows,
+                'mis_rows':   len(mis),
+                'repeat':     len(timings),
+            }
+            if timings:
+                entry.update({
+                    'min_s':    round(min(timings), 6),
+                    'median_s': round(statistics.median(timings), 6),
+                    'mean_s':   round(statistics.fmean(timings), 6),
+                    'max_s':    round(max(timings), 6),
+                })
+            if error:
+                entry['error'] = error
+            results.append(entry)
+            shown = f"{entry['median_s'] * 1000:9.1f} ms" if timings else f"ERROR {error}"
+            print(f"[BENCH]   {name:<34} {shown}")
+
+    import pandas as pd
+    return {
+        'meta': {
+            'created':   datetime.now().isoformat(timespec='seconds'),
+            'commit':    _git_commit(),
+            'python':    platform.python_version(),
+            'pandas':    pd.__version__,
+            'platform':  platform.platform(),
+            'seed':      seed,
+            'base_rows': base_rows,
+            'scales':    list(scales),
+            'repeat':    repeat,
+        },
+        'results': results,
+    }
+
+
+def compare_reports(old: dict[str, Any], new: dict[str, Any],
+                    threshold: float = 0.2) -> list[dict[str, Any]]:
+    """
+    Pair results by (engine, scale) and report median ratios.
+    `regression` is True where new/old exceeds 1 + threshold.
+    """
+    before = {(r['engine'], r['scale']): r for r in old.get('results', []) if 'median_s' in r}
+    rows: list[dict[str, Any]] = []
+    for r in new.get('results', []):
+        key = (r['engine'], r['scale'])
+        if key not in before or 'median_s' not in r or not before[key]['median_s']:
+            continue
+        ratio = r['median_s'] / before[key]['median_s']
+        rows.append({
+            'engine':     r['engine'],
+            'scale':      r['scale'],
+            'old_s':      before[key]['median_s'],
+            'new_s':      r['median_s'],
+            'ratio':      round(ratio, 3),
+            'regression': ratio > 1 + threshold,
+        })
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Core engine benchmarks (synthetic data)')
+    parser.add_argument('--scales',    type=int, nargs='+', default=list(DEFAULT_SCALES))
+    parser.add_argument('--base-rows', type=int, default=10, help='Rows per section at 1×')
+    parser.add_argument('--repeat',    type=int, default=3)
+    parser.add_argument('--seed',      type=int, default=42)
+    parser.add_argument('--only',      nargs='+', default=None, help='Subset of engines')
+    parser.add_argument('--out',       type=Path, default=None, help='Output JSON path')
+    parser.add_argument('--compare',   type=Path, default=None, help='Previous JSON to diff against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Regression threshold (0.2 = +20%%)')
+    parser.add_argument('--verbose',   action='store_true', help='Do not silence engine output')
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(tuple(args.scales), args.base_rows, args.repeat, args.seed,
+                            args.only, quiet_engines=not args.verbose)
+
+    out = args.out or DEFAULT_OUT_DIR / f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"[BENCH] Wrote {out}")
+
+    if args.compare:
+        old = json.loads(args.compare.read_text(encoding='utf-8'))
+        diff = compare_reports(old, report, args.threshold)
+        for d in diff:
+            flag = '  ⚠ REGRESSION' if d['regression'] else ''
+            print(f"[BENCH] {d['engine']:<34} {d['scale']:>4}×  x{d['ratio']:<6}{flag}")
+        if any(d['regression'] for d in diff):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,315 @@
+# benchmarks/synthetic.py
+# ─────────────────────────────────────────────────────────────────────────────
+# Seeded generator for realistic Google Sheet sections + MIS CSV frames.
+#
+# Output shapes mirror production:
+#   make_sheet_sections() → the dict fetch_google_sheet_data() returns
+#                           ({'weekly': df, 'monthly': df, 'sale': df}) plus the
+#                           bracket_map / prefix_map scan_bracket_headers() builds
+#   make_mis_csv()        → the DataFrame resolve_mis_csv() returns (all str)
+#
+# Realism knobs covered: bracket headers ("Weekday [Weekday]"), multi-day
+# weekly groups (same deal on several weekdays), multi-brand rows with tagged
+# MIS ID cells, "All Locations Except:" strings, monthly ordinals, sale ranges,
+# MIS rows that match / near-match / don't match the sheet.
+#
+# Same seed + same sizes → byte-identical frames, so timings are comparable
+# between commits.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from typing import Any
+
+import pandas as pd
+
+BRANDS: list[str] = [
+    'Stiiizy', 'Raw Garden', 'Kiva', 'Wyld', 'Camino', 'Plug Play', 'Jeeter',
+    'Alien Labs', 'Cookies', 'Connected', 'Heavy Hitters', 'Select', 'PAX',
+    'Papa & Barkley', 'Hash & Flowers', 'Cann', 'St. Ides', 'Lowell Farms',
+    'Glass House', 'Almora', 'Dompen', 'Punch Edibles', 'Kanha', 'Friendly Farms',
+    'Maven Genetics', 'Jungle Boys', 'Seed Junky', 'Fig Farms', 'Uncle Arnies',
+    'Old Pal', 'Pacific Stone', 'Dime Industries', 'Ember Valley', 'West Coast Cure',
+]
+STORES: list[str] = [
+    'West Hollywood', 'Beverly Hills', 'Koreatown', 'Riverside', 'Fresno (Palm)',
+    'Fresno (Shaw)', 'Oxnard', 'El Sobrante', 'Laguna Woods', 'Hawthorne', 'Dixon', 'Davis',
+]
+CATEGORIES: list[str] = ['Flower', 'Pre-Rolls', 'Vapes', 'Edibles', 'Concentrates',
+                         'Beverages', 'Tinctures', 'Topicals', 'Accessories']
+WEEKDAYS: list[str] = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday',
+                       'Saturday', 'Sunday']
+ORDINALS: list[str] = ['1st', '5th', '10th', '15th', '20th', '25th']
+
+# Sheet header → bracket alias (None = plain header)
+SHEET_COLUMNS: list[tuple[str, str | None]] = [
+    ('Weekday', 'Weekday'),
+    ('Brand', 'Brand'),
+    ('Linked Brand', None),
+    ('Deal Discount', 'Daily Deal Discount'),
+    ('Brand Contribution % (Credit)', 'Discount paid by vendor'),
+    ('Categories', 'Category'),
+    ('Category Exceptions', None),
+    ('Locations (Discount Applies at)', None),
+    ('Location Exceptions', None),
+    ('Contracted Duration (MM/DD/YY - MM/DD/YY)', None),
+    ('Wholesale?', 'Rebate type'),
+    ('Retail?', 'Rebate type'),
+    ('Deal Information', None),
+    ('Special Notes', None),
+    ('Blaze Discount Title', None),
+    ('MIS ID', None),
+]
+
+
+@dataclass
+class SyntheticSheet:
+    """Sections + the alias maps the engines expect alongside them."""
+    sections:    dict[str, pd.DataFrame]
+    bracket_map: dict[str, str]
+    prefix_map:  dict[str, str]
+    month:       int
+    year:        int
+    tab_name:    str
+    meta:        dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def total_rows(self) -> int:
+        return sum(len(df) for df in self.sections.values())
+
+
+def _header(name: str, alias: str | None, bracketed: bool) -> str:
+    return f'{name} [{alias}]' if (bracketed and alias) else name
+
+
+def _alias_maps(bracketed: bool) -> tuple[dict[str, str], dict[str, str]]:
+    bmap: dict[str, str] = {}
+    pmap: dict[str, str] = {}
+    if not bracketed:
+        return bmap, pmap
+    for name, alias in SHEET_COLUMNS:
+        if alias and alias != 'Rebate type':
+            full = _header(name, alias, True)
+            bmap[f'[{alias}]'] = full
+            pmap[name] = full
+    return bmap, pmap
+
+
+def _locations(rng: random.Random) -> tuple[str, str]:
+    roll = rng.random()
+    if roll < 0.55:
+        return 'All Locations', ''
+    if roll < 0.8:
+        excluded = rng.sample(STORES, rng.randint(1, 3))
+        return f"All Locations Except: {', '.join(excluded)}", ', '.join(excluded)
+    return ', '.join(sorted(rng.sample(STORES, rng.randint(1, 6)))), ''
+
+
+def _categories(rng: random.Random) -> str:
+    if rng.random() < 0.3:
+        return ''
+    return ', '.join(rng.sample(CATEGORIES, rng.randint(1, 3)))
+
+
+def _base_row(rng: random.Random, brand: str, mis_id: str) -> dict[str, str]:
+    locs, excs = _locations(rng)
+    wholesale = rng.random() < 0.5
+    return {
+        'Brand':                           brand,
+        'Linked Brand':                    rng.choice(['', '', rng.choice(BRANDS)]),
+        'Deal Discount':                   f'{rng.choice([10, 15, 20, 25, 30, 40, 50])}%',
+        'Brand Contribution % (Credit)':   f'{rng.choice([0, 25, 50, 100])}%',
+        'Categories':                      _categories(rng),
+        'Category Exceptions':             '',
+        'Locations (Discount Applies at)': locs,
+        'Location Exceptions':             excs,
+        'Wholesale?':                      'TRUE' if wholesale else 'FALSE',
+        'Retail?':                         'FALSE' if wholesale else 'TRUE',
+        'Deal Information':                rng.choice(['', 'BOGO', 'Bundle 3 for $50', 'Excludes 1g carts']),
+        'Special Notes':                   rng.choice(['', '', 'Vendor day', 'Tier 1']),
+        'Blaze Discount Title':            '',
+        'MIS ID':                          mis_id,
+    }
+
+
+def make_sheet_sections(
+    rows_per_section: int = 20,
+    seed: int = 42,
+    month: int = 3,
+    year: int = 2026,
+    bracketed: bool = True,
+    multi_day_ratio: float = 0.3,
+    multi_brand_ratio: float = 0.1,
+) -> SyntheticSheet:
+    """
+    Build weekly / monthly / sale sections of ~rows_per_section rows each.
+    Every row carries `_SHEET_ROW_NUM` exactly like fetch_google_sheet_data().
+    """
+    rng = random.Random(seed)
+    yy  = year % 100
+    next_id = [100000]
+
+    def new_id() -> str:
+        next_id[0] += 1
+        return str(next_id[0])
+
+    rows: dict[str, list[dict[str, str]]] = {'weekly': [], 'monthly': [], 'sale': []}
+
+    # ── Weekly (with multi-day groups) ───────────────────────────────────────
+    while len(rows['weekly']) < rows_per_section:
+        brand = rng.choice(BRANDS)
+        if rng.random() < multi_brand_ratio:
+            second = rng.choice([b for b in BRANDS if b != brand])
+            base = _base_row(rng, f'{brand}, {second}', f'W1: {new_id()}\nW1: {new_id()}')
+        else:
+            base = _base_row(rng, brand, rng.choice([new_id(), new_id(), '']))
+        days = (rng.sample(WEEKDAYS, rng.randint(2, 4)) if rng.random() < multi_day_ratio
+                else [rng.choice(WEEKDAYS)])
+        for day in days:
+            if len(rows['weekly']) >= rows_per_section:
+                break
+            rows['weekly'].append({**base, 'Weekday': day,
+                                   'Contracted Duration (MM/DD/YY - MM/DD/YY)': ''})
+
+    # ── Monthly (ordinal days) ───────────────────────────────────────────────
+    for _ in range(rows_per_section):
+        base = _base_row(rng, rng.choice(BRANDS), rng.choice([new_id(), '']))
+        days = ', '.join(sorted(rng.sample(ORDINALS, rng.randint(1, 2)),
+                                key=lambda o: int(o[:-2])))
+        rows['monthly'].append({**base, 'Weekday': '',
+                                'Contracted Duration (MM/DD/YY - MM/DD/YY)': days})
+
+    # ── Sale (date ranges inside the target month) ───────────────────────────
+    for _ in range(rows_per_section):
+        base  = _base_row(rng, rng.choice(BRANDS), rng.choice([new_id(), '']))
+        start = rng.randint(1, 24)
+        end   = min(start + rng.randint(0, 6), 28)
+        rows['sale'].append({**base, 'Weekday': '',
+                             'Contracted Duration (MM/DD/YY - MM/DD/YY)':
+                                 f'{month:02d}/{start:02d}/{yy:02d} - {month:02d}/{end:02d}/{yy:02d}'})
+
+    # ── Frames with real header text + sheet row numbers ─────────────────────
+    rename = {name: _header(name, alias, bracketed) for name, alias in SHEET_COLUMNS}
+    sections: dict[str, pd.DataFrame] = {}
+    row_num = 3  # header row is 2 on the real sheets
+    for name in ('weekly', 'monthly', 'sale'):
+        recs = []
+        for r in rows[name]:
+            rec = {rename[k]: r.get(k, '') for k, _ in SHEET_COLUMNS}
+            rec['_SHEET_ROW_NUM'] = row_num
+            row_num += 1
+            recs.append(rec)
+        sections[name] = pd.DataFrame(recs)
+        row_num += 3  # section marker + blank + header rows between sections
+
+    bmap, pmap = _alias_maps(bracketed)
+    month_name = pd.Timestamp(year=year, month=month, day=1).strftime('%B')
+    return SyntheticSheet(
+        sections=sections, bracket_map=bmap, prefix_map=pmap,
+        month=month, year=year, tab_name=f'{month_name} {year}',
+        meta={'seed': seed, 'rows_per_section': rows_per_section, 'bracketed': bracketed},
+    )
+
+
+def _mis_store_string(sheet_locs: str) -> str:
+    if sheet_locs.startswith('All Locations'):
+        return sheet_locs
+    return ', '.join(f'The Artist Tree - {s}' for s in sheet_locs.split(', '))
+
+
+def make_mis_csv(
+    sheet: SyntheticSheet,
+    mis_rows: int = 60,
+    seed: int = 7,
+    match_ratio: float = 0.6,
+    drift_ratio: float = 0.15,
+) -> pd.DataFrame:
+    """
+    Build a MIS CSV export consistent with `sheet`.
+    match_ratio of sheet rows get an exact MIS twin (same ID); drift_ratio of
+    those twins get a changed discount/date so audits find mismatches; the rest
+    of the mis_rows budget is unrelated noise.
+    """
+    rng = random.Random(seed)
+    month, year = sheet.month, sheet.year
+    out: list[dict[str, str]] = []
+
+    def mis_row(mis_id: str, brand: str, weekday: str, disc: str, vend: str,
+                cats: str, store: str) -> dict[str, str]:
+        start = f'{month:02d}/01/{year}'
+        end   = f'{month:02d}/{rng.choice([28, 30, 31]) if month != 2 else 28}/{year}'
+        return {
+            'ID':                           mis_id,
+            'Brand':                        brand,
+            'Linked Brand (if applicable)': rng.choice(['', 'N/A', rng.choice(BRANDS)]),
+            'Weekday':                      weekday,
+            'Daily Deal Discount':          disc,
+            'Discount paid by vendor':      vend,
+            'Category':                     cats,
+            'Start date':                   start,
+            'End date':                     end,
+            'Store':                        store,
+        }
+
+    for section, df in sheet.sections.items():
+        cols = {c.split(' [')[0]: c for c in df.columns}
+        for _, row in df.iterrows():
+            if len(out) >= mis_rows or rng.random() > match_ratio:
+                continue
+            raw_id = str(row[cols['MIS ID']])
+            ids = [p.split(':')[-1].strip() for p in raw_id.split('\n') if p.strip()]
+            if not ids:
+                continue
+            brands = [b.strip() for b in str(row[cols['Brand']]).split(',')] \
+                if 'Papa & Barkley' not in str(row[cols['Brand']]) else [str(row[cols['Brand']])]
+            disc = str(row[cols['Deal Discount']]).rstrip('%')
+            vend = str(row[cols['Brand Contribution % (Credit)']]).rstrip('%')
+            if rng.random() < drift_ratio:
+                disc = str(int(float(disc or 0)) + 5)
+            weekday = str(row[cols['Weekday']]) or ', '.join(rng.sample(WEEKDAYS, 7))
+            store = _mis_store_string(str(row[cols['Locations (Discount Applies at)']]))
+            for mid, brand in zip(ids, brands):
+                out.append(mis_row(mid, brand, weekday, disc, vend,
+                                   str(row[cols['Categories']]), store))
+
+    next_id = 900000
+    while len(out) < mis_rows:
+        next_id += 1
+        locs, _ = _locations(rng)
+        out.append(mis_row(
+            str(next_id), rng.choice(BRANDS),
+            ', '.join(sorted(rng.sample(WEEKDAYS, rng.randint(1, 3)), key=WEEKDAYS.index)),
+            str(rng.choice([10, 15, 20, 25, 30, 40, 50])),
+            str(rng.choice([0, 25, 50, 100])),
+            _categories(rng), _mis_store_string(locs),
+        ))
+
+    return pd.DataFrame(out[:mis_rows]).astype(str)
+
+
+def to_sheet_values(sheet: SyntheticSheet) -> list[list[str]]:
+    """
+    Raw tab values (what values().get returns) that parse back into
+    sheet.sections: title row, header, weekly rows, MONTHLYSTART + header,
+    monthly rows, SALESTART + header, sale rows, END420. Sheets omits
+    trailing empty cells, so rows are right-trimmed.
+    """
+    header = [c for c in sheet.sections['weekly'].columns if c != '_SHEET_ROW_NUM']
+    values: list[list[str]] = [['Deals'], list(header)]
+
+    def rows(sec: str) -> None:
+        for rec in sheet.sections[sec][header].itertuples(index=False):
+            cells = [str(v) for v in rec]
+            while cells and cells[-1] == '':
+                cells.pop()
+            values.append(cells)
+
+    rows('weekly')
+    values += [['MONTHLYSTART'], list(header)]
+    rows('monthly')
+    values += [['SALESTART'], list(header)]
+    rows('sale')
+    values.append(['END420'])
+    return values
@@ -12,6 +12,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.app import create_app
+from src.server import serve
 from src.utils.logger import get_logger
 
 log = get_logger(__name__)
@@ -30,7 +31,8 @@ def main() -> None:
     print(f"[BLAZE MIS] ✓ TAT-MIS-Architect ready → http://{host}:{port}")
     log.info("Flask server starting on %s:%s (debug=%s)", host, port, debug)
 
-    app.run(host=host, port=port, debug=debug, use_reloader=False)
+    # SERVER_MODE (settings.json) / FLASK_SERVER_MODE (env) selects dev vs waitress
+    serve(app, host=host, port=port, debug=debug)
 
 
 if __name__ == '__main__':
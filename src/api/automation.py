@@ -0,0 +1,126 @@
+# src/api/automation.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Background automation routes that run on browser-pool tabs
+# (src/automation/browser_pool.py) instead of the user's shared driver.
+#
+# Tier promotion:  POST /api/automation/tier-promotion  → 202 job
+#                  (the pooled twin of /api/blaze/update-tags, which lives in
+#                  the no-touch blaze.py and still uses execute_in_background)
+#                  {"engine": "api"} → Blaze API engine (src/integrations/blaze_tiers.py);
+#                  with "dry_run": true the diff is returned directly
+# Blaze token:     POST /api/automation/blaze-token     → capture + cache
+#                  (src/automation/blaze_token.py)
+# Zombie disable:  POST /api/automation/zombie-disable  → bulk, via the API
+#                  (src/integrations/blaze_promotions.py; failed IDs fall
+#                  back to the per-promotion UI flow /api/blaze/zombie-disable)
+#                  Off by default (BLAZE_API_BULK_DISABLE) until checked
+#                  against Blaze; while off every ID takes the UI flow.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import traceback
+
+from flask import Blueprint, current_app, jsonify, request
+
+bp = Blueprint('automation', __name__)
+
+
+@bp.route('/api/automation/tier-promotion', methods=['POST'])
+def tier_promotion():
+    """
+    Run the Tier Promotion tag update as a job.
+    engine='browser' (default): on a Blaze pool tab, submitted as long work so
+    quick Blaze jobs keep the lane's first tab.
+    engine='api': through the Blaze API; dry_run=true answers the diff directly.
+    """
+    try:
+        from src.core.jobs import JobQueueFull, get_job_runner
+
+        data         = request.get_json() or {}
+        engine       = str(data.get('engine', 'browser')).lower()
+        gui_username = data.get('mis_username', '').strip()
+        gui_password = data.get('mis_password', '').strip()
+
+        if engine == 'api':
+            from src.integrations.blaze_tiers import run_tier_update
+            if data.get('dry_run'):
+                return jsonify({'success': True, **run_tier_update(dry_run=True)})
+
+            def run(job):
+                job.progress(0, 'Applying tier tags through the Blaze API')
+                return run_tier_update(dry_run=False)
+        else:
+            from src.api.blaze import run_tier_promotion_update_logic
+            from src.automation.browser_pool import execute_pooled
+
+            def run(job):
+                job.progress(0, 'Queued on a Blaze pool tab')
+                result = execute_pooled('blaze', run_tier_promotion_update_logic, long=True,
+                                        gui_username=gui_username, gui_password=gui_password)
+                if not result['success']:
+                    raise RuntimeError(result['error'])
+                return {'message': result['result'], 'worker': result.get('worker')}
+
+        try:
+            job_id = get_job_runner().submit('tier_promotion', run, lock='tier_promotion',
+                                             meta={'path': request.path, 'engine': engine})
+        except JobQueueFull as e:
+            return jsonify({'success': False, 'error': str(e)}), 429
+
+        return jsonify({'success': True, 'async': True, 'job_id': job_id,
+                        'status_url': f'/api/jobs/{job_id}'}), 202
+
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@bp.route('/api/automation/blaze-token', methods=['POST'])
+def blaze_token():
+    """
+    Refresh the Blaze API token: capture it from the app's first API request
+    on a background tab, validate it and cache it (token files + session).
+    Body: {email?, password?, timeout?} — credentials only needed when the
+    browser's Blaze session has expired.
+    """
+    try:
+        from src.automation.blaze_token import DEFAULT_TIMEOUT, acquire_blaze_token
+
+        data   = request.get_json() or {}
+        result = acquire_blaze_token(data.get('email', '').strip(), data.get('password', '').strip(),
+                                     timeout=float(data.get('timeout', DEFAULT_TIMEOUT)))
+        result.pop('token', None)                 # never echo the token itself
+        return jsonify(result)
+
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@bp.route('/api/automation/zombie-disable', methods=['POST'])
+def zombie_disable_bulk():
+    """
+    Disable many promotions through the Blaze management API.
+    Body: {promo_ids: [...]}. Returns per-ID results; IDs in `failed` should
+    go through the UI flow (/api/blaze/zombie-disable) one at a time.
+    Answers {success: false, enabled: false} without calling Blaze unless
+    BLAZE_API_BULK_DISABLE is set.
+    """
+    try:
+        from src.integrations.blaze_promotions import bulk_set_active
+
+        if not current_app.config.get('BLAZE_API_BULK_DISABLE', False):
+            return jsonify({'success': False, 'enabled': False,
+                            'error': 'Bulk API disable is off (BLAZE_API_BULK_DISABLE)'})
+
+        data = request.get_json() or {}
+        promo_ids = data.get('promo_ids') or []
+        if not isinstance(promo_ids, list) or not promo_ids:
+            return jsonify({'success': False, 'error': 'No promo_ids provided'})
+
+        return jsonify({'success': True, **bulk_set_active(promo_ids, active=False)})
+
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)})
@@ -14,6 +14,8 @@ import traceback
 import pandas as pd
 from pathlib import Path
 from src.session import session
+from src.api.jobs import async_capable  # Job runner: long inventory calls can run as background jobs
+from src.core.jobs import JobQueueFull, get_job_runner
 from typing import Optional, Dict, List, Any
 from datetime import datetime, timedelta
 
@@ -1494,6 +1496,8 @@ class BlazeInventoryReporter:
             headers = {'Authorization': f'Token {token}', 'Accept': 'application/json'}
             r = _req.get('https://api.blaze.me/api/v1/mgmt/brands?start=0&limit=500',
                          headers=headers, timeout=15)
+            from src.integrations.blaze_auth import note_status
+            note_status(token, r.status_code)
             if r.ok:
                 brands = r.json().get('values', [])
                 self.brand_map = {b['id']: b.get('name', '') for b in brands}
@@ -2634,14 +2638,19 @@ def api_blaze_inventory_start():
     if session.get('blaze_inventory_running', False):
         return jsonify({'error': 'Report already running'}), 409
 
-    def run_in_thread():
+    # Job runner: bounded worker pool instead of an ad-hoc thread; job_id lets
+    # the UI poll /api/jobs/<id> in addition to the session-flag status route.
+    def run_in_job(job):
         reporter = BlazeInventoryReporter()
-        reporter.run_report(target_store)
+        return reporter.run_report(target_store)
     
-    thread = threading.Thread(target=run_in_thread, daemon=True)
-    thread.start()
+    try:
+        job_id = get_job_runner().submit('blaze_inventory', run_in_job,
+                                         lock='blaze_inventory', meta={'store': target_store})
+    except JobQueueFull as e:
+        return jsonify({'success': False, 'error': str(e)}), 429
     
-    return jsonify({'success': True})
+    return jsonify({'success': True, 'job_id': job_id})
 
 @bp.route('/api/blaze/inventory/status')
 def api_blaze_inventory_status():
@@ -2679,6 +2688,7 @@ def api_blaze_inventory_download():
     return jsonify({'success': True})
 
 @bp.route('/api/blaze/inventory/fetch', methods=['POST'])
+@async_capable('blaze_inventory', lock='blaze_inventory')
 def api_blaze_inventory_fetch():
     """
     Fetch inventory data and cache it per store.
@@ -0,0 +1,178 @@
+# src/api/diagnostics.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Diagnostics routes: saved request profiles (see src/utils/profiler.py) and
+# the sheet tab snapshot cache (see src/integrations/sheet_cache.py).
+#
+# Capture a profile:  POST /api/mis/maudit?profile=1   (or header X-Profile: 1)
+#                     requires PROFILING_ENABLED=true in config/settings.json
+# Then list/download: GET /api/diagnostics/profiles
+#                     GET /api/diagnostics/profiles/<id>?format=prof|txt|json
+#
+# Tab cache:          GET  /api/diagnostics/sheet-cache
+#                     POST /api/diagnostics/sheet-cache/clear   {"tab": optional}
+# Sheets service:     GET  /api/diagnostics/sheets-service
+# Settings cache:     GET  /api/diagnostics/settings-cache
+#                     POST /api/diagnostics/settings-cache/refresh  (active spreadsheet)
+# Sheet mirror:       GET  /api/diagnostics/sheet-mirror
+# Row cache:          GET  /api/diagnostics/row-cache
+#                     POST /api/diagnostics/row-cache/clear  (optional ?engine=)
+# MIS waits:          GET  /api/diagnostics/waits  (optional ?limit=N)
+# Browser pool:       GET  /api/diagnostics/browser-pool
+# Validator inject:   GET  /api/diagnostics/validation-injector
+# Blaze auth:         GET  /api/diagnostics/blaze-auth
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import traceback
+
+from flask import Blueprint, current_app, jsonify, request, send_file
+
+from src.integrations.sheet_cache import get_tab_cache
+from src.utils.profiler import PROFILE_NAME_RE, list_profiles, profile_dir
+
+bp = Blueprint('diagnostics', __name__)
+
+_FORMATS = {
+    'prof': 'application/octet-stream',
+    'txt':  'text/plain',
+    'json': 'application/json',
+}
+
+
+@bp.route('/api/diagnostics/profiles')
+def api_list_profiles():
+    """List saved request profiles (newest first). Optional ?limit=N."""
+    try:
+        limit    = int(request.args.get('limit', 50))
+        profiles = list_profiles(current_app.config)[:max(limit, 1)]
+        return jsonify({
+            'success':  True,
+            'enabled':  bool(current_app.config.get('PROFILING_ENABLED', False)),
+            'profiles': profiles,
+        })
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@bp.route('/api/diagnostics/profiles/<profile_id>')
+def api_download_profile(profile_id: str):
+    """Download one profile. ?format=prof (default, pstats) | txt | json."""
+    fmt = request.args.get('format', 'prof')
+    if fmt not in _FORMATS or not PROFILE_NAME_RE.match(profile_id):
+        return jsonify({'success': False, 'error': 'Invalid profile id or format'}), 400
+    path = profile_dir(current_app.config) / f'{profile_id}.{fmt}'
+    if not path.exists():
+        return jsonify({'success': False, 'error': f'Profile not found: {profile_id}'}), 404
+    return send_file(str(path), mimetype=_FORMATS[fmt], as_attachment=(fmt == 'prof'),
+                     download_name=path.name)
+
+
+@bp.route('/api/diagnostics/sheet-cache')
+def api_sheet_cache_stats():
+    """Tab snapshot cache: hit/miss counters and cached tabs, plus metadata/batchGet counts."""
+    from src.integrations import sheets_access
+    return jsonify({'success': True, **get_tab_cache().stats(), 'access': sheets_access.stats()})
+
+
+@bp.route('/api/diagnostics/sheet-cache/clear', methods=['POST'])
+def api_sheet_cache_clear():
+    """Drop cached tabs (all, or one tab of the active spreadsheet)."""
+    try:
+        from src.session import session
+        tab = (request.get_json(silent=True) or {}).get('tab')
+        sid = session.get_spreadsheet_id() if tab else None
+        cleared = get_tab_cache().invalidate(sid or None, tab or None, headers=True)
+        return jsonify({'success': True, 'cleared': cleared})
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@bp.route('/api/diagnostics/sheets-service')
+def api_sheets_service_stats():
+    """Sheets service manager: active profile, token expiry, refresh/build counters."""
+    from src.integrations.sheets_service import get_sheets_service_manager
+    return jsonify({'success': True, **get_sheets_service_manager().stats()})
+
+
+@bp.route('/api/diagnostics/settings-cache')
+def api_settings_cache_stats():
+    """Settings/Brand Rebate cache: entries (version, revision, sizes) and counters."""
+    from src.integrations.settings_cache import get_settings_cache
+    return jsonify({'success': True, **get_settings_cache().stats()})
+
+
+@bp.route('/api/diagnostics/sheet-mirror')
+def api_sheet_mirror_stats():
+    """Local sheet mirror: mirrored tabs (rows, revision, age) and sync counters."""
+    from src.integrations.sheet_mirror import get_sheet_mirror
+    return jsonify({'success': True, **get_sheet_mirror().stats()})
+
+
+@bp.route('/api/diagnostics/row-cache')
+def api_row_cache_stats():
+    """Per-row engine cache: entries per engine and hit/miss counters."""
+    from src.core.row_cache import get_row_cache
+    return jsonify({'success': True, **get_row_cache().stats()})
+
+
+@bp.route('/api/diagnostics/row-cache/clear', methods=['POST'])
+def api_row_cache_clear():
+    """Drop cached row results (all engines, or ?engine=run_maudit etc.)."""
+    from src.core.row_cache import get_row_cache
+    engine = request.args.get('engine') or None
+    return jsonify({'success': True, 'cleared': get_row_cache().clear(engine)})
+
+
+@bp.route('/api/diagnostics/waits')
+def api_wait_stats():
+    """MIS automation condition waits: per-condition timings and the most recent waits."""
+    try:
+        from src.automation.waits import get_wait_engine
+        engine = get_wait_engine()
+        limit  = int(request.args.get('limit', 50))
+        return jsonify({'success': True, **engine.stats(), 'recent': engine.recent(limit)})
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@bp.route('/api/diagnostics/browser-pool')
+def api_browser_pool_stats():
+    """Browser worker pool: per-lane workers, their tabs, current task and queue depth."""
+    from src.automation.browser_pool import get_browser_pool
+    return jsonify({'success': True, **get_browser_pool().stats()})
+
+
+@bp.route('/api/diagnostics/validation-injector')
+def api_validation_injector_stats():
+    """MIS validator injection: mode, tabs with a registered new-document script, failures."""
+    from src.automation.validation_injector import get_validation_injector
+    return jsonify({'success': True, **get_validation_injector().stats()})
+
+
+@bp.route('/api/diagnostics/blaze-auth')
+def api_blaze_auth_stats():
+    """Blaze token validation cache: TTL, hits vs live validations, re-acquires."""
+    from src.integrations.blaze_auth import get_blaze_client
+    return jsonify({'success': True, **get_blaze_client().stats()})
+
+
+@bp.route('/api/diagnostics/settings-cache/refresh', methods=['POST'])
+def api_settings_cache_refresh():
+    """Re-read the active spreadsheet's Settings/Brand Rebate tabs now."""
+    try:
+        from src.session import session
+        from src.integrations.settings_cache import get_settings_cache
+        sid = session.get_spreadsheet_id()
+        if not sid:
+            return jsonify({'success': False, 'error': 'No spreadsheet loaded'})
+        entry = get_settings_cache().refresh(sid, force=True)
+        if entry is None:
+            return jsonify({'success': False, 'error': 'Settings tabs could not be read'})
+        return jsonify({'success': True, **entry.summary()})
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)})
@@ -0,0 +1,139 @@
+# src/api/jobs.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Background job routes + the @async_capable opt-in decorator.
+# Runner / worker pool lives in src/core/jobs.py.
+#
+# Any route decorated with @async_capable keeps its normal synchronous
+# behaviour. Adding ?async=1 (or "async": true in a JSON body) instead returns
+#   202 {"success": true, "job_id": "...", "status_url": "/api/jobs/<id>"}
+# and the same view function runs on a worker thread against a replayed copy
+# of the request (body, headers, query string — uploads included).
+# Poll /api/jobs/<id>; fetch the route's normal JSON from /api/jobs/<id>/result.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import functools
+import traceback
+from typing import Any, Callable
+
+from flask import Blueprint, current_app, jsonify, request
+
+from src.core.jobs import (
+    FINISHED_STATES,
+    JobHandle,
+    JobQueueFull,
+    current_job,
+    get_job_runner,
+)
+
+bp = Blueprint('jobs', __name__)
+
+_TRUTHY = ('1', 'true', 'yes', 'on')
+
+
+# ── Opt-in decorator ──────────────────────────────────────────────────────────
+
+def _wants_async() -> bool:
+    if current_job() is not None:
+        return False  # already on a worker — never re-queue
+    if str(request.args.get('async', '')).lower() in _TRUTHY:
+        return True
+    if request.is_json:
+        body = request.get_json(silent=True)
+        if isinstance(body, dict) and str(body.get('async', '')).lower() in _TRUTHY:
+            return True
+    return False
+
+
+def async_capable(kind: str, lock: str | None = None) -> Callable:
+    """
+    Let a route run as a background job when the caller asks for it.
+
+    Args:
+        kind: Job label shown in /api/jobs (e.g. 'match', 'maudit').
+        lock: Optional serialization group. Jobs with the same lock run one at
+              a time (use 'browser' for anything that drives Selenium).
+    """
+    def decorator(view: Callable) -> Callable:
+        @functools.wraps(view)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _wants_async():
+                return view(*args, **kwargs)
+
+            app     = current_app._get_current_object()
+            body    = request.get_data(cache=True)
+            path    = request.path
+            method  = request.method
+            query   = request.query_string.decode('latin-1')
+            headers = [(k, v) for k, v in request.headers.items()]
+
+            def run(job: JobHandle) -> dict:
+                with app.test_request_context(path, method=method, query_string=query,
+                                              headers=headers, data=body):
+                    resp = app.make_response(view(*args, **kwargs))
+                    payload = resp.get_json(silent=True)
+                    return {
+                        'status_code': resp.status_code,
+                        'body': payload if payload is not None else resp.get_data(as_text=True),
+                    }
+
+            try:
+                job_id = get_job_runner().submit(kind, run, lock=lock, meta={'path': path})
+            except JobQueueFull as e:
+                return jsonify({'success': False, 'error': str(e)}), 429
+            return jsonify({
+                'success':    True,
+                'async':      True,
+                'job_id':     job_id,
+                'status_url': f'/api/jobs/{job_id}',
+            }), 202
+        return wrapper
+    return decorator
+
+
+# ── Routes ────────────────────────────────────────────────────────────────────
+
+@bp.route('/api/jobs')
+def list_jobs():
+    """List retained jobs (newest first). Optional ?kind= filter."""
+    try:
+        runner = get_job_runner()
+        jobs   = runner.list_jobs(kind=request.args.get('kind') or None)
+        return jsonify({'success': True, 'jobs': [j.to_dict() for j in jobs],
+                        'stats': runner.stats()})
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@bp.route('/api/jobs/<job_id>')
+def job_status(job_id: str):
+    """Status + percent for one job."""
+    job = get_job_runner().get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': f'Unknown or expired job: {job_id}'}), 404
+    return jsonify({'success': True, **job.to_dict()})
+
+
+@bp.route('/api/jobs/<job_id>/result')
+def job_result(job_id: str):
+    """Status plus the job's result. 202 while the job is still queued/running."""
+    job = get_job_runner().get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': f'Unknown or expired job: {job_id}'}), 404
+    finished = job.status in FINISHED_STATES
+    return jsonify({'success': True, **job.to_dict(include_result=finished)}), (200 if finished else 202)
+
+
+@bp.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def job_cancel(job_id: str):
+    """Request cancellation. Running jobs stop at their next progress checkpoint."""
+    runner = get_job_runner()
+    job    = runner.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': f'Unknown or expired job: {job_id}'}), 404
+    if not runner.cancel(job_id):
+        return jsonify({'success': False, 'error': f'Job already {job.status}',
+                        'status': job.status})
+    return jsonify({'success': True, **job.to_dict()})
@@ -17,7 +17,10 @@ import pandas as pd
 from flask import Blueprint, jsonify, request
 
 from src.session import session
+from src.api.jobs import async_capable
 from src.integrations.google_sheets import fetch_google_sheet_data, parse_tab_month_year
+from src.integrations.multi_tab import load_date_window, parse_window
+from src.integrations.sheet_mirror import offline_marker
 
 
 # ── Tab resolution helper ─────────────────────────────────────────────────────
@@ -112,7 +115,7 @@ def api_mis_audit():
                 )
             else:
                 all_results[section] = []
-        return jsonify({'success': True, 'results': all_results})
+        return jsonify({'success': True, 'results': all_results, **offline_marker(sections_data)})
     except Exception as e:
         traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)})
@@ -121,6 +124,7 @@ def api_mis_audit():
 # ── MAudit ─────────────────────────────────────────────────────────────────────
 
 @bp.route('/api/mis/maudit', methods=['POST'])
+@async_capable('maudit')
 def maudit():
     """
     MAudit: Verify Google Sheet deals against MIS CSV.
@@ -165,6 +169,7 @@ def maudit():
             'success': True,
             'results': combined_results,
             'summary': {k: len(v) for k, v in combined_results.items()},
+            **offline_marker(sections_data),
         })
 
     except Exception as e:
@@ -179,28 +184,36 @@ def gsheet_conflict_audit():
     """
     Date-aware pre-flight check: Scans Google Sheet for cross-section brand conflicts.
     Returns date_conflicts and brand_conflicts.
+    Optional "start"/"end" dates audit every month tab in that window at once.
     """
     try:
         data     = request.get_json() or {}
         tab_name = data.get('tab', '')
+        window   = parse_window(data)
 
-        if not tab_name:
+        if not tab_name and not window:
             return jsonify({'success': False, 'error': 'No tab specified'})
 
-        target_month, target_year = parse_tab_month_year(tab_name)
-        sections_data = fetch_google_sheet_data(tab_name)
+        if window:
+            sections_data = load_date_window(*window)
+            target_month, target_year = None, None
+            empty = all(df.empty for t in sections_data for df in t.sections.values())
+        else:
+            target_month, target_year = parse_tab_month_year(tab_name)
+            sections_data = fetch_google_sheet_data(tab_name)
+            empty = all(df.empty for df in sections_data.values())
 
-        if all(df.empty for df in sections_data.values()):
+        if empty:
             return jsonify({'success': False, 'error': 'No data found in the selected tab'})
 
         bmap = session.get_mis_bracket_map()
         pmap = session.get_mis_prefix_map()
 
         result = run_conflict_audit_sheet_vs_mis(
-            sections_data, target_month, target_year, bmap, pmap
+            sections_data, target_month, target_year, bmap, pmap, date_window=window
         )
 
-        return jsonify({'success': True, **result})
+        return jsonify({'success': True, **result, **offline_marker(sections_data)})
 
     except Exception as e:
         traceback.print_exc()
@@ -237,6 +250,7 @@ def conflict_audit():
 
 
 @bp.route('/api/mis/cleanup-audit', methods=['POST'])
+@async_capable('cleanup_audit')
 def cleanup_audit():
     """
     Cleanup Audit: find active MIS entries that should be turned off.
@@ -435,6 +449,7 @@ def cleanup_audit():
                 'fullMatch_count': len(full_match_issues),
                 'idOnly_count':    len(id_only_issues),
             },
+            **offline_marker(sections_data),
         })
 
     except Exception as e:
@@ -1,17 +1,25 @@
-# src/api/mis_automation.py — v2.0
+# src/api/mis_automation.py — v2.3
 # ─────────────────────────────────────────────────────────────────────────────
 # MIS Automation routes: browser init, deal creation, end-date updates,
 # validation injection, and pre-flight validation.
 # Selenium ops live in src/automation/mis_entry.py (no-touch zone).
+# v2.1: Batch entry (POST /api/mis/batch-entry + NDJSON stream) — see
+#       src/automation/mis_batch.py
+# v2.2: init-all captures the Blaze token from the first API request
+#       (src/automation/blaze_token.py) instead of robust_login's sleeps
+# v2.3: stored-token check goes through the TTL validation cache
+#       (src/integrations/blaze_auth.py)
 # ─────────────────────────────────────────────────────────────────────────────
 
 from __future__ import annotations
 
+import json
 import os
 import sys
+import time
 import traceback
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 
 from src.session import session
 
@@ -28,108 +36,20 @@ def _build_brand_aw_set() -> list[str]:
     v12.28 (corrected): Return sorted list of lowercase brand names that
     require the After Wholesale toggle ON.
 
-    Reads directly from the Brand Rebate Agreements tab (Settings tab as
-    fallback) — independent of whether the matcher has been run.
+    Served from the settings cache (src/integrations/settings_cache.py);
+    the tab parse lives in brand_helpers.load_brand_aw_list().
     Returns empty list on any error so the validation degrades gracefully.
-
-    Column detection (case-insensitive, scans first 10 rows for header):
-      Brand col : contains 'brand', NOT 'linked', NOT 'contribution'
-      AW flag   : contains 'after' AND 'wholesale'
     """
     try:
-        from src.integrations.google_sheets import authenticate_google_sheets
-
-        service = authenticate_google_sheets()
-        if not service:
-            print("[BRAND-AW-SET] No sheets service — skipping")
-            return []
-
         spreadsheet_id = session.get_spreadsheet_id()
         if not spreadsheet_id:
             print("[BRAND-AW-SET] No spreadsheet_id in session — skipping")
             return []
-
-        # ── Find the right tab ────────────────────────────────────────────────
-        metadata = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-        tab_name: str | None = None
-        for s in metadata.get('sheets', []):
-            t = s['properties']['title']
-            if 'brand rebate' in t.lower() or 'rebate agreement' in t.lower():
-                tab_name = t
-                break
-        if not tab_name:
-            for s in metadata.get('sheets', []):
-                t = s['properties']['title']
-                if 'setting' in t.lower():
-                    tab_name = t
-                    break
-        if not tab_name:
-            print("[BRAND-AW-SET] No Brand Rebate Agreements or Settings tab found")
-            return []
-
-        print(f"[BRAND-AW-SET] Reading tab: '{tab_name}'")
-
-        rows = service.spreadsheets().values().get(
-            spreadsheetId=spreadsheet_id,
-            range=f"'{tab_name}'!A1:Z1000"
-        ).execute().get('values', [])
-        if not rows:
-            return []
-
-        # ── Detect header row ─────────────────────────────────────────────────
-        header: list[str] = []
-        header_row_idx = -1
-        for i, row in enumerate(rows[:10]):
-            rl = [str(c).strip().lower() for c in row]
-            has_brand = any('brand' in c and 'linked' not in c and 'contribution' not in c for c in rl)
-            has_aw    = any('after' in c and 'wholesale' in c for c in rl)
-            if has_brand and has_aw:
-                header = rl
-                header_row_idx = i
-                break
-
-        if header_row_idx == -1:
-            print("[BRAND-AW-SET] Header with brand + after-wholesale columns not found")
-            return []
-
-        brand_idx = next(
-            (ci for ci, h in enumerate(header)
-             if 'brand' in h and 'linked' not in h and 'contribution' not in h),
-            -1
-        )
-        aw_idx = next(
-            (ci for ci, h in enumerate(header) if 'after' in h and 'wholesale' in h),
-            -1
-        )
-
-        if brand_idx == -1 or aw_idx == -1:
-            print(f"[BRAND-AW-SET] Columns not found — brand_idx={brand_idx}, aw_idx={aw_idx}")
-            return []
-
-        print(f"[BRAND-AW-SET] Cols: brand='{header[brand_idx]}', aw='{header[aw_idx]}'")
-
-        brands: set = set()
-        for row in rows[header_row_idx + 1:]:
-            if len(row) <= brand_idx:
-                continue
-            brand_val = str(row[brand_idx]).strip()
-            if not brand_val:
-                continue
-            aw_raw = str(row[aw_idx]).strip().upper() if len(row) > aw_idx else ''
-            if aw_raw in ('TRUE', 'YES', '1', 'X', '✔', 'CHECKED'):
-                for b in brand_val.split(','):
-                    b = b.strip()
-                    if b:
-                        brands.add(b.lower())
-
-        result = sorted(brands)
-        print(f"[BRAND-AW-SET] {len(result)} brands require after_wholesale: {result}")
-        return result
-
+        from src.integrations.settings_cache import get_settings_cache
+        return get_settings_cache().brand_aw_list(spreadsheet_id)
     except Exception as e:
         print(f"[BRAND-AW-SET] Error: {e}")
-        import traceback as _tb
-        _tb.print_exc()
+        traceback.print_exc()
         return []
 
 
@@ -158,26 +78,29 @@ def browser_status():
 def get_settings_dropdowns():
     """Fetch dropdown options from Settings tab for Enhanced Create Popup."""
     try:
-        from src.integrations.google_sheets import load_settings_dropdown_data
+        from src.integrations.settings_cache import get_settings_cache
 
         spreadsheet_id = session.get_spreadsheet_id()
         if not spreadsheet_id:
             return jsonify({'success': False, 'error': 'No spreadsheet loaded. Select a Google Sheet first.'})
 
-        service = session.get_sheets_service()
-        if not service:
-            return jsonify({'success': False, 'error': 'Sheets service not authenticated.'})
+        # Served from the settings cache (memory / disk); revalidated in the background
+        entry = get_settings_cache().get(spreadsheet_id)
+        if entry is None:
+            if not session.get_sheets_service():
+                return jsonify({'success': False, 'error': 'Sheets service not authenticated.'})
+            return jsonify({'success': False, 'error': 'Settings tabs could not be read.'})
 
-        data = load_settings_dropdown_data(spreadsheet_id, service)
+        data = entry.dropdowns
         # v12.28: Also build brand→AW set and include in response so the
         # injected MIS validator JS can reuse this single call.
-        brand_aw_list = _build_brand_aw_set()
         return jsonify({
             'success':          True,
             'stores':           data.get('stores', []),
             'categories':       data.get('categories', []),
             'brand_linked_map': data.get('brand_linked_map', {}),
-            'brand_aw_list':    brand_aw_list,
+            'brand_aw_list':    list(entry.brand_aw_list),
+            'settings_version': entry.version,
         })
     except Exception as e:
         traceback.print_exc()
@@ -188,8 +111,9 @@ def get_settings_dropdowns():
 def init_all():
     """Initialize browser, MIS login, and Blaze login in sequence."""
     try:
-        from src.automation.browser import init_browser, mis_login, robust_login
-        from src.integrations.blaze_api import load_stored_token, validate_token
+        from src.automation.browser import init_browser, mis_login
+        from src.integrations.blaze_api import load_stored_token
+        from src.integrations.blaze_auth import get_blaze_client
 
         data       = request.get_json() or {}
         mis_creds  = data.get('mis', {})
@@ -229,20 +153,37 @@ def init_all():
         blaze_success = False
         if blaze_creds.get('email') and blaze_creds.get('password'):
             stored_token = load_stored_token()
-            if validate_token(stored_token):
+            if get_blaze_client().cache.is_valid(stored_token):     # no request inside the TTL
                 print("[INIT] Existing token valid. Skipping sniffer.")
-                robust_login(blaze_creds['email'], blaze_creds['password'])
                 session.set_blaze_token(stored_token)
                 blaze_success = True
             else:
-                login_status = robust_login(blaze_creds['email'], blaze_creds['password'])
-                blaze_success = bool(login_status)
+                # Resolves on the app's first tokened API request (no fixed sleeps)
+                from src.automation.blaze_token import acquire_blaze_token
+                result = acquire_blaze_token(blaze_creds['email'], blaze_creds['password'])
+                if not result['success']:
+                    print(f"[INIT] Blaze token capture failed: {result['error']}")
+                blaze_success = result['success']
+
+        # 4. Sheets warm-up — metadata + Settings/Brand Rebate rows in one batch,
+        #    so the dropdown / brand-settings / AW loaders that follow hit cache.
+        sheets_ready = False
+        service        = session.get_sheets_service()
+        spreadsheet_id = session.get_spreadsheet_id()
+        if service and spreadsheet_id:
+            try:
+                from src.integrations import sheets_access
+                sheets_access.get_settings_bundle(service, spreadsheet_id, refresh=True)
+                sheets_ready = True
+            except Exception as sheets_err:
+                print(f"[INIT] Sheets warm-up skipped (non-fatal): {sheets_err}")
 
         return jsonify({
             'success':        True,
             'browser_ready':  session.is_browser_ready(),
             'mis_login':      mis_success,
             'blaze_login':    blaze_success,
+            'sheets_ready':   sheets_ready,
         })
 
     except Exception as e:
@@ -350,6 +291,89 @@ def automate_end_date():
         return jsonify({'success': False, 'error': str(e)})
 
 
+# ── Batch entry ───────────────────────────────────────────────────────────────
+
+BATCH_STREAM_POLL_S = 0.25
+
+
+@bp.route('/api/mis/batch-entry', methods=['POST'])
+def batch_entry():
+    """
+    Queue many MIS entries (build_final_entry_payload dicts and/or
+    {mis_id, new_date}) on one warm MIS page. Body {items, dry_run?}.
+    Always runs as a 'browser'-locked job; per-item status is in the job's
+    meta.items and on the NDJSON stream.
+    """
+    try:
+        from src.automation.mis_batch import new_item_states, run_mis_batch
+        from src.core.jobs import JobQueueFull, get_job_runner
+
+        data  = request.get_json() or {}
+        items = data.get('items')
+        if not isinstance(items, list) or not items:
+            return jsonify({'success': False, 'error': 'No items provided'})
+        if not all(isinstance(i, dict) for i in items):
+            return jsonify({'success': False, 'error': 'Every item must be an object'})
+        if not session.get_browser():
+            return jsonify({'success': False, 'error': 'Browser not initialized'})
+
+        dry_run = bool(data.get('dry_run', False))
+        states  = new_item_states(items)
+
+        def run(job):
+            driver = session.get_browser()
+            if not driver:
+                raise RuntimeError('Browser not initialized')
+            return run_mis_batch(driver, items, dry_run=dry_run, job=job, states=states)
+
+        try:
+            job_id = get_job_runner().submit('mis_batch', run, lock='browser',
+                                             meta={'path': request.path, 'dry_run': dry_run,
+                                                   'items': states})
+        except JobQueueFull as e:
+            return jsonify({'success': False, 'error': str(e)}), 429
+
+        return jsonify({
+            'success':    True,
+            'async':      True,
+            'job_id':     job_id,
+            'total':      len(items),
+            'status_url': f'/api/jobs/{job_id}',
+            'stream_url': f'/api/mis/batch-entry/{job_id}/stream',
+        }), 202
+
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@bp.route('/api/mis/batch-entry/<job_id>/stream')
+def batch_entry_stream(job_id: str):
+    """NDJSON: one {type: 'item'} line per item status change, then one {type: 'done'} line."""
+    from src.core.jobs import FINISHED_STATES, get_job_runner
+
+    job = get_job_runner().get(job_id)
+    if job is None or job.kind != 'mis_batch':
+        return jsonify({'success': False, 'error': f'Unknown or expired batch job: {job_id}'}), 404
+
+    def events():
+        seen: dict[int, tuple] = {}
+        while True:
+            finished = job.status in FINISHED_STATES
+            for state in job.meta.get('items', []):
+                row  = dict(state)
+                snap = (row['status'], row.get('error'))
+                if seen.get(row['index']) != snap:
+                    seen[row['index']] = snap
+                    yield json.dumps({'type': 'item', **row}) + '\n'
+            if finished:
+                yield json.dumps({'type': 'done', **job.to_dict(include_result=True)}, default=str) + '\n'
+                return
+            time.sleep(BATCH_STREAM_POLL_S)
+
+    return Response(stream_with_context(events()), mimetype='application/x-ndjson')
+
+
 @bp.route('/api/mis/inject-validation', methods=['POST'])
 def inject_validation():
     """Inject MIS validation system into the current browser page."""
@@ -444,17 +468,32 @@ def lookup_mis_id():
 
         # ── SMART FALLBACK (monolith v12.12.5) ───────────────────────────────
         # Most call sites (audit tab links) pass no row_data.
-        # Search google_df so the checklist fires for every MIS ID click.
+        # Search the local sheet mirror (indexed by MIS ID, any mirrored tab of
+        # this spreadsheet, current tab first), then google_df, so the checklist
+        # fires for every MIS ID click.
         if not row_data:
             print(f"[MIS LOOKUP] No row_data — searching Google Sheet for {mis_id}")
             try:
+                import pandas as pd
                 from src.utils.sheet_helpers import get_col
                 from src.utils.location_helpers import resolve_location_columns, format_location_display
+                from src.integrations.sheet_mirror import get_sheet_mirror
                 google_df = session.get_google_df()
                 bmap = session.get_mis_bracket_map()
                 pmap = session.get_mis_prefix_map()
-                if google_df is not None and not google_df.empty:
-                    matching_rows = []
+                matching_rows = []
+                spreadsheet_id = session.get_spreadsheet_id()
+                if spreadsheet_id:
+                    hits = get_sheet_mirror().query(spreadsheet_id, mis_id=mis_id)
+                    current_tab = session.get_mis_current_sheet()
+                    if any(h['tab'] == current_tab for h in hits):
+                        hits = [h for h in hits if h['tab'] == current_tab]
+                    elif hits:
+                        hits = [h for h in hits if h['tab'] == hits[0]['tab']]
+                    matching_rows = [pd.Series(h['row']) for h in hits]
+                    if matching_rows:
+                        print(f"[MIS LOOKUP] {len(matching_rows)} mirrored row(s) on '{hits[0]['tab']}'")
+                if not matching_rows and google_df is not None and not google_df.empty:
                     for _, g_row in google_df.iterrows():
                         for id_col in ('MIS ID', 'ID', 'Mis Id', 'MIS_ID', 'mis_id'):
                             if id_col not in google_df.columns:
@@ -547,6 +586,31 @@ def lookup_mis_id():
 
 # ── Utilities ─────────────────────────────────────────────────────────────────
 
+def _sections_from_mirror() -> dict[str, list[dict]]:
+    """MIS CSV rows generated from the current tab's mirrored sections (empty if not mirrored)."""
+    from src.core.matcher import generate_mis_csv_with_multiday
+    from src.integrations.sheet_mirror import get_sheet_mirror
+    spreadsheet_id = session.get_spreadsheet_id()
+    tab = session.get_mis_current_sheet()
+    if not spreadsheet_id or not tab:
+        return {}
+    loaded = get_sheet_mirror().load_sections(spreadsheet_id, tab)
+    if loaded is None:
+        return {}
+    frames, info = loaded
+    print(f"[NEWSLETTER] No generated CSV — using mirrored rows of '{tab}'")
+    out: dict[str, list[dict]] = {}
+    for skey, df in frames.items():
+        if df.empty:
+            out[skey] = []
+            continue
+        rows, _ = generate_mis_csv_with_multiday(
+            df, section_type=skey, spreadsheet_id=spreadsheet_id,
+            bracket_map=info['bracket_map'], prefix_map=info['prefix_map'])
+        out[skey] = rows
+    return out
+
+
 @bp.route('/api/mis/generate-newsletter', methods=['POST'])
 def generate_newsletter():
     """
@@ -564,8 +628,18 @@ def generate_newsletter():
 
     try:
         # ── Session source ────────────────────────────────────────────────────
-        sections = session.get('mis_generated_sections') or {}
-        if not sections:
+        # generate-csv stores {section: [rows]} as a JSON string; older
+        # sessions held {section: {'rows': [...]}}. Without a generated CSV,
+        # build the rows from the current tab's local sheet mirror.
+        raw = session.get('mis_generated_sections') or {}
+        if isinstance(raw, str):
+            import json as _json
+            raw = _json.loads(raw)
+        sections = {k: (v.get('rows', []) if isinstance(v, dict) else v or [])
+                    for k, v in (raw or {}).items()}
+        if not any(sections.values()):
+            sections = _sections_from_mirror()
+        if not any(sections.values()):
             return jsonify({'success': False, 'error': "No CSV generated. Please click 'Generate CSV' first."}), 400
 
         _PROJECT_ROOT   = _Path(__file__).resolve().parent.parent.parent
@@ -680,7 +754,7 @@ def generate_newsletter():
             'sale':    {'club420': [], 'tat_legacy': []},
         }
         for skey in ('weekly', 'monthly', 'sale'):
-            for raw_row in sections.get(skey, {}).get('rows', []):
+            for raw_row in sections.get(skey, []):
                 p = _process_row(raw_row, skey)
                 s = p['Store']
                 if _is_club420(s):    section_data[skey]['club420'].append(p)
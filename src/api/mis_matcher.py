@@ -16,15 +16,19 @@ import pandas as pd
 from flask import Blueprint, jsonify, request, send_file
 
 from src.session import session
+from src.api.jobs import async_capable
+from src.core.jobs import report_progress
 from src.integrations.google_sheets import (
     extract_spreadsheet_id,
     get_available_tabs,
     fetch_google_sheet_data,
     open_google_sheet_in_browser,
 )
+from src.integrations import sheets_access
+from src.integrations.sheet_mirror import offline_marker
+from src.integrations.sheet_writer import CellWrite, get_write_queue
 from src.utils.csv_resolver import resolve_mis_csv_for_route as resolve_mis_csv
 from src.utils.brand_helpers import manage_brand_list
-from src.utils.sheet_helpers import detect_header_row, get_col_letter
 from src.core.matcher import (
     enhanced_match_mis_ids,
     generate_mis_csv_with_multiday,
@@ -42,9 +46,12 @@ def load_sheet():
         if not spreadsheet_id:
             return jsonify({'success': False, 'error': 'Invalid Google Sheet URL'})
         session.set_spreadsheet_id(spreadsheet_id)
+        sheets_access.invalidate(spreadsheet_id)   # explicit load → fresh tab list
         tabs = get_available_tabs(spreadsheet_id)
         if not tabs:
             return jsonify({'success': False, 'error': 'No tabs found in spreadsheet'})
+        from src.integrations.settings_cache import get_settings_cache
+        get_settings_cache().prefetch(spreadsheet_id)
         return jsonify({'success': True, 'tabs': tabs, 'spreadsheet_id': spreadsheet_id})
     except Exception as e:
         traceback.print_exc()
@@ -92,6 +99,7 @@ def api_mis_init_sheet_page():
 
 
 @bp.route('/api/mis/generate-csv', methods=['POST'])
+@async_capable('generate_csv')
 def generate_csv():
     try:
         data = request.get_json()
@@ -131,7 +139,8 @@ def generate_csv():
             default=str
         ))
 
-        return jsonify({'success': True, 'sections': results, 'total_rows': total_count})
+        return jsonify({'success': True, 'sections': results, 'total_rows': total_count,
+                        **offline_marker(sections_data)})
     except Exception as e:
         traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)})
@@ -198,23 +207,26 @@ _MIS_REPORTS_DIR = Path(__file__).resolve().parent.parent.parent / 'reports' / '
 
 
 @bp.route('/api/mis/pull-csv', methods=['POST'])
+@async_capable('pull_csv', lock='mis_report')
 def pull_csv():
-    """Pull MIS CSV in background via browser automation. Monolith: line 25375."""
+    """Pull MIS CSV in background on a MIS browser-pool tab. Monolith: line 25375."""
     import time as _time
     try:
-        from src.automation.browser import execute_in_background
+        from src.automation.browser_pool import execute_pooled
         from src.automation.mis_entry import pull_mis_csv_report_background
         data         = request.get_json() or {}
         gui_username = data.get('mis_username', '').strip()
         gui_password = data.get('mis_password', '').strip()
         _MIS_REPORTS_DIR.mkdir(parents=True, exist_ok=True)
 
+        direct       = data.get('direct')      # None → MIS_REPORT_DIRECT
+
         def pull_operation(driver):
-            return pull_mis_csv_report_background(driver)
+            return pull_mis_csv_report_background(driver, direct=direct)
 
-        result = execute_in_background('mis', pull_operation,
-                                       gui_username=gui_username,
-                                       gui_password=gui_password)
+        result = execute_pooled('mis', pull_operation,
+                                gui_username=gui_username,
+                                gui_password=gui_password)
         if result['success']:
             success, path, filename = result['result']
             if success:
@@ -232,6 +244,7 @@ def pull_csv():
 
 
 @bp.route('/api/mis/match', methods=['POST'])
+@async_capable('match')
 def match():
     """
     ID Matcher: Match Google Sheet rows to MIS ID candidates.
@@ -253,12 +266,14 @@ def match():
             return jsonify({'success': False, 'error': 'No CSV available. Pull CSV or upload manually.'})
 
         session.set_mis_df(mis_df)
+        report_progress(10, f'Loaded MIS CSV ({len(mis_df)} rows)')
 
         # ── Update brand list ─────────────────────────────────────────────────
         manage_brand_list(mis_df)
 
         # ── Fetch Google Sheet sections ───────────────────────────────────────
         sections_data = fetch_google_sheet_data(tab_name)
+        report_progress(30, f'Fetched sheet tab "{tab_name}"')
 
         weekly_df  = sections_data.get('weekly',  pd.DataFrame()).copy()
         monthly_df = sections_data.get('monthly', pd.DataFrame()).copy()
@@ -275,13 +290,19 @@ def match():
         pmap = session.get_mis_prefix_map()
         tab  = session.get_mis_current_sheet() or tab_name
 
+        # Brand → linked brand from the settings cache (no Settings tab read per match)
+        from src.integrations.settings_cache import get_settings_cache
+        brand_settings = get_settings_cache().brand_settings(session.get_spreadsheet_id())
+
         all_matches: list[dict] = []
-        for section_name in ('weekly', 'monthly', 'sale'):
+        for step, section_name in enumerate(('weekly', 'monthly', 'sale')):
             df = sections_data.get(section_name, pd.DataFrame())
+            report_progress(30 + step * 20, f'Matching {section_name} section')
             if df.empty:
                 continue
             section_matches = enhanced_match_mis_ids(
                 df, mis_df,
+                brand_settings=brand_settings,
                 section_type=section_name,
                 bracket_map=bmap,
                 prefix_map=pmap,
@@ -299,13 +320,70 @@ def match():
               f"(weekly={len(grouped['weekly'])}, "
               f"monthly={len(grouped['monthly'])}, "
               f"sale={len(grouped['sale'])})")
-        return jsonify({'success': True, 'matches': grouped, 'total': len(all_matches)})
+        return jsonify({'success': True, 'matches': grouped, 'total': len(all_matches),
+                        **offline_marker(sections_data)})
 
     except Exception as e:
         traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)})
 
 
+def _writeback_response(spreadsheet_id: str, writes: list[CellWrite], data: dict):
+    """
+    Queue writes on the coalescing write-back queue (src/integrations/sheet_writer.py).
+    Default: return at once with a ticket. Body {"flush": true}: push now and
+    report the outcome (plus the final value for single-cell writes).
+    """
+    if not writes:
+        return jsonify({'success': True, 'updated': 0})
+    queue  = get_write_queue()
+    ticket = queue.enqueue(spreadsheet_id, writes)
+    resp: dict[str, Any] = {
+        'success':    True,
+        'updated':    len(writes),
+        'queued':     True,
+        'ticket':     ticket.id,
+        'status_url': f'/api/mis/writeback/{ticket.id}',
+    }
+    if data.get('flush'):
+        queue.wait(ticket)
+        if ticket.status != 'done':
+            # 'queued' here: the flush failed but the writes are kept and retried.
+            return jsonify({'success': False, 'error': ticket.error or f'Write-back {ticket.status}',
+                            'ticket': ticket.id, 'queued': ticket.status == 'queued'})
+        resp['queued'] = False
+        if len(writes) == 1:
+            resp['updated_value'] = next(iter(ticket.values.values()), '')
+    return jsonify(resp)
+
+
+@bp.route('/api/mis/writeback')
+def writeback_summary():
+    """Write-back queue: pending cells per spreadsheet, counters, recent tickets."""
+    return jsonify({'success': True, **get_write_queue().summary()})
+
+
+@bp.route('/api/mis/writeback/<ticket_id>')
+def writeback_status(ticket_id: str):
+    """Status of one write-back ticket (queued / flushing / done / failed)."""
+    status = get_write_queue().status(ticket_id)
+    if status is None:
+        return jsonify({'success': False, 'error': f'Unknown ticket: {ticket_id}'}), 404
+    return jsonify({'success': True, **status})
+
+
+@bp.route('/api/mis/writeback/flush', methods=['POST'])
+def writeback_flush():
+    """Push every pending write now and wait for the result (re-queued tickets are listed in `failed`)."""
+    try:
+        tickets = get_write_queue().flush(wait=True)
+        failed  = [t.to_dict() for t in tickets if t.status != 'done']
+        return jsonify({'success': not failed, 'flushed': len(tickets), 'failed': failed})
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)})
+
+
 @bp.route('/api/mis/apply-matches', methods=['POST'])
 def apply_matches():
     """Write confirmed MIS IDs back to the Google Sheet (section-aware tags)."""
@@ -322,16 +400,11 @@ def apply_matches():
         if not service or not spreadsheet_id or not sheet_name:
             return jsonify({'success': False, 'error': 'Not configured. Open a Google Sheet tab first.'})
 
-        result = service.spreadsheets().values().get(
-            spreadsheetId=spreadsheet_id,
-            range=f"'{sheet_name}'!A1:BZ20"
-        ).execute()
-        values = result.get('values', [])
-        if not values:
+        header_info = sheets_access.get_header(service, spreadsheet_id, sheet_name)
+        if header_info is None:
             return jsonify({'success': False, 'error': 'Sheet is empty'})
 
-        header_row_idx = detect_header_row(values)
-        headers = values[header_row_idx]
+        header_row_idx, headers = header_info
 
         mis_id_col: int | None = None
         for idx, header in enumerate(headers):
@@ -342,24 +415,11 @@ def apply_matches():
         if mis_id_col is None:
             return jsonify({'success': False, 'error': 'MIS ID column not found'})
 
-        target_col_letter = get_col_letter(mis_id_col)
-        row_numbers = [int(r) for r in matches.keys()]
-
-        data_to_update = []
-        for row_num, mis_id_value in matches.items():
-            data_to_update.append({
-                'range':  f"'{sheet_name}'!{target_col_letter}{row_num}",
-                'values': [[str(mis_id_value)]],
-            })
-
-        if data_to_update:
-            service.spreadsheets().values().batchUpdate(
-                spreadsheetId=spreadsheet_id,
-                body={'valueInputOption': 'RAW', 'data': data_to_update}
-            ).execute()
-
-        print(f"[APPLY-MATCHES] Applied {len(data_to_update)} MIS IDs to sheet")
-        return jsonify({'success': True, 'updated': len(data_to_update)})
+        seen   = (header_row_idx + 1, str(headers[mis_id_col]))   # re-checked at flush
+        writes = [CellWrite(sheet_name, int(row_num), mis_id_col, str(mis_id_value), header=seen)
+                  for row_num, mis_id_value in matches.items()]
+        print(f"[APPLY-MATCHES] Queued {len(writes)} MIS IDs for write-back")
+        return _writeback_response(spreadsheet_id, writes, data)
 
     except Exception as e:
         traceback.print_exc()
@@ -382,16 +442,11 @@ def apply_blaze_titles():
         if not service or not spreadsheet_id or not sheet_name:
             return jsonify({'success': False, 'error': 'Not configured'})
 
-        result = service.spreadsheets().values().get(
-            spreadsheetId=spreadsheet_id,
-            range=f"'{sheet_name}'!A1:BZ20"
-        ).execute()
-        values = result.get('values', [])
-        if not values:
+        header_info = sheets_access.get_header(service, spreadsheet_id, sheet_name)
+        if header_info is None:
             return jsonify({'success': False, 'error': 'Sheet is empty'})
 
-        header_row_idx = detect_header_row(values)
-        headers = values[header_row_idx]
+        header_row_idx, headers = header_info
 
         blaze_col: int | None = None
         for idx, header in enumerate(headers):
@@ -402,21 +457,10 @@ def apply_blaze_titles():
         if blaze_col is None:
             return jsonify({'success': False, 'error': 'Blaze Discount Title column not found'})
 
-        target_col_letter = get_col_letter(blaze_col)
-        data_to_update = []
-        for row_num, title_value in matches.items():
-            data_to_update.append({
-                'range':  f"'{sheet_name}'!{target_col_letter}{row_num}",
-                'values': [[str(title_value)]],
-            })
-
-        if data_to_update:
-            service.spreadsheets().values().batchUpdate(
-                spreadsheetId=spreadsheet_id,
-                body={'valueInputOption': 'RAW', 'data': data_to_update}
-            ).execute()
-
-        return jsonify({'success': True, 'updated': len(data_to_update)})
+        seen   = (header_row_idx + 1, str(headers[blaze_col]))    # re-checked at flush
+        writes = [CellWrite(sheet_name, int(row_num), blaze_col, str(title_value), header=seen)
+                  for row_num, title_value in matches.items()]
+        return _writeback_response(spreadsheet_id, writes, data)
 
     except Exception as e:
         traceback.print_exc()
@@ -428,7 +472,6 @@ def apply_split_id():
     """Write tagged MIS ID (W1/W2/WP etc.) to a Google Sheet row."""
     try:
         from src.utils.sheet_helpers import strip_mis_id_tag
-        from src.utils.brand_helpers import update_tagged_mis_cell
 
         data       = request.get_json()
         google_row = data.get('google_row')
@@ -450,16 +493,11 @@ def apply_split_id():
         if not service or not spreadsheet_id or not sheet_name:
             return jsonify({'success': False, 'error': 'Not configured'})
 
-        result = service.spreadsheets().values().get(
-            spreadsheetId=spreadsheet_id,
-            range=f"'{sheet_name}'!A1:BZ20"
-        ).execute()
-        values = result.get('values', [])
-        if not values:
+        header_info = sheets_access.get_header(service, spreadsheet_id, sheet_name)
+        if header_info is None:
             return jsonify({'success': False, 'error': 'Sheet is empty'})
 
-        header_row_idx = detect_header_row(values)
-        headers = values[header_row_idx]
+        header_row_idx, headers = header_info
 
         mis_id_col: int | None = None
         for idx, header in enumerate(headers):
@@ -470,34 +508,40 @@ def apply_split_id():
         if mis_id_col is None:
             return jsonify({'success': False, 'error': 'MIS ID column not found'})
 
-        col_letter = get_col_letter(mis_id_col)
-
-        # Read current cell value
-        current_result = service.spreadsheets().values().get(
-            spreadsheetId=spreadsheet_id,
-            range=f"'{sheet_name}'!{col_letter}{google_row}"
-        ).execute()
-        current_vals   = current_result.get('values', [[]])
-        current_val    = current_vals[0][0] if current_vals and current_vals[0] else ''
-
-        # Build updated cell value
-        tag_upper  = tag.upper()
-        new_entry  = f"{tag_upper}: {new_mis_id}"
-
-        if append and current_val:
-            updated_val = f"{current_val}\n{new_entry}"
-        else:
-            updated_val = new_entry
+        # The "<TAG>: <id>" line (PART2: / GAP: / PATCH: …) is appended to the
+        # cell's current content at flush time (append=False replaces the cell).
+        write = CellWrite(sheet_name, int(google_row), mis_id_col, new_mis_id,
+                          tag=tag, append=bool(append),
+                          header=(header_row_idx + 1, str(headers[mis_id_col])))
+        return _writeback_response(spreadsheet_id, [write], data)
 
-        service.spreadsheets().values().update(
-            spreadsheetId=spreadsheet_id,
-            range=f"'{sheet_name}'!{col_letter}{google_row}",
-            valueInputOption='RAW',
-            body={'values': [[updated_val]]},
-        ).execute()
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)})
 
-        return jsonify({'success': True, 'updated_value': updated_val})
 
+@bp.route('/api/mis/sheet-mirror/query')
+def sheet_mirror_query():
+    """
+    Query the local sheet mirror for the active spreadsheet — no Sheets call.
+    Params: brand, mis_id, weekday (substring), date (YYYY-MM-DD), tab, section, limit.
+    """
+    try:
+        from datetime import date
+        from src.integrations.sheet_mirror import get_sheet_mirror
+        spreadsheet_id = session.get_spreadsheet_id()
+        if not spreadsheet_id:
+            return jsonify({'success': False, 'error': 'No spreadsheet loaded. Load a sheet first.'})
+        args = request.args
+        on_date = date.fromisoformat(args['date']) if args.get('date') else None
+        rows = get_sheet_mirror().query(
+            spreadsheet_id,
+            brand=args.get('brand') or None, mis_id=args.get('mis_id') or None,
+            weekday=args.get('weekday') or None, on_date=on_date,
+            tab=args.get('tab') or None, section=args.get('section') or None,
+            limit=int(args.get('limit', 500)),
+        )
+        return jsonify({'success': True, 'count': len(rows), 'rows': rows})
     except Exception as e:
         traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)})
@@ -12,7 +12,10 @@ import pandas as pd
 from flask import Blueprint, jsonify, request
 
 from src.session import session
+from src.api.jobs import async_capable
 from src.integrations.google_sheets import fetch_google_sheet_data, parse_tab_month_year
+from src.integrations.multi_tab import load_date_window, parse_window
+from src.integrations.sheet_mirror import offline_marker
 from src.utils.csv_resolver import resolve_mis_csv_for_route as resolve_mis_csv
 from src.utils.fuzzy import generate_fuzzy_suggestions
 from src.core.updown_planner import (
@@ -26,32 +29,49 @@ bp = Blueprint('mis_updown', __name__)
 
 
 @bp.route('/api/mis/split-audit/planning', methods=['POST'])
+@async_capable('split_planning')
 def planning():
-    """Phase 1: Read Google Sheet, calculate the 4-step slicing plan."""
+    """
+    Phase 1: Read Google Sheet, calculate the 4-step slicing plan.
+    Optional "start"/"end" dates plan across every month tab in that window
+    (tabs loaded together — src/integrations/multi_tab.py).
+    """
     try:
         data     = request.get_json() or {}
         tab_name = data.get('tab', '')
+        window   = parse_window(data)
 
-        if not tab_name:
+        if not tab_name and not window:
             return jsonify({'success': False, 'error': 'No tab specified'})
 
-        target_month, target_year = parse_tab_month_year(tab_name)
-        print(f"[SPLIT AUDIT] Planning for {tab_name} → {target_month}/{target_year}")
-
-        sections_data = fetch_google_sheet_data(tab_name)
-        if all(df.empty for df in sections_data.values()):
+        if window:
+            month_tabs = load_date_window(*window)
+            target_month, target_year = month_tabs[0].month, month_tabs[0].year
+            print(f"[SPLIT AUDIT] Planning for {window[0]} → {window[1]} "
+                  f"across {[t.tab for t in month_tabs]}")
+            sections_data = month_tabs
+            empty = all(df.empty for t in month_tabs for df in t.sections.values())
+        else:
+            target_month, target_year = parse_tab_month_year(tab_name)
+            print(f"[SPLIT AUDIT] Planning for {tab_name} → {target_month}/{target_year}")
+            sections_data = fetch_google_sheet_data(tab_name)
+            empty = all(df.empty for df in sections_data.values())
+
+        if empty:
             return jsonify({'success': False, 'error': 'No data found in sheet'})
 
         bmap = session.get_mis_bracket_map()
         pmap = session.get_mis_prefix_map()
 
-        plan = build_split_plan(sections_data, target_month, target_year, bmap, pmap)
+        plan = build_split_plan(sections_data, target_month, target_year, bmap, pmap,
+                                date_window=window)
 
         # Persist for Phase 2
         session.set('split_plan', json.dumps({
             **{k: v for k, v in plan.items() if k not in ('weekly_deals', 'tier1_deals')},
             'target_month': target_month,
             'target_year':  target_year,
+            'date_window':  [d.isoformat() for d in window] if window else None,
         }, default=str))
 
         return jsonify({
@@ -61,6 +81,7 @@ def planning():
             'no_conflict':      plan['no_conflict'],
             'weekly_count':     len(plan['weekly_deals']),
             'tier1_count':      len(plan['tier1_deals']),
+            **offline_marker(sections_data),
         })
 
     except Exception as e:
@@ -69,6 +90,7 @@ def planning():
 
 
 @bp.route('/api/mis/split-audit/gap-check', methods=['POST'])
+@async_capable('split_gap_check')
 def gap_check():
     """Phase 2: Verify that manually entered MIS splits have closed all timeline gaps."""
     try:
@@ -103,6 +125,7 @@ def gap_check():
                 'tier1_conflicts': len(plan.get('splits_required', [])),
             },
             **gap_result,
+            **offline_marker(sections_data),
         })
 
     except Exception as e:
@@ -111,6 +134,7 @@ def gap_check():
 
 
 @bp.route('/api/mis/split-audit/final', methods=['POST'])
+@async_capable('split_final')
 def final():
     """Phase 3: Final Audit — ensures exactly 1 dominant deal on each conflict date."""
     try:
@@ -193,6 +217,7 @@ def final():
             'double_dips':  double_dips,
             'empty_gaps':   empty_gaps,
             'valid_dates':  valid_dates,
+            **offline_marker(sections_data),
         })
 
     except Exception as e:
@@ -201,6 +226,7 @@ def final():
 
 
 @bp.route('/api/mis/split-audit/final-check', methods=['POST'])
+@async_capable('split_final_check')
 def final_check():
     """Phase 4: Human-in-the-Loop. Verifies saved MIS data matches the plan."""
     try:
@@ -252,6 +278,7 @@ def final_check():
             'results':         verification_results,
             'verified_count':  verified_count,
             'unverified_count': unverified_count,
+            **offline_marker(sections_data),
         })
 
     except Exception as e:
@@ -260,6 +287,7 @@ def final_check():
 
 
 @bp.route('/api/mis/split-audit/fuzzy-suggestions', methods=['POST'])
+@async_capable('split_fuzzy')
 def fuzzy_suggestions():
     """Lightweight helper: find existing MIS IDs when strict name match fails."""
     try:
@@ -221,6 +221,15 @@ def switch_profile():
             return jsonify({'success': False, 'error': f'Credentials missing for "{handle}"'})
         save_last_used_profile(handle)
         session.set('active_profile_handle', handle)
+        # Cached sheet metadata / tabs belong to the previous account's view
+        from src.integrations import sheets_access
+        from src.integrations.sheet_cache import get_tab_cache
+        from src.integrations.sheets_service import get_sheets_service_manager
+        from src.integrations.settings_cache import get_settings_cache
+        sheets_access.invalidate()
+        get_tab_cache().invalidate(headers=True)
+        get_settings_cache().invalidate()
+        get_sheets_service_manager().reset()
         return jsonify({'success': True, 'message': f'Switched to "{handle}". Restart recommended.',
                         'restart_required': True})
     except Exception as e:
@@ -273,9 +282,12 @@ def auth_google():
     try:
         from src.session import session
         from src.integrations.google_sheets import authenticate_google_sheets
-        service = authenticate_google_sheets()
-        if service:
-            session.set_sheets_service(service)
+        from src.integrations.sheets_service import get_sheets_service_manager
+        if authenticate_google_sheets():
+            # Fresh token on disk → manager reloads it; routes share the per-thread proxy
+            manager = get_sheets_service_manager()
+            manager.reset()
+            session.set_sheets_service(manager.get_service())
             return jsonify({'success': True, 'message': 'Google Sheets authenticated'})
         return jsonify({'success': False, 'error': 'Authentication failed'})
     except Exception as e:
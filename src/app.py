@@ -2,6 +2,22 @@
 # Flask application factory. Registers all Blueprints.
 # Import create_app() from here — never instantiate Flask directly in route files.
 # v2.1: Added CORS headers (required by injected JS fetching from MIS browser tab)
+# v2.2: Request-timing middleware + /metrics (Prometheus text) — see src/utils/metrics.py
+# v2.3: Opt-in per-request cProfile capture (PROFILING_ENABLED) — see src/utils/profiler.py
+# v2.4: Revision-aware tab snapshot cache (SHEET_CACHE_*) — see src/integrations/sheet_cache.py
+# v2.5: Masked/cached sheet metadata + batchGet settings bundle — see src/integrations/sheets_access.py
+# v2.6: Debounced/coalesced sheet write-back queue (SHEET_WRITE_*) — see src/integrations/sheet_writer.py
+# v2.7: Sheets service built once per profile + background token refresh — see src/integrations/sheets_service.py
+# v2.8: Versioned, persisted Settings/Brand Rebate cache (SETTINGS_CACHE_*) — see src/integrations/settings_cache.py
+# v2.9: SQLite mirror of parsed tabs, offline fallback + queries (SHEET_MIRROR_*) — see src/integrations/sheet_mirror.py
+# v2.10: Per-row result cache for CSV generation / MAudit / matching (ROW_CACHE_*) — see src/core/row_cache.py
+# v2.11: Condition-driven waits for MIS form automation (MIS_WAIT_*) — see src/automation/waits.py
+# v2.12: Direct HTTP MIS report pull on the browser's session (MIS_REPORT_*) — see src/automation/mis_report.py
+# v2.13: Browser worker pool — background tabs per lane (BROWSER_POOL_*) — see src/automation/browser_pool.py
+# v2.14: MIS validators injected via CDP new-document scripts, not the 10s monitor (VALIDATION_INJECT_MODE)
+#        — see src/automation/validation_injector.py
+# v2.15: Blaze token validation cache (TTL) + pooled API client with re-acquire on 401
+#        (BLAZE_TOKEN_TTL_SECONDS, BLAZE_API_*) — see src/integrations/blaze_auth.py
 
 from __future__ import annotations
 import json
@@ -30,6 +46,41 @@ def create_app(config_override: dict | None = None) -> Flask:
     from src.session import init_session
     init_session(app)
 
+    from src.core.jobs import init_job_runner
+    init_job_runner(app.config)
+
+    from src.integrations.sheet_cache import init_tab_cache
+    from src.integrations.sheets_access import configure_sheets_access
+    init_tab_cache(app.config)
+    configure_sheets_access(app.config)
+
+    from src.integrations.sheet_mirror import init_sheet_mirror
+    init_sheet_mirror(app.config)
+
+    from src.integrations.sheet_writer import init_write_queue
+    init_write_queue(app.config)
+
+    from src.integrations.sheets_service import init_sheets_service
+    init_sheets_service(app.config)
+
+    from src.integrations.settings_cache import init_settings_cache
+    init_settings_cache(app.config)
+
+    from src.core.row_cache import init_row_cache
+    init_row_cache(app.config)
+
+    from src.automation.waits import init_wait_engine
+    init_wait_engine(app.config)
+
+    from src.automation.mis_report import init_mis_report
+    init_mis_report(app.config)
+
+    from src.automation.browser_pool import init_browser_pool
+    init_browser_pool(app.config)
+
+    from src.integrations.blaze_auth import init_blaze_auth
+    init_blaze_auth(app.config)
+
     _init_active_profile()
     _register_blueprints(app)
 
@@ -44,10 +95,25 @@ def create_app(config_override: dict | None = None) -> Flask:
         response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
         return response
 
-    # ── Fix 7: Background validation monitor thread ───────────────────────────
+    _register_request_timing(app)
+
+    from src.utils.profiler import register_profiling
+    register_profiling(app)
+
+    # ── Fix 7: MIS validator injection ───────────────────────────────────────
+    # v2.14: validators are registered as CDP new-document scripts when a
+    # browser is attached (src/automation/validation_injector.py). The 10s
+    # background_validation_monitor only runs with VALIDATION_INJECT_MODE=poll
+    # or when the driver has no CDP.
     import threading as _threading
+    from src.automation.validation_injector import init_validation_injector
+    injector        = init_validation_injector(app.config)
+    monitor_started = _threading.Event()
 
     def _launch_monitor() -> None:
+        if monitor_started.is_set():
+            return
+        monitor_started.set()
         with app.app_context():
             try:
                 from src.api.blaze import background_validation_monitor
@@ -61,7 +127,16 @@ def create_app(config_override: dict | None = None) -> Flask:
             except Exception as _e:
                 print(f"[APP] ⚠ Could not start validation monitor: {_e}")
 
-    _threading.Thread(target=_launch_monitor, daemon=True).start()
+    def _on_browser_attached(driver) -> None:
+        if not injector.install(driver):
+            _launch_monitor()
+
+    if injector.mode == 'poll':
+        _threading.Thread(target=_launch_monitor, daemon=True).start()
+    else:
+        from src.session import session
+        session.add_browser_listener(_on_browser_attached)
+        session.add_browser_detach_listener(injector.forget)
 
     return app
 
@@ -120,6 +195,32 @@ def _init_active_profile() -> None:
         print(f"[APP] Profile init warning (non-fatal): {e}")
 
 
+def _register_request_timing(app: Flask) -> None:
+    """
+    Time every request and feed src/utils/metrics.py.
+    Series are keyed by URL rule ('/api/jobs/<job_id>'), not raw path, so
+    cardinality stays bounded.
+    """
+    import time
+    from flask import g, request
+    from src.utils.metrics import metrics
+
+    @app.before_request
+    def _start_timer():
+        g._req_t0 = time.perf_counter()
+
+    @app.after_request
+    def _record_timing(response):
+        t0 = g.pop('_req_t0', None)
+        if t0 is not None:
+            route = request.url_rule.rule if request.url_rule else '<unmatched>'
+            metrics.record_request(
+                request.method, route, response.status_code,
+                time.perf_counter() - t0, response.content_length or 0,
+            )
+        return response
+
+
 def _register_blueprints(app: Flask) -> None:
     """Register all API Blueprints with per-blueprint error isolation."""
     import importlib
@@ -131,6 +232,9 @@ def _register_blueprints(app: Flask) -> None:
         ('src.api.mis_audit',      'mis_audit'),
         ('src.api.mis_automation', 'mis_automation'),
         ('src.api.blaze',          'blaze'),
+        ('src.api.automation',     'automation'),
+        ('src.api.jobs',           'jobs'),
+        ('src.api.diagnostics',    'diagnostics'),
     ]
 
     for mod_path, name in BLUEPRINTS:
@@ -143,7 +247,8 @@ def _register_blueprints(app: Flask) -> None:
             traceback.print_exc()
 
     # ── Routes defined inline (lightweight, no blueprint overhead) ────────────
-    from flask import render_template, jsonify
+    from flask import Response, render_template, jsonify
+    from src.utils.metrics import metrics
 
     @app.route('/')
     def index():  # type: ignore[misc]
@@ -158,4 +263,10 @@ def _register_blueprints(app: Flask) -> None:
             'profile':       session.get_active_handle(),
             'browser_ready': session.is_browser_ready(),
             'spreadsheet':   bool(session.get_spreadsheet_id()),
+            'metrics':       metrics.snapshot(),
         })
+
+    @app.route('/metrics')
+    def prometheus_metrics():  # type: ignore[misc]
+        return Response(metrics.render_prometheus(),
+                        mimetype='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,288 @@
+# src/automation/blaze_token.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Blaze token acquisition from the first authenticated API request.
+#
+# robust_login (browser.py) and the token sniffers in blaze_api.py (both
+# no-touch zones) wait on fixed sleeps — 2s after opening Promotions, 5s
+# after submitting the login form, another 8s after reloading — and then
+# hope a token was seen. The Blaze web app sends its first api.blaze.me
+# call (Authorization: Token …) within moments of loading, so most of that
+# time is spent asleep, and on a slow day 8s is still not enough.
+#
+# NetworkTokenListener resolves on that first request instead:
+#   • network — CDP Network.requestWillBeSent (and …ExtraInfo, where Chrome
+#     reports the final headers) read from chromedriver's performance log.
+#     acquire_blaze_token() attaches its own session to the Launcher's
+#     Chrome with performance logging on (browser_pool.attach_driver), so
+#     the user's tabs are never switched.
+#   • page — the same XHR/fetch interceptor the sniffers use, registered with
+#     Page.addScriptToEvaluateOnNewDocument; the fallback when only the
+#     shared driver (no performance log) is available. The capture then
+#     holds the 'browser' job lock, like execute_pooled's shared-driver path.
+# Both are checked through the wait engine ('wait:blaze_token'), so the
+# capture returns as soon as a token exists and fails at the timeout.
+#
+# A captured token is validated (blaze_auth validation cache) and cached in
+# both token files plus the session, so BlazeTokenManager.get_token() and
+# load_stored_token() pick it up without sniffing again.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import json
+import time
+from contextlib import nullcontext
+from typing import Any
+
+from src.automation.waits import WaitTimeout, element_present, get_wait_engine
+
+API_HOST        = 'api.blaze.me'
+PROMOTIONS_URL  = 'https://retail.blaze.me/company-promotions/promotions?page=0&pageSize=100'
+DEFAULT_TIMEOUT = 20.0
+
+_REQUEST_EVENTS = ('Network.requestWillBeSent', 'Network.requestWillBeSentExtraInfo')
+
+_INTERCEPTOR_JS = """
+(function () {
+    if (window.__blazeTokenHooked) return;
+    window.__blazeTokenHooked = true;
+    function grab(auth) {
+        if (typeof auth === 'string' && auth.indexOf('Token ') === 0 && !window._capturedBlazeToken) {
+            window._capturedBlazeToken = auth.slice(6).trim();
+        }
+    }
+    var setHeader = XMLHttpRequest.prototype.setRequestHeader;
+    XMLHttpRequest.prototype.setRequestHeader = function (name, value) {
+        if (typeof name === 'string' && name.toLowerCase() === 'authorization') grab(value);
+        return setHeader.apply(this, arguments);
+    };
+    var origFetch = window.fetch;
+    if (origFetch) window.fetch = function (input, init) {
+        try {
+            var h = (init && init.headers) || (input && input.headers) || {};
+            grab(typeof h.get === 'function' ? (h.get('Authorization') || '')
+                                             : (h['Authorization'] || h['authorization'] || ''));
+        } catch (e) {}
+        return origFetch.apply(this, arguments);
+    };
+})();
+"""
+
+
+def token_from_header(value: Any) -> str | None:
+    """'Token abc' → 'abc'; anything else → None."""
+    if isinstance(value, str) and value.startswith('Token '):
+        return value[6:].strip() or None
+    return None
+
+
+def _authorization(headers: dict | None) -> Any:
+    for name, value in (headers or {}).items():
+        if name.lower() == 'authorization':
+            return value
+    return None
+
+
+class NetworkTokenListener:
+    """Resolves on the first API request that carries a Blaze token."""
+
+    def __init__(self, host: str = API_HOST) -> None:
+        self.host = host
+        self.source: str | None = None          # 'network' | 'page' once captured
+        self.network = False                    # performance log readable on this driver
+        self._api_requests: set[str] = set()    # requestIds of api.blaze.me requests
+        self._script_id: str | None = None
+
+    def feed(self, entries: list[Any]) -> str | None:
+        """Scan performance-log entries (or raw CDP messages) for a token."""
+        for entry in entries:
+            try:
+                raw = entry.get('message', entry) if isinstance(entry, dict) else entry
+                message = json.loads(raw) if isinstance(raw, str) else raw
+                message = message.get('message', message)
+                method = message.get('method')
+                if method not in _REQUEST_EVENTS:
+                    continue
+                params = message.get('params') or {}
+                request_id = params.get('requestId', '')
+                if method == 'Network.requestWillBeSent':
+                    request = params.get('request') or {}
+                    if self.host not in request.get('url', ''):
+                        continue
+                    self._api_requests.add(request_id)
+                    headers = request.get('headers')
+                elif request_id in self._api_requests:
+                    headers = params.get('headers')
+                else:
+                    continue
+                token = token_from_header(_authorization(headers))
+                if token:
+                    return token
+            except (ValueError, AttributeError, TypeError):
+                continue
+        return None
+
+    def arm(self, driver: Any) -> None:
+        """
+        Call on the tab to watch, before navigating it: registers the page
+        interceptor and drops performance-log entries from earlier pages.
+        """
+        try:
+            result = driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument',
+                                            {'source': _INTERCEPTOR_JS})
+            self._script_id = (result or {}).get('identifier')
+        except Exception as e:
+            print(f"[BLAZE-TOKEN] Page interceptor unavailable: {e}")
+        try:
+            driver.get_log('performance')
+            self.network = True
+        except Exception:
+            self.network = False
+
+    def poll(self, driver: Any) -> str | None:
+        if self.network:
+            token = self.feed(driver.get_log('performance'))
+            if token:
+                self.source = 'network'
+                return token
+        token = driver.execute_script("return window._capturedBlazeToken || null;")
+        if token:
+            self.source = 'page'
+        return token
+
+    def wait(self, driver: Any, timeout: float = DEFAULT_TIMEOUT) -> str:
+        """The first token seen, or WaitTimeout."""
+        return get_wait_engine().until(driver, self.poll, 'blaze_token', timeout=timeout)
+
+    def disarm(self, driver: Any) -> None:
+        if self._script_id:
+            try:
+                driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument',
+                                       {'identifier': self._script_id})
+            except Exception:
+                pass
+            self._script_id = None
+
+
+def _listener_driver() -> tuple[Any, bool]:
+    """(driver, owned): a performance-logging session of our own, else the shared one."""
+    from src.automation.browser_pool import PoolUnavailable, attach_driver, get_browser_pool
+    try:
+        return attach_driver(get_browser_pool().debug_port, performance_log=True), True
+    except PoolUnavailable as e:
+        print(f"[BLAZE-TOKEN] {e} — using the shared browser")
+    from src.session import session
+    return session.get_browser(), False
+
+
+def _submit_login(driver: Any, email: str, password: str, timeout: float) -> None:
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+    get_wait_engine().until(driver, element_present('input[name="email"]'), 'blaze_login_form',
+                            timeout=timeout)
+    for name, value in (('email', email), ('password', password + Keys.RETURN)):
+        field = driver.find_element(By.NAME, name)
+        field.send_keys(Keys.CONTROL + 'a')
+        field.send_keys(Keys.DELETE)
+        field.send_keys(value)
+
+
+def _store(token: str) -> None:
+    from src.integrations.blaze_api import BlazeTokenManager, save_stored_token
+    from src.session import session
+    BlazeTokenManager._save(token)
+    save_stored_token(token)
+    session.set_blaze_token(token)
+
+
+def _validate(token: str) -> bool:
+    from src.integrations.blaze_auth import get_blaze_client
+    return get_blaze_client().cache.is_valid(token)
+
+
+def _capture(driver: Any, owned: bool, listener: NetworkTokenListener,
+             email: str, password: str, timeout: float, t0: float) -> str | dict[str, Any]:
+    """The token from a background tab on `driver`, or acquire_blaze_token's failure dict."""
+    original = target_id = None
+    try:
+        try:
+            original = driver.current_window_handle
+        except Exception:
+            pass
+        target_id = driver.execute_cdp_cmd('Target.createTarget',
+                                           {'url': 'about:blank', 'background': True})['targetId']
+        driver.switch_to.window(target_id)
+        listener.arm(driver)
+        driver.get(PROMOTIONS_URL)
+
+        if 'login' in (driver.current_url or '').lower():
+            if not (email and password):
+                raise RuntimeError('Blaze session expired and no credentials were given')
+            print("[BLAZE-TOKEN] Session expired. Logging in with credentials...")
+            _submit_login(driver, email, password, timeout)
+
+        token = listener.wait(driver, timeout)
+    except WaitTimeout:
+        return {'success': False, 'error': f'No Blaze API request with a token within {timeout:g}s',
+                'elapsed_sec': round(time.perf_counter() - t0, 3)}
+    except Exception as e:
+        return {'success': False, 'error': str(e), 'elapsed_sec': round(time.perf_counter() - t0, 3)}
+    finally:
+        listener.disarm(driver)
+        if target_id:
+            try:
+                driver.execute_cdp_cmd('Target.closeTarget', {'targetId': target_id})
+            except Exception:
+                pass
+        if original and not owned:
+            try:
+                driver.switch_to.window(original)
+            except Exception:
+                pass
+        if owned:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+    return token
+
+
+def acquire_blaze_token(
+    email: str = '',
+    password: str = '',
+    driver: Any = None,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> dict[str, Any]:
+    """
+    Open Promotions on a background tab, log in if Blaze redirects to the
+    login page, and return as soon as the app's first API request carries
+    a token. The background tab is closed again whatever the outcome, so
+    repeated re-acquires (BlazeApiClient on 401) do not pile up tabs.
+
+    Returns {'success', 'token', 'source', 'elapsed_sec'} or
+    {'success': False, 'error', 'elapsed_sec'}.
+    """
+    t0 = time.perf_counter()
+    owned = shared = False
+    if driver is None:
+        driver, owned = _listener_driver()
+        shared = not owned
+    if driver is None:
+        return {'success': False, 'error': 'Browser not initialized', 'elapsed_sec': 0.0}
+
+    listener = NetworkTokenListener()
+    # The shared driver is what 'browser'-locked jobs drive: serialize with them
+    from src.core.jobs import get_job_runner
+    with get_job_runner().hold('browser') if shared else nullcontext():
+        result = _capture(driver, owned, listener, email, password, timeout, t0)
+    if isinstance(result, dict):
+        return result
+    token = result
+
+    if not _validate(token):
+        return {'success': False, 'error': 'Captured token was rejected by the Blaze API',
+                'elapsed_sec': round(time.perf_counter() - t0, 3)}
+    _store(token)
+    elapsed = round(time.perf_counter() - t0, 3)
+    print(f"[BLAZE-TOKEN] ✅ Token captured from {listener.source} in {elapsed}s")
+    return {'success': True, 'token': token, 'source': listener.source, 'elapsed_sec': elapsed}
@@ -0,0 +1,313 @@
+# src/automation/browser_pool.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Browser worker pool for background automation.
+#
+# execute_in_background (browser.py, no-touch zone) runs everything on the
+# one session.get_browser() driver, switching window_handles back and forth,
+# so a CSV pull, a MIS lookup and a Blaze sequence cannot overlap — and a
+# long run (run_tier_promotion_update_logic) holds the user's driver for
+# minutes.
+#
+# The pool owns lanes of workers ('mis', 'blaze'). Each worker is one thread
+# with its own queue and its own WebDriver session attached to the Launcher's
+# Chrome (debuggerAddress, as init_browser does). A worker's tab is a CDP
+# background target (Target.createTarget background=true), so the user's
+# visible tab is never switched or focused. Operations receive a view of the
+# driver whose window_handles is just that tab — ensure_mis_ready's tab scan
+# and any other handle juggling stay inside it.
+#
+# Routing: submit(lane, ...) goes to the least-loaded worker of the lane;
+# long=True work never lands on a lane's first worker while the lane has
+# more than one, so quick jobs always have a free tab.
+#
+# execute_pooled() has execute_in_background's contract and falls back to it
+# when the pool is disabled or cannot attach (no Launcher Chrome on the
+# debug port). The fallback drives the shared browser, so it holds the
+# 'browser' job lock (JobRunner.hold) like every other shared-driver job.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+DEFAULT_DEBUG_PORT = 9222
+DEFAULT_LANES      = {'mis': 2, 'blaze': 2}
+BLAZE_URL          = 'https://app.blaze.me'
+
+
+class PoolUnavailable(RuntimeError):
+    """The pool cannot provide a tab (no Chrome to attach to, pool disabled)."""
+
+
+def attach_driver(debug_port: int = DEFAULT_DEBUG_PORT, performance_log: bool = False) -> Any:
+    """
+    A new WebDriver session on the Launcher's Chrome (same browser, same cookies).
+    performance_log=True makes CDP Network events readable via get_log('performance').
+    """
+    try:
+        from selenium import webdriver
+        options = webdriver.ChromeOptions()
+        options.add_experimental_option('debuggerAddress', f'127.0.0.1:{debug_port}')
+        if performance_log:
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        driver = webdriver.Chrome(options=options)
+        _ = driver.window_handles
+        return driver
+    except Exception as e:
+        raise PoolUnavailable(f'Could not attach to Chrome on port {debug_port}: {e}') from e
+
+
+def _start_url(lane: str) -> str:
+    if lane == 'mis':
+        from src.automation.mis_entry import MIS_URL
+        return MIS_URL
+    if lane == 'blaze':
+        return BLAZE_URL
+    return 'about:blank'
+
+
+class _TabView:
+    """Driver proxy confined to one tab: window_handles lists only that tab."""
+
+    def __init__(self, driver: Any, handle: str) -> None:
+        object.__setattr__(self, '_driver', driver)
+        object.__setattr__(self, '_handle', handle)
+
+    @property
+    def window_handles(self) -> list[str]:
+        return [self._handle]
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._driver, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._driver, name, value)
+
+
+class _Task:
+    __slots__ = ('func', 'args', 'kwargs', 'creds', 'label', 'future')
+
+    def __init__(self, func: Callable, args: tuple, kwargs: dict, creds: tuple[str, str], label: str) -> None:
+        self.func   = func
+        self.args   = args
+        self.kwargs = kwargs
+        self.creds  = creds
+        self.label  = label
+        self.future: Future = Future()
+
+
+class BrowserWorker:
+    """One thread, one queue, one WebDriver session, one background tab."""
+
+    def __init__(self, lane: str, index: int, driver_factory: Callable[[], Any]) -> None:
+        self.lane     = lane
+        self.name     = f'{lane}-{index}'
+        self.driver: Any = None
+        self.handle: str | None = None
+        self._factory = driver_factory
+        self._queue: queue.Queue[_Task | None] = queue.Queue()
+        self._thread  = threading.Thread(target=self._run, name=f'browser-pool-{self.name}', daemon=True)
+        self._started = False
+        self._lock    = threading.Lock()
+        self.current: str | None = None
+        self.done     = 0
+        self.failed   = 0
+        self.busy_s   = 0.0
+
+    def submit(self, task: _Task) -> Future:
+        with self._lock:
+            if not self._started:
+                self._thread.start()
+                self._started = True
+        self._queue.put(task)
+        return task.future
+
+    def load(self) -> int:
+        return self._queue.qsize() + (1 if self.current else 0)
+
+    def _open_tab(self) -> None:
+        if self.driver is None:
+            self.driver = self._factory()
+            self.handle = None
+        if self.handle and self.handle in self.driver.window_handles:
+            self.driver.switch_to.window(self.handle)
+            return
+        target = self.driver.execute_cdp_cmd('Target.createTarget',
+                                             {'url': _start_url(self.lane), 'background': True})
+        self.handle = target['targetId']
+        self.driver.switch_to.window(self.handle)
+        print(f"[BROWSER-POOL] {self.name}: opened background tab {self.handle}")
+
+    def _prepare(self, view: _TabView, creds: tuple[str, str]) -> None:
+        """Same readiness execute_in_background gives each tab type, on this tab."""
+        if self.lane == 'mis':
+            from src.automation.mis_entry import ensure_mis_ready
+            ensure_mis_ready(view, *creds)
+        elif self.lane == 'blaze':
+            from src.automation.browser import ensure_logged_in
+            ensure_logged_in(view, 'blaze', *creds)
+
+    def _check_alive(self) -> None:
+        """After a failure: forget a closed tab or a dead session so the next task rebuilds it."""
+        try:
+            if self.handle not in self.driver.window_handles:
+                self.handle = None
+        except Exception:
+            self.driver, self.handle = None, None
+
+    def _run(self) -> None:
+        while True:
+            task = self._queue.get()
+            if task is None:
+                break
+            if not task.future.set_running_or_notify_cancel():
+                continue
+            self.current = task.label
+            t0 = time.perf_counter()
+            try:
+                self._open_tab()
+                view = _TabView(self.driver, self.handle)
+                self._prepare(view, task.creds)
+                task.future.set_result(task.func(view, *task.args, **task.kwargs))
+                self.done += 1
+            except BaseException as e:
+                self.failed += 1
+                if self.driver is not None:
+                    self._check_alive()
+                task.future.set_exception(e)
+            finally:
+                self.busy_s += time.perf_counter() - t0
+                self.current = None
+
+    def close(self) -> None:
+        if self._started:
+            self._queue.put(None)
+            self._thread.join(timeout=10)
+        if self.driver is not None:
+            try:
+                if self.handle:
+                    self.driver.switch_to.window(self.handle)
+                    self.driver.close()
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver, self.handle = None, None
+
+    def stats(self) -> dict[str, Any]:
+        return {'name': self.name, 'lane': self.lane, 'tab': self.handle,
+                'attached': self.driver is not None, 'current': self.current,
+                'queued': self._queue.qsize(), 'done': self.done, 'failed': self.failed,
+                'busy_s': round(self.busy_s, 3)}
+
+
+class BrowserPool:
+    """Lanes of browser workers; work is routed by lane ('mis' / 'blaze')."""
+
+    def __init__(
+        self,
+        lanes: dict[str, int] | None = None,
+        driver_factory: Callable[[], Any] | None = None,
+        enabled: bool = True,
+        debug_port: int = DEFAULT_DEBUG_PORT,
+    ) -> None:
+        self.enabled    = enabled
+        self.debug_port = debug_port
+        factory = driver_factory or attach_driver
+        self.lanes: dict[str, list[BrowserWorker]] = {
+            lane: [BrowserWorker(lane, i, factory) for i in range(max(1, n))]
+            for lane, n in (lanes or DEFAULT_LANES).items()
+        }
+
+    def submit(
+        self,
+        lane: str,
+        func: Callable,
+        *args: Any,
+        creds: tuple[str, str] = ('', ''),
+        long: bool = False,
+        **kwargs: Any,
+    ) -> Future:
+        """Queue func(driver_view, *args, **kwargs) on the lane's least-loaded worker."""
+        if not self.enabled:
+            raise PoolUnavailable('Browser pool disabled')
+        workers = self.lanes.get(lane)
+        if not workers:
+            raise PoolUnavailable(f'No browser pool lane for {lane!r}')
+        candidates = workers[1:] if long and len(workers) > 1 else workers
+        worker = min(candidates, key=BrowserWorker.load)
+        future = worker.submit(_Task(func, args, kwargs, creds, getattr(func, '__name__', 'task')))
+        future.worker = worker.name        # type: ignore[attr-defined]
+        return future
+
+    def stats(self) -> dict[str, Any]:
+        return {'enabled': self.enabled,
+                'lanes': {lane: [w.stats() for w in ws] for lane, ws in self.lanes.items()}}
+
+    def shutdown(self) -> None:
+        for workers in self.lanes.values():
+            for w in workers:
+                w.close()
+
+
+def execute_pooled(tab_type: str, operation_func: Callable, *args: Any, **kwargs: Any) -> dict:
+    """
+    execute_in_background() on a pool tab: same arguments (gui_username /
+    gui_password kwargs), same {'success', 'result' | 'error'} result, plus
+    'worker'. long=True keeps the lane's first tab free for quick work.
+    Falls back to execute_in_background when the pool cannot serve the call,
+    holding the 'browser' job lock for the run.
+    """
+    gui_username = kwargs.pop('gui_username', '')
+    gui_password = kwargs.pop('gui_password', '')
+    long         = kwargs.pop('long', False)
+    try:
+        future = get_browser_pool().submit(tab_type, operation_func, *args,
+                                           creds=(gui_username, gui_password), long=long, **kwargs)
+        try:
+            return {'success': True, 'result': future.result(), 'worker': future.worker}
+        except PoolUnavailable:
+            raise
+        except Exception as e:
+            return {'success': False, 'error': str(e), 'worker': future.worker}
+    except PoolUnavailable as e:
+        print(f"[BROWSER-POOL] {e} — using the shared browser")
+
+    # The shared driver is what 'browser'-locked jobs drive: serialize with them
+    from src.automation.browser import execute_in_background
+    from src.core.jobs import get_job_runner
+    with get_job_runner().hold('browser'):
+        return execute_in_background(tab_type, operation_func, *args,
+                                     gui_username=gui_username, gui_password=gui_password, **kwargs)
+
+
+# Singleton — rebuilt by init_browser_pool() from the app factory
+browser_pool = BrowserPool()
+
+
+def init_browser_pool(config: Any) -> BrowserPool:
+    """
+    Config keys (settings.json or app.config):
+        BROWSER_POOL_ENABLED     = True   background automation on pool tabs
+        BROWSER_POOL_MIS_TABS    = 2      MIS workers (tabs)
+        BROWSER_POOL_BLAZE_TABS  = 2      Blaze workers (tabs)
+        BROWSER_DEBUG_PORT       = 9222   Launcher Chrome remote-debugging port
+    """
+    global browser_pool
+    browser_pool.shutdown()
+    port = int(config.get('BROWSER_DEBUG_PORT', DEFAULT_DEBUG_PORT))
+    browser_pool = BrowserPool(
+        lanes={'mis':   int(config.get('BROWSER_POOL_MIS_TABS', DEFAULT_LANES['mis'])),
+               'blaze': int(config.get('BROWSER_POOL_BLAZE_TABS', DEFAULT_LANES['blaze']))},
+        driver_factory=lambda: attach_driver(port),
+        enabled=bool(config.get('BROWSER_POOL_ENABLED', True)),
+        debug_port=port,
+    )
+    return browser_pool
+
+
+def get_browser_pool() -> BrowserPool:
+    return browser_pool
@@ -0,0 +1,172 @@
+# src/automation/mis_batch.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Batch MIS deal entry: a list of build_final_entry_payload() results (or
+# end-date payloads with mis_id + new_date) entered back to back on one warm
+# MIS page.
+#
+# The single-deal routes each run ensure_mis_ready() — which refreshes the
+# page — then open a fresh modal. Here the page is readied once; before every
+# later item a one-call probe (mis_page_warm) decides whether it is still
+# usable, and ensure_mis_ready() only runs again when it is not. Each deal is
+# filled, verified and saved; the modal closing is the save confirmation.
+#
+# A failing item is dismissed (modal closed without saving), recorded with its
+# error and appended to `retry` — the batch carries on. POSTing `retry` back
+# re-runs just those payloads.
+#
+# Item state is kept in place in the `items` list (job.meta['items'] when run
+# as a job), so /api/jobs/<id> and the NDJSON stream route show each item as
+# it moves pending → running → saved / filled / failed / skipped.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from src.automation import mis_entry
+
+PENDING = 'pending'
+RUNNING = 'running'
+SAVED   = 'saved'     # filled and saved
+FILLED  = 'filled'    # dry run: filled + verified, then dismissed
+FAILED  = 'failed'
+SKIPPED = 'skipped'
+
+ITEM_FINISHED: frozenset[str] = frozenset({SAVED, FILLED, FAILED, SKIPPED})
+
+# Planner rows that are notes, not MIS entries
+_NO_ENTRY_ACTIONS = frozenset({'GAP'})
+
+
+class BatchItemFailed(Exception):
+    """One item could not be entered; the batch continues with the next."""
+
+
+def item_kind(item: dict) -> str | None:
+    """'end_date' (mis_id + new_date), 'create', or None when there is nothing to enter."""
+    if str(item.get('action', '')).upper() in _NO_ENTRY_ACTIONS:
+        return None
+    if item.get('mis_id') and item.get('new_date'):
+        return 'end_date'
+    sd = item.get('sheet_data') or {}
+    if (sd.get('brand') or item.get('brand')) and item.get('start_date'):
+        return 'create'
+    return None
+
+
+def new_item_states(items: list[dict]) -> list[dict]:
+    """Initial per-item status rows (index, kind, label, status)."""
+    states = []
+    for i, item in enumerate(items):
+        kind = item_kind(item)
+        label = (item.get('brand') or (item.get('sheet_data') or {}).get('brand')
+                 or f"MIS {item.get('mis_id', '')}".strip())
+        states.append({
+            'index':  i,
+            'kind':   kind,
+            'label':  label,
+            'action': item.get('action', ''),
+            'dates':  f"{item.get('start_date', '')} → {item.get('end_date') or item.get('new_date', '')}",
+            'status': PENDING,
+        })
+    return states
+
+
+def run_mis_batch(
+    driver: Any,
+    items: list[dict],
+    dry_run: bool = False,
+    job: Any = None,
+    states: list[dict] | None = None,
+) -> dict:
+    """
+    Enter every item on one warm MIS page. Never raises for a single item.
+
+    Args:
+        items:   build_final_entry_payload() dicts and/or {mis_id, new_date}.
+        dry_run: fill + verify each item, then close the modal without saving.
+        job:     JobHandle — progress per item; cancellation stops before the next item.
+        states:  status rows to update in place (defaults to new_item_states(items)).
+
+    Returns {success, total, saved, filled, failed, skipped, readiness_checks,
+             elapsed_sec, items, retry}.
+    """
+    states = states if states is not None else new_item_states(items)
+    retry: list[dict] = []
+    readiness_checks = 0
+    warm = False
+    t_batch = time.perf_counter()
+    total = len(items)
+
+    try:
+        from src.session import session
+        session.set_automation_in_progress(True)
+    except Exception:
+        session = None
+
+    try:
+        for i, (item, state) in enumerate(zip(items, states)):
+            if job is not None:
+                job.progress(100.0 * i / max(total, 1), f'{i + 1}/{total}: {state["label"]}')
+
+            if state['kind'] is None:
+                state.update(status=SKIPPED, reason='Nothing to enter (GAP row or no brand / dates)')
+                continue
+
+            state['status'] = RUNNING
+            t0 = time.perf_counter()
+            try:
+                # Ready the page once; afterwards only re-ready when the probe says so
+                if not (warm and mis_entry.mis_page_warm(driver)):
+                    creds = mis_entry._load_saved_creds()
+                    mis_entry.ensure_mis_ready(driver, creds.get('mis_username', ''),
+                                               creds.get('mis_password', ''))
+                    readiness_checks += 1
+                    warm = True
+
+                if state['kind'] == 'end_date':
+                    result = mis_entry.update_mis_end_date(driver, item, ensure_ready=False)
+                else:
+                    result = mis_entry.fill_deal_form(driver, item, ensure_ready=False)
+                if not result.get('success'):
+                    raise BatchItemFailed(result.get('error') or 'Fill failed')
+                if result.get('warnings'):
+                    raise BatchItemFailed('; '.join(result['warnings']))
+                if result.get('fill_mode'):
+                    state['fill_mode'] = result['fill_mode']
+
+                if dry_run:
+                    mis_entry.dismiss_modal(driver)
+                    state['status'] = FILLED
+                else:
+                    saved = mis_entry.save_deal_form(driver)
+                    if not saved.get('success'):
+                        raise BatchItemFailed(saved.get('error') or 'Save failed')
+                    state['status'] = SAVED
+
+            except Exception as e:
+                state.update(status=FAILED, error=str(e))
+                retry.append(item)
+                print(f"[MIS BATCH] ✗ item {i + 1}/{total} ({state['label']}): {e}")
+                if not mis_entry.dismiss_modal(driver):
+                    warm = False          # page state unknown → full readiness check next item
+            finally:
+                state['elapsed_sec'] = round(time.perf_counter() - t0, 3)
+    finally:
+        if session is not None:
+            session.set_automation_in_progress(False)
+
+    counts = {s: sum(1 for st in states if st['status'] == s) for s in (SAVED, FILLED, FAILED, SKIPPED)}
+    elapsed = round(time.perf_counter() - t_batch, 3)
+    print(f"[MIS BATCH] {total} items in {elapsed}s — {counts[SAVED]} saved, {counts[FILLED]} filled, "
+          f"{counts[FAILED]} failed, {counts[SKIPPED]} skipped, {readiness_checks} readiness check(s)")
+    return {
+        'success':          counts[FAILED] == 0,
+        'total':            total,
+        **counts,
+        'readiness_checks': readiness_checks,
+        'elapsed_sec':      elapsed,
+        'items':            states,
+        'retry':            retry,
+    }
@@ -1,11 +1,29 @@
-# src/automation/mis_entry.py — v2.0
+# src/automation/mis_entry.py — v2.5
 # ─────────────────────────────────────────────────────────────────────────────
 # MIS Selenium form-filling automation.
 # Provides: fill_deal_form, automate_full_create, update_mis_end_date,
-#           automate_full_end_date, ensure_mis_ready, strip_mis_id_tag
+#           automate_full_end_date, ensure_mis_ready, strip_mis_id_tag,
+#           mis_page_warm, save_deal_form, dismiss_modal
 #
 # NOTE: No-touch-zone imports (browser.py, blaze_sync.py) are kept intact.
 # All Selenium ops live here; no Selenium in route files.
+#
+# v2.1: Fixed sleeps in the form primitives, filter_and_open_mis_id and
+#       update_mis_end_date replaced by condition waits (src/automation/waits.py):
+#       Select2 open/closed/option rendered, modal shown/hidden, DataTables
+#       filter drawn, field value landed.
+# v2.2: fill_deal_form fills the whole modal in one execute_script call
+#       (_bulk_fill_form) and verifies every field in the same round trip;
+#       only fields that fail verification go through the per-field path.
+# v2.3: mis_page_warm / save_deal_form / dismiss_modal for the batch pipeline
+#       (src/automation/mis_batch.py); fill_deal_form / update_mis_end_date
+#       take ensure_ready=False when the caller already holds a warm MIS page.
+# v2.4: pull_mis_csv_report_background can try the direct HTTP pull first
+#       (src/automation/mis_report.py, MIS_REPORT_DIRECT, off by default); the table render +
+#       CSV button + download-dir polling path is the fallback.
+# v2.5: ensure_mis_ready registers the MIS validators on the user's MIS tab
+#       as a CDP new-document script before its refresh
+#       (src/automation/validation_injector.py).
 # ─────────────────────────────────────────────────────────────────────────────
 
 from __future__ import annotations
@@ -15,6 +33,20 @@ import traceback
 from datetime import datetime, timedelta
 from typing import Any
 
+from src.automation.waits import (
+    datatable_filtered,
+    get_wait_engine,
+    is_checked,
+    modal_hidden,
+    modal_shown,
+    select2_choice,
+    select2_closed,
+    select2_open,
+    select2_option,
+    value_equals,
+)
+from src.utils.metrics import timed
+
 MIS_URL          = 'https://mis.theartisttree.com/daily-discount'
 MIS_URL_FRAGMENT = 'mis.theartisttree.com'
 
@@ -23,6 +55,18 @@ MASTER_STORE_LIST = [
     'Hawthorne', 'Koreatown', 'Laguna Woods', 'Oxnard', 'Riverside', 'West Hollywood',
 ]
 
+# MIS field → <select> element ID (Select2 single / multi)
+SELECT2_FIELD_IDS = {
+    'Brand':        'brand_id',
+    'Linked Brand': 'linked_brand_id',
+    'Rebate Type':  'daily_discount_type_id',
+}
+MULTI_SELECT_FIELD_IDS = {   # monolith: FIELD_SELECT_MAP
+    'Weekday':  'weekday_ids',
+    'Category': 'category_ids',
+    'Store':    'store_ids',
+}
+
 
 # ── Utility helpers ───────────────────────────────────────────────────────────
 
@@ -42,6 +86,11 @@ def _log(msg: str, level: str = 'INFO') -> None:
     print(f'[{ts}] [{level}] {msg}')
 
 
+def _wait(driver: Any, predicate: Any, name: str, timeout: float | None = None) -> Any:
+    """Soft condition wait: the predicate's value, or None on timeout."""
+    return get_wait_engine().maybe(driver, predicate, name, timeout)
+
+
 def _load_saved_creds() -> dict:
     """Load MIS/Blaze credentials from the active profile blaze_config."""
     try:
@@ -59,13 +108,13 @@ def _click_backdrop(driver: Any) -> None:
     try:
         el = driver.find_element('css selector', 'h4.modal-title, .modal-header, .modal-body h5')
         el.click()
-        time.sleep(0.10)
+        _wait(driver, select2_closed(), 'select2_closed', 0.5)
     except Exception:
         try:
             from selenium.webdriver.common.keys import Keys
             from selenium.webdriver.common.action_chains import ActionChains
             ActionChains(driver).send_keys(Keys.ESCAPE).perform()
-            time.sleep(0.08)
+            _wait(driver, select2_closed(), 'select2_closed', 0.5)
         except Exception:
             pass
 
@@ -73,9 +122,14 @@ def _click_backdrop(driver: Any) -> None:
 def _fast_type(driver: Any, element: Any, text: str, field_name: str = 'field') -> bool:
     """
     Fast text input: JS injection → send_keys → char-by-char fallback.
-    Returns True on success.
+    Returns True on success. Each method waits for the value to land instead
+    of sleeping; input masks that reformat the value just end the wait early.
     """
     text = str(text)
+
+    def settle() -> None:
+        _wait(driver, value_equals(element, text), 'field_value', 0.3)
+
     # Method 1: JS
     try:
         driver.execute_script("""
@@ -84,14 +138,14 @@ def _fast_type(driver: Any, element: Any, text: str, field_name: str = 'field')
             el.dispatchEvent(new Event('input', { bubbles: true }));
             el.dispatchEvent(new Event('keyup',  { bubbles: true }));
         """, element, text)
-        time.sleep(0.15)
+        settle()
         return True
     except Exception:
         pass
     # Method 2: send_keys
     try:
         element.send_keys(text)
-        time.sleep(0.15)
+        settle()
         return True
     except Exception:
         pass
@@ -99,8 +153,7 @@ def _fast_type(driver: Any, element: Any, text: str, field_name: str = 'field')
     try:
         for ch in text:
             element.send_keys(ch)
-            time.sleep(0.015)
-        time.sleep(0.15)
+        settle()
         return True
     except Exception as e:
         _log(f'[{field_name}] All type methods failed: {e}', 'ERROR')
@@ -130,21 +183,14 @@ def _select2_pick(driver: Any, label_text: str, value: str, field_name: str) ->
         return True
 
     from selenium.webdriver.common.by import By
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
     from selenium.webdriver.common.action_chains import ActionChains
     from selenium.webdriver.common.keys import Keys
 
-    FIELD_ID_MAP = {
-        'Brand': 'brand_id',
-        'Linked Brand': 'linked_brand_id',
-        'Rebate Type': 'daily_discount_type_id',
-    }
-    select_id = FIELD_ID_MAP.get(field_name, field_name.lower().replace(' ', '_'))
+    select_id = SELECT2_FIELD_IDS.get(field_name, field_name.lower().replace(' ', '_'))
 
     try:
-        ActionChains(driver).send_keys(Keys.ESCAPE).perform(); time.sleep(0.1)
-        _click_backdrop(driver); time.sleep(0.15)
+        ActionChains(driver).send_keys(Keys.ESCAPE).perform()
+        _click_backdrop(driver)
 
         container = None
         for method, css in [
@@ -167,28 +213,22 @@ def _select2_pick(driver: Any, label_text: str, value: str, field_name: str) ->
                 return False
 
         ActionChains(driver).move_to_element(container).click().perform()
-        time.sleep(0.25)
+        _wait(driver, select2_open(), 'select2_open', 2)
 
         # Type to filter if search input is visible
         search_inputs = driver.find_elements(By.CSS_SELECTOR, '.select2-dropdown .select2-search__field')
         for si in search_inputs:
             if si.is_displayed():
                 ActionChains(driver).move_to_element(si).click().perform()
-                time.sleep(0.1)
                 _fast_type(driver, si, str(value), field_name)
                 break
 
-        # Click matching option
-        val_xpath = _build_xpath_contains(str(value))
-        for xpath in [
-            f"//li[contains(@class,'select2-results__option') and normalize-space(text())={val_xpath}]",
-            f"//li[contains(@class,'select2-results__option') and contains(text(),{val_xpath})]",
-        ]:
+        # Click matching option (exact text preferred, then contains)
+        opt = _wait(driver, select2_option(str(value)), 'select2_option', 2)
+        if opt:
             try:
-                opt = WebDriverWait(driver, 2).until(EC.element_to_be_clickable((By.XPATH, xpath)))
                 opt.click()
                 _log(f'[{field_name}] Selected: {value}')
-                time.sleep(0.2)
                 _click_backdrop(driver)
                 return True
             except Exception:
@@ -208,7 +248,7 @@ def _fill_date(driver: Any, field_id: str, date_str: str, label: str) -> bool:
     try:
         el = driver.find_element(By.ID, field_id)
         driver.execute_script("arguments[0].value = '';", el)
-        el.click(); time.sleep(0.1)
+        el.click()
         _fast_type(driver, el, date_str, label)
         _log(f'[{label}] Set: {date_str}')
         return True
@@ -231,6 +271,28 @@ def _fill_numeric(driver: Any, field_id: str, value: str, label: str) -> bool:
         return False
 
 
+def _split_values(values: list | str) -> list[str]:
+    """Comma-separated string or list → trimmed, non-empty strings."""
+    if isinstance(values, str):
+        return [v.strip() for v in values.split(',') if v.strip()]
+    return [str(v).strip() for v in values if v and str(v).strip()]
+
+
+def _resolve_target_stores(locations_str: str) -> list[str]:
+    """'All Locations', individual stores, or 'All Locations Except: X, Y' → store names."""
+    loc = str(locations_str).strip()
+    if not loc or loc.lower() in ('all', 'all locations', ''):
+        return MASTER_STORE_LIST[:]
+    if 'except' in loc.lower():
+        import re
+        except_match = re.search(r'except[:\s]*(.*)', loc, re.IGNORECASE)
+        if except_match:
+            excluded = {s.strip().lower() for s in except_match.group(1).split(',')}
+            return [s for s in MASTER_STORE_LIST if s.lower() not in excluded]
+        return MASTER_STORE_LIST[:]
+    return [s.strip() for s in loc.split(',') if s.strip()]
+
+
 def _select_stores(driver: Any, locations_str: str) -> bool:
     """
     Handle the multi-select store list: 'All Locations', individual stores,
@@ -242,19 +304,7 @@ def _select_stores(driver: Any, locations_str: str) -> bool:
 
     loc = str(locations_str).strip()
     _log(f'[Stores] Resolving: {loc}')
-
-    if not loc or loc.lower() in ('all', 'all locations', ''):
-        target_stores = MASTER_STORE_LIST[:]
-    elif 'except' in loc.lower():
-        import re
-        except_match = re.search(r'except[:\s]*(.*)', loc, re.IGNORECASE)
-        if except_match:
-            excluded = {s.strip().lower() for s in except_match.group(1).split(',')}
-            target_stores = [s for s in MASTER_STORE_LIST if s.lower() not in excluded]
-        else:
-            target_stores = MASTER_STORE_LIST[:]
-    else:
-        target_stores = [s.strip() for s in loc.split(',') if s.strip()]
+    target_stores = _resolve_target_stores(loc)
 
     _log(f'[Stores] Targeting {len(target_stores)} stores: {target_stores}')
 
@@ -264,7 +314,8 @@ def _select_stores(driver: Any, locations_str: str) -> bool:
         try:
             all_cb = driver.find_element(By.XPATH, all_cb_xpath)
             if all_cb.is_selected():
-                all_cb.click(); time.sleep(0.2)
+                all_cb.click()
+                _wait(driver, is_checked(all_cb, False), 'checkbox_state', 1)
         except Exception:
             pass
 
@@ -274,7 +325,8 @@ def _select_stores(driver: Any, locations_str: str) -> bool:
             try:
                 cb = WebDriverWait(driver, 2).until(EC.presence_of_element_located((By.XPATH, xpath)))
                 if not cb.is_selected():
-                    cb.click(); time.sleep(0.1)
+                    cb.click()
+                    _wait(driver, is_checked(cb), 'checkbox_state', 1)
                 _log(f'  ✓ {store}')
             except Exception:
                 _log(f'  ✗ {store} — not found in modal', 'WARN')
@@ -294,7 +346,9 @@ def _atomic_multi_select(driver: Any, label_text: str, values: list | str, field
     Monolith: atomic_multi_select() — opens the dropdown ONCE, clicks each
     option in sequence, then closes. Used for Weekday, Category, Store.
 
-    values: comma-separated string OR list of strings.
+    values: comma-separated string OR list of strings. Values already chosen
+    are left alone (a click would unselect them in Select2 v4). True only
+    when every value ends up selected.
     """
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
@@ -302,29 +356,19 @@ def _atomic_multi_select(driver: Any, label_text: str, values: list | str, field
     from selenium.webdriver.common.action_chains import ActionChains
     from selenium.webdriver.common.keys import Keys
 
-    if isinstance(values, str):
-        values = [v.strip() for v in values.split(',') if v.strip()]
-    else:
-        values = [str(v).strip() for v in values if v and str(v).strip()]
+    values = _split_values(values)
 
     if not values:
         _log(f'[{field_name}] Skipping — no values', 'SKIP')
         return True
 
-    # MIS field → select element ID mapping (monolith: FIELD_SELECT_MAP)
-    FIELD_SELECT_MAP = {
-        'Weekday':  'weekday_ids',
-        'Category': 'category_ids',
-        'Store':    'store_ids',
-    }
-    select_id = FIELD_SELECT_MAP.get(field_name, field_name.lower().replace(' ', '_'))
+    select_id = MULTI_SELECT_FIELD_IDS.get(field_name, field_name.lower().replace(' ', '_'))
 
     _log(f'[{field_name}] Atomic multi-select: {values}')
 
     def _close_dropdown() -> None:
         try:
             ActionChains(driver).send_keys(Keys.ESCAPE).perform()
-            time.sleep(0.08)
         except Exception:
             pass
         _click_backdrop(driver)
@@ -332,7 +376,6 @@ def _atomic_multi_select(driver: Any, label_text: str, values: list | str, field
     try:
         # Step 1: Close any open dropdown
         _close_dropdown()
-        time.sleep(0.1)
 
         # Step 2: Locate Select2 container (try multiple selectors)
         container = None
@@ -367,7 +410,7 @@ def _atomic_multi_select(driver: Any, label_text: str, values: list | str, field
             ActionChains(driver).move_to_element(sel_area).click().perform()
         except Exception:
             ActionChains(driver).move_to_element(container).click().perform()
-        time.sleep(0.3)
+        _wait(driver, select2_open(), 'select2_open', 2)
 
         # Step 4: Get search input
         search_input = None
@@ -393,6 +436,15 @@ def _atomic_multi_select(driver: Any, label_text: str, values: list | str, field
         # Step 5: For each value — type to filter, click option
         selected_count = 0
         for value in values:
+            try:
+                already = select2_choice(select_id, value)(driver)   # one check, not a wait
+            except Exception:
+                already = False
+            if already:
+                selected_count += 1
+                _log(f'  [{field_name}] ✓ {value} (already selected)')
+                continue
+
             # Re-open if dropdown closed between iterations
             try:
                 is_open = 'select2-container--open' in (container.get_attribute('class') or '')
@@ -401,7 +453,7 @@ def _atomic_multi_select(driver: Any, label_text: str, values: list | str, field
             if not is_open:
                 try:
                     ActionChains(driver).move_to_element(container).click().perform()
-                    time.sleep(0.25)
+                    _wait(driver, select2_open(), 'select2_open', 2)
                 except Exception:
                     pass
 
@@ -409,9 +461,7 @@ def _atomic_multi_select(driver: Any, label_text: str, values: list | str, field
             if search_input:
                 try:
                     search_input.clear()
-                    time.sleep(0.05)
                     _fast_type(driver, search_input, value, field_name)
-                    time.sleep(0.3)
                 except Exception:
                     # Re-acquire stale reference
                     try:
@@ -419,29 +469,20 @@ def _atomic_multi_select(driver: Any, label_text: str, values: list | str, field
                             By.CSS_SELECTOR, '.select2-container--open .select2-search__field'
                         )
                         search_input.clear()
-                        time.sleep(0.05)
                         _fast_type(driver, search_input, value, field_name)
-                        time.sleep(0.3)
                     except Exception:
                         pass
 
-            # Click matching option
-            val_xpath = _build_xpath_contains(value)
+            # Click matching option (exact text preferred, then contains) once rendered
             clicked = False
-            for xpath in (
-                f"//li[contains(@class,'select2-results__option') and normalize-space(text())={val_xpath}]",
-                f"//li[contains(@class,'select2-results__option') and contains(text(),{val_xpath})]",
-            ):
+            opt = _wait(driver, select2_option(value, skip_selected=True), 'select2_option', 2)
+            if opt:
                 try:
-                    opt = WebDriverWait(driver, 2).until(
-                        EC.element_to_be_clickable((By.XPATH, xpath))
-                    )
                     opt.click()
-                    time.sleep(0.15)
-                    clicked = True
-                    selected_count += 1
-                    _log(f'  [{field_name}] ✓ {value}')
-                    break
+                    clicked = bool(_wait(driver, select2_choice(select_id, value), 'select2_choice', 1))
+                    if clicked:
+                        selected_count += 1
+                        _log(f'  [{field_name}] ✓ {value}')
                 except Exception:
                     pass
 
@@ -449,9 +490,9 @@ def _atomic_multi_select(driver: Any, label_text: str, values: list | str, field
                 # Keyboard fallback
                 try:
                     ActionChains(driver).send_keys(Keys.ARROW_DOWN).perform()
-                    time.sleep(0.1)
                     ActionChains(driver).send_keys(Keys.ENTER).perform()
-                    time.sleep(0.1)
+                    if not _wait(driver, select2_choice(select_id, value), 'select2_choice', 1):
+                        raise RuntimeError('no tag after Enter')
                     selected_count += 1
                     _log(f'  [{field_name}] ✓ {value} (keyboard fallback)')
                 except Exception:
@@ -461,7 +502,7 @@ def _atomic_multi_select(driver: Any, label_text: str, values: list | str, field
         _close_dropdown()
 
         _log(f'[{field_name}] Done: {selected_count}/{len(values)} selected')
-        return selected_count > 0
+        return selected_count == len(values)
 
     except Exception as e:
         _log(f'[{field_name}] _atomic_multi_select error: {e}', 'ERROR')
@@ -472,8 +513,146 @@ def _atomic_multi_select(driver: Any, label_text: str, values: list | str, field
         return False
 
 
+# ── Bulk form fill (one execute_script per form) ─────────────────────────────
+
+# specs: [{key, kind: input|select|multi|checkboxes, id?, value?, values?}]
+# Returns {key: {ok, actual, missing?, error?}} read back in the same call.
+_BULK_FILL_JS = r"""
+var specs = arguments[0], out = {}, $ = window.jQuery;
+function norm(s) { return String(s == null ? '' : s).replace(/\s+/g, ' ').trim().toLowerCase(); }
+function fire(el, names) { names.forEach(function (n) { el.dispatchEvent(new Event(n, { bubbles: true })); }); }
+function changed(el) { if ($) { $(el).trigger('change'); } else { fire(el, ['change']); } }
+function findOpt(sel, want) {
+    want = norm(want); var part = null;
+    for (var i = 0; i < sel.options.length; i++) {
+        var t = norm(sel.options[i].textContent);
+        if (t === want) return sel.options[i];
+        if (!part && want && t.indexOf(want) !== -1) part = sel.options[i];
+    }
+    return part;
+}
+specs.forEach(function (f) {
+    try {
+        if (f.kind === 'input') {
+            var el = document.getElementById(f.id);
+            if (!el) { out[f.key] = { ok: false, error: 'no #' + f.id }; return; }
+            el.value = f.value;
+            fire(el, ['input', 'keyup', 'change']);
+            out[f.key] = { ok: el.value === f.value, actual: el.value };
+        } else if (f.kind === 'select' || f.kind === 'multi') {
+            var sel = document.getElementById(f.id);
+            if (!sel) { out[f.key] = { ok: false, error: 'no #' + f.id }; return; }
+            var wants = f.kind === 'multi' ? f.values : [f.value], missing = [];
+            wants.forEach(function (w) {
+                var o = findOpt(sel, w);
+                if (o) { o.selected = true; } else { missing.push(w); }
+            });
+            if (missing.length < wants.length) changed(sel);
+            var actual = Array.prototype.map.call(sel.selectedOptions, function (o) { return o.textContent.trim(); });
+            out[f.key] = { ok: !missing.length && actual.length >= wants.length, actual: actual, missing: missing };
+        } else if (f.kind === 'checkboxes') {
+            var boxes = {};
+            document.querySelectorAll('label').forEach(function (l) {
+                var cb = l.querySelector('input[type=checkbox]');
+                if (cb) boxes[norm(l.textContent)] = cb;
+            });
+            if (boxes['all'] && boxes['all'].checked) boxes['all'].click();
+            var miss = [], on = [];
+            f.values.forEach(function (name) {
+                var cb = boxes[norm(name)];
+                if (!cb) { miss.push(name); return; }
+                if (!cb.checked) cb.click();
+                if (cb.checked) on.push(name);
+            });
+            out[f.key] = { ok: !miss.length && on.length === f.values.length, actual: on, missing: miss };
+        }
+    } catch (e) {
+        out[f.key] = { ok: false, error: String(e) };
+    }
+});
+return out;
+"""
+
+
+def _bulk_fill_specs(fields: dict) -> list[dict]:
+    """
+    fill_deal_form's resolved values → _BULK_FILL_JS specs (same element IDs,
+    value formatting and store resolution as the per-field path). Empty fields
+    are left out, exactly like the per-field path skips them.
+    """
+    specs: list[dict] = []
+    for key, field_name in (('brand', 'Brand'), ('linked_brand', 'Linked Brand'),
+                            ('rebate_type', 'Rebate Type')):
+        if fields.get(key):
+            specs.append({'key': key, 'kind': 'select', 'id': SELECT2_FIELD_IDS[field_name],
+                          'value': str(fields[key])})
+    for key, field_id in (('discount', 'discount_rate'), ('vendor_contrib', 'vendor_rebate'),
+                          ('after_wholesale', 'after_wholesale')):
+        if fields.get(key):
+            specs.append({'key': key, 'kind': 'input', 'id': field_id,
+                          'value': str(fields[key]).replace('%', '').strip()})
+    for key in ('start_date', 'end_date'):
+        if fields.get(key):
+            specs.append({'key': key, 'kind': 'input', 'id': key, 'value': str(fields[key])})
+    for key, field_name in (('weekday', 'Weekday'), ('categories', 'Category')):
+        values = _split_values(fields.get(key) or '')
+        if values:
+            specs.append({'key': key, 'kind': 'multi', 'id': MULTI_SELECT_FIELD_IDS[field_name],
+                          'values': values})
+    if fields.get('locations'):
+        specs.append({'key': 'locations', 'kind': 'checkboxes',
+                      'values': _resolve_target_stores(fields['locations'])})
+    return specs
+
+
+def _unverified_values(values: list | str, result: dict | None) -> list[str]:
+    """
+    Multi-select values the bulk fill did not get selected. The per-field
+    fallback clicks only these: re-clicking a value _BULK_FILL_JS already
+    selected would unselect it.
+    """
+    values = _split_values(values)
+    if not result or result.get('error'):
+        return values
+    if result.get('missing'):
+        return [v for v in values if v in result['missing']]
+    actual = [' '.join(str(a).split()).lower() for a in result.get('actual') or []]
+    return [v for v in values if not any(' '.join(v.split()).lower() in a for a in actual)]
+
+
+@timed()
+def _bulk_fill_form(driver: Any, fields: dict) -> dict[str, dict]:
+    """
+    Fill every modal field in one execute_script round trip and read each one
+    back. Returns {field: {ok, actual, ...}}; {} if the script itself failed,
+    so every field falls back to the per-field path.
+    """
+    specs = _bulk_fill_specs(fields)
+    if not specs:
+        return {}
+    try:
+        result = driver.execute_script(_BULK_FILL_JS, specs) or {}
+    except Exception as e:
+        _log(f'[Bulk fill] script failed, using per-field path: {e}', 'WARN')
+        return {}
+    ok = [k for k, v in result.items() if v.get('ok')]
+    _log(f'[Bulk fill] {len(ok)}/{len(specs)} fields verified in one call')
+    return result
+
+
 # ── Session management ────────────────────────────────────────────────────────
 
+def _register_validators(driver: Any) -> None:
+    try:
+        from src.session import session
+        if session is not None and driver is session.get_browser():
+            from src.automation.validation_injector import get_validation_injector
+            get_validation_injector().install(driver)
+    except Exception as e:
+        _log(f'Validator registration skipped: {e}', 'WARN')
+
+
+@timed()
 def ensure_mis_ready(driver: Any, username: str = '', password: str = '') -> bool:
     """
     Ensure MIS tab is open and logged in.
@@ -499,6 +678,9 @@ def ensure_mis_ready(driver: Any, username: str = '', password: str = '') -> boo
         time.sleep(2)
         driver.switch_to.window(driver.window_handles[-1])
 
+    # Validators load with the refresh below (CDP new-document script, user's browser only)
+    _register_validators(driver)
+
     driver.refresh()
     time.sleep(2)
 
@@ -542,8 +724,76 @@ def ensure_mis_ready(driver: Any, username: str = '', password: str = '') -> boo
     return True
 
 
+def mis_page_warm(driver: Any) -> bool:
+    """
+    One-call check that the current tab is a logged-in MIS daily-discount page
+    (table + Add button present, no login form). Lets batch runs skip
+    ensure_mis_ready(), which refreshes the page.
+    """
+    try:
+        return bool(driver.execute_script("""
+            return location.href.indexOf(arguments[0]) !== -1
+                && !!document.getElementById('daily-discount')
+                && !!document.querySelector('button.btn-add-dialog')
+                && !document.querySelector("input[name='email']");
+        """, MIS_URL_FRAGMENT))
+    except Exception:
+        return False
+
+
+# ── Modal save / dismiss ──────────────────────────────────────────────────────
+
+_CLICK_MODAL_SAVE_JS = """
+var ms = document.querySelectorAll('.modal.show, .modal.in');
+for (var i = ms.length - 1; i >= 0; i--) {
+    var btn = ms[i].querySelector('.btn-submit, button[type=submit]');
+    if (btn) { btn.click(); return true; }
+}
+return false;
+"""
+
+_MODAL_ERRORS_JS = """
+var out = [];
+document.querySelectorAll('.modal.show .alert-danger, .modal.in .alert-danger, '
+    + '.modal.show .invalid-feedback, .modal.in .help-block, .modal.show .text-danger, .modal.in .text-danger')
+    .forEach(function (e) { var t = e.textContent.trim(); if (t) out.push(t); });
+return out.join(' | ');
+"""
+
+
+@timed()
+def save_deal_form(driver: Any, timeout: float = 10.0) -> dict:
+    """
+    Click Save on the open MIS modal and wait for it to close.
+    A modal that stays open means MIS rejected the entry — its error text is returned.
+    """
+    try:
+        if not driver.execute_script(_CLICK_MODAL_SAVE_JS):
+            return {'success': False, 'error': 'Save button not found in open modal'}
+        if _wait(driver, modal_hidden(), 'modal_saved', timeout):
+            return {'success': True}
+        errors = driver.execute_script(_MODAL_ERRORS_JS)
+        return {'success': False, 'error': errors or f'Modal still open {timeout:.0f}s after Save'}
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+
+def dismiss_modal(driver: Any) -> bool:
+    """Close any open modal without saving. Returns True once no modal is shown."""
+    try:
+        driver.execute_script("""
+            document.querySelectorAll(".modal.show button.close, .modal.in button.close, "
+                + ".modal.show [data-dismiss='modal'], .modal.in [data-dismiss='modal']")
+                .forEach(function (b) { b.click(); });
+        """)
+    except Exception:
+        pass
+    return bool(_wait(driver, modal_hidden(), 'modal_hidden', 3))
+
+
 # ── filter_and_open_mis_id ────────────────────────────────────────────────────
 
+@timed()
 def filter_and_open_mis_id(driver: Any, mis_id: str) -> bool:
     """
     Filter MIS datatable by ID and open the entry's edit popup.
@@ -560,7 +810,7 @@ def filter_and_open_mis_id(driver: Any, mis_id: str) -> bool:
             for btn in driver.find_elements(By.CSS_SELECTOR, "button.close[data-dismiss='modal']"):
                 if btn.is_displayed():
                     btn.click()
-                    time.sleep(0.5)
+                    _wait(driver, modal_hidden(), 'modal_hidden', 2)
                     break
         except Exception:
             pass
@@ -585,14 +835,14 @@ def filter_and_open_mis_id(driver: Any, mis_id: str) -> bool:
         search_input.send_keys(Keys.CONTROL + "a")
         search_input.send_keys(Keys.DELETE)
         search_input.send_keys(str(mis_id))
-        time.sleep(1)
+        _wait(driver, datatable_filtered('daily-discount', str(mis_id)), 'datatable_filtered', 5)
 
         # Click the edit button for this specific ID
         edit_btn = WebDriverWait(driver, 5).until(
             EC.element_to_be_clickable((By.CSS_SELECTOR, f"a.btn-table-dialog[data-id='{mis_id}']"))
         )
         edit_btn.click()
-        time.sleep(1)
+        _wait(driver, modal_shown('discount_rate'), 'modal_shown', 5)
         return True
 
     except Exception as e:
@@ -602,14 +852,23 @@ def filter_and_open_mis_id(driver: Any, mis_id: str) -> bool:
 
 # ── fill_deal_form ────────────────────────────────────────────────────────────
 
-def fill_deal_form(driver: Any, payload: dict) -> dict:
+@timed()
+def fill_deal_form(driver: Any, payload: dict, ensure_ready: bool = True) -> dict:
     """
     Selenium: Click Add New → fill all modal fields from payload.
     Does NOT click Save — user reviews first.
 
     payload keys: brand, linked_brand, weekday, discount, vendor_contrib,
                   locations, categories, start_date, end_date, rebate_type,
-                  after_wholesale (optional), sheet_data (dict, alias keys accepted)
+                  after_wholesale (optional), sheet_data (dict, alias keys accepted),
+                  bulk_fill (optional, default True — one-call fast path)
+
+    Result fill_mode: 'bulk' (every field verified in one call), 'mixed'
+    (fallback_fields went through the per-field path) or 'per_field'.
+    failed_fields: per-field fills that reported failure (each also a warning).
+
+    ensure_ready=False skips ensure_mis_ready() (and its page refresh) for
+    callers that already checked the page (mis_page_warm).
     """
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
@@ -636,64 +895,81 @@ def fill_deal_form(driver: Any, payload: dict) -> dict:
         print(f"\n{'='*60}\n[MIS CREATE] Brand={brand} | {start_date}→{end_date}\n{'='*60}")
 
         # Ensure MIS session
-        creds = _load_saved_creds()
-        ensure_mis_ready(driver, creds.get('mis_username', ''), creds.get('mis_password', ''))
+        if ensure_ready:
+            creds = _load_saved_creds()
+            ensure_mis_ready(driver, creds.get('mis_username', ''), creds.get('mis_password', ''))
 
         # Click Add New
         add_btn = WebDriverWait(driver, 5).until(
             EC.element_to_be_clickable((By.CSS_SELECTOR, 'button.btn-add-dialog'))
         )
-        add_btn.click(); time.sleep(2)
+        add_btn.click()
 
-        # Wait for modal
-        WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.ID, 'discount_rate')))
+        # Wait for modal (fade finished, form field visible)
+        get_wait_engine().until(driver, modal_shown('discount_rate'), 'modal_shown', 5)
         _log('Modal opened')
 
         warnings = []
 
-        # Fill fields
-        if brand:
-            ok = _select2_pick(driver, 'Brand', brand, 'Brand')
-            if not ok: warnings.append(f'Brand "{brand}" not found')
-
-        if linked_brand:
-            _select2_pick(driver, 'Linked Brand', linked_brand, 'Linked Brand')
-
-        if rebate_type:
-            _select2_pick(driver, 'Rebate Type', rebate_type, 'Rebate Type')
-
-        if discount:
-            _fill_numeric(driver, 'discount_rate', discount, 'Discount')
-
-        if vendor_contrib:
-            _fill_numeric(driver, 'vendor_rebate', vendor_contrib, 'Vendor Rebate')
-
-        if after_wholesale:
-            _fill_numeric(driver, 'after_wholesale', after_wholesale, 'After Wholesale')
-
-        if start_date:
-            _fill_date(driver, 'start_date', start_date, 'Start Date')
-
-        if end_date:
-            _fill_date(driver, 'end_date', end_date, 'End Date')
-
-        if weekday:
-            # Weekday is a multi-select — use atomic open-once-click-all pattern
-            _atomic_multi_select(driver, 'Day of Week', weekday, 'Weekday')
-
-        if locations:
-            _select_stores(driver, locations)
-
-        if categories:
-            # Category is a multi-select — use atomic open-once-click-all pattern
-            _atomic_multi_select(driver, 'Category', categories, 'Category')
+        # Fast path: whole modal in one round trip (payload bulk_fill=False skips it)
+        verified: dict[str, dict] = {}
+        if payload.get('bulk_fill', True):
+            verified = _bulk_fill_form(driver, {
+                'brand': brand, 'linked_brand': linked_brand, 'rebate_type': rebate_type,
+                'discount': discount, 'vendor_contrib': vendor_contrib,
+                'after_wholesale': after_wholesale, 'start_date': start_date,
+                'end_date': end_date, 'weekday': weekday, 'categories': categories,
+                'locations': locations,
+            })
+        done = {k for k, v in verified.items() if v.get('ok')}
+
+        # Per-field path for anything the fast path could not verify.
+        # Each helper returns False when its field is left unfilled; that is a
+        # warning here, and run_mis_batch fails the item rather than saving it.
+        per_field = (
+            ('brand',           brand,           lambda: _select2_pick(driver, 'Brand', brand, 'Brand')),
+            ('linked_brand',    linked_brand,    lambda: _select2_pick(driver, 'Linked Brand', linked_brand, 'Linked Brand')),
+            ('rebate_type',     rebate_type,     lambda: _select2_pick(driver, 'Rebate Type', rebate_type, 'Rebate Type')),
+            ('discount',        discount,        lambda: _fill_numeric(driver, 'discount_rate', discount, 'Discount')),
+            ('vendor_contrib',  vendor_contrib,  lambda: _fill_numeric(driver, 'vendor_rebate', vendor_contrib, 'Vendor Rebate')),
+            ('after_wholesale', after_wholesale, lambda: _fill_numeric(driver, 'after_wholesale', after_wholesale, 'After Wholesale')),
+            ('start_date',      start_date,      lambda: _fill_date(driver, 'start_date', start_date, 'Start Date')),
+            ('end_date',        end_date,        lambda: _fill_date(driver, 'end_date', end_date, 'End Date')),
+            # Weekday / Category are multi-selects — atomic open-once-click-all pattern
+            # Only the values the bulk fill left unselected (a re-click unselects)
+            ('weekday',         weekday,         lambda: _atomic_multi_select(
+                driver, 'Day of Week', _unverified_values(weekday, verified.get('weekday')), 'Weekday')),
+            ('locations',       locations,       lambda: _select_stores(driver, locations)),
+            ('categories',      categories,      lambda: _atomic_multi_select(
+                driver, 'Category', _unverified_values(categories, verified.get('categories')), 'Category')),
+        )
+        failed_fields: list[str] = []
+        for key, value, fill in per_field:
+            if value and key not in done and not fill():
+                failed_fields.append(key)
+                warnings.append(f'Brand "{brand}" not found' if key == 'brand'
+                                else f'{key} not filled ("{value}")')
+
+        fallback = [k for k in verified if k not in done]
+        if not verified:
+            fill_mode = 'per_field'
+        else:
+            fill_mode = 'bulk' if not fallback else 'mixed'
+            if fallback:
+                _log(f'[Bulk fill] per-field fallback for: {", ".join(fallback)}', 'WARN')
 
-        _log('✅ All fields filled. Modal open for user review.')
+        if failed_fields:
+            _log(f'Fields not filled: {", ".join(failed_fields)}. Modal open for user review.', 'WARN')
+        else:
+            _log('✅ All fields filled. Modal open for user review.')
         session.set_automation_in_progress(False)
 
         return {
-            'success':  True,
-            'warnings': warnings,
+            'success':   True,
+            'warnings':  warnings,
+            'fill_mode': fill_mode,
+            'fallback_fields': fallback,
+            'failed_fields':   failed_fields,
             'filled': {
                 'brand': brand, 'linked_brand': linked_brand, 'weekday': weekday,
                 'discount': discount, 'vendor_contrib': vendor_contrib,
@@ -739,10 +1015,12 @@ def automate_full_create(driver: Any, payload: dict, session: Any = None) -> dic
 
 # ── update_mis_end_date ───────────────────────────────────────────────────────
 
-def update_mis_end_date(driver: Any, payload: dict) -> dict:
+@timed()
+def update_mis_end_date(driver: Any, payload: dict, ensure_ready: bool = True) -> dict:
     """
     Expand-and-Attack end date update.
     Filters MIS table by ID → expands row → clicks Edit → updates end date.
+    ensure_ready=False: caller already holds a warm MIS page (see fill_deal_form).
     """
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
@@ -758,15 +1036,18 @@ def update_mis_end_date(driver: Any, payload: dict) -> dict:
         if not new_date:
             return {'success': False, 'error': 'No new date provided'}
 
-        creds = _load_saved_creds()
-        ensure_mis_ready(driver, creds.get('mis_username', ''), creds.get('mis_password', ''))
+        if ensure_ready:
+            creds = _load_saved_creds()
+            ensure_mis_ready(driver, creds.get('mis_username', ''), creds.get('mis_password', ''))
 
         _log(f'Expand & Attack: MIS ID {mis_id} → {new_date}')
 
         # Close any open modals
         for btn in driver.find_elements(By.CSS_SELECTOR, "button.close[data-dismiss='modal'], .btn-close"):
             if btn.is_displayed():
-                btn.click(); time.sleep(0.3); break
+                btn.click()
+                _wait(driver, modal_hidden(), 'modal_hidden', 2)
+                break
 
         # Step 1: Filter search
         search = WebDriverWait(driver, 5).until(
@@ -776,7 +1057,7 @@ def update_mis_end_date(driver: Any, payload: dict) -> dict:
         search.send_keys(Keys.CONTROL + 'a')
         search.send_keys(Keys.DELETE)
         search.send_keys(mis_id)
-        time.sleep(1.5)
+        _wait(driver, datatable_filtered('daily-discount', mis_id), 'datatable_filtered', 5)
 
         # Step 2: Find target row
         WebDriverWait(driver, 5).until(
@@ -790,16 +1071,16 @@ def update_mis_end_date(driver: Any, payload: dict) -> dict:
 
         # Step 3: Expand row (click first cell to reveal child row with Edit button)
         first_cell = target_row.find_element(By.CSS_SELECTOR, 'td:first-child')
-        first_cell.click(); time.sleep(1.2)
+        first_cell.click()
 
-        # Step 4: Find Edit button in child row
+        # Step 4: Find Edit button in child row (waits for it to become visible)
         edit_btn = WebDriverWait(driver, 4).until(
             EC.element_to_be_clickable((By.CSS_SELECTOR, 'a.btn-table-dialog'))
         )
-        edit_btn.click(); time.sleep(1.5)
+        edit_btn.click()
 
         # Step 5: Wait for edit modal
-        WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.ID, 'discount_rate')))
+        get_wait_engine().until(driver, modal_shown('discount_rate'), 'modal_shown', 5)
 
         # Step 6: Update end date
         ok = _fill_date(driver, 'end_date', new_date, 'End Date')
@@ -836,9 +1117,13 @@ def automate_full_end_date(driver: Any, payload: dict, session: Any = None) -> d
 
 
 # ── Additive: pull_mis_csv_report_background (monolith: lines 24982–25192) ───
-def pull_mis_csv_report_background(driver: Any) -> tuple[bool, str, str]:
+@timed()
+def pull_mis_csv_report_background(driver: Any, direct: bool | None = None) -> tuple[bool, str, str]:
     """
     Background CSV pull — uses provided driver directly.
+    Direct mode (direct=None → MIS_REPORT_DIRECT): fetch the table's data
+    endpoint over HTTP with the browser's cookies; on any failure fall through
+    to the Selenium path below.
     Smart Validation & Retry Logic:
     - Verifies table is fully populated before clicking CSV button
     - Validates downloaded file size (< 1KB = misfire/empty)
@@ -860,6 +1145,15 @@ def pull_mis_csv_report_background(driver: Any) -> tuple[bool, str, str]:
 
     _MIS_REPORTS_DIR = _Path(__file__).resolve().parent.parent.parent / 'reports' / 'MIS_CSV_REPORTS'
     _MIS_REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+
+    from src.automation.mis_report import get_mis_report_client
+    client = get_mis_report_client()
+    if client.enabled if direct is None else direct:
+        ok, path_or_error, filename = client.download(driver, _MIS_REPORTS_DIR)
+        if ok:
+            return ok, path_or_error, filename
+        _log(f'Direct download unavailable ({path_or_error}) — falling back to table export', 'WARN')
+
     MAX_RETRY_ATTEMPTS = 3
     MIN_VALID_FILE_SIZE = 1024
 
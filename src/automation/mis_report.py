@@ -0,0 +1,275 @@
+# src/automation/mis_report.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Direct HTTP pull of the MIS daily-discount report, riding the attached
+# browser's logged-in session.
+#
+# The Selenium path (pull_mis_csv_report_background) switches the DataTable
+# to "ALL", waits for thousands of rows to render in the DOM, clicks the CSV
+# button and polls the downloads directory. Rendering is most of that time.
+#
+# Here one execute_script call reads what the table itself fetches from —
+# its ajax URL, the exact query it last sent (jQuery.param, so nested
+# DataTables params survive), the column titles and the CSRF token — and the
+# driver's cookies ride along on a pooled requests.Session. The request is
+# replayed with start=0 / length=-1 / empty search, and the response is
+# streamed in chunks to a .part file in reports/MIS_CSV_REPORTS:
+#
+#   text/csv          renamed into place as-is
+#   JSON              DataTables payload ({data: [...]}, or the table's
+#                     dataSrc) converted to CSV with the table's column
+#                     titles; untitled columns (action buttons) are skipped
+#                     and cell HTML is stripped, as the CSV button does
+#
+# The written header must carry every REQUIRED_COLUMNS title the matcher and
+# audits read; the raw ajax values skip the table's column renderers and the
+# CSV button's exportOptions, so a report that does not line up is discarded.
+#
+# Anything else (no DataTables ajax source, HTML login page, non-200, zero
+# rows, missing columns) returns (False, reason, '') and the caller falls back
+# to Selenium. Off by default (MIS_REPORT_DIRECT) until checked against MIS.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import csv
+import html
+import json
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from src.utils.metrics import timed
+
+DEFAULT_TIMEOUT   = 60.0
+DEFAULT_POOL_SIZE = 4
+CHUNK_SIZE        = 64 * 1024
+
+_TAG_RE = re.compile(r'<[^>]*>')
+
+# CSV-button titles that resolve_mis_csv consumers (matcher, MAudit, split audit) read
+REQUIRED_COLUMNS = ('ID', 'Brand', 'Weekday', 'Daily Deal Discount', 'Discount paid by vendor',
+                    'Category', 'Start date', 'End date', 'Store')
+
+# Everything the table's own ajax call needs, read in one round trip.
+_SOURCE_JS = """
+var t = document.getElementById(arguments[0]);
+if (!t || !window.jQuery || !jQuery.fn.dataTable || !jQuery.fn.dataTable.isDataTable(t)) return null;
+var dt = jQuery(t).DataTable(), s = dt.settings()[0], ajax = s.ajax;
+var url = dt.ajax.url() || (typeof ajax === 'string' ? ajax : (ajax && ajax.url));
+if (!url) return null;
+var params = jQuery.extend(true, {}, dt.ajax.params() || {});
+if (s.oFeatures.bServerSide) {
+    params.start = 0;
+    params.length = -1;
+    if (params.search) params.search.value = '';
+}
+var meta = document.querySelector('meta[name="csrf-token"]');
+return {
+    page_url:   location.href,
+    url:        new URL(url, location.href).href,
+    method:     ((ajax && (ajax.type || ajax.method)) || 'GET').toUpperCase(),
+    query:      jQuery.param(params),
+    data_src:   (ajax && typeof ajax.dataSrc === 'string') ? ajax.dataSrc : 'data',
+    csrf:       meta ? meta.getAttribute('content') : '',
+    user_agent: navigator.userAgent,
+    columns:    s.aoColumns.map(function (c) {
+        return {data: (typeof c.mData === 'function') ? null : c.mData,
+                title: (c.sTitle || '').replace(/<[^>]*>/g, '').trim()};
+    })
+};
+"""
+
+
+class ReportUnavailable(Exception):
+    """The direct pull cannot produce the report; the Selenium path should run."""
+
+
+def report_filename(now: datetime | None = None) -> str:
+    """Same name the Selenium path gives a finished download."""
+    now = now or datetime.now()
+    return f"MIS_CSV_REPORT_{now.strftime('%Y-%m-%d')}_{now.strftime('%I-%M-%S-%p')}.csv"
+
+
+def cell_text(value: Any) -> str:
+    """Export text for one cell: HTML stripped and entities decoded."""
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return ' '.join(html.unescape(_TAG_RE.sub(' ', str(value))).split())
+
+
+def _pluck(row: Any, key: Any) -> Any:
+    """DataTables mData lookup: array index, or dotted key into an object row."""
+    if isinstance(row, list):
+        try:
+            return row[int(key)]
+        except (TypeError, ValueError, IndexError):
+            return None
+    for part in str(key).split('.'):
+        if not isinstance(row, dict):
+            return None
+        row = row.get(part)
+    return row
+
+
+def json_report_to_csv(payload: Any, columns: list[dict], data_src: str, dest: Path) -> int:
+    """Write a DataTables JSON payload to dest as CSV. Returns the data row count."""
+    rows = payload if data_src == '' else _pluck(payload, data_src or 'data')
+    if rows is None and isinstance(payload, dict):
+        rows = payload.get('aaData')
+    if not isinstance(rows, list):
+        raise ReportUnavailable(f'No "{data_src or "data"}" rows in the report response')
+    cols = [c for c in columns if c.get('title') and c.get('data') is not None]
+    if not cols:
+        raise ReportUnavailable('Report table has no exportable columns')
+    with open(dest, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.writer(fh)
+        writer.writerow([c['title'] for c in cols])
+        for row in rows:
+            writer.writerow([cell_text(_pluck(row, c['data'])) for c in cols])
+    return len(rows)
+
+
+def missing_columns(path: Path) -> list[str]:
+    """REQUIRED_COLUMNS absent from the CSV header at path (case-insensitive)."""
+    with open(path, newline='', encoding='utf-8-sig') as fh:
+        header = next(csv.reader(fh), [])
+    have = {h.strip().lower() for h in header}
+    return [c for c in REQUIRED_COLUMNS if c.lower() not in have]
+
+
+class MisReportClient:
+    """Pooled HTTP client for the MIS report endpoint; cookies come from the driver."""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        timeout: float = DEFAULT_TIMEOUT,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        table_id: str = 'daily-discount',
+    ) -> None:
+        self.enabled   = enabled
+        self.timeout   = timeout
+        self.pool_size = pool_size
+        self.table_id  = table_id
+        self._session: Any = None
+        self._lock = threading.Lock()
+
+    def _http(self) -> Any:
+        """requests.Session with a keep-alive pool, built on first use."""
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                sess = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                sess.mount('http://', adapter)
+                sess.mount('https://', adapter)
+                self._session = sess
+            return self._session
+
+    def report_source(self, driver: Any) -> dict:
+        source = driver.execute_script(_SOURCE_JS, self.table_id)
+        if not source or not source.get('url'):
+            raise ReportUnavailable(f'#{self.table_id} has no DataTables ajax source')
+        return source
+
+    def _request(self, driver: Any, source: dict) -> Any:
+        http = self._http()
+        http.cookies.clear()                  # only the browser's current session counts
+        cookies = '; '.join(f"{c['name']}={c['value']}" for c in driver.get_cookies())
+        headers = {
+            'Cookie':           cookies,
+            'User-Agent':       source.get('user_agent') or 'Mozilla/5.0',
+            'X-Requested-With': 'XMLHttpRequest',
+            'Accept':           'application/json, text/csv, */*',
+            'Referer':          source.get('page_url', ''),
+        }
+        if source.get('csrf'):
+            headers['X-CSRF-TOKEN'] = source['csrf']
+        if source.get('method') == 'POST':
+            headers['Content-Type'] = 'application/x-www-form-urlencoded; charset=UTF-8'
+            return http.post(source['url'], data=source.get('query', ''), headers=headers,
+                             timeout=self.timeout, stream=True)
+        url = source['url']
+        if source.get('query'):
+            url += ('&' if '?' in url else '?') + source['query']
+        return http.get(url, headers=headers, timeout=self.timeout, stream=True)
+
+    @timed('mis_report_direct')
+    def download(self, driver: Any, dest_dir: Path) -> tuple[bool, str, str]:
+        """
+        Fetch the report over HTTP into dest_dir.
+        Returns (success, path_or_error, filename) — the Selenium path's contract.
+        """
+        dest_dir = Path(dest_dir)
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        final_name = report_filename()
+        part = dest_dir / f'.{final_name}.part'
+        try:
+            source = self.report_source(driver)
+            with self._request(driver, source) as resp:
+                if resp.status_code != 200:
+                    raise ReportUnavailable(f'HTTP {resp.status_code} from {source["url"]}')
+                ctype = resp.headers.get('Content-Type', '').lower()
+                if 'html' in ctype:
+                    raise ReportUnavailable('Got an HTML page (MIS session expired?)')
+                size = 0
+                with open(part, 'wb') as fh:
+                    for chunk in resp.iter_content(CHUNK_SIZE):
+                        fh.write(chunk)
+                        size += len(chunk)
+
+            final_path = dest_dir / final_name
+            if 'csv' in ctype:
+                if size == 0:
+                    raise ReportUnavailable('Empty CSV response')
+                part.replace(final_path)
+                rows = '?'
+            else:
+                with open(part, 'rb') as fh:
+                    payload = json.load(fh)
+                rows = json_report_to_csv(payload, source.get('columns') or [],
+                                          source.get('data_src', 'data'), final_path)
+                if rows == 0:
+                    final_path.unlink(missing_ok=True)
+                    raise ReportUnavailable('Report response has no rows')
+            missing = missing_columns(final_path)
+            if missing:
+                final_path.unlink(missing_ok=True)
+                raise ReportUnavailable(f'Report lacks MIS CSV column(s): {", ".join(missing)}')
+            print(f"[MIS CSV] ✓ Direct download: {final_name} ({size} bytes, {rows} rows)")
+            return True, str(final_path), final_name
+        except ReportUnavailable as e:
+            return False, str(e), ''
+        except Exception as e:
+            return False, f'Direct download failed: {e}', ''
+        finally:
+            part.unlink(missing_ok=True)
+
+
+# Singleton — rebuilt by init_mis_report() from the app factory
+mis_report_client = MisReportClient()
+
+
+def init_mis_report(config: Any) -> MisReportClient:
+    """
+    Config keys (settings.json or app.config):
+        MIS_REPORT_DIRECT     = False  try the HTTP pull before the Selenium CSV button
+        MIS_REPORT_TIMEOUT    = 60     connect/read timeout per request (s)
+        MIS_REPORT_POOL_SIZE  = 4      keep-alive connections kept per host
+    """
+    global mis_report_client
+    mis_report_client = MisReportClient(
+        enabled=bool(config.get('MIS_REPORT_DIRECT', False)),
+        timeout=float(config.get('MIS_REPORT_TIMEOUT', DEFAULT_TIMEOUT)),
+        pool_size=int(config.get('MIS_REPORT_POOL_SIZE', DEFAULT_POOL_SIZE)),
+    )
+    return mis_report_client
+
+
+def get_mis_report_client() -> MisReportClient:
+    return mis_report_client
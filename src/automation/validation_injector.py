@@ -0,0 +1,165 @@
+# src/automation/validation_injector.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Event-driven MIS validator injection.
+#
+# background_validation_monitor (src/api/blaze.py, no-touch zone) woke every
+# 10s: a SQLite read of automation_in_progress, driver.current_url and two
+# execute_script probes, then re-injected inject_mis_validation /
+# inject_mis_browser_click_listeners when a navigation had wiped them — a
+# steady stream of chromedriver traffic and up to 10s without validators.
+#
+# Here the same two scripts are registered once per tab with CDP
+# Page.addScriptToEvaluateOnNewDocument. Chrome then runs them itself at the
+# start of every new document in that tab (navigation, reload, MIS form
+# round trip) — injection happens at navigation time, with no polling and no
+# chromedriver round trips after registration. The wrapper only runs on the
+# top frame of a daily-discount page and defers to DOMContentLoaded; the
+# scripts' own VALIDATOR_V2_ACTIVE / MIS_BROWSER_LISTENERS_ACTIVE guards keep
+# a later inject_mis_validation(expected_data=...) a message, not a re-inject.
+#
+# The script text is captured from the blaze.py injectors themselves (they
+# are called against a recording driver), so the injected JS is exactly
+# what the monitor injected.
+#
+# Registration points: session.set_browser() (browser attached) and
+# mis_entry.ensure_mis_ready() (landed on a MIS tab, before its refresh).
+# A replaced or cleared browser is forgotten (session detach listener), so a
+# new driver that reuses the old one's id() still gets its scripts.
+# VALIDATION_INJECT_MODE='poll', or a driver without CDP, keeps the monitor.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable
+
+PAGE_FRAGMENT = 'daily-discount'
+
+_DOCUMENT_WRAPPER = """
+(function () {
+    if (window.top !== window || location.href.indexOf(%(fragment)s) === -1) return;
+    var run = function () {
+        try { (function () { %(body)s })(); }
+        catch (e) { console.error('[VALIDATION-INJECT] new-document script failed', e); }
+    };
+    if (document.readyState === 'loading') document.addEventListener('DOMContentLoaded', run, {once: true});
+    else run();
+})();
+"""
+
+
+class _ScriptRecorder:
+    """Stands in for a driver: records the scripts an injector would run."""
+
+    def __init__(self) -> None:
+        self.scripts: list[str] = []
+
+    def execute_script(self, script: str, *args: Any) -> Any:
+        if script.strip().startswith('return window.'):
+            return False                      # "not active yet" → injector builds the full script
+        self.scripts.append(script)
+        return None
+
+
+def capture_script(inject: Callable[..., Any], *args: Any, **kwargs: Any) -> str:
+    """The JS `inject(driver, *args, **kwargs)` would run, joined in call order."""
+    recorder = _ScriptRecorder()
+    inject(recorder, *args, **kwargs)
+    if not recorder.scripts:
+        raise RuntimeError(f'{getattr(inject, "__name__", inject)} ran no script')
+    return '\n;\n'.join(recorder.scripts)
+
+
+def document_script(body: str, fragment: str = PAGE_FRAGMENT) -> str:
+    """Wrap body to run once per daily-discount document, after the DOM exists."""
+    import json
+    return _DOCUMENT_WRAPPER % {'fragment': json.dumps(fragment), 'body': body}
+
+
+def _default_injectors() -> list[Callable[[Any], Any]]:
+    from src.api.blaze import inject_mis_browser_click_listeners, inject_mis_validation
+    return [lambda d: inject_mis_validation(d, expected_data=None), inject_mis_browser_click_listeners]
+
+
+class ValidationInjector:
+    """Registers the MIS validators as CDP new-document scripts, once per tab."""
+
+    def __init__(
+        self,
+        mode: str = 'cdp',
+        injectors: Callable[[], list[Callable[[Any], Any]]] | None = None,
+    ) -> None:
+        self.mode        = mode
+        self._injectors  = injectors or _default_injectors
+        self._source: str | None = None
+        self._lock       = threading.Lock()
+        self._installed: dict[tuple[int, str], str] = {}   # (driver id, handle) → script identifier
+        self.registrations = 0
+        self.fallbacks     = 0
+        self.last_error: str | None = None
+
+    def source(self) -> str:
+        with self._lock:
+            if self._source is None:
+                body = '\n;\n'.join(capture_script(inject) for inject in self._injectors())
+                self._source = document_script(body)
+            return self._source
+
+    def install(self, driver: Any) -> bool:
+        """
+        Register the validators on the driver's current tab (idempotent per tab)
+        and run them now if that tab is already on daily-discount.
+        False when CDP is unavailable — the caller keeps the polling monitor.
+        """
+        if self.mode != 'cdp' or not hasattr(driver, 'execute_cdp_cmd'):
+            return False
+        try:
+            key = (id(driver), driver.current_window_handle)
+            with self._lock:
+                if key in self._installed:
+                    return True
+            source = self.source()
+            result = driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': source})
+            with self._lock:
+                self._installed[key] = (result or {}).get('identifier', '')
+                self.registrations += 1
+            if PAGE_FRAGMENT in (driver.current_url or ''):
+                driver.execute_script(source)
+            print(f"[VALIDATION-INJECT] ✅ Validators registered on tab {key[1]} (CDP new-document)")
+            return True
+        except Exception as e:
+            self.last_error = str(e)
+            self.fallbacks += 1
+            print(f"[VALIDATION-INJECT] ⚠ CDP registration failed: {e}")
+            return False
+
+    def forget(self, driver: Any) -> None:
+        """Drop registrations for a driver that went away (new session → new scripts)."""
+        with self._lock:
+            for key in [k for k in self._installed if k[0] == id(driver)]:
+                del self._installed[key]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {'mode': self.mode, 'tabs': [h for _, h in self._installed],
+                    'registrations': self.registrations, 'fallbacks': self.fallbacks,
+                    'last_error': self.last_error}
+
+
+# Singleton — rebuilt by init_validation_injector() from the app factory
+validation_injector = ValidationInjector()
+
+
+def init_validation_injector(config: Any) -> ValidationInjector:
+    """
+    Config keys (settings.json or app.config):
+        VALIDATION_INJECT_MODE  = 'cdp'   'cdp' (new-document scripts) | 'poll' (10s monitor)
+    """
+    global validation_injector
+    mode = str(config.get('VALIDATION_INJECT_MODE', 'cdp')).lower()
+    validation_injector = ValidationInjector(mode='poll' if mode == 'poll' else 'cdp')
+    return validation_injector
+
+
+def get_validation_injector() -> ValidationInjector:
+    return validation_injector
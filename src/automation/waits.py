@@ -0,0 +1,275 @@
+# src/automation/waits.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Condition-driven waits for the MIS form automation (mis_entry.py).
+#
+# Fixed sleeps (0.1–0.3s per Select2 option, 0.15s around every typed field,
+# 1–2s after opening a modal or filtering the table) made one deal entry
+# spend most of its wall time asleep. Each pause is now a wait on the thing
+# it was waiting for:
+#
+#   select2_open / select2_closed     dropdown state
+#   select2_option(text)              option rendered (returns the <li>)
+#   select2_choice(select_id, text)   multi-select tag added after a click
+#   modal_shown(field_id) / modal_hidden
+#   datatable_filtered(table_id, term) search applied + draw complete
+#   value_equals(el, text), is_checked(el), element_present(css)
+#
+# Predicates are JS snippets run through driver.execute_script, so the engine
+# needs nothing from Selenium and runs against any object with that method
+# (tests use a fake driver). Predicate errors (stale element, JS error while
+# the page re-renders) count as "not ready yet".
+#
+# Polling is adaptive: the first check is immediate, then the interval starts
+# at a quarter of that condition's recent typical duration (clamped to
+# MIS_WAIT_MIN/MAX_INTERVAL) and backs off ×1.5. Every wait is recorded as a
+# metrics span 'wait:<name>' (timeouts flagged as errors → /metrics, /health)
+# and in a bounded recent-waits log (GET /api/diagnostics/waits).
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+
+from src.utils.metrics import metrics
+
+DEFAULT_TIMEOUT      = 5.0
+DEFAULT_MIN_INTERVAL = 0.01
+DEFAULT_MAX_INTERVAL = 0.2
+BACKOFF              = 1.5
+RECENT_WAITS         = 200
+
+Predicate = Callable[[Any], Any]
+
+
+class WaitTimeout(TimeoutError):
+    """A condition did not become true within its timeout."""
+
+
+# ── Predicates ────────────────────────────────────────────────────────────────
+
+def js_condition(script: str, *args: Any) -> Predicate:
+    """Predicate that is ready when `script` (run with args) returns a truthy value."""
+    return lambda driver: driver.execute_script(script, *args)
+
+
+_VISIBLE = "function vis(e){ return !!(e && (e.offsetWidth || e.offsetHeight || e.getClientRects().length)); }"
+
+
+def select2_open() -> Predicate:
+    return js_condition(_VISIBLE + """
+        var d = document.querySelector('.select2-container--open .select2-dropdown, .select2-dropdown');
+        return !!document.querySelector('.select2-container--open') && vis(d);
+    """)
+
+
+def select2_closed() -> Predicate:
+    return js_condition("return !document.querySelector('.select2-container--open');")
+
+
+def select2_option(text: str, exact: bool = False, skip_selected: bool = False) -> Predicate:
+    """
+    Rendered, selectable option whose text matches; returns the <li> element.
+    skip_selected: ignore options already chosen (aria-selected="true") — in a
+    Select2 v4 multi-select, clicking one of those unselects it.
+    """
+    return js_condition("""
+        var want = arguments[0].trim(), exact = arguments[1], skipSelected = arguments[2];
+        if (document.querySelector('.select2-results__option.loading-results')) return null;
+        var opts = document.querySelectorAll('.select2-container--open .select2-results__option, .select2-results__option');
+        var partial = null;
+        for (var i = 0; i < opts.length; i++) {
+            var o = opts[i];
+            if (o.getAttribute('aria-disabled') === 'true' || o.classList.contains('select2-results__message')) continue;
+            if (skipSelected && o.getAttribute('aria-selected') === 'true') continue;
+            var t = o.textContent.replace(/\\s+/g, ' ').trim();
+            if (t === want) return o;
+            if (!exact && !partial && t.indexOf(want) !== -1) partial = o;
+        }
+        return partial;
+    """, str(text), bool(exact), bool(skip_selected))
+
+
+def select2_choice(select_id: str, text: str) -> Predicate:
+    """Multi-select tag for `text` present (the option click has landed)."""
+    return js_condition("""
+        var sel = document.getElementById(arguments[0]), want = arguments[1].trim();
+        if (sel && sel.selectedOptions) {
+            for (var i = 0; i < sel.selectedOptions.length; i++)
+                if (sel.selectedOptions[i].textContent.trim().indexOf(want) !== -1) return true;
+        }
+        var tags = document.querySelectorAll('.select2-selection__choice');
+        for (var j = 0; j < tags.length; j++)
+            if ((tags[j].getAttribute('title') || tags[j].textContent).indexOf(want) !== -1) return true;
+        return false;
+    """, str(select_id), str(text))
+
+
+def modal_shown(field_id: str = 'discount_rate') -> Predicate:
+    """A Bootstrap modal is fully shown (fade finished) and contains #field_id."""
+    return js_condition(_VISIBLE + """
+        var el = document.getElementById(arguments[0]);
+        if (!el || !vis(el)) return false;
+        var m = el.closest('.modal');
+        if (!m) return true;
+        return (m.classList.contains('show') || m.classList.contains('in'))
+               && getComputedStyle(m).opacity === '1';
+    """, str(field_id))
+
+
+def modal_hidden() -> Predicate:
+    return js_condition(_VISIBLE + """
+        var ms = document.querySelectorAll('.modal.show, .modal.in');
+        for (var i = 0; i < ms.length; i++) if (vis(ms[i])) return false;
+        return !document.querySelector('.modal-backdrop');
+    """)
+
+
+def datatable_filtered(table_id: str, term: str) -> Predicate:
+    """
+    DataTables search for `term` applied and drawn (processing indicator hidden).
+    With the DataTables API the applied search is authoritative (Responsive can
+    hide the matching cell); without it, a row showing the term or the empty row.
+    """
+    return js_condition(_VISIBLE + """
+        var t = document.getElementById(arguments[0]), term = arguments[1];
+        if (!t) return false;
+        if (vis(document.getElementById(arguments[0] + '_processing'))) return false;
+        if (window.jQuery && jQuery.fn.dataTable && jQuery.fn.dataTable.isDataTable(t))
+            return jQuery(t).DataTable().search() === term;
+        if (t.querySelector('tbody td.dataTables_empty')) return true;
+        var rows = t.querySelectorAll('tbody tr:not(.child)');
+        for (var i = 0; i < rows.length; i++)
+            if (rows[i].textContent.indexOf(term) !== -1) return true;
+        return false;
+    """, str(table_id), str(term))
+
+
+def value_equals(element: Any, text: str) -> Predicate:
+    return js_condition("return arguments[0].value === arguments[1];", element, str(text))
+
+
+def is_checked(element: Any, checked: bool = True) -> Predicate:
+    return js_condition("return !!arguments[0].checked === arguments[1];", element, bool(checked))
+
+
+def element_present(css: str) -> Predicate:
+    """First element matching css (returned), or null."""
+    return js_condition("return document.querySelector(arguments[0]);", str(css))
+
+
+# ── Engine ────────────────────────────────────────────────────────────────────
+
+class WaitEngine:
+    """Polls predicates with adaptive intervals and records every wait."""
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.timeout      = timeout
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self._sleep       = sleep
+        self._clock       = clock
+        self._lock        = threading.Lock()
+        self._typical: dict[str, float] = {}          # EMA of successful durations
+        self._recent: deque[dict[str, Any]] = deque(maxlen=RECENT_WAITS)
+
+    def until(self, driver: Any, predicate: Predicate, name: str,
+              timeout: float | None = None) -> Any:
+        """Poll until predicate(driver) is truthy; return its value or raise WaitTimeout."""
+        limit = self.timeout if timeout is None else timeout
+        start = self._clock()
+        interval = self._first_interval(name)
+        polls, last_error = 0, None
+        while True:
+            polls += 1
+            try:
+                value = predicate(driver)
+            except Exception as e:
+                value, last_error = None, e
+            elapsed = self._clock() - start
+            if value:
+                self._record(name, elapsed, polls, ok=True)
+                return value
+            if elapsed >= limit:
+                self._record(name, elapsed, polls, ok=False)
+                detail = f' (last error: {last_error})' if last_error else ''
+                raise WaitTimeout(f'{name}: not ready after {elapsed:.2f}s / {polls} polls{detail}')
+            self._sleep(min(interval, max(limit - elapsed, 0.0)))
+            interval = min(interval * BACKOFF, self.max_interval)
+
+    def maybe(self, driver: Any, predicate: Predicate, name: str,
+              timeout: float | None = None) -> Any:
+        """until(), but returns None instead of raising on timeout."""
+        try:
+            return self.until(driver, predicate, name, timeout)
+        except WaitTimeout:
+            return None
+
+    def _first_interval(self, name: str) -> float:
+        with self._lock:
+            typical = self._typical.get(name)
+        if typical is None:
+            return self.min_interval
+        return min(self.max_interval, max(self.min_interval, typical / 4))
+
+    def _record(self, name: str, seconds: float, polls: int, ok: bool) -> None:
+        metrics.record_span(f'wait:{name}', seconds, error=not ok)
+        with self._lock:
+            if ok:
+                prev = self._typical.get(name)
+                self._typical[name] = seconds if prev is None else 0.7 * prev + 0.3 * seconds
+            self._recent.append({'name': name, 'seconds': round(seconds, 4), 'polls': polls,
+                                 'ok': ok, 'at': time.time()})
+
+    def recent(self, limit: int = 50) -> list[dict[str, Any]]:
+        with self._lock:
+            return list(self._recent)[-limit:][::-1]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            per_name: dict[str, dict[str, Any]] = {}
+            for w in self._recent:
+                s = per_name.setdefault(w['name'], {'count': 0, 'timeouts': 0, 'total_s': 0.0, 'max_s': 0.0})
+                s['count']    += 1
+                s['timeouts'] += int(not w['ok'])
+                s['total_s']  += w['seconds']
+                s['max_s']     = max(s['max_s'], w['seconds'])
+            for s in per_name.values():
+                s['avg_s']   = round(s['total_s'] / s['count'], 4)
+                s['total_s'] = round(s['total_s'], 4)
+            return {'timeout': self.timeout, 'min_interval': self.min_interval,
+                    'max_interval': self.max_interval, 'waits': per_name,
+                    'typical_s': {n: round(v, 4) for n, v in self._typical.items()}}
+
+
+# Singleton — rebuilt by init_wait_engine() from the app factory
+wait_engine = WaitEngine()
+
+
+def init_wait_engine(config: Any) -> WaitEngine:
+    """
+    Config keys (settings.json or app.config):
+        MIS_WAIT_TIMEOUT       = 5.0    default per-wait timeout (s)
+        MIS_WAIT_MIN_INTERVAL  = 0.01   shortest poll interval (s)
+        MIS_WAIT_MAX_INTERVAL  = 0.2    longest poll interval (s)
+    """
+    global wait_engine
+    wait_engine = WaitEngine(
+        timeout=float(config.get('MIS_WAIT_TIMEOUT', DEFAULT_TIMEOUT)),
+        min_interval=float(config.get('MIS_WAIT_MIN_INTERVAL', DEFAULT_MIN_INTERVAL)),
+        max_interval=float(config.get('MIS_WAIT_MAX_INTERVAL', DEFAULT_MAX_INTERVAL)),
+    )
+    return wait_engine
+
+
+def get_wait_engine() -> WaitEngine:
+    return wait_engine
@@ -13,7 +13,7 @@
 from __future__ import annotations
 
 import re
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any, Dict, List, Literal, Tuple
 
 import pandas as pd
@@ -36,6 +36,8 @@ from src.utils.location_helpers import (
     resolve_location_columns,
 )
 from src.utils.sheet_helpers import get_col, parse_percentage, parse_mis_id_cell
+from src.utils.metrics import timed
+from src.core.row_cache import engine_context, frame_version, get_row_cache, row_keys
 
 
 AuditResultGroup = Dict[str, List[dict]]
@@ -86,6 +88,7 @@ def _norm_num(val: Any) -> float | None:
 
 # ── MAudit: Sheet → MIS ───────────────────────────────────────────────────────
 
+@timed()
 def run_maudit(
     google_df: pd.DataFrame,
     mis_df: pd.DataFrame,
@@ -122,12 +125,13 @@ def run_maudit(
     if not id_col:
         raise ValueError("Cannot find ID column in MIS CSV")
 
-    for idx, row in google_df.iterrows():
+    def audit_row(idx: Any, row: pd.Series) -> Tuple[str, dict] | None:
+        """(result bucket, entry) for one sheet row, or None when the row is skipped."""
         true_row = int(row.get('_SHEET_ROW_NUM', idx + 2))
 
         brand = str(get_col(row, ['[Brand]', 'Brand'], '', bmap, pmap)).strip()
         if not brand or brand in ('nan', 'None', '-', ''):
-            continue
+            return None
 
         mis_id_cell = str(row.get('MIS ID', '')).strip()
         discount_raw  = str(get_col(row, ['[Daily Deal Discount]', 'Deal Discount Value/Type',
@@ -152,8 +156,7 @@ def run_maudit(
 
         # ── Missing MIS ID ────────────────────────────────────────────────────
         if not mis_id_cell or mis_id_cell in ('nan', 'None', '-', ''):
-            results['missing_id'].append(base_entry)
-            continue
+            return 'missing_id', base_entry
 
         # ── Parse MIS ID cell → extract first usable numeric ID ──────────────
         parsed = parse_mis_id_cell(mis_id_cell, section_type)
@@ -170,15 +173,13 @@ def run_maudit(
                 first_mis_id = ids[0]
 
         if not first_mis_id:
-            results['missing_id'].append({**base_entry, 'note': 'Could not parse MIS ID'})
-            continue
+            return 'missing_id', {**base_entry, 'note': 'Could not parse MIS ID'}
 
         # ── Look up in MIS CSV ────────────────────────────────────────────────
         csv_matches = mis_df[mis_df[id_col].astype(str).str.strip() == str(first_mis_id).strip()]
 
         if csv_matches.empty:
-            results['not_found'].append({**base_entry, 'mis_id': first_mis_id})
-            continue
+            return 'not_found', {**base_entry, 'mis_id': first_mis_id}
 
         # ── Field comparison ──────────────────────────────────────────────────
         csv_row   = csv_matches.iloc[0]
@@ -217,16 +218,28 @@ def run_maudit(
             },
         }
 
-        if issues:
-            results['mismatches'].append(full_entry)
+        return ('mismatches' if issues else 'verified'), full_entry
+
+    # Per-row results are memoised on row content + MIS snapshot (src/core/row_cache.py)
+    cache = get_row_cache()
+    if cache.enabled:
+        ctx  = engine_context('run_maudit', section_type, google_df, bmap, pmap,
+                              frame_version(mis_df))
+        keys = row_keys(google_df)
+    for pos, (idx, row) in enumerate(google_df.iterrows()):
+        if cache.enabled:
+            out = cache.memo('run_maudit', ctx, keys[pos], lambda: audit_row(idx, row))
         else:
-            results['verified'].append(full_entry)
+            out = audit_row(idx, row)
+        if out is not None:
+            results[out[0]].append(out[1])
 
     return results
 
 
 # ── Conflict Audit: MIS → Sheet (Zombie detection) ────────────────────────────
 
+@timed()
 def run_conflict_audit_mis_vs_sheet(
     mis_df: pd.DataFrame,
     google_df: pd.DataFrame | None = None,  # reserved for future cross-reference
@@ -303,12 +316,14 @@ def run_conflict_audit_mis_vs_sheet(
 
 # ── Conflict Audit: Sheet → MIS (cross-section brand date conflicts) ──────────
 
+@timed()
 def run_conflict_audit_sheet_vs_mis(
-    sections_data: dict[str, pd.DataFrame],
-    target_month: int,
-    target_year: int,
+    sections_data: dict[str, pd.DataFrame] | list,
+    target_month: int | None = None,
+    target_year: int | None = None,
     bracket_map: dict | None = None,
     prefix_map: dict | None = None,
+    date_window: tuple[date, date] | None = None,
 ) -> dict[str, Any]:
     """
     Date-aware pre-flight check: Scans Google Sheet for cross-section brand conflicts.
@@ -319,7 +334,13 @@ def run_conflict_audit_sheet_vs_mis(
     Migrated from monolith api_gsheet_conflict_audit() (~line 31377).
 
     This is a pure-data function. Callers provide sections_data from
-    fetch_google_sheet_data(), which is already in SessionManager.
+    fetch_google_sheet_data(), which is already in SessionManager — or a list
+    of (tab, month, year, sections) from multi_tab.load_date_window(), in
+    which case target_month/target_year are ignored and entries carry 'tab'.
+    date_window=(start, end) drops dates outside the window, and rows left
+    with none. A deal repeated on two month tabs is counted once; each tab's
+    entry keeps its own tab / google_row and only the dates not already
+    listed for it on an earlier tab.
     """
     from src.utils.date_helpers import (
         expand_weekday_to_dates,
@@ -327,6 +348,8 @@ def run_conflict_audit_sheet_vs_mis(
         parse_sale_dates,
         get_monthly_day_of_month,
         get_all_weekdays_for_multiday_group,
+        month_slices,
+        clip_to_window,
     )
     from src.core.matcher import detect_multi_day_groups
 
@@ -339,88 +362,112 @@ def run_conflict_audit_sheet_vs_mis(
     section_counts = {'weekly': 0, 'monthly': 0, 'sale': 0}
     unique_brands:  set[str] = set()
 
-    for section_key in ('weekly', 'monthly', 'sale'):
-        section_df = sections_data.get(section_key, pd.DataFrame())
-        if section_df.empty:
-            continue
-
-        multi_day_groups, row_to_group = detect_multi_day_groups(section_df, section_key, bmap, pmap)
-        processed_groups: set[str] = set()
+    slices   = month_slices(sections_data, target_month, target_year)
+    seen_on: dict[tuple, tuple[str | None, set]] = {}    # deal signature → (first tab, dates placed)
 
-        for idx, row in section_df.iterrows():
-            brand = str(get_col(row, ['[Brand]', 'Brand'], '', bmap, pmap)).strip()
-            if not brand:
+    for tab, month, year, tab_sections in slices:
+        for section_key in ('weekly', 'monthly', 'sale'):
+            section_df = tab_sections.get(section_key, pd.DataFrame())
+            if section_df.empty:
                 continue
 
-            unique_brands.add(brand)
-            true_row  = int(row.get('_SHEET_ROW_NUM', idx + 2))
-            group_id  = row_to_group.get(true_row)
-
-            # Weekday/date raw
-            if section_key == 'weekly':
-                weekday_raw = str(get_col(row, ['[Weekday]', 'Weekday', 'Day of Week'], '-', bmap, pmap)).strip()
-            elif section_key == 'monthly':
-                weekday_raw = get_monthly_day_of_month(row) or '-'
-            else:
-                weekday_raw = str(get_col(row, ['[Weekday]', 'Sale Runs:', 'Contracted Duration',
-                                                 'Weekday/ Day of Month', 'Day of Week', 'Weekday'], '-', bmap, pmap)).strip()
-
-            discount    = str(get_col(row, ['[Daily Deal Discount]', 'Deal Discount Value/Type', 'Deal Discount'], '-', bmap, pmap)).strip()
-            vendor      = str(get_col(row, ['[Discount paid by vendor]', 'Brand Contribution % (Credit)', 'Vendor Contribution'], '-', bmap, pmap)).strip()
-            mis_id      = str(get_col(row, ['MIS ID', 'ID'], '', bmap, pmap)).strip()
-            special_notes = str(row.get('SPECIAL NOTES', '')).strip()
-            loc_raw, exc_raw = resolve_location_columns(row)
-            locations   = format_location_display(loc_raw, exc_raw)
-
-            # Expanded dates
-            expanded_dates: list = []
-            is_multi_day_parent = False
-
-            if section_key == 'weekly':
-                if group_id and group_id in multi_day_groups:
-                    if group_id in processed_groups:
+            multi_day_groups, row_to_group = detect_multi_day_groups(section_df, section_key, bmap, pmap)
+            processed_groups: set[str] = set()
+
+            for idx, row in section_df.iterrows():
+                brand = str(get_col(row, ['[Brand]', 'Brand'], '', bmap, pmap)).strip()
+                if not brand:
+                    continue
+
+                unique_brands.add(brand)
+                true_row  = int(row.get('_SHEET_ROW_NUM', idx + 2))
+                group_id  = row_to_group.get(true_row)
+
+                # Weekday/date raw
+                if section_key == 'weekly':
+                    weekday_raw = str(get_col(row, ['[Weekday]', 'Weekday', 'Day of Week'], '-', bmap, pmap)).strip()
+                elif section_key == 'monthly':
+                    weekday_raw = get_monthly_day_of_month(row) or '-'
+                else:
+                    weekday_raw = str(get_col(row, ['[Weekday]', 'Sale Runs:', 'Contracted Duration',
+                                                     'Weekday/ Day of Month', 'Day of Week', 'Weekday'], '-', bmap, pmap)).strip()
+
+                discount    = str(get_col(row, ['[Daily Deal Discount]', 'Deal Discount Value/Type', 'Deal Discount'], '-', bmap, pmap)).strip()
+                vendor      = str(get_col(row, ['[Discount paid by vendor]', 'Brand Contribution % (Credit)', 'Vendor Contribution'], '-', bmap, pmap)).strip()
+                mis_id      = str(get_col(row, ['MIS ID', 'ID'], '', bmap, pmap)).strip()
+                special_notes = str(row.get('SPECIAL NOTES', '')).strip()
+                loc_raw, exc_raw = resolve_location_columns(row)
+                locations   = format_location_display(loc_raw, exc_raw)
+
+                # Expanded dates
+                expanded_dates: list = []
+                is_multi_day_parent = False
+
+                if section_key == 'weekly':
+                    if group_id and group_id in multi_day_groups:
+                        if group_id in processed_groups:
+                            continue
+                        processed_groups.add(group_id)
+                        is_multi_day_parent = True
+                        expanded_dates = get_all_weekdays_for_multiday_group(
+                            multi_day_groups[group_id], section_df, section_key, month, year
+                        )
+                        weekday_raw = ', '.join(multi_day_groups[group_id].get('weekdays', []))
+                    else:
+                        expanded_dates = expand_weekday_to_dates(weekday_raw, month, year)
+                elif section_key == 'monthly':
+                    expanded_dates = parse_monthly_dates(weekday_raw, month, year)
+                else:  # sale
+                    expanded_dates = parse_sale_dates(weekday_raw, month, year)
+
+                if date_window:
+                    expanded_dates = clip_to_window(expanded_dates, date_window)
+                    if not expanded_dates:
+                        continue
+
+                # Same deal listed on two month tabs (a sale spanning the boundary, or a
+                # recurring row): counted once, but each tab keeps its own entry (so a
+                # conflict points at that tab's row) with only the dates not yet placed
+                brand_key = brand.lower().strip()
+                signature = (brand_key, section_key, weekday_raw, discount, locations)
+                first = seen_on.get(signature)
+                repeat = first is not None and first[0] != tab
+                if repeat:
+                    expanded_dates = [d for d in expanded_dates if d not in first[1]]
+                    if not expanded_dates:
                         continue
-                    processed_groups.add(group_id)
-                    is_multi_day_parent = True
-                    expanded_dates = get_all_weekdays_for_multiday_group(
-                        multi_day_groups[group_id], section_df, section_key, target_month, target_year
-                    )
-                    weekday_raw = ', '.join(multi_day_groups[group_id].get('weekdays', []))
                 else:
-                    expanded_dates = expand_weekday_to_dates(weekday_raw, target_month, target_year)
-            elif section_key == 'monthly':
-                expanded_dates = parse_monthly_dates(weekday_raw, target_month, target_year)
-            else:  # sale
-                expanded_dates = parse_sale_dates(weekday_raw, target_month, target_year)
-
-            section_counts[section_key] += 1
-
-            entry = {
-                'brand': brand,
-                'section': section_key,
-                'google_row': true_row,
-                'weekday': weekday_raw,
-                'discount': discount,
-                'vendor': vendor,
-                'mis_id': mis_id,
-                'locations': locations,
-                'special_notes': special_notes,
-                'expanded_dates': expanded_dates,
-                'is_multi_day': is_multi_day_parent,
-            }
-
-            # Brand general map (cross-section presence)
-            brand_key = brand.lower().strip()
-            if brand_key not in brand_general_map:
-                brand_general_map[brand_key] = []
-            brand_general_map[brand_key].append(entry)
-
-            # Brand + date map
-            for d in expanded_dates:
-                key = (brand_key, d)
-                if key not in brand_date_map:
-                    brand_date_map[key] = []
-                brand_date_map[key].append(entry)
+                    section_counts[section_key] += 1
+
+                entry = {
+                    'brand': brand,
+                    'section': section_key,
+                    'google_row': true_row,
+                    'weekday': weekday_raw,
+                    'discount': discount,
+                    'vendor': vendor,
+                    'mis_id': mis_id,
+                    'locations': locations,
+                    'special_notes': special_notes,
+                    'expanded_dates': expanded_dates,
+                    'is_multi_day': is_multi_day_parent,
+                }
+                if tab is not None:
+                    entry['tab'] = tab
+                seen_on.setdefault(signature, (tab, set()))[1].update(expanded_dates)
+
+                # Brand general map (cross-section presence) — one entry per deal
+                if not repeat:
+                    if brand_key not in brand_general_map:
+                        brand_general_map[brand_key] = []
+                    brand_general_map[brand_key].append(entry)
+
+                # Brand + date map
+                for d in expanded_dates:
+                    key = (brand_key, d)
+                    if key not in brand_date_map:
+                        brand_date_map[key] = []
+                    brand_date_map[key].append(entry)
 
     # ── Date Conflicts ────────────────────────────────────────────────────────
     date_conflicts: list[dict] = []
@@ -458,7 +505,7 @@ def run_conflict_audit_sheet_vs_mis(
 
     brand_conflicts.sort(key=lambda x: x['brand'])
 
-    return {
+    result = {
         'date_conflicts':  date_conflicts,
         'brand_conflicts': brand_conflicts,
         'section_counts':  section_counts,
@@ -466,3 +513,8 @@ def run_conflict_audit_sheet_vs_mis(
         'total_date_conflicts':  len(date_conflicts),
         'total_brand_conflicts': len(brand_conflicts),
     }
+    if slices and slices[0][0] is not None:
+        result['tabs'] = [s[0] for s in slices]
+    if date_window:
+        result['date_window'] = [d.isoformat() for d in date_window]
+    return result
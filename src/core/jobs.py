@@ -0,0 +1,359 @@
+# src/core/jobs.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Background job runner for long-running work (match, audits, CSV pulls,
+# inventory fetches) that used to block the Flask request thread.
+#
+#   submit(kind, func)  → job_id       (returns immediately)
+#   get(job_id)         → status dict  (queued / running / done / failed / cancelled)
+#   cancel(job_id)      → bool
+#
+# Workers are a bounded ThreadPoolExecutor (JOB_WORKERS). Pending work is
+# capped (JOB_MAX_PENDING) so a stuck browser cannot grow the queue forever.
+# Finished jobs are kept for JOB_TTL_SECONDS, then purged lazily.
+#
+# Job functions receive a JobHandle as their only argument. Progress and
+# cancellation are cooperative: call handle.progress(pct, msg), which raises
+# JobCancelled once the job has been cancelled. Code that does not know it is
+# inside a job can call report_progress() — a no-op outside a worker thread.
+#
+# Jobs sharing a `lock` name (e.g. 'browser') run one at a time, so two jobs
+# can never drive the same Selenium window concurrently. The lock is taken
+# before dispatch: a job whose lock is busy waits in a per-lock FIFO, not in
+# a worker thread, so queued browser jobs never starve unrelated work.
+# hold(lock) takes a named lock from running code, in the same FIFO — e.g. a
+# browser-pool job that falls back to the shared driver takes 'browser'.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import threading
+import time
+import traceback
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+# ── Status constants ──────────────────────────────────────────────────────────
+QUEUED    = 'queued'
+RUNNING   = 'running'
+DONE      = 'done'
+FAILED    = 'failed'
+CANCELLED = 'cancelled'
+
+FINISHED_STATES: frozenset[str] = frozenset({DONE, FAILED, CANCELLED})
+
+DEFAULT_WORKERS     = 4
+DEFAULT_MAX_PENDING = 32
+DEFAULT_TTL_SECONDS = 3600
+
+
+class JobCancelled(BaseException):
+    """
+    Raised inside a job when it has been cancelled.
+    BaseException (like KeyboardInterrupt) so route-level `except Exception`
+    blocks do not swallow it and turn a cancel into a 'failed' result.
+    """
+
+
+class JobQueueFull(RuntimeError):
+    """Raised by submit() when JOB_MAX_PENDING jobs are already waiting."""
+
+
+_current = threading.local()
+
+
+class JobHandle:
+    """Per-job state. Handed to the job function; read by the status route."""
+
+    def __init__(self, kind: str, lock: str | None = None, meta: dict | None = None) -> None:
+        self.id:          str            = uuid.uuid4().hex[:12]
+        self.kind:        str            = kind
+        self.lock:        str | None     = lock
+        self.meta:        dict           = dict(meta or {})
+        self.status:      str            = QUEUED
+        self.percent:     float          = 0.0
+        self.message:     str            = ''
+        self.result:      Any            = None
+        self.error:       str | None     = None
+        self.created_at:  float          = time.time()
+        self.started_at:  float | None   = None
+        self.finished_at: float | None   = None
+        self.future:      Future | None  = None
+        self._cancel      = threading.Event()
+
+    # ── Called from inside the job ───────────────────────────────────────────
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def check_cancelled(self) -> None:
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+
+    def progress(self, percent: float, message: str = '') -> None:
+        """Record progress (0–100). Raises JobCancelled if a cancel is pending."""
+        self.check_cancelled()
+        self.percent = max(0.0, min(100.0, float(percent)))
+        if message:
+            self.message = message
+
+    # ── Serialization ─────────────────────────────────────────────────────────
+
+    def to_dict(self, include_result: bool = False) -> dict:
+        end = self.finished_at or time.time()
+        out = {
+            'job_id':      self.id,
+            'kind':        self.kind,
+            'status':      self.status,
+            'percent':     round(self.percent, 1),
+            'message':     self.message,
+            'error':       self.error,
+            'meta':        self.meta,
+            'created_at':  self.created_at,
+            'started_at':  self.started_at,
+            'finished_at': self.finished_at,
+            'elapsed_sec': round(end - self.started_at, 3) if self.started_at else None,
+        }
+        if include_result:
+            out['result'] = self.result
+        return out
+
+
+class JobRunner:
+    """Bounded worker pool + in-memory job registry with TTL retention."""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.max_pending = max(1, int(max_pending))
+        self.ttl_seconds = float(ttl_seconds)
+        self._pool  = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job')
+        self._jobs: dict[str, JobHandle] = {}
+        self._lock  = threading.Lock()
+        self._busy_locks: set[str] = set()
+        # lock → FIFO of (job, start); start() dispatches a job or wakes a hold()
+        self._waiting: dict[str, deque[tuple[JobHandle | None, Callable[[], None]]]] = {}
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    def submit(
+        self,
+        kind: str,
+        func: Callable[[JobHandle], Any],
+        lock: str | None = None,
+        meta: dict | None = None,
+    ) -> str:
+        """Queue func(handle) on the worker pool. Returns the job_id."""
+        self.purge_expired()
+        job = JobHandle(kind, lock=lock, meta=meta)
+        with self._lock:
+            pending = sum(1 for j in self._jobs.values() if j.status in (QUEUED, RUNNING))
+            if pending >= self.max_pending:
+                raise JobQueueFull(f'{pending} jobs already pending (limit {self.max_pending})')
+            self._jobs[job.id] = job
+            waiting = bool(lock) and lock in self._busy_locks
+            if waiting:
+                job.message = f'Waiting for {lock}'
+                self._waiting.setdefault(lock, deque()).append((job, lambda: self._dispatch(job, func)))
+            elif lock:
+                self._busy_locks.add(lock)
+        if not waiting:
+            self._dispatch(job, func)
+        print(f"[JOBS] Queued {kind} job {job.id}")
+        return job.id
+
+    def get(self, job_id: str) -> JobHandle | None:
+        self.purge_expired()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self, kind: str | None = None) -> list[JobHandle]:
+        self.purge_expired()
+        with self._lock:
+            jobs = list(self._jobs.values())
+        if kind:
+            jobs = [j for j in jobs if j.kind == kind]
+        return sorted(jobs, key=lambda j: j.created_at, reverse=True)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job. Queued jobs never start; running jobs stop at their next
+        progress() checkpoint. Returns False if the job is unknown or finished.
+        """
+        job = self.get(job_id)
+        if job is None or job.status in FINISHED_STATES:
+            return False
+        job._cancel.set()
+        if job.lock and self._unqueue(job):
+            self._finish(job, CANCELLED, error='Cancelled before start')
+        elif job.future is not None and job.future.cancel():
+            self._finish(job, CANCELLED, error='Cancelled before start')
+            if job.lock:
+                self._release(job.lock)
+        print(f"[JOBS] Cancel requested for {job.kind} job {job.id}")
+        return True
+
+    @contextmanager
+    def hold(self, lock: str) -> Iterator[None]:
+        """
+        Hold a named lock around a block, waiting behind jobs already queued on
+        it. A no-op inside a job that already holds the lock. A job cancelled
+        while waiting raises JobCancelled.
+        """
+        job = current_job()
+        if job is not None and job.lock == lock:
+            yield
+            return
+        ready = threading.Event()
+        entry = (job, ready.set)
+        with self._lock:
+            if lock in self._busy_locks:
+                self._waiting.setdefault(lock, deque()).append(entry)
+            else:
+                self._busy_locks.add(lock)
+                ready.set()
+        while not ready.wait(0.2):
+            if job is not None and job.cancelled:
+                with self._lock:
+                    queue = self._waiting.get(lock)
+                    waiting = bool(queue) and entry in queue
+                    if waiting:
+                        queue.remove(entry)
+                if waiting:
+                    raise JobCancelled()
+        try:
+            yield
+        finally:
+            self._release(lock)
+
+    def purge_expired(self) -> int:
+        """Drop finished jobs older than the TTL. Returns number removed."""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [jid for jid, j in self._jobs.items()
+                       if j.status in FINISHED_STATES and (j.finished_at or 0) < cutoff]
+            for jid in expired:
+                del self._jobs[jid]
+        return len(expired)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts: dict[str, int] = {}
+            for j in self._jobs.values():
+                counts[j.status] = counts.get(j.status, 0) + 1
+        return {'workers': self.max_workers, 'max_pending': self.max_pending,
+                'ttl_seconds': self.ttl_seconds, 'counts': counts}
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Cancel everything still pending and stop the pool."""
+        for job in self.list_jobs():
+            if job.status not in FINISHED_STATES:
+                self.cancel(job.id)
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    # ── Worker side ───────────────────────────────────────────────────────────
+
+    def _dispatch(self, job: JobHandle, func: Callable[[JobHandle], Any]) -> None:
+        job.future = self._pool.submit(self._run, job, func)
+
+    def _unqueue(self, job: JobHandle) -> bool:
+        """Drop a job still waiting for its lock. True if it was waiting."""
+        with self._lock:
+            queue = self._waiting.get(job.lock or '')
+            for entry in list(queue or ()):
+                if entry[0] is job:
+                    queue.remove(entry)
+                    return True
+        return False
+
+    def _release(self, lock: str) -> None:
+        """Hand a released lock to the next waiter (queued job or hold()), or free it."""
+        with self._lock:
+            queue = self._waiting.get(lock)
+            nxt = queue.popleft() if queue else None
+            if nxt is None:
+                self._busy_locks.discard(lock)
+        if nxt is not None:
+            nxt[1]()
+
+    def _run(self, job: JobHandle, func: Callable[[JobHandle], Any]) -> None:
+        _current.job = job
+        try:
+            if job.cancelled:
+                self._finish(job, CANCELLED, error='Cancelled before start')
+                return
+            job.status     = RUNNING
+            job.started_at = time.time()
+            result = func(job)
+            job.result  = result
+            job.percent = 100.0
+            self._finish(job, DONE)
+        except JobCancelled:
+            self._finish(job, CANCELLED, error='Cancelled')
+        except Exception as e:
+            traceback.print_exc()
+            self._finish(job, FAILED, error=str(e))
+        finally:
+            _current.job = None
+            if job.lock:
+                self._release(job.lock)
+
+    def _finish(self, job: JobHandle, status: str, error: str | None = None) -> None:
+        job.status      = status
+        job.error       = error
+        job.finished_at = time.time()
+        took = f"{job.finished_at - job.started_at:.1f}s" if job.started_at else '-'
+        print(f"[JOBS] {job.kind} job {job.id} → {status} ({took})")
+
+
+# ── Module-level helpers ──────────────────────────────────────────────────────
+
+def current_job() -> JobHandle | None:
+    """Return the JobHandle for the calling worker thread, or None."""
+    return getattr(_current, 'job', None)
+
+
+def report_progress(percent: float, message: str = '') -> None:
+    """Progress hook safe to call from any code path (no-op outside a job)."""
+    job = current_job()
+    if job is not None:
+        job.progress(percent, message)
+
+
+# Singleton — populated by init_job_runner() called from app factory
+job_runner: JobRunner | None = None
+
+
+def init_job_runner(config: Any) -> JobRunner:
+    """
+    Build (or rebuild) the singleton from app config.
+
+    Config keys (settings.json or app.config):
+        JOB_WORKERS      = 4     worker threads
+        JOB_MAX_PENDING  = 32    queued + running cap
+        JOB_TTL_SECONDS  = 3600  how long finished results are kept
+    """
+    global job_runner
+    if job_runner is not None:
+        job_runner.shutdown(wait=False)
+    job_runner = JobRunner(
+        max_workers=int(config.get('JOB_WORKERS', DEFAULT_WORKERS)),
+        max_pending=int(config.get('JOB_MAX_PENDING', DEFAULT_MAX_PENDING)),
+        ttl_seconds=float(config.get('JOB_TTL_SECONDS', DEFAULT_TTL_SECONDS)),
+    )
+    return job_runner
+
+
+def get_job_runner() -> JobRunner:
+    """Return the singleton, creating a default-configured one if needed."""
+    global job_runner
+    if job_runner is None:
+        job_runner = JobRunner()
+    return job_runner
@@ -34,6 +34,8 @@ except ImportError:
             partial_ratio = token_set_ratio
 
 from src.utils.date_helpers import get_monthly_day_of_month, parse_end_date
+from src.utils.metrics import timed
+from src.core.row_cache import context_key, engine_context, frame_version, get_row_cache, row_keys
 from src.utils.location_helpers import (
     resolve_location_columns,
     format_location_display,
@@ -42,7 +44,6 @@ from src.utils.location_helpers import (
 from src.utils.brand_helpers import (
     parse_multi_brand,
     match_mis_ids_to_brands,
-    load_brand_settings,
 )
 from src.utils.sheet_helpers import (
     get_col,
@@ -78,13 +79,11 @@ def detect_multi_day_groups(
     def gc(row: pd.Series, names: List[str], default: Any = '') -> Any:
         return get_col(row, names, default, bmap, pmap)
 
-    groups: Dict[str, Dict] = {}
-    row_to_group: Dict[int, str] = {}
-
-    for _, g_row in google_df.iterrows():
+    def row_info(g_row: pd.Series) -> Tuple[str, int, str, str, bool] | None:
+        """(group_id, true_row, weekday, brand, has_missing) for one row; None if no brand."""
         brand_raw = str(gc(g_row, ['[Brand]', 'Brand'], '')).strip()
         if not brand_raw:
-            continue
+            return None
 
         if section_type == 'weekly':
             weekday_raw = str(gc(g_row, ['[Weekday]', 'Weekday', 'Day of Week'], '')).strip().title()
@@ -114,6 +113,25 @@ def detect_multi_day_groups(
         group_id  = hashlib.md5(group_key.encode()).hexdigest()[:12]
 
         has_missing = not weekday_raw or weekday_raw.lower() in ('', 'nan', 'none')
+        return group_id, true_row, weekday_raw, brand_raw, has_missing
+
+    groups: Dict[str, Dict] = {}
+    row_to_group: Dict[int, str] = {}
+
+    # Per-row group keys are memoised on row content (src/core/row_cache.py)
+    cache = get_row_cache()
+    if cache.enabled:
+        ctx  = engine_context('detect_multi_day_groups', section_type, google_df, bmap, pmap)
+        keys = row_keys(google_df)
+
+    for pos, (_, g_row) in enumerate(google_df.iterrows()):
+        if cache.enabled:
+            info = cache.memo('detect_multi_day_groups', ctx, keys[pos], lambda: row_info(g_row))
+        else:
+            info = row_info(g_row)
+        if info is None:
+            continue
+        group_id, true_row, weekday_raw, brand_raw, has_missing = info
 
         if group_id not in groups:
             groups[group_id] = {'rows': [], 'weekdays': [], 'brand': brand_raw, 'has_missing_weekday': has_missing}
@@ -147,6 +165,7 @@ def should_skip_end420_row(row_dict: Dict) -> bool:
 # Core Matcher
 # ---------------------------------------------------------------------------
 
+@timed()
 def enhanced_match_mis_ids(
     google_df: pd.DataFrame,
     mis_df: pd.DataFrame,
@@ -224,15 +243,15 @@ def enhanced_match_mis_ids(
         if m: return 2000+int(m.group(2)), int(m.group(1))
         return -1, -1
 
-    matches: List[Dict] = []
-
-    for g_idx, g_row in google_df.iterrows():
+    def match_row(g_idx: Any, g_row: pd.Series) -> List[Dict]:
+        """Match entries for one sheet row (one per brand of a multi-brand row)."""
+        row_matches: List[Dict] = []
         if should_skip_end420_row(g_row.to_dict()):
-            continue
+            return row_matches
 
         brand_raw = str(gc(g_row, ['[Brand]', 'Brand'], '')).strip()
         if not brand_raw:
-            continue
+            return row_matches
 
         if section_type == 'weekly':
             weekday_raw = str(gc(g_row, ['[Weekday]', 'Weekday', 'Day of Week'], '')).strip()
@@ -432,7 +451,7 @@ def enhanced_match_mis_ids(
                     pfx = str(key)[:m.start()].strip()
                     if pfx and pfx not in raw_row: raw_row[pfx] = val
 
-            matches.append({
+            row_matches.append({
                 'google_row': true_row, 'brand': cur_brand, 'brand_raw': brand_raw,
                 'linked_brand': linked_from_settings, 'is_multi_brand': is_multi,
                 'multi_brand_index': b_idx if is_multi else None,
@@ -458,6 +477,25 @@ def enhanced_match_mis_ids(
                 'date_raw':    str(gc(g_row, ['Contracted Duration (MM/DD/YY - MM/DD/YY)',
                                               'Contracted Duration', 'Sale Runs:'], '')).strip(),
             })
+        return row_matches
+
+    # Per-row results are memoised on row content, the row's multi-day group
+    # and the MIS snapshot (src/core/row_cache.py)
+    cache = get_row_cache()
+    if cache.enabled:
+        ctx  = engine_context('enhanced_match_mis_ids', section_type, google_df, bmap, pmap,
+                              frame_version(mis_df), brand_settings, tab_name)
+        keys = row_keys(google_df)
+
+    matches: List[Dict] = []
+    for pos, (g_idx, g_row) in enumerate(google_df.iterrows()):
+        if not cache.enabled:
+            matches.extend(match_row(g_idx, g_row))
+            continue
+        true_row = int(gc(g_row, ['_SHEET_ROW_NUM'], g_idx + 2))
+        group    = multi_day_groups.get(row_to_group.get(true_row, ''))
+        key      = (keys[pos], context_key(group) if group else '')
+        matches.extend(cache.memo('enhanced_match_mis_ids', ctx, key, lambda: match_row(g_idx, g_row)))
 
     return matches
 
@@ -466,6 +504,7 @@ def enhanced_match_mis_ids(
 # CSV Generation
 # ---------------------------------------------------------------------------
 
+@timed()
 def generate_mis_csv_with_multiday(
     google_df: pd.DataFrame,
     section_type: str = 'weekly',
@@ -483,7 +522,9 @@ def generate_mis_csv_with_multiday(
     brand_settings: Dict = {}
     if spreadsheet_id:
         try:
-            brand_settings = load_brand_settings(spreadsheet_id)
+            # Settings cache (src/integrations/settings_cache.py) — no sheet read per call
+            from src.integrations.settings_cache import get_settings_cache
+            brand_settings = get_settings_cache().brand_settings(spreadsheet_id)
         except Exception:
             pass
 
@@ -498,18 +539,12 @@ def generate_mis_csv_with_multiday(
             if k in d: return v
         return 999
 
-    csv_rows: List[Dict] = []
-    processed_groups: set = set()
-    retail_alerts: List[Dict] = []
-    multiday_details: List[Dict] = []
-
-    for g_idx, g_row in google_df.iterrows():
-        if should_skip_end420_row(g_row.to_dict()):
-            continue
-
-        brand_raw = str(gc(g_row, ['[Brand]', 'Brand'], '')).strip()
-        if not brand_raw:
-            continue
+    def build_unit(g_idx: Any, g_row: pd.Series, brand_raw: str, true_row: int,
+                   in_group: bool) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+        """(csv rows, retail alerts, multi-day details) for one row or one multi-day group."""
+        unit_rows: List[Dict] = []
+        unit_alerts: List[Dict] = []
+        unit_details: List[Dict] = []
 
         if section_type == 'weekly':
             weekday_input = str(gc(g_row, ['[Weekday]', 'Weekday', 'Day of Week'], '')).strip().title()
@@ -519,16 +554,11 @@ def generate_mis_csv_with_multiday(
             weekday_input = str(gc(g_row, ['[Weekday]', 'Sale Runs:', 'Contracted Duration',
                                             'Weekday/ Day of Month', 'Day of Week', 'Weekday'], '')).strip().title()
 
-        true_row  = int(g_row['_SHEET_ROW_NUM']) if '_SHEET_ROW_NUM' in g_row.index else g_idx + 2
-        in_group  = (true_row in row_to_group and row_to_group[true_row] in multi_day_groups)
         sn_pkg: List[Dict] = []
         di_pkg: List[Dict] = []
 
         if in_group:
-            gid = row_to_group[true_row]
-            if gid in processed_groups: continue
-            processed_groups.add(gid)
-
+            gid      = row_to_group[true_row]
             gd       = multi_day_groups[gid]
             ref_rows = google_df[google_df['_SHEET_ROW_NUM'] == gd['rows'][0]]
             ref_row  = ref_rows.iloc[0] if not ref_rows.empty else g_row
@@ -542,7 +572,7 @@ def generate_mis_csv_with_multiday(
             data_source       = ref_row
 
             row_day_combo = [f'(Row {r}) ({gd["weekdays"][i] if i < len(gd["weekdays"]) else "?"})' for i, r in enumerate(gd['rows'])]
-            multiday_details.append({
+            unit_details.append({
                 'brand': str(gc(ref_row, ['[Brand]', 'Brand'], '')).strip(),
                 'title_meta': f'({len(unique_wds)} Days)',
                 'body_data': ', '.join(row_day_combo),
@@ -595,7 +625,7 @@ def generate_mis_csv_with_multiday(
         if is_retail:
             notes_csv  = '[ACTION: CHECK RETAIL TOGGLE] '
             ui_rebate  = 'Retail'
-            retail_alerts.append({'brand': brand_raw, 'title_meta': '', 'body_data': f'Row {google_rows_track} ({weekday_val})'})
+            unit_alerts.append({'brand': brand_raw, 'title_meta': '', 'body_data': f'Row {google_rows_track} ({weekday_val})'})
         elif is_wholesale:
             rebate_csv, ui_rebate = 'Wholesale', 'Wholesale'
 
@@ -616,7 +646,7 @@ def generate_mis_csv_with_multiday(
 
             cat_csv = '' if 'All Categories' in categories else categories
 
-            csv_rows.append({
+            unit_rows.append({
                 'ID': '', 'Weekday': weekday_val, 'Store': store_str,
                 'Brand': cur_brand, 'Linked Brand (if applicable)': linked_val,
                 'Category': cat_csv, 'Daily Deal Discount': f'{discount:.2f}',
@@ -631,6 +661,49 @@ def generate_mis_csv_with_multiday(
                 'DISPLAY_CATEGORY': categories, 'DISPLAY_STORE': display_store,
                 'UI_SPECIAL_NOTES': sn_pkg, 'UI_DEAL_INFO': di_pkg, 'UI_REBATE_DISPLAY': ui_rebate,
             })
+        return unit_rows, unit_alerts, unit_details
+
+    # Each unit (single row, or a whole multi-day group) is memoised on the
+    # content of every row it reads (src/core/row_cache.py)
+    cache = get_row_cache()
+    if cache.enabled:
+        ctx  = engine_context('generate_mis_csv_with_multiday', section_type, google_df, bmap, pmap,
+                              brand_settings)
+        keys = row_keys(google_df)
+        key_by_row: Dict[Any, str] = {}
+        if '_SHEET_ROW_NUM' in google_df.columns:
+            for r_num, k in zip(google_df['_SHEET_ROW_NUM'], keys):
+                key_by_row.setdefault(r_num, k)
+
+    csv_rows: List[Dict] = []
+    processed_groups: set = set()
+    retail_alerts: List[Dict] = []
+    multiday_details: List[Dict] = []
+
+    for pos, (g_idx, g_row) in enumerate(google_df.iterrows()):
+        if should_skip_end420_row(g_row.to_dict()):
+            continue
+
+        brand_raw = str(gc(g_row, ['[Brand]', 'Brand'], '')).strip()
+        if not brand_raw:
+            continue
+
+        true_row  = int(g_row['_SHEET_ROW_NUM']) if '_SHEET_ROW_NUM' in g_row.index else g_idx + 2
+        in_group  = (true_row in row_to_group and row_to_group[true_row] in multi_day_groups)
+        if in_group:
+            gid = row_to_group[true_row]
+            if gid in processed_groups: continue
+            processed_groups.add(gid)
+
+        if cache.enabled:
+            members = tuple(key_by_row.get(r, '') for r in multi_day_groups[gid]['rows']) if in_group else ()
+            unit = cache.memo('generate_mis_csv_with_multiday', ctx, (keys[pos], members),
+                              lambda: build_unit(g_idx, g_row, brand_raw, true_row, in_group))
+        else:
+            unit = build_unit(g_idx, g_row, brand_raw, true_row, in_group)
+        csv_rows.extend(unit[0])
+        retail_alerts.extend(unit[1])
+        multiday_details.extend(unit[2])
 
     csv_rows_sorted = sorted(csv_rows, key=lambda x: x['WEEKDAY_SORT_KEY'])
     summary = {
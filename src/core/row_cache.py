@@ -0,0 +1,163 @@
+# src/core/row_cache.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Per-row result cache for the sheet engines: generate_mis_csv_with_multiday,
+# enhanced_match_mis_ids, run_maudit (and the multi-day group scan they share).
+#
+# Editing one row and re-running Generate CSV / MAudit / Match used to redo
+# every row. Each engine now memoises its output per unit of work:
+#
+#   row key      blake2b of the index label + _SHEET_ROW_NUM + every cell
+#                (a multi-day group unit: all member row keys, group order)
+#   context key  what else the engine reads — section, column layout,
+#                bracket/prefix maps, MIS snapshot version, brand settings,
+#                tab name
+#
+# so only changed rows and the siblings of a changed multi-day group are
+# recomputed. Row keys are taken from the frame at call time (one join per
+# row), so an edited or mutated frame can never be served a stale result.
+#
+# MIS snapshot version = content hash of the MIS CSV frame: re-pulling an
+# unchanged CSV keeps every cached row; any MIS change recomputes them.
+#
+# Entries are returned as deep copies; the store is a bounded LRU.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+import pandas as pd
+
+MISS = object()
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=12).hexdigest()
+
+
+def row_keys(df: pd.DataFrame) -> list[str]:
+    """One content hash per row (index label + every cell, _SHEET_ROW_NUM included)."""
+    return [_digest('\x1f'.join(map(str, (label, *cells))))
+            for label, cells in zip(df.index, df.itertuples(index=False, name=None))]
+
+
+def frame_version(df: pd.DataFrame | None) -> str:
+    """Content hash of a whole frame (MIS snapshot version). Column order matters."""
+    if df is None:
+        return ''
+    h = hashlib.blake2b(digest_size=12)
+    h.update('\x1f'.join(map(str, df.columns)).encode('utf-8', 'surrogatepass'))
+    try:
+        h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    except TypeError:                        # unhashable cells (lists, dicts)
+        h.update(df.to_json(orient='values', default_handler=str).encode('utf-8'))
+    return h.hexdigest()
+
+
+def context_key(*parts: Any) -> str:
+    """Stable hash of the non-row inputs an engine reads."""
+    return _digest(json.dumps(parts, sort_keys=True, default=str))
+
+
+def engine_context(engine: str, section: str, df: pd.DataFrame, bracket_map: dict,
+                   prefix_map: dict, *extra: Any) -> str:
+    """
+    Context key shared by the engines: column layout, alias maps and the
+    session's [Store] alias (resolve_location_columns reads it from session).
+    """
+    try:
+        from src.session import session
+        store_alias = (session.get_mis_bracket_map() or {}).get('[Store]', '')
+    except Exception:
+        store_alias = ''
+    return context_key(engine, section, list(map(str, df.columns)), bracket_map, prefix_map,
+                       store_alias, *extra)
+
+
+class RowResultCache:
+    """Bounded LRU of (engine, context, row key) → result."""
+
+    def __init__(self, enabled: bool = True, max_entries: int = 50_000) -> None:
+        self.enabled     = enabled
+        self.max_entries = max(1, int(max_entries))
+        self._lock       = threading.Lock()
+        self._store: OrderedDict[tuple[str, str, Hashable], Any] = OrderedDict()
+        self._counts: dict[str, dict[str, int]] = {}
+
+    def get(self, engine: str, context: str, key: Hashable) -> Any:
+        """Deep copy of the cached result, or MISS."""
+        with self._lock:
+            value = self._store.get((engine, context, key), MISS)
+            if value is not MISS:
+                self._store.move_to_end((engine, context, key))
+            self._bump(engine, 'hits' if value is not MISS else 'misses')
+        return value if value is MISS else copy.deepcopy(value)
+
+    def put(self, engine: str, context: str, key: Hashable, value: Any) -> None:
+        stored = copy.deepcopy(value)
+        with self._lock:
+            self._store[(engine, context, key)] = stored
+            self._store.move_to_end((engine, context, key))
+            while len(self._store) > self.max_entries:
+                self._store.popitem(last=False)
+
+    def memo(self, engine: str, context: str, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Cached result for key, computing (and storing) it on a miss."""
+        if not self.enabled:
+            return compute()
+        value = self.get(engine, context, key)
+        if value is MISS:
+            value = compute()
+            self.put(engine, context, key, value)
+        return value
+
+    def clear(self, engine: str | None = None) -> int:
+        with self._lock:
+            if engine is None:
+                n = len(self._store)
+                self._store.clear()
+                return n
+            gone = [k for k in self._store if k[0] == engine]
+            for k in gone:
+                del self._store[k]
+            return len(gone)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            per_engine: dict[str, int] = {}
+            for engine, _, _ in self._store:
+                per_engine[engine] = per_engine.get(engine, 0) + 1
+            return {'enabled': self.enabled, 'entries': len(self._store),
+                    'max_entries': self.max_entries, 'per_engine': per_engine,
+                    'counts': {e: dict(c) for e, c in self._counts.items()}}
+
+    def _bump(self, engine: str, key: str) -> None:
+        c = self._counts.setdefault(engine, {'hits': 0, 'misses': 0})
+        c[key] += 1
+
+
+# Singleton — rebuilt by init_row_cache() from the app factory
+row_cache = RowResultCache()
+
+
+def init_row_cache(config: Any) -> RowResultCache:
+    """
+    Config keys (settings.json or app.config):
+        ROW_CACHE_ENABLED      = true
+        ROW_CACHE_MAX_ENTRIES  = 50000   LRU bound across all engines
+    """
+    global row_cache
+    row_cache = RowResultCache(
+        enabled=bool(config.get('ROW_CACHE_ENABLED', True)),
+        max_entries=int(config.get('ROW_CACHE_MAX_ENTRIES', 50_000)),
+    )
+    return row_cache
+
+
+def get_row_cache() -> RowResultCache:
+    return row_cache
@@ -7,6 +7,7 @@
 #
 # Entry points:
 #   build_split_plan(sections_data, target_month, target_year)   → plan dict
+#     (sections_data may be a list of month tabs + date_window — multi_tab.py)
 #   verify_gap_closure(plan, mis_df)                              → gap dict
 #   build_final_entry_payload(plan_row)                           → payload dict
 #   verify_final_entry(plan_row, mis_df)                          → verify dict
@@ -38,6 +39,8 @@ from src.utils.date_helpers import (
     parse_sale_dates,
     get_monthly_day_of_month,
     get_all_weekdays_for_multiday_group,
+    month_slices,
+    clip_to_window,
 )
 from src.utils.location_helpers import (
     format_location_display,
@@ -47,6 +50,7 @@ from src.utils.location_helpers import (
 )
 from src.utils.sheet_helpers import get_col, parse_mis_id_cell
 from src.core.matcher import detect_multi_day_groups
+from src.utils.metrics import timed
 
 
 # ── Private helpers ───────────────────────────────────────────────────────────
@@ -170,6 +174,7 @@ def detect_split_requirements(
     for weekly in weekly_deals:
         brand_lower   = weekly.get('brand', '').lower()
         weekly_dates  = weekly.get('expanded_dates', [])
+        tab_key       = {'tab': weekly['tab']} if 'tab' in weekly else {}   # multi-month plans
         conflict_dates: list[date] = []
         interrupting:   list[dict] = []
 
@@ -192,6 +197,7 @@ def detect_split_requirements(
                 'deal_info':     weekly.get('deal_info', ''),
                 'special_notes': weekly.get('special_notes', ''),
                 'categories':    weekly.get('categories', ''),
+                **tab_key,
             })
             continue
 
@@ -211,6 +217,7 @@ def detect_split_requirements(
                 'locations':     weekly.get('locations'),
                 'google_row':    weekly.get('google_row'),
                 'mis_id':        weekly.get('mis_id'),
+                **tab_key,
             })
             continue
 
@@ -246,7 +253,9 @@ def detect_split_requirements(
                 'google_row':    interrupting[0].get('google_row') if interrupting else None,
                 'mis_id':        interrupting[0].get('mis_id') if interrupting else '',
                 'deal_info':     interrupting[0].get('deal_info') if interrupting else '',
+                **({'tab': interrupting[0]['tab']} if interrupting and 'tab' in interrupting[0] else {}),
             },
+            **tab_key,
         })
 
     return splits_required, no_conflict
@@ -254,17 +263,24 @@ def detect_split_requirements(
 
 # ── Phase 1: Planning ─────────────────────────────────────────────────────────
 
+@timed()
 def build_split_plan(
-    sections_data: dict[str, pd.DataFrame],
-    target_month: int,
-    target_year:  int,
+    sections_data: dict[str, pd.DataFrame] | list,
+    target_month: int | None = None,
+    target_year:  int | None = None,
     bracket_map: dict | None = None,
     prefix_map:  dict | None = None,
+    date_window: tuple[date, date] | None = None,
 ) -> dict[str, Any]:
     """
     Phase 1: Analyze Google Sheet sections and produce a 4-step slicing plan.
     Migrated from monolith api_split_audit_planning() (~line 31850).
 
+    sections_data is one tab's sections, or a list of (tab, month, year,
+    sections) from multi_tab.load_date_window() — then every deal carries
+    'tab' and a sale on one tab can split a weekly deal on the next.
+    date_window=(start, end) keeps only dates inside the window.
+
     Returns:
         {
             'weekly_deals': [...],
@@ -283,95 +299,124 @@ def build_split_plan(
     weekly_deals: list[dict] = []
     tier1_deals:  list[dict] = []
 
-    # ── Weekly (Tier 2) ───────────────────────────────────────────────────────
-    weekly_df = sections_data.get('weekly', pd.DataFrame())
-    if not weekly_df.empty:
-        multi_day_groups, row_to_group = detect_multi_day_groups(weekly_df, 'weekly', bmap, pmap)
-        processed_groups: set[str] = set()
+    slices  = month_slices(sections_data, target_month, target_year)
+    seen_on: dict[tuple, tuple[str | None, set]] = {}    # Tier 1 signature → (first tab, dates placed)
 
-        for idx, row in weekly_df.iterrows():
-            brand = str(gc(row, ['[Brand]', 'Brand'], '')).strip()
-            if not brand:
-                continue
+    for tab, month, year, tab_sections in slices:
+        tab_key = {'tab': tab} if tab is not None else {}
 
-            true_row   = int(row.get('_SHEET_ROW_NUM', idx + 2))
-            group_id   = row_to_group.get(true_row)
-            weekday_raw = str(gc(row, ['[Weekday]', 'Weekday', 'Day of Week'], '-')).strip()
+        # ── Weekly (Tier 2) ───────────────────────────────────────────────────
+        weekly_df = tab_sections.get('weekly', pd.DataFrame())
+        if not weekly_df.empty:
+            multi_day_groups, row_to_group = detect_multi_day_groups(weekly_df, 'weekly', bmap, pmap)
+            processed_groups: set[str] = set()
 
-            if group_id and group_id in multi_day_groups:
-                if group_id in processed_groups:
+            for idx, row in weekly_df.iterrows():
+                brand = str(gc(row, ['[Brand]', 'Brand'], '')).strip()
+                if not brand:
                     continue
-                processed_groups.add(group_id)
-                expanded_dates = get_all_weekdays_for_multiday_group(
-                    multi_day_groups[group_id], weekly_df, 'weekly', target_month, target_year
-                )
-                weekday_raw = ', '.join(multi_day_groups[group_id].get('weekdays', []))
-            else:
-                expanded_dates = expand_weekday_to_dates(weekday_raw, target_month, target_year)
-
-            loc_raw, exc_raw = resolve_location_columns(row)
-            locations = format_location_display(loc_raw, exc_raw)
-
-            wholesale_val     = gc(row, ['Wholesale', 'Wholesale?'], '')
-            retail_val        = gc(row, ['Retail', 'Retail?'], '')
-            after_wholesale_v = gc(row, ['Rebate After Wholesale Discount?', 'After Wholesale', 'After Wholesale?'], '')
-            truthy = ('TRUE', 'YES', '1', 'X', '✔', 'CHECKED')
-
-            weekly_deals.append({
-                'brand':         brand,
-                'weekday':       weekday_raw,
-                'discount':      str(gc(row, ['[Daily Deal Discount]', 'Deal Discount Value/Type', 'Deal Discount'], '-')).strip(),
-                'vendor_contrib': str(gc(row, ['[Discount paid by vendor]', 'Brand Contribution % (Credit)', 'Vendor Contribution'], '-')).strip(),
-                'locations':     locations,
-                'mis_id':        str(gc(row, ['MIS ID', 'ID'], '')).strip(),
-                'expanded_dates': expanded_dates,
-                'section':       'weekly',
-                'google_row':    true_row,
-                'deal_info':     str(gc(row, ['Deal info', 'Deal Info', 'Deal'], '')).strip(),
-                'special_notes': str(gc(row, ['Special Notes', 'Notes'], '')).strip(),
-                'categories':    str(gc(row, ['[Category]', 'Categories'], '')).strip(),
-                'retail':        'TRUE' if str(retail_val).upper() in truthy else 'FALSE',
-                'wholesale':     'TRUE' if str(wholesale_val).upper() in truthy else 'FALSE',
-                'after_wholesale': 'TRUE' if str(after_wholesale_v).upper() in truthy else 'FALSE',
-            })
-
-    # ── Tier 1: Monthly + Sale ────────────────────────────────────────────────
-    for section_key in ('monthly', 'sale'):
-        section_df = sections_data.get(section_key, pd.DataFrame())
-        if section_df.empty:
-            continue
 
-        for idx, row in section_df.iterrows():
-            brand = str(gc(row, ['[Brand]', 'Brand'], '')).strip()
-            if not brand:
+                true_row   = int(row.get('_SHEET_ROW_NUM', idx + 2))
+                group_id   = row_to_group.get(true_row)
+                weekday_raw = str(gc(row, ['[Weekday]', 'Weekday', 'Day of Week'], '-')).strip()
+
+                if group_id and group_id in multi_day_groups:
+                    if group_id in processed_groups:
+                        continue
+                    processed_groups.add(group_id)
+                    expanded_dates = get_all_weekdays_for_multiday_group(
+                        multi_day_groups[group_id], weekly_df, 'weekly', month, year
+                    )
+                    weekday_raw = ', '.join(multi_day_groups[group_id].get('weekdays', []))
+                else:
+                    expanded_dates = expand_weekday_to_dates(weekday_raw, month, year)
+
+                if date_window:
+                    expanded_dates = clip_to_window(expanded_dates, date_window)
+                    if not expanded_dates:
+                        continue
+
+                loc_raw, exc_raw = resolve_location_columns(row)
+                locations = format_location_display(loc_raw, exc_raw)
+
+                wholesale_val     = gc(row, ['Wholesale', 'Wholesale?'], '')
+                retail_val        = gc(row, ['Retail', 'Retail?'], '')
+                after_wholesale_v = gc(row, ['Rebate After Wholesale Discount?', 'After Wholesale', 'After Wholesale?'], '')
+                truthy = ('TRUE', 'YES', '1', 'X', '✔', 'CHECKED')
+
+                weekly_deals.append({
+                    'brand':         brand,
+                    'weekday':       weekday_raw,
+                    'discount':      str(gc(row, ['[Daily Deal Discount]', 'Deal Discount Value/Type', 'Deal Discount'], '-')).strip(),
+                    'vendor_contrib': str(gc(row, ['[Discount paid by vendor]', 'Brand Contribution % (Credit)', 'Vendor Contribution'], '-')).strip(),
+                    'locations':     locations,
+                    'mis_id':        str(gc(row, ['MIS ID', 'ID'], '')).strip(),
+                    'expanded_dates': expanded_dates,
+                    'section':       'weekly',
+                    'google_row':    true_row,
+                    'deal_info':     str(gc(row, ['Deal info', 'Deal Info', 'Deal'], '')).strip(),
+                    'special_notes': str(gc(row, ['Special Notes', 'Notes'], '')).strip(),
+                    'categories':    str(gc(row, ['[Category]', 'Categories'], '')).strip(),
+                    'retail':        'TRUE' if str(retail_val).upper() in truthy else 'FALSE',
+                    'wholesale':     'TRUE' if str(wholesale_val).upper() in truthy else 'FALSE',
+                    'after_wholesale': 'TRUE' if str(after_wholesale_v).upper() in truthy else 'FALSE',
+                    **tab_key,
+                })
+
+        # ── Tier 1: Monthly + Sale ────────────────────────────────────────────
+        for section_key in ('monthly', 'sale'):
+            section_df = tab_sections.get(section_key, pd.DataFrame())
+            if section_df.empty:
                 continue
 
-            true_row = int(row.get('_SHEET_ROW_NUM', idx + 2))
+            for idx, row in section_df.iterrows():
+                brand = str(gc(row, ['[Brand]', 'Brand'], '')).strip()
+                if not brand:
+                    continue
 
-            if section_key == 'monthly':
-                date_raw = get_monthly_day_of_month(row) or '-'
-                expanded_dates = parse_monthly_dates(date_raw, target_month, target_year)
-            else:  # sale
-                date_raw = str(gc(row, ['Contracted Duration (MM/DD/YY - MM/DD/YY)',
-                                         'Contracted Duration', 'Sale Runs:'], '-')).strip()
-                expanded_dates = parse_sale_dates(date_raw, target_month, target_year)
+                true_row = int(row.get('_SHEET_ROW_NUM', idx + 2))
 
-            if not expanded_dates:
-                continue
+                if section_key == 'monthly':
+                    date_raw = get_monthly_day_of_month(row) or '-'
+                    expanded_dates = parse_monthly_dates(date_raw, month, year)
+                else:  # sale
+                    date_raw = str(gc(row, ['Contracted Duration (MM/DD/YY - MM/DD/YY)',
+                                             'Contracted Duration', 'Sale Runs:'], '-')).strip()
+                    expanded_dates = parse_sale_dates(date_raw, month, year)
 
-            loc_raw, exc_raw = resolve_location_columns(row)
-            tier1_deals.append({
-                'brand':         brand,
-                'date_raw':      date_raw,
-                'discount':      str(gc(row, ['[Daily Deal Discount]', 'Deal Discount Value/Type', 'Deal Discount'], '-')).strip(),
-                'vendor_contrib': str(gc(row, ['[Discount paid by vendor]', 'Brand Contribution % (Credit)', 'Vendor Contribution'], '-')).strip(),
-                'locations':     format_location_display(loc_raw, exc_raw),
-                'mis_id':        str(gc(row, ['MIS ID', 'ID'], '')).strip(),
-                'expanded_dates': expanded_dates,
-                'section':       section_key,
-                'google_row':    true_row,
-                'deal_info':     str(gc(row, ['Deal info', 'Deal Info', 'Deal'], '')).strip(),
-            })
+                expanded_dates = clip_to_window(expanded_dates, date_window)
+                if not expanded_dates:
+                    continue
+
+                loc_raw, exc_raw = resolve_location_columns(row)
+                discount  = str(gc(row, ['[Daily Deal Discount]', 'Deal Discount Value/Type', 'Deal Discount'], '-')).strip()
+                locations = format_location_display(loc_raw, exc_raw)
+                signature = (brand.lower(), section_key, date_raw, discount, locations)
+                first = seen_on.get(signature)
+                if first is not None and first[0] != tab:
+                    # Recurring row on a later tab: its own deal (this tab's row) for
+                    # only the dates an earlier tab did not already list
+                    expanded_dates = [d for d in expanded_dates if d not in first[1]]
+                    if not expanded_dates:
+                        continue
+
+                deal = {
+                    'brand':         brand,
+                    'date_raw':      date_raw,
+                    'discount':      discount,
+                    'vendor_contrib': str(gc(row, ['[Discount paid by vendor]', 'Brand Contribution % (Credit)', 'Vendor Contribution'], '-')).strip(),
+                    'locations':     locations,
+                    'mis_id':        str(gc(row, ['MIS ID', 'ID'], '')).strip(),
+                    'expanded_dates': expanded_dates,
+                    'section':       section_key,
+                    'google_row':    true_row,
+                    'deal_info':     str(gc(row, ['Deal info', 'Deal Info', 'Deal'], '')).strip(),
+                    **tab_key,
+                }
+                tier1_deals.append(deal)
+                seen_on.setdefault(signature, (tab, set()))[1].update(expanded_dates)
+
+    target_month, target_year = slices[0][1], slices[0][2]
 
     # ── Conflict detection ────────────────────────────────────────────────────
     splits_required, no_conflict = detect_split_requirements(
@@ -380,6 +425,8 @@ def build_split_plan(
 
     try:
         date_context = datetime(target_year, target_month, 1).strftime('%B %Y')
+        if len(slices) > 1:
+            date_context += ' – ' + datetime(slices[-1][2], slices[-1][1], 1).strftime('%B %Y')
     except ValueError:
         date_context = f"{target_month}/{target_year}"
 
@@ -394,6 +441,7 @@ def build_split_plan(
 
 # ── Phase 2: Gap Check ────────────────────────────────────────────────────────
 
+@timed()
 def verify_gap_closure(
     split_plan: dict[str, Any],
     mis_df: pd.DataFrame,
@@ -5,6 +5,9 @@
 #           update_single_promotion_in_memory, monitor_browser_return,
 #           analyze_blaze_network_traffic
 # Step 2: No-Touch Zone Migration - extracted verbatim, zero logic changes.
+# v2.15 hooks (src/integrations/blaze_auth.py): BlazeTokenManager.get_token
+#   validates through the TTL cache; the direct API calls report their status
+#   with note_status() (2xx confirms, 401 drops the token from the cache).
 # =============================================================================
 import os
 import json
@@ -15,11 +18,14 @@ import threading
 import traceback
 from pathlib import Path
 from src.session import session
+from src.utils.metrics import timed
 from typing import Optional, Dict, List, Any
 from datetime import datetime, timedelta
 
 # C-3: normalize_store_name — canonical definition is in location_helpers (additive import)
 from src.utils.location_helpers import normalize_store_name
+# v2.15: direct API calls report their status to the token validation cache (additive import)
+from src.integrations.blaze_auth import note_status
 
 # Selenium (optional - Blaze browser ops)
 import os
@@ -187,6 +193,7 @@ def analyze_blaze_network_traffic():
         traceback.print_exc()
 
 
+@timed()
 def get_api_data(token_input):
     """
     Fetch Blaze API data with FLEXIBLE token input.
@@ -217,6 +224,7 @@ def get_api_data(token_input):
         headers = {"Authorization": f"Token {promo_token}"}
         r = requests.get("https://api.blaze.me/api/v1/mgmt/shops?start=0&limit=500", 
                         headers=headers, timeout=10)
+        note_status(promo_token, r.status_code)
         if r.ok:
             for s in r.json().get('values', []):
                 shops[s['id']] = s['name']
@@ -235,6 +243,7 @@ def get_api_data(token_input):
             # [SUCCESS] CHANGE 3: Use 'skip=' parameter instead of 'start='
             url = f"https://api.blaze.me/api/v1/mgmt/smartcollections/search?skip={skip}&limit=200"
             r = requests.get(url, headers=headers, timeout=10)
+            note_status(group_token, r.status_code)
             
             if not r.ok:
                 print(f"[API] [ERROR] Collections endpoint returned {r.status_code}: {r.text[:100]}")
@@ -280,6 +289,7 @@ def get_api_data(token_input):
                 f"https://api.blaze.me/api/v1/mgmt/company/promotions?start={start}&limit=100",
                 headers=headers, timeout=10
             )
+            note_status(promo_token, r.status_code)
             if not r.ok:
                 print(f"[API] [ERROR] Promotions endpoint returned {r.status_code}")
                 break
@@ -837,6 +847,7 @@ def update_single_promotion_in_memory(promo_id: str):
         url = f"https://api.blaze.me/api/v1/mgmt/company/promotions/{promo_id}"
         print(f"[SYNC] Fetching single row: {promo_id}...")
         r = requests.get(url, headers=headers)
+        note_status(token, r.status_code)
         
         if not r.ok:
             print(f"[WARN] Failed to fetch row {promo_id}: {r.status_code}")
@@ -994,7 +1005,8 @@ class BlazeTokenManager:
             try:
                 with open(cls.TOKEN_FILE, 'r') as f:
                     cached = json.load(f).get('token')
-                    if cls.validate(cached):
+                    from src.integrations.blaze_auth import get_blaze_client
+                    if get_blaze_client().cache.is_valid(cached):   # no request inside the TTL
                         print("[TOKEN] Using cached session.")
                         return cached
             except:
@@ -1134,6 +1146,7 @@ class BlazeTokenManager:
                 
                 try:
                     r = requests.get(url, headers=headers, timeout=10)
+                    note_status(token, r.status_code)
                     
                     if r.status_code == 404:
                         print("[BRANDS] WARNING: Global brand endpoint not available (404). Using fallback methods.")
@@ -0,0 +1,329 @@
+# src/integrations/blaze_auth.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Blaze API token validation cache + authorized, pooled API client.
+#
+# validate_token / BlazeTokenManager.validate (blaze_api.py, no-touch zone)
+# make a live GET /mgmt/shops every time a token is checked, so every sync
+# and init paid an extra round trip before doing any real work — even when
+# the same token had answered a real API call seconds earlier.
+#
+# TokenValidationCache remembers when each token was last confirmed valid:
+#   • is_valid(token)  within BLAZE_TOKEN_TTL_SECONDS → True, no request;
+#                      otherwise one live validation, remembered if it passes
+#   • confirm(token)   a real API call answered 2xx — free revalidation
+#   • invalidate(token) a real API call answered 401 — forget at once
+#
+# BlazeApiClient sends API calls on a keep-alive requests.Session with the
+# session's token. 2xx confirms the token; 401 invalidates it, re-acquires
+# one through the existing flows — capture from the browser
+# (blaze_token.acquire_blaze_token, which logs in when needed), then
+# BlazeTokenManager._sniff_login (headless, then visible) with the active
+# profile's Blaze credentials — and retries the call once with the new
+# token. Callers never see the expired-token 401. A 403 is Blaze's "no
+# permission for this resource" (see blaze_sync.trigger_ecom_sync): the
+# token is still good, so it is returned as-is with no re-login.
+#
+# BlazeTokenManager.get_token (the sync paths' token source) checks through
+# the same cache. The sync paths still call requests directly (blaze_api.py
+# get_api_data / fetch_global_brands / update_single_promotion_in_memory,
+# the inventory brand fetch in blaze.py); each reports its status through
+# note_status(), so a token revoked server-side is dropped on its first 401
+# instead of being handed out from the cache for the rest of the TTL.
+# (blaze_sync's e-commerce sync uses its own per-call login token, not this one.)
+#
+# Bulk callers (blaze_promotions.py) fan out on at most BLAZE_API_WORKERS
+# threads and call throttle() before each request: one RateLimiter per
+# client, so every bulk operation shares the BLAZE_API_RATE budget.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from typing import Any, Callable
+
+DEFAULT_API_BASE  = 'https://api.blaze.me'
+DEFAULT_TTL       = 300.0
+DEFAULT_TIMEOUT   = 15.0
+DEFAULT_POOL_SIZE = 8
+DEFAULT_WORKERS   = 4
+DEFAULT_RATE      = 10.0
+TOKEN_EXPIRED     = 401
+
+
+def fingerprint(token: str | None) -> str:
+    """Short, non-reversible token id for logs and diagnostics."""
+    return hashlib.sha256((token or '').encode()).hexdigest()[:10] if token else ''
+
+
+class RateLimiter:
+    """Evenly spaced permits: at most `rate_per_s` acquire() returns per second."""
+
+    def __init__(
+        self,
+        rate_per_s: float = DEFAULT_RATE,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.interval = 1.0 / rate_per_s if rate_per_s > 0 else 0.0
+        self._sleep   = sleep
+        self._clock   = clock
+        self._lock    = threading.Lock()
+        self._next    = 0.0
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = self._clock()
+            at = max(now, self._next)
+            self._next = at + self.interval
+        if at > now:
+            self._sleep(at - now)
+
+
+def _live_validate(token: str) -> bool:
+    from src.integrations.blaze_api import BlazeTokenManager
+    return BlazeTokenManager.validate(token)
+
+
+class TokenValidationCache:
+    """Token → last time it was confirmed valid; validations inside the TTL are skipped."""
+
+    def __init__(
+        self,
+        ttl_s: float = DEFAULT_TTL,
+        validator: Callable[[str], bool] = _live_validate,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_s      = ttl_s
+        self._validator = validator
+        self._clock     = clock
+        self._lock      = threading.Lock()
+        self._confirmed: dict[str, float] = {}
+        self.hits          = 0
+        self.validations   = 0
+        self.invalidations = 0
+
+    def fresh(self, token: str | None) -> bool:
+        if not token:
+            return False
+        with self._lock:
+            at = self._confirmed.get(token)
+            return at is not None and self._clock() - at < self.ttl_s
+
+    def is_valid(self, token: str | None) -> bool:
+        """True from cache inside the TTL, else one live validation."""
+        if not token:
+            return False
+        if self.fresh(token):
+            with self._lock:
+                self.hits += 1
+            return True
+        with self._lock:
+            self.validations += 1
+        ok = bool(self._validator(token))
+        if ok:
+            self.confirm(token)
+        else:
+            self.invalidate(token)
+        return ok
+
+    def confirm(self, token: str | None) -> None:
+        if token:
+            with self._lock:
+                self._confirmed[token] = self._clock()
+
+    def invalidate(self, token: str | None) -> None:
+        with self._lock:
+            if self._confirmed.pop(token or '', None) is not None:
+                self.invalidations += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            now = self._clock()
+            return {'ttl_s': self.ttl_s, 'hits': self.hits, 'validations': self.validations,
+                    'invalidations': self.invalidations,
+                    'tokens': [{'token': fingerprint(t), 'age_s': round(now - at, 1)}
+                               for t, at in self._confirmed.items()]}
+
+
+def note_status(token: str | None, status_code: int) -> None:
+    """Feed a direct `requests` call's status into the cache: 2xx confirms, 401 invalidates."""
+    if status_code == TOKEN_EXPIRED:
+        blaze_client.cache.invalidate(token)
+    elif 200 <= status_code < 300:
+        blaze_client.cache.confirm(token)
+
+
+def _current_token() -> str | None:
+    from src.integrations.blaze_api import load_stored_token
+    from src.session import session
+    return session.get_blaze_token() or load_stored_token()
+
+
+def _profile_creds() -> tuple[str, str]:
+    from src.api.profiles import get_last_used_profile, load_profile_credentials
+    creds = load_profile_credentials(get_last_used_profile())
+    return creds.get('blaze_email', ''), creds.get('blaze_password', '')
+
+
+def _reacquire_token() -> str | None:
+    """A new token through the existing flows: browser capture, then sniff login."""
+    from src.automation.blaze_token import acquire_blaze_token
+    email, password = _profile_creds()
+    result = acquire_blaze_token(email, password)
+    if result['success']:
+        return result['token']
+    if not (email and password):
+        print(f"[BLAZE-AUTH] Browser capture failed ({result['error']}) and no saved credentials")
+        return None
+    print(f"[BLAZE-AUTH] Browser capture failed ({result['error']}) — trying sniff login")
+    from src.integrations.blaze_api import BlazeTokenManager, save_stored_token
+    from src.session import session
+    token = (BlazeTokenManager._sniff_login(email, password, headless=True)
+             or BlazeTokenManager._sniff_login(email, password, headless=False))
+    if token:
+        BlazeTokenManager._save(token)
+        save_stored_token(token)
+        session.set_blaze_token(token)
+    return token
+
+
+class BlazeApiClient:
+    """Pooled, authorized Blaze API client with transparent re-acquire on 401."""
+
+    def __init__(
+        self,
+        cache: TokenValidationCache | None = None,
+        base_url: str = DEFAULT_API_BASE,
+        timeout: float = DEFAULT_TIMEOUT,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        workers: int = DEFAULT_WORKERS,
+        rate_per_s: float = DEFAULT_RATE,
+        token_source: Callable[[], str | None] = _current_token,
+        reacquire: Callable[[], str | None] = _reacquire_token,
+    ) -> None:
+        self.cache         = cache or TokenValidationCache()
+        self.base_url      = base_url.rstrip('/')
+        self.timeout       = timeout
+        self.pool_size     = pool_size
+        self.workers       = max(1, workers)
+        self.limiter       = RateLimiter(rate_per_s)
+        self._token_source = token_source
+        self._reacquire    = reacquire
+        self._session: Any = None
+        self._lock         = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self.reacquired    = 0
+
+    def _http(self) -> Any:
+        """requests.Session with a keep-alive pool, built on first use."""
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                sess = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                sess.mount('http://', adapter)
+                sess.mount('https://', adapter)
+                self._session = sess
+            return self._session
+
+    def throttle(self) -> None:
+        """Wait for a permit from the client-wide rate limit (bulk callers)."""
+        self.limiter.acquire()
+
+    def url(self, path: str) -> str:
+        return path if path.startswith('http') else f'{self.base_url}/{path.lstrip("/")}'
+
+    def token(self) -> str | None:
+        return self._token_source()
+
+    def valid_token(self) -> str | None:
+        """The current token if it checks out (cached inside the TTL), else a re-acquired one."""
+        token = self.token()
+        if self.cache.is_valid(token):
+            return token
+        return self.refresh(token)
+
+    def refresh(self, stale: str | None) -> str | None:
+        """Re-acquire once for all threads that saw `stale` fail."""
+        with self._refresh_lock:
+            current = self.token()
+            if current and current != stale and self.cache.fresh(current):
+                return current                      # another thread already re-acquired
+            self.cache.invalidate(stale)
+            print(f"[BLAZE-AUTH] Token {fingerprint(stale) or '(none)'} rejected — re-acquiring")
+            token = self._reacquire()
+            if token:
+                self.reacquired += 1
+                self.cache.confirm(token)
+            return token
+
+    def request(self, method: str, path: str, token: str | None = None, **kwargs: Any) -> Any:
+        """
+        requests-style call with 'Authorization: Token …'. A 401 invalidates
+        the token, re-acquires one and retries once; the final response is returned.
+        A 403 (no permission for this resource) is returned without a re-acquire.
+        """
+        token = token or self.token()
+        kwargs.setdefault('timeout', self.timeout)
+        headers = dict(kwargs.pop('headers', None) or {})
+
+        def send(tok: str | None) -> Any:
+            return self._http().request(method, self.url(path),
+                                        headers={**headers, 'Authorization': f'Token {tok}'}, **kwargs)
+
+        resp = send(token)
+        if resp.status_code == TOKEN_EXPIRED:
+            self.cache.invalidate(token)
+            token = self.refresh(token)
+            if not token:
+                return resp
+            resp = send(token)
+            if resp.status_code == TOKEN_EXPIRED:
+                self.cache.invalidate(token)
+                return resp
+        if resp.status_code < 300:
+            self.cache.confirm(token)
+        return resp
+
+    def get(self, path: str, **kwargs: Any) -> Any:
+        return self.request('GET', path, **kwargs)
+
+    def stats(self) -> dict[str, Any]:
+        return {'base_url': self.base_url, 'pool_size': self.pool_size, 'workers': self.workers,
+                'rate_per_s': round(1 / self.limiter.interval, 2) if self.limiter.interval else None,
+                'reacquired': self.reacquired, 'cache': self.cache.stats()}
+
+
+# Singleton — rebuilt by init_blaze_auth() from the app factory
+blaze_client = BlazeApiClient()
+
+
+def init_blaze_auth(config: Any) -> BlazeApiClient:
+    """
+    Config keys (settings.json or app.config):
+        BLAZE_TOKEN_TTL_SECONDS  = 300    skip re-validating a confirmed token for this long
+        BLAZE_API_BASE           = 'https://api.blaze.me'
+        BLAZE_API_TIMEOUT        = 15     per-request timeout (s)
+        BLAZE_API_POOL_SIZE      = 8      keep-alive connections
+        BLAZE_API_WORKERS        = 4      concurrent requests per bulk operation
+        BLAZE_API_RATE           = 10     requests per second across bulk operations (0 = off)
+    """
+    global blaze_client
+    blaze_client = BlazeApiClient(
+        cache=TokenValidationCache(ttl_s=float(config.get('BLAZE_TOKEN_TTL_SECONDS', DEFAULT_TTL))),
+        base_url=str(config.get('BLAZE_API_BASE', DEFAULT_API_BASE)),
+        timeout=float(config.get('BLAZE_API_TIMEOUT', DEFAULT_TIMEOUT)),
+        pool_size=int(config.get('BLAZE_API_POOL_SIZE', DEFAULT_POOL_SIZE)),
+        workers=int(config.get('BLAZE_API_WORKERS', DEFAULT_WORKERS)),
+        rate_per_s=float(config.get('BLAZE_API_RATE', DEFAULT_RATE)),
+    )
+    return blaze_client
+
+
+def get_blaze_client() -> BlazeApiClient:
+    return blaze_client
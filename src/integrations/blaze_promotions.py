@@ -0,0 +1,143 @@
+# src/integrations/blaze_promotions.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Promotion status updates through the Blaze management API.
+#
+# /api/blaze/zombie-disable (src/api/blaze.py, no-touch zone) disables one
+# promotion per call by driving the Blaze UI: navigate, Setup tab, Status
+# switch, Schedule tab, Save — about ten sleeps of 0.3–1s each, plus the
+# frontend's 0.5s pause between calls. Fifty zombies took many minutes.
+#
+# set_promotion_active() does the same change as the Save button does:
+#   GET  /api/v1/mgmt/company/promotions/<id>        current promotion
+#   PUT  /api/v1/mgmt/company/promotions/<id>        same body, active flipped
+# and verifies it from the PUT response (or a re-read when the response has
+# no body). bulk_set_active() runs a list of IDs on BLAZE_API_WORKERS
+# threads under the client's BLAZE_API_RATE limit, then patches Status in
+# the in-memory promotions frame (session.get_blaze_df()) for every verified
+# change, so the table reflects it without a full refresh.
+#
+# Requests go through blaze_auth.BlazeApiClient: session token, keep-alive
+# pool, transparent re-acquire on 401. IDs that fail are returned as
+# such; the caller falls back to the UI flow for those.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable
+
+from src.integrations.blaze_auth import BlazeApiClient, get_blaze_client
+from src.utils.metrics import timed
+
+PROMOTION_PATH = '/api/v1/mgmt/company/promotions/{id}'
+
+
+def _status(active: bool) -> str:
+    return 'Active' if active else 'Inactive'
+
+
+def _json(resp: Any) -> dict | None:
+    try:
+        body = resp.json()
+    except ValueError:
+        return None
+    return body if isinstance(body, dict) else None
+
+
+def fetch_promotion(client: BlazeApiClient, promo_id: str) -> dict:
+    client.throttle()
+    resp = client.get(PROMOTION_PATH.format(id=promo_id))
+    if resp.status_code != 200:
+        raise RuntimeError(f'GET promotion {promo_id} returned {resp.status_code}')
+    promo = _json(resp)
+    if promo is None:
+        raise RuntimeError(f'GET promotion {promo_id} returned no JSON object')
+    return promo
+
+
+def put_promotion(client: BlazeApiClient, promo_id: str, body: dict) -> dict:
+    """PUT the full promotion body; the promotion as Blaze now has it."""
+    client.throttle()
+    resp = client.request('PUT', PROMOTION_PATH.format(id=promo_id), json=body)
+    if resp.status_code >= 300:
+        raise RuntimeError(f'PUT promotion {promo_id} returned {resp.status_code}')
+    saved = _json(resp)
+    return saved if saved and 'active' in saved else fetch_promotion(client, promo_id)
+
+
+def set_promotion_active(client: BlazeApiClient, promo_id: str, active: bool) -> dict[str, Any]:
+    """
+    One promotion's status through the API. Never raises:
+    {'id', 'ok', 'changed', 'status'} or {'id', 'ok': False, 'error'}.
+    """
+    promo_id = str(promo_id)
+    try:
+        promo = fetch_promotion(client, promo_id)
+        if bool(promo.get('active')) == active:
+            return {'id': promo_id, 'ok': True, 'changed': False, 'status': _status(active)}
+        saved = put_promotion(client, promo_id, {**promo, 'active': active})
+        if bool(saved.get('active')) != active:
+            return {'id': promo_id, 'ok': False, 'error': 'Blaze kept the old status after the update'}
+        return {'id': promo_id, 'ok': True, 'changed': True, 'status': _status(active)}
+    except Exception as e:
+        return {'id': promo_id, 'ok': False, 'error': str(e)}
+
+
+def patch_promotions_frame(statuses: dict[str, str]) -> int:
+    """Set Status for the given IDs in the in-memory promotions frame; rows patched."""
+    from src.session import session
+    df = session.get_blaze_df()
+    if not statuses or df is None or df.empty or 'ID' not in df.columns:
+        return 0
+    ids = df['ID'].astype(str)
+    patched = 0
+    for promo_id, status in statuses.items():
+        mask = ids == str(promo_id)
+        if mask.any():
+            df.loc[mask, 'Status'] = status
+            patched += int(mask.sum())
+    if patched:
+        session.set('blaze_last_update_ts', time.time())    # frontend refresh signal
+    return patched
+
+
+@timed('blaze_bulk_status')
+def bulk_set_active(
+    promo_ids: Iterable[Any],
+    active: bool = False,
+    client: BlazeApiClient | None = None,
+) -> dict[str, Any]:
+    """
+    Set many promotions' status with bounded concurrency and the client's
+    rate limit. Results are in input order; `failed` lists the IDs to retry
+    through the UI.
+    """
+    client = client or get_blaze_client()
+    ids = list(dict.fromkeys(str(p) for p in promo_ids if str(p).strip()))
+    t0 = time.perf_counter()
+    if not ids:
+        return {'results': [], 'changed': 0, 'unchanged': 0, 'failed': [], 'patched': 0,
+                'elapsed_sec': 0.0}
+
+    if not client.valid_token():
+        error = 'No valid Blaze token'
+        return {'results': [{'id': i, 'ok': False, 'error': error} for i in ids], 'changed': 0,
+                'unchanged': 0, 'failed': ids, 'patched': 0, 'elapsed_sec': 0.0}
+
+    with ThreadPoolExecutor(max_workers=min(client.workers, len(ids)),
+                            thread_name_prefix='blaze-bulk') as pool:
+        results = list(pool.map(lambda i: set_promotion_active(client, i, active), ids))
+
+    patched = patch_promotions_frame({r['id']: r['status'] for r in results if r['ok']})
+    summary = {
+        'results':     results,
+        'changed':     sum(1 for r in results if r['ok'] and r['changed']),
+        'unchanged':   sum(1 for r in results if r['ok'] and not r['changed']),
+        'failed':      [r['id'] for r in results if not r['ok']],
+        'patched':     patched,
+        'elapsed_sec': round(time.perf_counter() - t0, 3),
+    }
+    print(f"[BLAZE-BULK] {_status(active)}: {summary['changed']} changed, {summary['unchanged']} "
+          f"unchanged, {len(summary['failed'])} failed in {summary['elapsed_sec']}s")
+    return summary
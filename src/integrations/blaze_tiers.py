@@ -0,0 +1,175 @@
+# src/integrations/blaze_tiers.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Tier promotion tag update through the Blaze management API.
+#
+# run_tier_promotion_update_logic (src/api/blaze.py, no-touch zone) does the
+# update by driving the Blaze UI: for every store except Davis/Dixon it
+# switches the shop dropdown (5s), and for each of T1/T2/T3 BAG DAY it
+# searches (3s), opens the row (4s), clicks Edit (2s), backspaces the
+# Product Tags box and types "Promo" / "promo", saves blind (2s) and reloads
+# the list (3s). Runtime grows with stores × tiers, and nothing checks that a
+# save stuck.
+#
+# Here the same outcome is computed and applied as data:
+#   1. plan   — tier promotions come from the in-memory promotions frame
+#               (session.get_blaze_df(): ID / Name / Locations), matched by
+#               name like the UI search, skipping promotions that only run
+#               at excluded stores. Each is read once (GET, concurrent) and
+#               diffed against the desired tags.
+#   2. apply  — promotions whose tags differ are PUT back with the desired
+#               tags (blaze_promotions.put_promotion), on BLAZE_API_WORKERS
+#               threads under the client's BLAZE_API_RATE limit.
+#   3. verify — every applied promotion is read again; a mismatch is a
+#               failure, not a silent success.
+# dry_run=True stops after the plan and returns the diff.
+#
+# Promotions are company-level with shopIds, so one PUT covers every store
+# the UI loop visited separately. TIER_TAG_FIELD is the promotion field
+# behind the Product Tags box.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable
+
+from src.integrations.blaze_auth import BlazeApiClient, get_blaze_client
+from src.integrations.blaze_promotions import fetch_promotion, put_promotion
+from src.utils.metrics import timed
+
+TIER_PROMOTIONS = ('T1 BAG DAY', 'T2 BAG DAY', 'T3 BAG DAY')
+EXCLUDED_STORES = ('Davis', 'Dixon')
+TIER_TAGS       = ('Promo', 'promo')
+TIER_TAG_FIELD  = 'productTags'
+
+
+@dataclass
+class TierChange:
+    id:        str
+    name:      str
+    locations: str
+    before:    list[str] = field(default_factory=list)
+    after:     list[str] = field(default_factory=list)
+    action:    str = 'pending'        # update | unchanged | updated | failed
+    error:     str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def tag_names(value: Any) -> list[str]:
+    """Tag list as plain strings (Blaze may send strings or {name: ...} objects)."""
+    names = []
+    for tag in value or []:
+        name = tag.get('name') if isinstance(tag, dict) else tag
+        if name is not None and str(name).strip():
+            names.append(str(name).strip())
+    return names
+
+
+def same_tags(a: list[str], b: list[str]) -> bool:
+    return sorted(a) == sorted(b)
+
+
+def tier_candidates(
+    df: Any,
+    names: tuple[str, ...] = TIER_PROMOTIONS,
+    excluded: tuple[str, ...] = EXCLUDED_STORES,
+) -> list[TierChange]:
+    """Tier promotions in the promotions frame, minus those only at excluded stores."""
+    if df is None or df.empty or not {'ID', 'Name'} <= set(df.columns):
+        return []
+    wanted = [n.lower() for n in names]
+    out: list[TierChange] = []
+    for row in df.to_dict('records'):
+        name = str(row.get('Name') or '')
+        if not any(w in name.lower() for w in wanted):
+            continue
+        locations = str(row.get('Locations') or '')
+        stores = [s.strip() for s in locations.split(',') if s.strip()]
+        if stores and all(any(ex.lower() in s.lower() for ex in excluded) for s in stores):
+            continue
+        out.append(TierChange(id=str(row['ID']), name=name, locations=locations))
+    return out
+
+
+def _fan_out(client: BlazeApiClient, func: Callable[[TierChange], None], items: list[TierChange]) -> None:
+    if not items:
+        return
+    with ThreadPoolExecutor(max_workers=min(client.workers, len(items)),
+                            thread_name_prefix='blaze-tiers') as pool:
+        list(pool.map(func, items))
+
+
+@timed('blaze_tier_update')
+def run_tier_update(
+    dry_run: bool = True,
+    client: BlazeApiClient | None = None,
+    df: Any = None,
+    tags: tuple[str, ...] = TIER_TAGS,
+    tag_field: str = TIER_TAG_FIELD,
+) -> dict[str, Any]:
+    """
+    Plan (and unless dry_run, apply and verify) the tier promotion tags.
+    Returns {'dry_run', 'changes': [TierChange...], 'summary', 'elapsed_sec'}.
+    """
+    t0 = time.perf_counter()
+    client = client or get_blaze_client()
+    if df is None:
+        from src.session import session
+        df = session.get_blaze_df()
+    if df is None:
+        raise RuntimeError('Blaze promotions not loaded — refresh Blaze data first')
+    if not client.valid_token():
+        raise RuntimeError('No valid Blaze token')
+
+    desired = list(tags)
+    changes = tier_candidates(df)
+    bodies: dict[str, dict] = {}
+
+    def plan(change: TierChange) -> None:
+        try:
+            promo = fetch_promotion(client, change.id)
+            bodies[change.id] = promo
+            change.before = tag_names(promo.get(tag_field))
+            change.after  = desired
+            change.action = 'unchanged' if same_tags(change.before, desired) else 'update'
+        except Exception as e:
+            change.action, change.error = 'failed', str(e)
+
+    def apply(change: TierChange) -> None:
+        try:
+            saved = put_promotion(client, change.id, {**bodies[change.id], tag_field: desired})
+            if not same_tags(tag_names(saved.get(tag_field)), desired):
+                raise RuntimeError('Blaze kept the old tags after the update')
+            change.action = 'updated'
+        except Exception as e:
+            change.action, change.error = 'failed', str(e)
+
+    def verify(change: TierChange) -> None:
+        try:
+            now = tag_names(fetch_promotion(client, change.id).get(tag_field))
+            if not same_tags(now, desired):
+                change.action, change.error = 'failed', f'Final state has tags {now}'
+        except Exception as e:
+            change.action, change.error = 'failed', f'Final state unreadable: {e}'
+
+    _fan_out(client, plan, changes)
+    if not dry_run:
+        to_update = [c for c in changes if c.action == 'update']
+        _fan_out(client, apply, to_update)
+        _fan_out(client, verify, [c for c in to_update if c.action == 'updated'])
+
+    counts: dict[str, int] = {}
+    for c in changes:
+        counts[c.action] = counts.get(c.action, 0) + 1
+    result = {
+        'dry_run':     dry_run,
+        'changes':     [c.to_dict() for c in changes],
+        'summary':     {'promotions': len(changes), **counts},
+        'elapsed_sec': round(time.perf_counter() - t0, 3),
+    }
+    print(f"[TIER-API] {'Dry run' if dry_run else 'Applied'}: {result['summary']} in {result['elapsed_sec']}s")
+    return result
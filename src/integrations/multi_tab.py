@@ -0,0 +1,167 @@
+# src/integrations/multi_tab.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Multi-month tab loader for cross-month audits and planning.
+#
+# fetch_google_sheet_data() reads one month tab per call, so a quarter meant
+# three sequential reads + parses. Weekly deals and sales routinely cross a
+# month boundary, so the conflict audit and split planner need neighbouring
+# months side by side.
+#
+#   resolve_month_tabs(titles, start, end)  → [(tab, month, year)] in order
+#   load_month_tabs(tabs)                   → [MonthTab(tab, month, year, sections)]
+#   load_date_window(start, end)            → both of the above
+#
+# Loading:
+#   1. tab snapshot cache first (src/integrations/sheet_cache.py)
+#   2. every miss in ONE values().batchGet (sheets_access.read_tabs_values)
+#   3. misses parsed concurrently with split_sheet_sections(); the bracket
+#      scan (which merges into the session alias maps) runs afterwards, in order
+#
+# The session's current sheet / header row are left as they were — loading
+# neighbouring months must not retarget the write-back routes.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Any, NamedTuple
+
+import pandas as pd
+
+MAX_PARSE_WORKERS = 4
+
+_MONTH_NUM = {name: i for i, name in enumerate(
+    ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+     'August', 'September', 'October', 'November', 'December'], start=1)}
+
+
+class MonthTab(NamedTuple):
+    tab:      str
+    month:    int
+    year:     int
+    sections: dict[str, pd.DataFrame]
+
+
+def tab_month(tab: str) -> tuple[int, int] | None:
+    """(month, year) for a month tab title, None for anything else (Settings, …)."""
+    from src.integrations.google_sheets import parse_tab_month_year
+    month_name, year = parse_tab_month_year(tab)
+    if not month_name or not year:
+        return None
+    return _MONTH_NUM[month_name], int(year)
+
+
+def resolve_month_tabs(titles: list[str], start: date, end: date) -> list[tuple[str, int, int]]:
+    """
+    Month tabs overlapping start..end, oldest first. When two titles map to the
+    same month ('Jan 2026' and 'January 2026') the first one in the sheet wins.
+    """
+    from src.utils.date_helpers import months_in_window
+    wanted = set(months_in_window(start, end))
+    found: dict[tuple[int, int], str] = {}
+    for title in titles:
+        my = tab_month(title)
+        if my in wanted and my not in found:
+            found[my] = title
+    return [(found[(m, y)], m, y) for m, y in sorted(found, key=lambda my: (my[1], my[0]))]
+
+
+def parse_window(data: dict[str, Any]) -> tuple[date, date] | None:
+    """
+    Optional date window from a request body: {"start": ..., "end": ...}
+    (YYYY-MM-DD or MM/DD/YYYY). None when neither is given.
+    """
+    from src.utils.date_helpers import normalize_date
+    raw_start, raw_end = data.get('start'), data.get('end')
+    if not raw_start and not raw_end:
+        return None
+    parsed: list[date] = []
+    for raw in (raw_start or raw_end, raw_end or raw_start):
+        try:
+            parsed.append(datetime.strptime(normalize_date(raw), '%m/%d/%Y').date())
+        except ValueError:
+            raise ValueError(f'Invalid date: {raw!r}')
+    start, end = parsed
+    if end < start:
+        raise ValueError('Date window end is before start')
+    return start, end
+
+
+def load_month_tabs(tabs: list[tuple[str, int, int]],
+                    max_workers: int = MAX_PARSE_WORKERS) -> list[MonthTab]:
+    """Sections for each (tab, month, year), in the order given."""
+    from src.session import session
+    from src.integrations import sheets_access
+    from src.integrations.google_sheets import scan_bracket_headers, split_sheet_sections
+    from src.integrations.sheet_cache import get_tab_cache
+
+    service        = session.get_sheets_service()
+    spreadsheet_id = session.get_spreadsheet_id()
+    if not service or not spreadsheet_id:
+        raise ValueError('Service not available')
+
+    current_sheet  = session.get_mis_current_sheet()
+    header_row_idx = session.get_mis_header_row_idx()
+    cache          = get_tab_cache()
+
+    loaded:    dict[str, dict[str, pd.DataFrame]] = {}
+    revisions: dict[str, str | None] = {}
+    try:
+        for tab, _, _ in tabs:
+            cached, revisions[tab] = cache.lookup(service, spreadsheet_id, tab)
+            if cached is not None:
+                loaded[tab] = cached
+
+        misses = [tab for tab, _, _ in tabs if tab not in loaded]
+        if misses:
+            values = sheets_access.read_tabs_values(service, spreadsheet_id, misses)
+            to_parse = {}
+            for tab in misses:
+                if not values[tab]:
+                    loaded[tab] = {'weekly': pd.DataFrame(), 'monthly': pd.DataFrame(),
+                                   'sale': pd.DataFrame()}
+                    continue
+                reused = cache.reuse_if_unchanged(spreadsheet_id, tab, values[tab], revisions[tab])
+                if reused is not None:
+                    loaded[tab] = reused
+                else:
+                    to_parse[tab] = values[tab]
+
+            if to_parse:
+                workers = max(1, min(max_workers, len(to_parse)))
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tab-parse') as pool:
+                    parsed = dict(zip(to_parse, pool.map(
+                        lambda v: split_sheet_sections(v, scan_brackets=False), to_parse.values())))
+                for tab, (idx, sections) in parsed.items():
+                    for sec, df in sections.items():
+                        if not df.empty:
+                            sections[sec] = scan_bracket_headers(df, section_name=sec)
+                    cache.store(spreadsheet_id, tab, to_parse[tab], revisions[tab], sections,
+                                header_row_idx=idx)
+                    loaded[tab] = sections
+    finally:
+        if current_sheet:
+            session.set_mis_current_sheet(current_sheet)
+        session.set_mis_header_row_idx(header_row_idx)
+
+    print(f"[MULTI-TAB] Loaded {len(tabs)} tab(s): {len(tabs) - len(misses)} cached, "
+          f"{len(misses)} read in one batch")
+    return [MonthTab(tab, m, y, loaded[tab]) for tab, m, y in tabs]
+
+
+def load_date_window(start: date, end: date) -> list[MonthTab]:
+    """Resolve the month tabs covering start..end and load them."""
+    from src.session import session
+    from src.integrations import sheets_access
+
+    service        = session.get_sheets_service()
+    spreadsheet_id = session.get_spreadsheet_id()
+    if not service or not spreadsheet_id:
+        raise ValueError('Service not available')
+
+    titles = sheets_access.get_tab_titles(service, spreadsheet_id)
+    tabs   = resolve_month_tabs(titles, start, end)
+    if not tabs:
+        raise ValueError(f'No month tabs found for {start:%m/%d/%Y} – {end:%m/%d/%Y}')
+    return load_month_tabs(tabs)
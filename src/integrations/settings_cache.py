@@ -0,0 +1,372 @@
+# src/integrations/settings_cache.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Versioned cache for everything derived from the Settings / Brand Rebate
+# Agreements tabs:
+#
+#   brand_settings   brand → linked brand       (brand_helpers.load_brand_settings)
+#   dropdowns        stores, categories, map    (google_sheets.load_settings_dropdown_data)
+#   brand_aw_list    brands needing After Wholesale (brand_helpers.load_brand_aw_list)
+#
+# These tabs change a few times a month but were re-read on every init,
+# match, generate-csv and validator injection. sheets_access's 60 s bundle
+# TTL only collapsed reads inside one user action.
+#
+# Each spreadsheet has one SettingsEntry:
+#   version    bumps only when the derived content changes
+#   revision   Drive file version at build time (None → checksum mode)
+#   persisted  config/cache/settings/<spreadsheet_id>.json, so a restart
+#              serves the last known settings before the first API call
+#
+# get() never waits on the network once an entry exists. Entries older than
+# SETTINGS_CACHE_CHECK_SECONDS are revalidated in the background: a Drive
+# revision probe, and a rebuild only if the revision moved (or, without a
+# revision, after SETTINGS_CACHE_MAX_AGE_SECONDS). A daemon thread does the
+# same for every known spreadsheet on the same schedule.
+#
+# The loaders themselves are unchanged; the cache fetches the settings
+# bundle once (refresh=True) and each loader parses from it.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+PROJECT_ROOT            = Path(__file__).resolve().parent.parent.parent
+DEFAULT_CACHE_DIR       = PROJECT_ROOT / 'config' / 'cache' / 'settings'
+DEFAULT_CHECK_SECONDS   = 60.0
+DEFAULT_MAX_AGE_SECONDS = 900.0
+
+_SAFE_NAME = re.compile(r'[^A-Za-z0-9_-]')
+
+
+@dataclass
+class SettingsEntry:
+    spreadsheet_id: str
+    version:        int
+    revision:       str | None
+    checksum:       str
+    brand_settings: dict[str, str]
+    dropdowns:      dict[str, Any]
+    brand_aw_list:  list[str]
+    loaded_at:      float = field(default_factory=time.time)
+    checked_at:     float = field(default_factory=time.time)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            'spreadsheet_id': self.spreadsheet_id,
+            'version':        self.version,
+            'revision':       self.revision,
+            'brands':         len(self.brand_settings),
+            'stores':         len(self.dropdowns.get('stores', [])),
+            'categories':     len(self.dropdowns.get('categories', [])),
+            'aw_brands':      len(self.brand_aw_list),
+            'age_sec':        round(time.time() - self.loaded_at, 1),
+        }
+
+
+def _default_service() -> Any:
+    from src.session import session
+    return session.get_sheets_service()
+
+
+def build_settings(service: Any, spreadsheet_id: str) -> dict[str, Any]:
+    """
+    One fresh settings bundle, parsed by the existing loaders.
+    Raises if the bundle cannot be fetched (the loaders would swallow it and
+    return empties, which must not overwrite a good entry).
+    """
+    from src.integrations import sheets_access
+    from src.integrations.google_sheets import load_settings_dropdown_data
+    from src.utils.brand_helpers import load_brand_aw_list, load_brand_settings
+
+    sheets_access.get_settings_bundle(service, spreadsheet_id, refresh=True)
+    return {
+        'brand_settings': load_brand_settings(spreadsheet_id, service),
+        'dropdowns':      load_settings_dropdown_data(spreadsheet_id, service),
+        'brand_aw_list':  load_brand_aw_list(spreadsheet_id, service),
+    }
+
+
+class SettingsCache:
+    """SettingsEntry per spreadsheet, persisted to disk. Thread-safe."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        cache_dir: Path | None = DEFAULT_CACHE_DIR,
+        check_seconds: float = DEFAULT_CHECK_SECONDS,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+        service_getter: Callable[[], Any] = _default_service,
+        builder: Callable[[Any, str], dict[str, Any]] = build_settings,
+        revision_probe: Callable[[Any, str], str | None] | None = None,
+        background: bool = True,
+    ) -> None:
+        self.enabled         = enabled
+        self.cache_dir       = Path(cache_dir) if cache_dir else None
+        self.check_seconds   = max(float(check_seconds), 0.0)
+        self.max_age_seconds = max(float(max_age_seconds), 0.0)
+        self.background      = background
+        self._service        = service_getter
+        self._builder        = builder
+        self._probe          = revision_probe or self._probe_drive
+        self._lock           = threading.Lock()
+        self._entries: dict[str, SettingsEntry] = {}
+        self._inflight: set[str] = set()
+        self._thread: threading.Thread | None = None
+        self._stop   = threading.Event()
+        self._counts = {'hit': 0, 'disk_load': 0, 'build': 0, 'unchanged': 0,
+                        'revision_skip': 0, 'errors': 0}
+
+    # ── Read side ────────────────────────────────────────────────────────────
+
+    def get(self, spreadsheet_id: str) -> SettingsEntry | None:
+        """
+        Entry for a spreadsheet: memory → disk → synchronous build.
+        A stale entry is returned as-is and revalidated in the background.
+        None only when nothing is cached and the tabs cannot be read.
+        """
+        if not spreadsheet_id:
+            return None
+        if not self.enabled:
+            return self._build(spreadsheet_id, None)     # live read every call
+
+        with self._lock:
+            entry = self._entries.get(spreadsheet_id)
+        if entry is None:
+            entry = self._load_disk(spreadsheet_id)
+        if entry is None:
+            entry = self.refresh(spreadsheet_id, force=True)
+        else:
+            with self._lock:
+                self._counts['hit'] += 1
+            if time.time() - entry.checked_at >= self.check_seconds:
+                self._revalidate_async(spreadsheet_id)
+        self._start_refresher()
+        return entry
+
+    def prefetch(self, spreadsheet_id: str) -> None:
+        """Warm the entry off the request thread (sheet just loaded)."""
+        if self.enabled and self.background and spreadsheet_id:
+            threading.Thread(target=self.get, args=(spreadsheet_id,),
+                             name='settings-prefetch', daemon=True).start()
+
+    def brand_settings(self, spreadsheet_id: str) -> dict[str, str]:
+        entry = self.get(spreadsheet_id)
+        return dict(entry.brand_settings) if entry else {}
+
+    def dropdowns(self, spreadsheet_id: str) -> dict[str, Any]:
+        entry = self.get(spreadsheet_id)
+        if entry is None:
+            return {'stores': [], 'categories': [], 'brand_linked_map': {}}
+        return json.loads(json.dumps(entry.dropdowns))
+
+    def brand_aw_list(self, spreadsheet_id: str) -> list[str]:
+        entry = self.get(spreadsheet_id)
+        return list(entry.brand_aw_list) if entry else []
+
+    # ── Refresh ──────────────────────────────────────────────────────────────
+
+    def refresh(self, spreadsheet_id: str, force: bool = False) -> SettingsEntry | None:
+        """
+        Revalidate one spreadsheet. Rebuilds when forced, when the Drive
+        revision moved, or (no revision available) when the entry is older
+        than max_age_seconds. Returns the current entry (old one on failure).
+        """
+        service = self._service()
+        with self._lock:
+            entry = self._entries.get(spreadsheet_id)
+        if not service:
+            return entry
+
+        revision = self._probe(service, spreadsheet_id)
+        now = time.time()
+        if entry is not None and not force:
+            same_rev = revision is not None and revision == entry.revision
+            young    = revision is None and now - entry.loaded_at < self.max_age_seconds
+            if same_rev or young:
+                entry.checked_at = now
+                with self._lock:
+                    self._counts['revision_skip'] += 1
+                return entry
+        return self._build(spreadsheet_id, service, revision) or entry
+
+    def invalidate(self, spreadsheet_id: str | None = None) -> int:
+        """Forget in-memory entries (files on disk are kept and revalidated on load)."""
+        with self._lock:
+            if spreadsheet_id is None:
+                n = len(self._entries)
+                self._entries.clear()
+            else:
+                n = 1 if self._entries.pop(spreadsheet_id, None) else 0
+        return n
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                'enabled':         self.enabled,
+                'check_seconds':   self.check_seconds,
+                'max_age_seconds': self.max_age_seconds,
+                'cache_dir':       str(self.cache_dir) if self.cache_dir else None,
+                'refresher_alive': bool(self._thread and self._thread.is_alive()),
+                'counts':          dict(self._counts),
+                'entries':         [e.summary() for e in self._entries.values()],
+            }
+
+    def shutdown(self) -> None:
+        self._stop.set()
+
+    # ── Internals ────────────────────────────────────────────────────────────
+
+    def _build(self, spreadsheet_id: str, service: Any,
+               revision: str | None = None) -> SettingsEntry | None:
+        service = service or self._service()
+        if not service:
+            return None
+        try:
+            data = self._builder(service, spreadsheet_id)
+        except Exception as e:
+            with self._lock:
+                self._counts['errors'] += 1
+            print(f"[SETTINGS-CACHE] Refresh failed for {spreadsheet_id[:12]}…: {e}")
+            return None
+
+        from src.integrations.sheet_cache import values_checksum
+        checksum = values_checksum([data['brand_settings'], data['dropdowns'], data['brand_aw_list']])
+        now = time.time()
+        with self._lock:
+            prev = self._entries.get(spreadsheet_id)
+            if prev is not None and prev.checksum == checksum:
+                prev.revision, prev.loaded_at, prev.checked_at = revision, now, now
+                self._counts['unchanged'] += 1
+                entry, changed = prev, False
+            else:
+                entry = SettingsEntry(
+                    spreadsheet_id=spreadsheet_id,
+                    version=(prev.version + 1) if prev else 1,
+                    revision=revision,
+                    checksum=checksum,
+                    brand_settings=dict(data['brand_settings']),
+                    dropdowns=dict(data['dropdowns']),
+                    brand_aw_list=list(data['brand_aw_list']),
+                )
+                self._entries[spreadsheet_id] = entry
+                self._counts['build'] += 1
+                changed = True
+        if changed:
+            print(f"[SETTINGS-CACHE] {spreadsheet_id[:12]}… → v{entry.version} "
+                  f"({len(entry.brand_settings)} brands, {len(entry.brand_aw_list)} AW)")
+            from src.session import session
+            if session is not None and session.get_spreadsheet_id() == spreadsheet_id:
+                session.set_brand_settings(dict(entry.brand_settings))
+        if self.enabled:
+            self._save_disk(entry)
+        return entry
+
+    def _revalidate_async(self, spreadsheet_id: str) -> None:
+        if not self.background:
+            return
+        with self._lock:
+            if spreadsheet_id in self._inflight:
+                return
+            self._inflight.add(spreadsheet_id)
+
+        def _run() -> None:
+            try:
+                self.refresh(spreadsheet_id)
+            finally:
+                with self._lock:
+                    self._inflight.discard(spreadsheet_id)
+
+        threading.Thread(target=_run, name='settings-revalidate', daemon=True).start()
+
+    def _start_refresher(self) -> None:
+        if not self.background or not self.check_seconds:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def _loop() -> None:
+            while not self._stop.wait(self.check_seconds):
+                with self._lock:
+                    ids = list(self._entries)
+                for sid in ids:
+                    try:
+                        self.refresh(sid)
+                    except Exception as e:
+                        print(f"[SETTINGS-CACHE] Background refresh error: {e}")
+
+        self._thread = threading.Thread(target=_loop, name='settings-cache-refresh', daemon=True)
+        self._thread.start()
+
+    def _probe_drive(self, service: Any, spreadsheet_id: str) -> str | None:
+        from src.integrations.sheet_cache import get_tab_cache
+        return get_tab_cache().probe_revision(service, spreadsheet_id)
+
+    def _path(self, spreadsheet_id: str) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f'{_SAFE_NAME.sub("_", spreadsheet_id)}.json'
+
+    def _save_disk(self, entry: SettingsEntry) -> None:
+        path = self._path(entry.spreadsheet_id)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix('.tmp')
+            tmp.write_text(json.dumps(asdict(entry), ensure_ascii=False), encoding='utf-8')
+            tmp.replace(path)
+        except OSError as e:
+            print(f"[SETTINGS-CACHE] Could not persist settings: {e}")
+
+    def _load_disk(self, spreadsheet_id: str) -> SettingsEntry | None:
+        path = self._path(spreadsheet_id)
+        if path is None or not path.exists():
+            return None
+        try:
+            raw = json.loads(path.read_text(encoding='utf-8'))
+            entry = SettingsEntry(**raw)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"[SETTINGS-CACHE] Ignoring unreadable {path.name}: {e}")
+            return None
+        entry.checked_at = 0.0          # serve now, revalidate on this call
+        with self._lock:
+            entry = self._entries.setdefault(spreadsheet_id, entry)
+            self._counts['disk_load'] += 1
+        print(f"[SETTINGS-CACHE] Loaded v{entry.version} for {spreadsheet_id[:12]}… from disk")
+        return entry
+
+
+# Singleton — rebuilt by init_settings_cache() from the app factory
+settings_cache = SettingsCache()
+
+
+def init_settings_cache(config: Any) -> SettingsCache:
+    """
+    Config keys (settings.json or app.config):
+        SETTINGS_CACHE_ENABLED          = true
+        SETTINGS_CACHE_DIR              = config/cache/settings   ("" → memory only)
+        SETTINGS_CACHE_CHECK_SECONDS    = 60    revision probe / background schedule
+        SETTINGS_CACHE_MAX_AGE_SECONDS  = 900   forced re-read when Drive revision is unavailable
+    """
+    global settings_cache
+    settings_cache.shutdown()
+    cache_dir = config.get('SETTINGS_CACHE_DIR', DEFAULT_CACHE_DIR)
+    settings_cache = SettingsCache(
+        enabled=bool(config.get('SETTINGS_CACHE_ENABLED', True)),
+        cache_dir=Path(cache_dir) if cache_dir else None,
+        check_seconds=float(config.get('SETTINGS_CACHE_CHECK_SECONDS', DEFAULT_CHECK_SECONDS)),
+        max_age_seconds=float(config.get('SETTINGS_CACHE_MAX_AGE_SECONDS', DEFAULT_MAX_AGE_SECONDS)),
+    )
+    return settings_cache
+
+
+def get_settings_cache() -> SettingsCache:
+    return settings_cache
@@ -0,0 +1,387 @@
+# src/integrations/sheet_cache.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Revision-aware snapshot cache for parsed Google Sheet tabs.
+#
+# fetch_google_sheet_data(tab) downloads the whole tab, detects the header,
+# splits weekly/monthly/sale and scans bracket headers. generate-csv, match,
+# maudit, cleanup-audit, the conflict audits and split-audit all call it,
+# often several times per user action on a tab nobody has touched.
+#
+# Each snapshot is keyed by (spreadsheet_id, tab) and remembers:
+#   revision   Drive file `version` at fetch time (None if Drive is not reachable
+#              with the current token — spreadsheets-only scope, offline, etc.)
+#
+# The Sheets API exposes no revision, so the probe needs a Drive scope on the
+# token. A token granted only `spreadsheets` (the app's default SCOPES) is
+# recognised from its scopes without making a request and goes straight to
+# checksum mode; so does a 403 for insufficient scope / Drive API disabled.
+# Any other probe failure (network, 5xx, rate limit) is transient: checksum
+# mode for PROBE_RETRY_SECONDS, then the probe is tried again.
+#   checksum   blake2b of the raw cell values
+#   sections   parsed DataFrames + header row idx + bracket/prefix maps
+#
+# Lookup order (fetch_google_sheet_data):
+#   1. snapshot validated < SHEET_CACHE_REVALIDATE_SECONDS ago → hit, no I/O
+#   2. Drive revision unchanged                                → hit, 1 tiny call
+#   3. values fetched, checksum unchanged                      → parse skipped
+#   4. otherwise                                               → full parse, store
+#
+# Our own write-backs (apply-matches, apply-blaze-titles, apply-split-id)
+# call invalidate() so step 1 never serves a tab we just edited.
+# Hits return copies; callers may mutate the frames freely.
+#
+# Detected header rows are remembered separately (SHEET_HEADER_TTL_SECONDS):
+# a cell write-back drops the snapshot but not the header, so consecutive
+# apply calls don't re-read the header block. See sheets_access.get_header().
+#
+# store() also hands every parsed tab to the SQLite mirror (sheet_mirror.py),
+# which outlives this in-memory LRU and serves tabs when the API is down.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+import pandas as pd
+
+DEFAULT_REVALIDATE_SECONDS = 10.0
+DEFAULT_MAX_TABS           = 24
+DEFAULT_HEADER_TTL_SECONDS = 300.0
+PROBE_RETRY_SECONDS        = 60.0
+
+# Any of these lets files().get read `version`
+DRIVE_READ_SCOPES = frozenset({
+    'https://www.googleapis.com/auth/drive',
+    'https://www.googleapis.com/auth/drive.readonly',
+    'https://www.googleapis.com/auth/drive.file',
+    'https://www.googleapis.com/auth/drive.metadata',
+    'https://www.googleapis.com/auth/drive.metadata.readonly',
+})
+
+
+@dataclass
+class TabSnapshot:
+    spreadsheet_id:      str
+    tab:                 str
+    revision:            str | None
+    checksum:            str
+    sections:            dict[str, pd.DataFrame]
+    header_row_idx:      int
+    bracket_map:         dict[str, str]
+    prefix_map:          dict[str, str]
+    rebate_type_columns: list[str]
+    fetched_at:          float = field(default_factory=time.time)
+    validated_at:        float = field(default_factory=time.time)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            'spreadsheet_id': self.spreadsheet_id,
+            'tab':            self.tab,
+            'revision':       self.revision,
+            'rows':           {k: int(len(v)) for k, v in self.sections.items()},
+            'age_sec':        round(time.time() - self.fetched_at, 1),
+        }
+
+
+def values_checksum(values: list[list[Any]]) -> str:
+    """Stable digest of a values().get() payload."""
+    raw = json.dumps(values, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class TabSnapshotCache:
+    """LRU of TabSnapshot keyed by (spreadsheet_id, tab). Thread-safe."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        revalidate_seconds: float = DEFAULT_REVALIDATE_SECONDS,
+        max_tabs: int = DEFAULT_MAX_TABS,
+        header_ttl_seconds: float = DEFAULT_HEADER_TTL_SECONDS,
+    ) -> None:
+        self.enabled            = enabled
+        self.revalidate_seconds = max(float(revalidate_seconds), 0.0)
+        self.max_tabs           = max(int(max_tabs), 1)
+        self.header_ttl_seconds = max(float(header_ttl_seconds), 0.0)
+        self._lock              = threading.Lock()
+        self._snaps: OrderedDict[tuple[str, str], TabSnapshot] = OrderedDict()
+        self._headers: dict[tuple[str, str], tuple[float, int, list[Any]]] = {}
+        self._drive_services: dict[int, Any] = {}
+        self._drive_unavailable: set[str]    = set()
+        self._probe_retry_at: dict[str, float] = {}
+        self._counts = {'hit_fresh': 0, 'hit_revision': 0, 'hit_checksum': 0,
+                        'miss': 0, 'invalidated': 0}
+
+    # ── Lookup / store (called from fetch_google_sheet_data) ─────────────────
+
+    def lookup(self, service: Any, spreadsheet_id: str, tab: str,
+               ) -> tuple[dict[str, pd.DataFrame] | None, str | None]:
+        """
+        Return (sections, revision). sections is None on a miss; revision is the
+        Drive version probed *before* the caller fetches, so a snapshot is never
+        labelled newer than its data.
+        """
+        if not self.enabled:
+            return None, None
+        key = (spreadsheet_id, tab)
+        with self._lock:
+            snap = self._snaps.get(key)
+        if snap is not None and time.time() - snap.validated_at < self.revalidate_seconds:
+            return self._hit(snap, 'hit_fresh'), snap.revision
+
+        revision = self.probe_revision(service, spreadsheet_id)
+        if snap is not None and revision is not None and revision == snap.revision:
+            snap.validated_at = time.time()
+            return self._hit(snap, 'hit_revision'), revision
+        return None, revision
+
+    def reuse_if_unchanged(self, spreadsheet_id: str, tab: str, values: list[list[Any]],
+                           revision: str | None) -> dict[str, pd.DataFrame] | None:
+        """Values already fetched — skip the parse if they match the snapshot."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            snap = self._snaps.get((spreadsheet_id, tab))
+        if snap is None or snap.checksum != values_checksum(values):
+            with self._lock:
+                self._counts['miss'] += 1
+            return None
+        snap.revision     = revision
+        snap.validated_at = time.time()
+        return self._hit(snap, 'hit_checksum')
+
+    def store(self, spreadsheet_id: str, tab: str, values: list[list[Any]],
+              revision: str | None, sections: dict[str, pd.DataFrame],
+              header_row_idx: int | None = None) -> None:
+        """
+        Snapshot a freshly parsed tab together with the alias maps it produced.
+        header_row_idx defaults to the session's (set by fetch_google_sheet_data).
+        """
+        from src.session import session
+        if not self.enabled:
+            self._mirror(spreadsheet_id, tab, values, revision,
+                         {k: v.copy() for k, v in sections.items()},
+                         session.get_mis_header_row_idx() if header_row_idx is None else header_row_idx)
+            return
+        snap = TabSnapshot(
+            spreadsheet_id=spreadsheet_id,
+            tab=tab,
+            revision=revision,
+            checksum=values_checksum(values),
+            sections={k: v.copy() for k, v in sections.items()},
+            header_row_idx=(session.get_mis_header_row_idx() if header_row_idx is None
+                            else int(header_row_idx)),
+            bracket_map=dict(session.get_mis_bracket_map()),
+            prefix_map=dict(session.get_mis_prefix_map()),
+            rebate_type_columns=list(session.get_mis_rebate_type_columns()),
+        )
+        with self._lock:
+            self._snaps[(spreadsheet_id, tab)] = snap
+            self._snaps.move_to_end((spreadsheet_id, tab))
+            while len(self._snaps) > self.max_tabs:
+                self._snaps.popitem(last=False)
+        if snap.header_row_idx < len(values):
+            self.remember_header(spreadsheet_id, tab, snap.header_row_idx,
+                                 values[snap.header_row_idx])
+        # Snapshot frames are never mutated (hits return copies) — safe to share
+        self._mirror(spreadsheet_id, tab, values, revision, snap.sections, snap.header_row_idx,
+                     checksum=snap.checksum)
+
+    def _mirror(self, spreadsheet_id: str, tab: str, values: list[list[Any]],
+                revision: str | None, sections: dict[str, pd.DataFrame],
+                header_row_idx: int, checksum: str | None = None) -> None:
+        from src.session import session
+        from src.integrations.sheet_mirror import get_sheet_mirror
+        try:
+            get_sheet_mirror().sync(
+                spreadsheet_id, tab, sections, checksum or values_checksum(values), revision,
+                header_row_idx, session.get_mis_bracket_map(), session.get_mis_prefix_map(),
+                session.get_mis_rebate_type_columns())
+        except Exception as e:
+            print(f"[SHEET-CACHE] Mirror sync skipped: {e}")
+
+    # ── Header rows (shared by read + write-back paths) ──────────────────────
+
+    def remember_header(self, spreadsheet_id: str, tab: str, header_row_idx: int,
+                        header: list[Any]) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._headers[(spreadsheet_id, tab)] = (time.time(), int(header_row_idx), list(header))
+
+    def get_header(self, spreadsheet_id: str, tab: str) -> tuple[int, list[Any]] | None:
+        """(header_row_idx, raw header cells) if detected recently, else None."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            hit = self._headers.get((spreadsheet_id, tab))
+        if hit is None or time.time() - hit[0] >= self.header_ttl_seconds:
+            return None
+        return hit[1], list(hit[2])
+
+    def invalidate(self, spreadsheet_id: str | None = None, tab: str | None = None,
+                   headers: bool = False) -> int:
+        """
+        Drop snapshots. No args = everything; spreadsheet only = all its tabs.
+        headers=True also forgets remembered header rows (cell write-backs
+        leave them alone; profile switch / manual clear drop them).
+        """
+        def _match(k: tuple[str, str]) -> bool:
+            return ((spreadsheet_id is None or k[0] == spreadsheet_id)
+                    and (tab is None or k[1] == tab))
+
+        with self._lock:
+            keys = [k for k in self._snaps if _match(k)]
+            for k in keys:
+                del self._snaps[k]
+            if headers:
+                for k in [k for k in self._headers if _match(k)]:
+                    del self._headers[k]
+            self._counts['invalidated'] += len(keys)
+        if keys:
+            print(f"[SHEET-CACHE] Invalidated {len(keys)} snapshot(s)"
+                  f"{f' for {tab!r}' if tab else ''}")
+        return len(keys)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                'enabled':            self.enabled,
+                'revalidate_seconds': self.revalidate_seconds,
+                'max_tabs':           self.max_tabs,
+                'counts':             dict(self._counts),
+                'revision_probe':     {'disabled': sorted(self._drive_unavailable),
+                                       'retrying': sorted(k for k, t in self._probe_retry_at.items()
+                                                          if t > time.time())},
+                'tabs':               [s.summary() for s in self._snaps.values()],
+            }
+
+    # ── Revision probe ───────────────────────────────────────────────────────
+
+    def probe_revision(self, service: Any, spreadsheet_id: str) -> str | None:
+        """
+        Drive `version` for the spreadsheet (bumps on any edit), or None.
+        Uses the Sheets service's own credentials. A token without a Drive
+        scope (or a 403 saying so) disables probing for that spreadsheet;
+        other failures skip probing for PROBE_RETRY_SECONDS.
+        """
+        if spreadsheet_id in self._drive_unavailable:
+            return None
+        if time.time() < self._probe_retry_at.get(spreadsheet_id, 0.0):
+            return None
+        try:
+            creds = _credentials_of(service)
+            if creds is None:
+                raise RuntimeError('no credentials on sheets service')
+            if not has_drive_scope(creds):
+                self._disable_probe(spreadsheet_id, 'token has no Drive scope')
+                return None
+            meta = self._drive_for(creds).files().get(
+                fileId=spreadsheet_id,
+                fields='version,modifiedTime',
+                supportsAllDrives=True,
+            ).execute()
+            self._probe_retry_at.pop(spreadsheet_id, None)
+            return str(meta.get('version') or meta.get('modifiedTime') or '') or None
+        except Exception as e:
+            if scope_denied(e):
+                self._disable_probe(spreadsheet_id, f'Drive refused the token ({type(e).__name__})')
+            else:
+                self._probe_retry_at[spreadsheet_id] = time.time() + PROBE_RETRY_SECONDS
+                print(f"[SHEET-CACHE] Drive revision probe failed ({type(e).__name__}: {e}); "
+                      f"checksum mode for {PROBE_RETRY_SECONDS:.0f}s")
+            return None
+
+    def _disable_probe(self, spreadsheet_id: str, reason: str) -> None:
+        self._drive_unavailable.add(spreadsheet_id)
+        print(f"[SHEET-CACHE] Drive revision unavailable ({reason}); "
+              f"using checksum mode for {spreadsheet_id[:12]}…")
+
+    def _drive_for(self, creds: Any) -> Any:
+        drive = self._drive_services.get(id(creds))
+        if drive is None:
+            from googleapiclient.discovery import build
+            drive = build('drive', 'v3', credentials=creds, cache_discovery=False)
+            self._drive_services = {id(creds): drive}
+        return drive
+
+    # ── Internals ────────────────────────────────────────────────────────────
+
+    def _hit(self, snap: TabSnapshot, kind: str) -> dict[str, pd.DataFrame]:
+        """Replay the session side effects of a real fetch, return fresh copies."""
+        replay_session_state(snap.tab, snap.header_row_idx, snap.bracket_map,
+                             snap.prefix_map, snap.rebate_type_columns)
+        with self._lock:
+            self._counts[kind] += 1
+            self._snaps.move_to_end((snap.spreadsheet_id, snap.tab))
+        print(f"[SHEET-CACHE] {kind}: '{snap.tab}' (revision={snap.revision})")
+        return {k: v.copy() for k, v in snap.sections.items()}
+
+
+def _credentials_of(service: Any) -> Any | None:
+    return getattr(getattr(service, '_http', None), 'credentials', None)
+
+
+def has_drive_scope(creds: Any) -> bool:
+    """False only when the token's scopes are known and none of them reach Drive."""
+    scopes = getattr(creds, 'granted_scopes', None) or getattr(creds, 'scopes', None)
+    return not scopes or bool(DRIVE_READ_SCOPES & set(scopes))
+
+
+def scope_denied(exc: Exception) -> bool:
+    """A Drive 403 that will not go away on retry (scope / API disabled), not a rate limit."""
+    status = getattr(getattr(exc, 'resp', None), 'status', None)
+    if str(status) != '403':
+        return False
+    content = getattr(exc, 'content', b'') or b''
+    detail = (content.decode('utf-8', 'replace') if isinstance(content, bytes) else str(content)).lower()
+    return any(k in detail for k in ('insufficient', 'accessnotconfigured', 'service_disabled'))
+
+
+def replay_session_state(tab: str, header_row_idx: int, bracket_map: dict[str, str],
+                         prefix_map: dict[str, str], rebate_type_columns: list[str]) -> None:
+    """Session side effects of fetch_google_sheet_data, for tabs served without parsing."""
+    from src.session import session
+    session.set_mis_header_row_idx(header_row_idx)
+    session.set_mis_bracket_map({**session.get_mis_bracket_map(), **bracket_map})
+    session.set_mis_prefix_map({**session.get_mis_prefix_map(), **prefix_map})
+    rebate = list(session.get_mis_rebate_type_columns())
+    rebate += [c for c in rebate_type_columns if c not in rebate]
+    session.set_mis_rebate_type_columns(rebate)
+    session.set_mis_current_sheet(tab)
+
+
+# Singleton — reconfigured by init_tab_cache() from the app factory
+tab_cache = TabSnapshotCache()
+
+
+def init_tab_cache(config: Any) -> TabSnapshotCache:
+    """
+    Build the singleton from app config.
+
+    Config keys (settings.json or app.config):
+        SHEET_CACHE_ENABLED             = true
+        SHEET_CACHE_REVALIDATE_SECONDS  = 10    serve without any I/O inside this window
+        SHEET_CACHE_MAX_TABS            = 24    LRU bound
+        SHEET_HEADER_TTL_SECONDS        = 300   remembered header rows (write-back paths)
+    """
+    global tab_cache
+    tab_cache = TabSnapshotCache(
+        enabled=bool(config.get('SHEET_CACHE_ENABLED', True)),
+        revalidate_seconds=float(config.get('SHEET_CACHE_REVALIDATE_SECONDS',
+                                            DEFAULT_REVALIDATE_SECONDS)),
+        max_tabs=int(config.get('SHEET_CACHE_MAX_TABS', DEFAULT_MAX_TABS)),
+        header_ttl_seconds=float(config.get('SHEET_HEADER_TTL_SECONDS',
+                                            DEFAULT_HEADER_TTL_SECONDS)),
+    )
+    return tab_cache
+
+
+def get_tab_cache() -> TabSnapshotCache:
+    return tab_cache
@@ -0,0 +1,499 @@
+# src/integrations/sheet_mirror.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Local SQLite mirror of parsed Google Sheet tabs.
+#
+# The tab snapshot cache (sheet_cache.py) is in-memory and bounded; once a
+# process restarts, or the Sheets API is slow / failing, every audit route
+# is back to a live round trip — or an empty result, because
+# fetch_google_sheet_data() swallows errors.
+#
+# Every tab parsed by fetch_google_sheet_data / multi_tab is mirrored (via
+# TabSnapshotCache.store) into config/cache/sheet_mirror.db:
+#
+#   mirror_tabs     one row per (spreadsheet, tab): revision, checksum,
+#                   header row, bracket/prefix maps, section column order
+#   mirror_rows     one row per sheet row: section, _SHEET_ROW_NUM, row hash,
+#                   brand, weekday/date text, raw MIS ID cell, cell values
+#   mirror_mis_ids  MIS IDs parsed out of the (tagged) MIS ID cell
+#   mirror_dates    concrete dates a row is active on, for its month tab
+#
+# Sync is incremental: unchanged tab checksum → nothing written; otherwise
+# only rows whose hash changed are rewritten and vanished rows deleted.
+# Writes run on one background thread so routes never wait on SQLite.
+#
+# Readers:
+#   load_sections(sid, tab)  → sections dict, same shape as a live fetch
+#   query(sid, brand=, mis_id=, weekday=, on_date=, tab=, section=)
+#   serve_offline(tab)       → fetch_google_sheet_data's fallback when the
+#                              API call fails (session side effects replayed);
+#                              each DataFrame's attrs carry 'mirrored_at'
+#   offline_marker(sections) → {'offline': True, 'mirrored_at': ...} for routes
+#                              to merge into their JSON, {} for live data
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+PROJECT_ROOT    = Path(__file__).resolve().parent.parent.parent
+DEFAULT_DB_PATH = PROJECT_ROOT / 'config' / 'cache' / 'sheet_mirror.db'
+
+SECTIONS = ('weekly', 'monthly', 'sale')
+
+_MIS_ID_RE = re.compile(r'\b\d{3,}\b')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mirror_tabs (
+    spreadsheet_id      TEXT NOT NULL,
+    tab                 TEXT NOT NULL,
+    month               INTEGER,
+    year                INTEGER,
+    revision            TEXT,
+    checksum            TEXT NOT NULL,
+    header_row_idx      INTEGER NOT NULL,
+    bracket_map         TEXT NOT NULL,
+    prefix_map          TEXT NOT NULL,
+    rebate_type_columns TEXT NOT NULL,
+    columns             TEXT NOT NULL,
+    synced_at           REAL NOT NULL,
+    PRIMARY KEY (spreadsheet_id, tab)
+);
+CREATE TABLE IF NOT EXISTS mirror_rows (
+    spreadsheet_id TEXT NOT NULL,
+    tab            TEXT NOT NULL,
+    section        TEXT NOT NULL,
+    sheet_row      INTEGER NOT NULL,
+    row_hash       TEXT NOT NULL,
+    brand          TEXT NOT NULL,
+    weekday        TEXT NOT NULL,
+    mis_id_raw     TEXT NOT NULL,
+    cells          TEXT NOT NULL,
+    PRIMARY KEY (spreadsheet_id, tab, section, sheet_row)
+);
+CREATE INDEX IF NOT EXISTS ix_mirror_rows_brand
+    ON mirror_rows (spreadsheet_id, brand COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS mirror_mis_ids (
+    spreadsheet_id TEXT NOT NULL,
+    tab            TEXT NOT NULL,
+    section        TEXT NOT NULL,
+    sheet_row      INTEGER NOT NULL,
+    mis_id         TEXT NOT NULL,
+    PRIMARY KEY (spreadsheet_id, tab, section, sheet_row, mis_id)
+);
+CREATE INDEX IF NOT EXISTS ix_mirror_mis_ids ON mirror_mis_ids (spreadsheet_id, mis_id);
+CREATE TABLE IF NOT EXISTS mirror_dates (
+    spreadsheet_id TEXT NOT NULL,
+    tab            TEXT NOT NULL,
+    section        TEXT NOT NULL,
+    sheet_row      INTEGER NOT NULL,
+    day            TEXT NOT NULL,
+    PRIMARY KEY (spreadsheet_id, tab, section, sheet_row, day)
+);
+CREATE INDEX IF NOT EXISTS ix_mirror_dates ON mirror_dates (spreadsheet_id, day);
+"""
+
+_CHILD_TABLES = ('mirror_mis_ids', 'mirror_dates')
+
+
+def _jsonable(v: Any) -> Any:
+    if v is None:
+        return None
+    if hasattr(v, 'item') and not isinstance(v, (str, bytes)):
+        try:
+            v = v.item()                    # numpy scalar → Python
+        except (ValueError, AttributeError):
+            pass
+    if isinstance(v, float) and v != v:     # NaN
+        return None
+    if isinstance(v, (str, int, float, bool)):
+        return v
+    try:
+        if pd.isna(v):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return str(v)
+
+
+def _row_fields(row: pd.Series, section: str, month_year: tuple[int, int] | None,
+                bmap: dict, pmap: dict) -> tuple[str, str, str, list[str], list[str]]:
+    """(brand, weekday/date text, raw MIS ID cell, MIS IDs, ISO dates) — auditor's column rules."""
+    from src.utils.date_helpers import (
+        expand_weekday_to_dates,
+        get_monthly_day_of_month,
+        parse_monthly_dates,
+        parse_sale_dates,
+    )
+    from src.utils.sheet_helpers import get_col
+
+    brand = str(get_col(row, ['[Brand]', 'Brand'], '', bmap, pmap)).strip()
+    if section == 'weekly':
+        when = str(get_col(row, ['[Weekday]', 'Weekday', 'Day of Week'], '', bmap, pmap)).strip()
+    elif section == 'monthly':
+        when = get_monthly_day_of_month(row) or ''
+    else:
+        when = str(get_col(row, ['[Weekday]', 'Sale Runs:', 'Contracted Duration',
+                                 'Weekday/ Day of Month', 'Day of Week', 'Weekday'], '', bmap, pmap)).strip()
+    mis_raw = str(get_col(row, ['MIS ID', 'ID'], '', bmap, pmap)).strip()
+    if mis_raw.lower() in ('nan', 'none'):
+        mis_raw = ''
+
+    days: list[str] = []
+    if month_year and when and when != '-':
+        m, y = month_year
+        try:
+            if section == 'weekly':
+                parsed = [d for part in re.split(r'[,/&]', when)
+                          for d in expand_weekday_to_dates(part, m, y)]
+            elif section == 'monthly':
+                parsed = parse_monthly_dates(when, m, y)
+            else:
+                parsed = parse_sale_dates(when, m, y)
+            days = sorted({d.isoformat() for d in parsed})
+        except Exception:
+            days = []
+    return brand, when, mis_raw, _MIS_ID_RE.findall(mis_raw), days
+
+
+class SheetMirror:
+    """SQLite-backed mirror. Thread-local connections; writes serialised on one worker."""
+
+    def __init__(self, db_path: Path | str = DEFAULT_DB_PATH, enabled: bool = True,
+                 background: bool = True) -> None:
+        self.enabled    = enabled
+        self.background = background
+        self.db_path    = Path(db_path)
+        self._local     = threading.local()
+        self._lock      = threading.Lock()
+        self._pending: list[Future] = []
+        self._executor: ThreadPoolExecutor | None = None
+        self._counts    = {'syncs': 0, 'unchanged_tabs': 0, 'rows_written': 0,
+                           'rows_deleted': 0, 'offline_serves': 0, 'errors': 0}
+        if self.enabled:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn().executescript(_SCHEMA)
+
+    # ── Connection ───────────────────────────────────────────────────────────
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    # ── Write side ───────────────────────────────────────────────────────────
+
+    def sync(self, spreadsheet_id: str, tab: str, sections: dict[str, pd.DataFrame],
+             checksum: str, revision: str | None, header_row_idx: int,
+             bracket_map: dict, prefix_map: dict, rebate_type_columns: list) -> Future | None:
+        """Queue a tab for mirroring. Frames must not be mutated afterwards."""
+        if not self.enabled:
+            return None
+        args = (spreadsheet_id, tab, sections, checksum, revision, int(header_row_idx),
+                dict(bracket_map), dict(prefix_map), list(rebate_type_columns))
+        if not self.background:
+            self._sync_now(*args)
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sheet-mirror')
+            fut = self._executor.submit(self._sync_now, *args)
+            self._pending = [f for f in self._pending if not f.done()] + [fut]
+        return fut
+
+    def flush(self, timeout: float | None = 30) -> None:
+        """Wait for queued syncs (tests, shutdown)."""
+        with self._lock:
+            pending = list(self._pending)
+        for fut in pending:
+            try:
+                fut.result(timeout=timeout)
+            except Exception:
+                pass
+
+    def _sync_now(self, spreadsheet_id: str, tab: str, sections: dict[str, pd.DataFrame],
+                  checksum: str, revision: str | None, header_row_idx: int,
+                  bracket_map: dict, prefix_map: dict, rebate_type_columns: list) -> None:
+        from src.integrations.multi_tab import tab_month
+        try:
+            t0   = time.perf_counter()
+            conn = self._conn()
+            prev = conn.execute(
+                "SELECT checksum FROM mirror_tabs WHERE spreadsheet_id=? AND tab=?",
+                (spreadsheet_id, tab)).fetchone()
+            meta = (revision, header_row_idx, json.dumps(bracket_map), json.dumps(prefix_map),
+                    json.dumps(rebate_type_columns), time.time())
+            if prev is not None and prev['checksum'] == checksum:
+                with conn:
+                    conn.execute(
+                        "UPDATE mirror_tabs SET revision=?, header_row_idx=?, bracket_map=?, "
+                        "prefix_map=?, rebate_type_columns=?, synced_at=? "
+                        "WHERE spreadsheet_id=? AND tab=?", (*meta, spreadsheet_id, tab))
+                self._bump('unchanged_tabs')
+                return
+
+            month_year = tab_month(tab)
+            existing = {(r['section'], r['sheet_row']): r['row_hash'] for r in conn.execute(
+                "SELECT section, sheet_row, row_hash FROM mirror_rows WHERE spreadsheet_id=? AND tab=?",
+                (spreadsheet_id, tab))}
+            columns: dict[str, list[str]] = {}
+            upserts: list[tuple] = []
+            children: list[tuple[str, int, list[str], list[str]]] = []
+            seen: set[tuple[str, int]] = set()
+
+            for section in SECTIONS:
+                df = sections.get(section)
+                if df is None or df.empty:
+                    columns[section] = [] if df is None else [str(c) for c in df.columns]
+                    continue
+                cols = [str(c) for c in df.columns]
+                columns[section] = cols
+                col_sig = json.dumps(cols)
+                for pos, (idx, row) in enumerate(df.iterrows()):
+                    raw_num  = row.get('_SHEET_ROW_NUM', None)
+                    sheet_row = int(raw_num) if raw_num is not None and not pd.isna(raw_num) else pos + 2
+                    cells    = json.dumps([_jsonable(v) for v in row.tolist()], ensure_ascii=False)
+                    row_hash = hashlib.blake2b((col_sig + cells).encode('utf-8'), digest_size=12).hexdigest()
+                    key = (section, sheet_row)
+                    seen.add(key)
+                    if existing.get(key) == row_hash:
+                        continue
+                    brand, when, mis_raw, ids, days = _row_fields(
+                        row, section, month_year, bracket_map, prefix_map)
+                    upserts.append((spreadsheet_id, tab, section, sheet_row, row_hash,
+                                    brand, when, mis_raw, cells))
+                    children.append((section, sheet_row, ids, days))
+
+            gone = [k for k in existing if k not in seen]
+            with conn:
+                for section, sheet_row in gone + [(c[0], c[1]) for c in children]:
+                    for table in _CHILD_TABLES:
+                        conn.execute(f"DELETE FROM {table} WHERE spreadsheet_id=? AND tab=? "
+                                     "AND section=? AND sheet_row=?",
+                                     (spreadsheet_id, tab, section, sheet_row))
+                conn.executemany(
+                    "DELETE FROM mirror_rows WHERE spreadsheet_id=? AND tab=? AND section=? AND sheet_row=?",
+                    [(spreadsheet_id, tab, s, r) for s, r in gone])
+                conn.executemany(
+                    "INSERT OR REPLACE INTO mirror_rows (spreadsheet_id, tab, section, sheet_row, "
+                    "row_hash, brand, weekday, mis_id_raw, cells) VALUES (?,?,?,?,?,?,?,?,?)", upserts)
+                conn.executemany(
+                    "INSERT OR IGNORE INTO mirror_mis_ids VALUES (?,?,?,?,?)",
+                    [(spreadsheet_id, tab, s, r, mid) for s, r, ids, _ in children for mid in ids])
+                conn.executemany(
+                    "INSERT OR IGNORE INTO mirror_dates VALUES (?,?,?,?,?)",
+                    [(spreadsheet_id, tab, s, r, d) for s, r, _, days in children for d in days])
+                conn.execute(
+                    "INSERT OR REPLACE INTO mirror_tabs (spreadsheet_id, tab, month, year, revision, "
+                    "checksum, header_row_idx, bracket_map, prefix_map, rebate_type_columns, columns, "
+                    "synced_at) VALUES (?,?,?,?,?,?,?,?,?,?,?,?)",
+                    (spreadsheet_id, tab, *(month_year or (None, None)), revision, checksum,
+                     header_row_idx, meta[2], meta[3], meta[4], json.dumps(columns), meta[5]))
+            with self._lock:
+                self._counts['syncs']        += 1
+                self._counts['rows_written'] += len(upserts)
+                self._counts['rows_deleted'] += len(gone)
+            print(f"[SHEET-MIRROR] '{tab}': {len(upserts)} row(s) written, {len(gone)} removed "
+                  f"in {(time.perf_counter() - t0) * 1000:.0f} ms")
+        except Exception as e:
+            self._bump('errors')
+            print(f"[SHEET-MIRROR] Sync failed for '{tab}': {e}")
+
+    # ── Read side ────────────────────────────────────────────────────────────
+
+    def load_sections(self, spreadsheet_id: str, tab: str
+                      ) -> tuple[dict[str, pd.DataFrame], dict[str, Any]] | None:
+        """(sections, tab meta) rebuilt from the mirror, or None if the tab was never mirrored."""
+        if not self.enabled:
+            return None
+        conn = self._conn()
+        meta = conn.execute("SELECT * FROM mirror_tabs WHERE spreadsheet_id=? AND tab=?",
+                            (spreadsheet_id, tab)).fetchone()
+        if meta is None:
+            return None
+        columns = json.loads(meta['columns'])
+        rows: dict[str, list[list[Any]]] = {s: [] for s in SECTIONS}
+        for r in conn.execute("SELECT section, cells FROM mirror_rows WHERE spreadsheet_id=? AND tab=? "
+                              "ORDER BY sheet_row", (spreadsheet_id, tab)):
+            rows.setdefault(r['section'], []).append(json.loads(r['cells']))
+        sections = {s: pd.DataFrame(rows.get(s, []), columns=columns.get(s, [])) if columns.get(s)
+                    else pd.DataFrame() for s in SECTIONS}
+        info = {
+            'tab':                 tab,
+            'revision':            meta['revision'],
+            'header_row_idx':      meta['header_row_idx'],
+            'bracket_map':         json.loads(meta['bracket_map']),
+            'prefix_map':          json.loads(meta['prefix_map']),
+            'rebate_type_columns': json.loads(meta['rebate_type_columns']),
+            'synced_at':           meta['synced_at'],
+        }
+        return sections, info
+
+    def query(self, spreadsheet_id: str, brand: str | None = None, mis_id: str | None = None,
+              weekday: str | None = None, on_date: date | None = None, tab: str | None = None,
+              section: str | None = None, limit: int = 500) -> list[dict[str, Any]]:
+        """
+        Mirrored rows matching every filter given. brand / weekday are
+        case-insensitive substrings; mis_id matches any ID in the cell.
+        """
+        if not self.enabled:
+            return []
+        where, params = ['r.spreadsheet_id = ?'], [spreadsheet_id]
+        if tab:
+            where.append('r.tab = ?'); params.append(tab)
+        if section:
+            where.append('r.section = ?'); params.append(section)
+        if brand:
+            where.append("r.brand LIKE ? COLLATE NOCASE"); params.append(f'%{brand.strip()}%')
+        if weekday:
+            where.append("r.weekday LIKE ? COLLATE NOCASE"); params.append(f'%{weekday.strip()}%')
+        if mis_id:
+            where.append("EXISTS (SELECT 1 FROM mirror_mis_ids m WHERE m.spreadsheet_id = r.spreadsheet_id "
+                         "AND m.tab = r.tab AND m.section = r.section AND m.sheet_row = r.sheet_row "
+                         "AND m.mis_id = ?)")
+            params.append(str(mis_id).strip())
+        if on_date:
+            where.append("EXISTS (SELECT 1 FROM mirror_dates d WHERE d.spreadsheet_id = r.spreadsheet_id "
+                         "AND d.tab = r.tab AND d.section = r.section AND d.sheet_row = r.sheet_row "
+                         "AND d.day = ?)")
+            params.append(on_date.isoformat())
+
+        conn = self._conn()
+        columns = {t['tab']: json.loads(t['columns']) for t in conn.execute(
+            "SELECT tab, columns FROM mirror_tabs WHERE spreadsheet_id=?", (spreadsheet_id,))}
+        out: list[dict[str, Any]] = []
+        sql = (f"SELECT r.* FROM mirror_rows r WHERE {' AND '.join(where)} "
+               "ORDER BY r.tab, r.sheet_row LIMIT ?")
+        for r in conn.execute(sql, (*params, int(limit))):
+            cols = columns.get(r['tab'], {}).get(r['section'], [])
+            ids  = [m['mis_id'] for m in conn.execute(
+                "SELECT mis_id FROM mirror_mis_ids WHERE spreadsheet_id=? AND tab=? AND section=? "
+                "AND sheet_row=?", (spreadsheet_id, r['tab'], r['section'], r['sheet_row']))]
+            out.append({
+                'tab':       r['tab'],
+                'section':   r['section'],
+                'sheet_row': r['sheet_row'],
+                'brand':     r['brand'],
+                'weekday':   r['weekday'],
+                'mis_ids':   ids,
+                'row':       dict(zip(cols, json.loads(r['cells']))),
+            })
+        return out
+
+    def tabs(self, spreadsheet_id: str | None = None) -> list[dict[str, Any]]:
+        if not self.enabled:
+            return []
+        sql, params = "SELECT t.spreadsheet_id, t.tab, t.revision, t.synced_at, " \
+                      "(SELECT COUNT(*) FROM mirror_rows r WHERE r.spreadsheet_id = t.spreadsheet_id " \
+                      "AND r.tab = t.tab) AS rows FROM mirror_tabs t", ()
+        if spreadsheet_id:
+            sql, params = sql + " WHERE t.spreadsheet_id = ?", (spreadsheet_id,)
+        return [{'spreadsheet_id': r['spreadsheet_id'], 'tab': r['tab'], 'revision': r['revision'],
+                 'rows': r['rows'], 'age_sec': round(time.time() - r['synced_at'], 1)}
+                for r in self._conn().execute(sql + " ORDER BY t.synced_at DESC", params)]
+
+    def serve_offline(self, tab: str) -> dict[str, pd.DataFrame] | None:
+        """Mirrored sections for the active spreadsheet, with session side effects replayed."""
+        from src.session import session
+        from src.integrations.sheet_cache import replay_session_state
+        spreadsheet_id = session.get_spreadsheet_id() if session is not None else ''
+        if not spreadsheet_id:
+            return None
+        try:
+            loaded = self.load_sections(spreadsheet_id, tab)
+        except sqlite3.Error as e:
+            print(f"[SHEET-MIRROR] Offline read failed: {e}")
+            return None
+        if loaded is None:
+            return None
+        sections, info = loaded
+        replay_session_state(tab, info['header_row_idx'], info['bracket_map'],
+                             info['prefix_map'], info['rebate_type_columns'])
+        mirrored_at = datetime.fromtimestamp(info['synced_at']).isoformat(timespec='seconds')
+        for df in sections.values():
+            df.attrs['mirrored_at'] = mirrored_at
+        self._bump('offline_serves')
+        print(f"[SHEET-MIRROR] Serving '{tab}' from local mirror "
+              f"(synced {time.time() - info['synced_at']:.0f}s ago)")
+        return sections
+
+    def clear(self, spreadsheet_id: str | None = None) -> None:
+        if not self.enabled:
+            return
+        conn = self._conn()
+        with conn:
+            for table in ('mirror_tabs', 'mirror_rows', *_CHILD_TABLES):
+                if spreadsheet_id is None:
+                    conn.execute(f"DELETE FROM {table}")
+                else:
+                    conn.execute(f"DELETE FROM {table} WHERE spreadsheet_id=?", (spreadsheet_id,))
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        return {'enabled': self.enabled, 'db_path': str(self.db_path), 'counts': counts,
+                'tabs': self.tabs() if self.enabled else []}
+
+    def shutdown(self) -> None:
+        self.flush(timeout=10)
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def _bump(self, key: str) -> None:
+        with self._lock:
+            self._counts[key] += 1
+
+
+def offline_marker(sections: Any) -> dict[str, Any]:
+    """{'offline': True, 'mirrored_at': ...} when sections came from serve_offline(), else {}."""
+    if not isinstance(sections, dict):
+        return {}
+    for df in sections.values():
+        mirrored_at = getattr(df, 'attrs', {}).get('mirrored_at')
+        if mirrored_at:
+            return {'offline': True, 'mirrored_at': mirrored_at}
+    return {}
+
+
+# Singleton — rebuilt by init_sheet_mirror() from the app factory
+sheet_mirror: SheetMirror | None = None
+
+
+def init_sheet_mirror(config: Any) -> SheetMirror:
+    """
+    Config keys (settings.json or app.config):
+        SHEET_MIRROR_ENABLED  = true
+        SHEET_MIRROR_DB_PATH  = config/cache/sheet_mirror.db
+    """
+    global sheet_mirror
+    if sheet_mirror is not None:
+        sheet_mirror.shutdown()
+    sheet_mirror = SheetMirror(
+        db_path=config.get('SHEET_MIRROR_DB_PATH') or DEFAULT_DB_PATH,
+        enabled=bool(config.get('SHEET_MIRROR_ENABLED', True)),
+    )
+    return sheet_mirror
+
+
+def get_sheet_mirror() -> SheetMirror:
+    global sheet_mirror
+    if sheet_mirror is None:
+        sheet_mirror = SheetMirror(enabled=False)
+    return sheet_mirror
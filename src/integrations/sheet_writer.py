@@ -0,0 +1,483 @@
+# src/integrations/sheet_writer.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Coalescing write-back queue for Google Sheet cell updates.
+#
+# apply-matches, apply-blaze-titles and apply-split-id used to call
+# values().batchUpdate / values().update themselves, so confirming 100
+# matches one at a time meant hundreds of API calls and quota 429s.
+# They now enqueue cell writes here and return immediately with a ticket.
+#
+#   enqueue(spreadsheet_id, [CellWrite…]) → ticket id
+#   status(ticket) / summary()            → what the UI polls
+#   flush(spreadsheet_id=None, wait=True) → push pending writes now
+#
+# Per spreadsheet, writes are debounced (SHEET_WRITE_DEBOUNCE_MS after the
+# last enqueue, never later than SHEET_WRITE_MAX_DELAY_MS after the first)
+# and sent as ONE values().batchUpdate. A later plain write to the same cell
+# replaces an earlier one.
+#
+# Tagged MIS ID lines ("<TAG>: <id>", apply-split-id's W2: / PART2: / GAP: …)
+# are written verbatim: append=True adds the line to the cell's current
+# content (read in one values().batchGet at flush time, as late as possible,
+# so edits made in the sheet while the write was queued are kept; a line
+# already present is not added twice), append=False replaces the cell.
+#
+# Writes carry the header label the route matched its column by (`header`).
+# The same batchGet re-reads those header cells; if a column was inserted,
+# moved or renamed since the header was cached (sheets_access.get_header),
+# nothing is written: the batch fails with HeaderMismatchError and the tab's
+# remembered header is dropped, so the next apply re-detects it.
+#
+# 429 / 5xx responses are retried with exponential backoff + jitter
+# (SHEET_WRITE_MAX_RETRIES). A flush that still fails for a transient reason
+# (retries exhausted, network error, no Sheets service) is queued again with
+# a growing delay (SHEET_WRITE_REQUEUE_SEC, doubling up to REQUEUE_CAP_SEC);
+# its tickets stay 'queued' with the last error. Only a permanent 4xx fails
+# them. Flushed tabs are invalidated in the tab cache.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+DEFAULT_DEBOUNCE_MS  = 750
+DEFAULT_MAX_DELAY_MS = 3000
+DEFAULT_MAX_RETRIES  = 5
+BACKOFF_BASE_SEC     = 1.0
+BACKOFF_CAP_SEC      = 32.0
+DEFAULT_REQUEUE_SEC  = 30.0
+REQUEUE_CAP_SEC      = 600.0
+TICKETS_KEPT         = 200
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Ticket states
+QUEUED   = 'queued'
+FLUSHING = 'flushing'
+DONE     = 'done'
+FAILED   = 'failed'
+
+
+@dataclass
+class CellWrite:
+    """
+    One cell update. `tag` set → the line "<TAG>: <value>" (apply-split-id's
+    W2: / PART2: / GAP: / PATCH: lines), appended to the cell's current
+    content when append=True, else replacing the whole cell. `header` is
+    (1-based header row, label) as the caller saw it; checked at flush time.
+    """
+    tab:     str
+    row:     int             # 1-based sheet row
+    col:     int             # 0-based column index
+    value:   str             # plain value, or the MIS ID for tag writes
+    tag:     str | None = None
+    append:  bool       = False
+    header:  tuple[int, str] | None = None
+
+    @property
+    def key(self) -> tuple[str, int, int]:
+        return (self.tab, self.row, self.col)
+
+    def a1(self) -> str:
+        from src.integrations.sheets_access import a1_tab
+        from src.utils.sheet_helpers import get_col_letter
+        return f'{a1_tab(self.tab)}!{get_col_letter(self.col)}{self.row}'
+
+
+@dataclass
+class Ticket:
+    id:             str
+    spreadsheet_id: str
+    cells:          int
+    status:         str = QUEUED
+    error:          str | None = None
+    created_at:     float = field(default_factory=time.time)
+    flushed_at:     float | None = None
+    attempts:       int = 0                                        # failed flushes, re-queued
+    values:         dict[str, str] = field(default_factory=dict)  # A1 → final value
+    done:           threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'ticket':         self.id,
+            'spreadsheet_id': self.spreadsheet_id,
+            'cells':          self.cells,
+            'status':         self.status,
+            'error':          self.error,
+            'created_at':     self.created_at,
+            'flushed_at':     self.flushed_at,
+            'attempts':       self.attempts,
+            'values':         dict(self.values),
+        }
+
+
+class WriteQuotaError(RuntimeError):
+    """Raised when a Sheets call still fails with a retryable status after all retries."""
+
+
+class HeaderMismatchError(RuntimeError):
+    """A target column's header no longer reads what the caller matched it by."""
+
+
+def _http_status(exc: BaseException) -> int | None:
+    resp = getattr(exc, 'resp', None)
+    status = getattr(resp, 'status', None) or getattr(exc, 'status_code', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_permanent(exc: BaseException) -> bool:
+    """A 4xx other than 429, or a moved column: retrying the same batch cannot succeed."""
+    if isinstance(exc, HeaderMismatchError):
+        return True
+    status = _http_status(exc)
+    return status is not None and 400 <= status < 500 and status not in RETRY_STATUSES
+
+
+def _default_service() -> Any:
+    from src.session import session
+    return session.get_sheets_service()
+
+
+class _Pending:
+    """Writes waiting for one spreadsheet."""
+
+    def __init__(self) -> None:
+        self.ops:     OrderedDict[tuple[str, int, int], list[CellWrite]] = OrderedDict()
+        self.tickets: list[Ticket] = []
+        self.first_at = 0.0
+        self.last_at  = 0.0
+        self.retry_at = 0.0      # re-queued after a failed flush: not before this
+        self.attempts = 0
+
+
+class WriteBackQueue:
+    def __init__(
+        self,
+        debounce_ms: float = DEFAULT_DEBOUNCE_MS,
+        max_delay_ms: float = DEFAULT_MAX_DELAY_MS,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        service_getter: Callable[[], Any] | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        requeue_sec: float = DEFAULT_REQUEUE_SEC,
+    ) -> None:
+        self.debounce    = max(float(debounce_ms), 0.0) / 1000.0
+        self.max_delay   = max(float(max_delay_ms), float(debounce_ms)) / 1000.0
+        self.max_retries = max(int(max_retries), 0)
+        self.requeue_sec = max(float(requeue_sec), 0.0)
+        self._service    = service_getter or _default_service
+        self._sleep      = sleep
+
+        self._cond        = threading.Condition()
+        self._flush_lock  = threading.Lock()
+        self._pending:  dict[str, _Pending]      = {}
+        self._tickets:  OrderedDict[str, Ticket] = OrderedDict()
+        self._thread:   threading.Thread | None  = None
+        self._stopped   = False
+        self._counts    = {'flushes': 0, 'api_calls': 0, 'cells_written': 0,
+                           'retries': 0, 'failed_flushes': 0, 'requeued': 0}
+
+    # ── Public API ───────────────────────────────────────────────────────────
+
+    def enqueue(self, spreadsheet_id: str, writes: list[CellWrite]) -> Ticket:
+        """Queue writes for one spreadsheet. Returns the ticket the UI can poll."""
+        ticket = Ticket(id=uuid.uuid4().hex[:12], spreadsheet_id=spreadsheet_id, cells=len(writes))
+        now = time.time()
+        with self._cond:
+            pend = self._pending.setdefault(spreadsheet_id, _Pending())
+            if not pend.ops:
+                pend.first_at = now
+            pend.last_at = now
+            for w in writes:
+                if w.tag is None:
+                    pend.ops[w.key] = [w]         # plain write supersedes anything queued
+                else:
+                    pend.ops.setdefault(w.key, []).append(w)
+            pend.tickets.append(ticket)
+            self._tickets[ticket.id] = ticket
+            while len(self._tickets) > TICKETS_KEPT:
+                self._tickets.popitem(last=False)
+            self._ensure_thread()
+            self._cond.notify_all()
+        print(f"[WRITEBACK] Queued {len(writes)} cell(s) → ticket {ticket.id}")
+        return ticket
+
+    def flush(self, spreadsheet_id: str | None = None, wait: bool = True) -> list[Ticket]:
+        """Flush pending writes now (one spreadsheet or all). Returns the affected tickets."""
+        with self._cond:
+            sids = [spreadsheet_id] if spreadsheet_id else list(self._pending)
+            tickets = [t for sid in sids if sid in self._pending for t in self._pending[sid].tickets]
+        if wait:
+            for sid in sids:
+                self._flush_spreadsheet(sid)
+        else:
+            with self._cond:
+                for sid in sids:
+                    if sid in self._pending:
+                        self._pending[sid].first_at = 0.0
+                        self._pending[sid].retry_at = 0.0
+                self._cond.notify_all()
+        return tickets
+
+    def wait(self, ticket: Ticket, timeout: float | None = 60.0) -> Ticket:
+        """
+        Flush the ticket's spreadsheet immediately and wait for this attempt:
+        done, failed, or queued again for a retry (status 'queued', error set).
+        """
+        if ticket.status == QUEUED:
+            self._flush_spreadsheet(ticket.spreadsheet_id)
+        deadline = None if timeout is None else time.time() + timeout
+        while ticket.status == FLUSHING and not ticket.done.wait(0.05):
+            if deadline is not None and time.time() >= deadline:
+                break
+        return ticket
+
+    def status(self, ticket_id: str) -> dict[str, Any] | None:
+        t = self._tickets.get(ticket_id)
+        return t.to_dict() if t else None
+
+    def summary(self) -> dict[str, Any]:
+        with self._cond:
+            pending = {sid: len(p.ops) for sid, p in self._pending.items() if p.ops}
+            recent  = [t.to_dict() for t in list(self._tickets.values())[-20:]][::-1]
+            return {
+                'pending_cells':  sum(pending.values()),
+                'pending':        pending,
+                'debounce_ms':    int(self.debounce * 1000),
+                'max_delay_ms':   int(self.max_delay * 1000),
+                'counts':         dict(self._counts),
+                'recent':         recent,
+            }
+
+    def shutdown(self, flush: bool = True) -> None:
+        """Stop the scheduler thread, pushing whatever is still queued first."""
+        if flush:
+            try:
+                self.flush(wait=True)
+            except Exception as e:
+                print(f"[WRITEBACK] Final flush failed: {e}")
+        with self._cond:
+            self._stopped = True
+            left = sum(len(p.ops) for p in self._pending.values())
+            self._cond.notify_all()
+        if left:
+            print(f"[WRITEBACK] ✗ {left} cell(s) still unwritten at shutdown")
+
+    # ── Scheduler ────────────────────────────────────────────────────────────
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name='sheet-writeback', daemon=True)
+            self._thread.start()
+
+    def _due_at(self, pend: _Pending) -> float:
+        return max(min(pend.last_at + self.debounce, pend.first_at + self.max_delay), pend.retry_at)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                now  = time.time()
+                due  = {sid: self._due_at(p) for sid, p in self._pending.items() if p.ops}
+                ready = [sid for sid, at in due.items() if at <= now]
+                if not ready:
+                    timeout = (min(due.values()) - now) if due else None
+                    self._cond.wait(timeout)
+                    continue
+            for sid in ready:
+                try:
+                    self._flush_spreadsheet(sid)
+                except Exception as e:  # never let the scheduler die
+                    print(f"[WRITEBACK] Flush error for {sid[:12]}…: {e}")
+
+    # ── Flush ────────────────────────────────────────────────────────────────
+
+    def _flush_spreadsheet(self, spreadsheet_id: str) -> None:
+        with self._flush_lock:
+            with self._cond:
+                pend = self._pending.pop(spreadsheet_id, None)
+            if pend is None or not pend.ops:
+                return
+            for t in pend.tickets:
+                t.status = FLUSHING
+            try:
+                final = self._write(spreadsheet_id, pend.ops)
+                status, error = DONE, None
+            except Exception as e:
+                self._bump('failed_flushes')
+                if not _is_permanent(e):
+                    self._requeue(spreadsheet_id, pend, e)
+                    return
+                final, status, error = {}, FAILED, str(e)
+                print(f"[WRITEBACK] ✗ Flush failed ({len(pend.ops)} cells): {e}")
+
+            now = time.time()
+            for t in pend.tickets:
+                t.status, t.error, t.flushed_at = status, error, now
+                t.values = final
+                t.done.set()
+
+            if status == DONE:
+                from src.integrations.sheet_cache import get_tab_cache
+                for tab in {k[0] for k in pend.ops}:
+                    get_tab_cache().invalidate(spreadsheet_id, tab)
+
+    def _requeue(self, spreadsheet_id: str, pend: _Pending, exc: BaseException) -> None:
+        """Put a failed batch back ahead of anything queued since, to retry later."""
+        pend.attempts += 1
+        delay = min(self.requeue_sec * (2 ** (pend.attempts - 1)), REQUEUE_CAP_SEC)
+        error = f'{exc} — queued again, retry {pend.attempts} in {delay:.0f}s'
+        for t in pend.tickets:
+            t.attempts = pend.attempts
+        with self._cond:
+            newer = self._pending.get(spreadsheet_id)
+            if newer is not None:
+                for key, writes in newer.ops.items():
+                    if writes[0].tag is None:
+                        pend.ops[key] = writes     # a later plain write supersedes
+                    else:
+                        pend.ops.setdefault(key, []).extend(writes)
+                pend.tickets.extend(newer.tickets)
+                pend.last_at = max(pend.last_at, newer.last_at)
+            pend.retry_at = time.time() + delay
+            self._pending[spreadsheet_id] = pend
+            for t in pend.tickets:
+                t.status, t.error = QUEUED, error
+            self._counts['requeued'] += 1
+            self._ensure_thread()
+            self._cond.notify_all()
+        print(f"[WRITEBACK] ✗ Flush failed ({len(pend.ops)} cells): {error}")
+
+    def _write(self, spreadsheet_id: str,
+               ops: OrderedDict[tuple[str, int, int], list[CellWrite]]) -> dict[str, str]:
+        """Check headers, resolve tag lines, then one batchUpdate. Returns A1 → value written."""
+        service = self._service()
+        if not service:
+            raise RuntimeError('Sheets service not available')
+
+        tagged = [k for k, ws in ops.items() if ws[0].tag is not None]
+        headers: dict[tuple[str, int, int], str] = {}   # header cell → label the caller matched
+        for writes in ops.values():
+            for w in writes:
+                if w.header is not None:
+                    headers[(w.tab, int(w.header[0]), w.col)] = str(w.header[1])
+        current: dict[tuple[str, int, int], str] = {}
+        if tagged or headers:
+            keys = tagged + [k for k in headers if k not in tagged]
+            ranges = [CellWrite(*k, value='').a1() for k in keys]
+            resp = self._call(lambda: service.spreadsheets().values().batchGet(
+                spreadsheetId=spreadsheet_id, ranges=ranges, majorDimension='ROWS',
+            ).execute())
+            value_ranges = resp.get('valueRanges', [])
+            for i, k in enumerate(keys):
+                vals = value_ranges[i].get('values', []) if i < len(value_ranges) else []
+                current[k] = str(vals[0][0]) if vals and vals[0] else ''
+            self._check_headers(spreadsheet_id, headers, current)
+
+        final: dict[str, str] = {}
+        data: list[dict[str, Any]] = []
+        for key, writes in ops.items():
+            # ops per cell are [tag…] or [plain, tag…] (a plain write resets the list)
+            if writes[0].tag is None:
+                value, tag_ops = str(writes[0].value), writes[1:]
+            else:
+                value, tag_ops = current.get(key, ''), writes
+            for w in tag_ops:
+                line = f'{w.tag.upper()}: {w.value}'
+                if w.append and line.lower() in (l.strip().lower() for l in value.split('\n')):
+                    continue  # line already present — a re-sent apply must not duplicate it
+                value = f'{value}\n{line}' if w.append and value else line
+            a1 = writes[0].a1()
+            final[a1] = value
+            data.append({'range': a1, 'values': [[value]]})
+
+        self._call(lambda: service.spreadsheets().values().batchUpdate(
+            spreadsheetId=spreadsheet_id,
+            body={'valueInputOption': 'RAW', 'data': data},
+        ).execute())
+        self._bump('flushes')
+        self._bump('cells_written', len(data))
+        print(f"[WRITEBACK] ✓ Flushed {len(data)} cell(s) in one batchUpdate "
+              f"({len(tagged)} tagged read-modify-write)")
+        return final
+
+    def _check_headers(self, spreadsheet_id: str, headers: dict[tuple[str, int, int], str],
+                       current: dict[tuple[str, int, int], str]) -> None:
+        """Raise HeaderMismatchError (and forget the tab's header) if a target column moved."""
+        moved = [(k, label) for k, label in headers.items()
+                 if current.get(k, '').strip() != label.strip()]
+        if not moved:
+            return
+        from src.integrations.sheet_cache import get_tab_cache
+        for tab in {k[0] for k, _ in moved}:
+            get_tab_cache().invalidate(spreadsheet_id, tab, headers=True)
+        key, label = moved[0]
+        raise HeaderMismatchError(
+            f"{CellWrite(*key, value='').a1()} now reads {current.get(key, '')!r}, not {label!r} — "
+            f"the sheet's columns changed; nothing was written, apply again")
+
+    def _bump(self, counter: str, n: int = 1) -> None:
+        with self._cond:
+            self._counts[counter] += n
+
+    def _call(self, fn: Callable[[], Any]) -> Any:
+        """Run one Sheets call, backing off on 429 / 5xx."""
+        attempt = 0
+        while True:
+            try:
+                self._bump('api_calls')
+                return fn()
+            except Exception as e:
+                status = _http_status(e)
+                if status not in RETRY_STATUSES:
+                    raise
+                if attempt >= self.max_retries:
+                    raise WriteQuotaError(f'Sheets API {status} after {attempt} retries') from e
+                delay = min(BACKOFF_BASE_SEC * (2 ** attempt), BACKOFF_CAP_SEC)
+                delay += random.uniform(0, delay / 2)
+                self._bump('retries')
+                print(f"[WRITEBACK] Sheets {status} — retry {attempt + 1}/{self.max_retries} "
+                      f"in {delay:.1f}s")
+                self._sleep(delay)
+                attempt += 1
+
+
+# Singleton — rebuilt by init_write_queue() from the app factory
+write_queue: WriteBackQueue | None = None
+
+
+def init_write_queue(config: Any) -> WriteBackQueue:
+    """
+    Config keys (settings.json or app.config):
+        SHEET_WRITE_DEBOUNCE_MS   = 750    quiet time before a batch goes out
+        SHEET_WRITE_MAX_DELAY_MS  = 3000   upper bound while writes keep arriving
+        SHEET_WRITE_MAX_RETRIES   = 5      429 / 5xx retries per API call
+        SHEET_WRITE_REQUEUE_SEC   = 30     first re-queue delay after a failed flush (doubles)
+    """
+    global write_queue
+    if write_queue is not None:
+        write_queue.shutdown(flush=True)
+    write_queue = WriteBackQueue(
+        debounce_ms=float(config.get('SHEET_WRITE_DEBOUNCE_MS', DEFAULT_DEBOUNCE_MS)),
+        max_delay_ms=float(config.get('SHEET_WRITE_MAX_DELAY_MS', DEFAULT_MAX_DELAY_MS)),
+        max_retries=int(config.get('SHEET_WRITE_MAX_RETRIES', DEFAULT_MAX_RETRIES)),
+        requeue_sec=float(config.get('SHEET_WRITE_REQUEUE_SEC', DEFAULT_REQUEUE_SEC)),
+    )
+    return write_queue
+
+
+def get_write_queue() -> WriteBackQueue:
+    global write_queue
+    if write_queue is None:
+        write_queue = WriteBackQueue()
+    return write_queue
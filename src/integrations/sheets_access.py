@@ -0,0 +1,383 @@
+# src/integrations/sheets_access.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Thin Sheets access layer: spreadsheet metadata and multi-range reads.
+#
+# Before this module every helper paid for its own full
+# spreadsheets().get() (every sheet property, every protected range, every
+# conditional format) just to find a tab title or a gid, then issued its own
+# values().get():
+#
+#   get_sheet_gid / get_available_tabs          metadata
+#   load_settings_dropdown_data                 metadata + Settings + Brand tab
+#   load_brand_settings                         metadata + Brand Rebate tab
+#   _build_brand_aw_set                         metadata + Brand Rebate tab
+#
+# Now:
+#   get_metadata()         one spreadsheets().get() with a `fields` mask,
+#                          cached per spreadsheet (tab → gid / gridProperties)
+#   batch_get()            one values().batchGet() for any number of ranges
+#   get_settings_bundle()  metadata + Settings/Brand Rebate rows in ≤ 2 calls,
+#                          shared by the dropdown, brand-settings and AW loaders
+#   read_tab_values()      open-ended tab read (A1:<col>, no silent A1:AZ2000
+#                          truncation), as wide as the last detected header;
+#                          tabs taller than a chunk are paged in row chunks,
+#                          stopping at the END420 marker
+#   get_header()           header row for write-back routes, reused from the
+#                          last read of that tab instead of fetching A1:BZ20
+#   read_tabs_values()     several whole tabs in one values().batchGet()
+#                          (multi-month loader, src/integrations/multi_tab.py)
+#
+# Callers pass the service explicitly; nothing here authenticates.
+# invalidate() after loading a different sheet or switching profile.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+# Only what the app reads — skips protectedRanges, conditionalFormats, etc.
+METADATA_FIELDS = (
+    'spreadsheetId,properties(title),'
+    'sheets(properties(sheetId,title,index,gridProperties(rowCount,columnCount,frozenRowCount)))'
+)
+
+DEFAULT_METADATA_TTL = 300.0
+DEFAULT_SETTINGS_TTL = 60.0
+
+SETTINGS_RANGE = 'A1:Z500'
+BRAND_RANGE    = 'A1:Z1000'
+
+LEGACY_TAB_RANGE     = 'A1:AZ2000'   # used only when grid size is unknown
+DEFAULT_CHUNK_ROWS   = 5000
+HEADER_SCAN_ROWS     = 20            # detect_header_row looks at the first 10
+HEADER_WIDTH_MARGIN  = 5             # spare columns read past the detected header
+STOP_MARKER          = 'END420'
+
+_lock = threading.Lock()
+_metadata: dict[str, tuple[float, dict]]   = {}
+_bundles:  dict[str, tuple[float, dict]]   = {}
+_calls:    dict[str, int]                  = {'metadata': 0, 'batch_get': 0}
+
+_metadata_ttl = DEFAULT_METADATA_TTL
+_settings_ttl = DEFAULT_SETTINGS_TTL
+_chunk_rows   = DEFAULT_CHUNK_ROWS
+
+
+def configure_sheets_access(config: Any) -> None:
+    """
+    Config keys (settings.json or app.config):
+        SHEETS_METADATA_TTL_SECONDS  = 300   tab list / gid / grid size
+        SHEETS_SETTINGS_TTL_SECONDS  = 60    Settings + Brand Rebate rows
+        SHEET_FETCH_CHUNK_ROWS       = 5000  tabs taller than this are paged
+    """
+    global _metadata_ttl, _settings_ttl, _chunk_rows
+    _metadata_ttl = float(config.get('SHEETS_METADATA_TTL_SECONDS', DEFAULT_METADATA_TTL))
+    _settings_ttl = float(config.get('SHEETS_SETTINGS_TTL_SECONDS', DEFAULT_SETTINGS_TTL))
+    _chunk_rows   = max(int(config.get('SHEET_FETCH_CHUNK_ROWS', DEFAULT_CHUNK_ROWS)), 1)
+
+
+def a1_tab(tab: str) -> str:
+    """Quote a tab title for A1 notation ('O''Brien' style escaping)."""
+    return "'" + str(tab).replace("'", "''") + "'"
+
+
+# ── Metadata ──────────────────────────────────────────────────────────────────
+
+def get_metadata(service: Any, spreadsheet_id: str, refresh: bool = False) -> dict:
+    """
+    Masked spreadsheet metadata, cached for SHEETS_METADATA_TTL_SECONDS.
+    Shape: {'title': str, 'tabs': {title: {'gid', 'index', 'rows', 'cols', 'frozen'}}}
+    """
+    now = time.time()
+    if not refresh:
+        with _lock:
+            hit = _metadata.get(spreadsheet_id)
+        if hit and now - hit[0] < _metadata_ttl:
+            return hit[1]
+
+    raw = service.spreadsheets().get(spreadsheetId=spreadsheet_id, fields=METADATA_FIELDS).execute()
+    tabs: dict[str, dict] = {}
+    for sheet in raw.get('sheets', []):
+        props = sheet.get('properties', {})
+        grid  = props.get('gridProperties', {})
+        tabs[props.get('title', '')] = {
+            'gid':    props.get('sheetId'),
+            'index':  props.get('index', len(tabs)),
+            'rows':   int(grid.get('rowCount', 0) or 0),
+            'cols':   int(grid.get('columnCount', 0) or 0),
+            'frozen': int(grid.get('frozenRowCount', 0) or 0),
+        }
+    meta = {'title': raw.get('properties', {}).get('title', ''), 'tabs': tabs}
+    with _lock:
+        _metadata[spreadsheet_id] = (now, meta)
+        _calls['metadata'] += 1
+    return meta
+
+
+def get_tab_titles(service: Any, spreadsheet_id: str, refresh: bool = False) -> list[str]:
+    tabs = get_metadata(service, spreadsheet_id, refresh)['tabs']
+    return sorted(tabs, key=lambda t: tabs[t]['index'])
+
+
+def get_gid(service: Any, spreadsheet_id: str, tab: str) -> str | None:
+    info = get_metadata(service, spreadsheet_id)['tabs'].get(tab)
+    return str(info['gid']) if info and info.get('gid') is not None else None
+
+
+def get_grid(service: Any, spreadsheet_id: str, tab: str) -> dict | None:
+    """{'rows', 'cols', 'frozen'} for a tab, or None if the tab is unknown."""
+    info = get_metadata(service, spreadsheet_id)['tabs'].get(tab)
+    return {k: info[k] for k in ('rows', 'cols', 'frozen')} if info else None
+
+
+def find_settings_tabs(titles: list[str]) -> tuple[str | None, str | None]:
+    """
+    (settings_tab, brand_rebate_tab). Brand Rebate: the first title containing
+    'brand rebate' / 'rebate agreement' (the brand loaders' rule; the old
+    dropdown loader kept the last one). Settings: the first other title
+    containing 'setting' — a Brand Rebate title never doubles as Settings.
+    """
+    def _is_brand(t: str) -> bool:
+        return 'brand rebate' in t.lower() or 'rebate agreement' in t.lower()
+
+    brand = next((t for t in titles if _is_brand(t)), None)
+    settings = next((t for t in titles if 'setting' in t.lower() and not _is_brand(t)), None)
+    return settings, brand
+
+
+# ── Values ────────────────────────────────────────────────────────────────────
+
+def batch_get(service: Any, spreadsheet_id: str, ranges: list[str]) -> list[list[list[Any]]]:
+    """One values().batchGet(); returns each range's rows in request order."""
+    if not ranges:
+        return []
+    resp = service.spreadsheets().values().batchGet(
+        spreadsheetId=spreadsheet_id,
+        ranges=list(ranges),
+        majorDimension='ROWS',
+    ).execute()
+    with _lock:
+        _calls['batch_get'] += 1
+    value_ranges = resp.get('valueRanges', [])
+    return [vr.get('values', []) for vr in value_ranges] + [[]] * (len(ranges) - len(value_ranges))
+
+
+def get_settings_bundle(service: Any, spreadsheet_id: str, refresh: bool = False) -> dict:
+    """
+    Everything the Settings-driven loaders need, in at most two API calls.
+    Keys: tabs, settings_tab, brand_tab, settings_rows, brand_rows.
+    Rows are [] when the tab does not exist.
+    """
+    now = time.time()
+    if not refresh:
+        with _lock:
+            hit = _bundles.get(spreadsheet_id)
+        if hit and now - hit[0] < _settings_ttl:
+            return hit[1]
+
+    titles = get_tab_titles(service, spreadsheet_id, refresh)
+    settings_tab, brand_tab = find_settings_tabs(titles)
+
+    wanted: list[tuple[str, str]] = []
+    if settings_tab:
+        # Settings doubles as the brand source when there is no Brand Rebate tab
+        span = SETTINGS_RANGE if brand_tab else BRAND_RANGE
+        wanted.append(('settings_rows', f'{a1_tab(settings_tab)}!{span}'))
+    if brand_tab:
+        wanted.append(('brand_rows', f'{a1_tab(brand_tab)}!{BRAND_RANGE}'))
+    fetched = batch_get(service, spreadsheet_id, [r for _, r in wanted])
+
+    bundle: dict[str, Any] = {
+        'tabs':          titles,
+        'settings_tab':  settings_tab,
+        'brand_tab':     brand_tab,
+        'settings_rows': [],
+        'brand_rows':    [],
+    }
+    for (key, _), rows in zip(wanted, fetched):
+        bundle[key] = rows
+    with _lock:
+        _bundles[spreadsheet_id] = (now, bundle)
+    print(f"[SHEETS-ACCESS] Settings bundle: settings={settings_tab!r} "
+          f"({len(bundle['settings_rows'])} rows), brand={brand_tab!r} "
+          f"({len(bundle['brand_rows'])} rows)")
+    return bundle
+
+
+def _grid_or_none(service: Any, spreadsheet_id: str, tab: str) -> dict | None:
+    try:
+        return get_grid(service, spreadsheet_id, tab)
+    except Exception as e:
+        print(f"[SHEETS-ACCESS] Grid size unavailable for '{tab}' ({e}); using {LEGACY_TAB_RANGE}")
+        return None
+
+
+def _read_cols(spreadsheet_id: str, tab: str, grid: dict) -> int:
+    """Columns to read: the detected header's width plus a margin, else the whole grid."""
+    from src.integrations.sheet_cache import get_tab_cache
+    cached = get_tab_cache().get_header(spreadsheet_id, tab)
+    if not cached or not cached[1]:
+        return grid['cols']
+    return min(len(cached[1]) + HEADER_WIDTH_MARGIN, grid['cols'])
+
+
+def _reaches_edge(values: list[list[Any]], cols: int, grid: dict) -> bool:
+    """A row filled up to a narrowed read's last column — the header may have grown."""
+    return cols < grid['cols'] and any(len(row) >= cols for row in values)
+
+
+def read_tab_values(service: Any, spreadsheet_id: str, tab: str,
+                    chunk_rows: int | None = None) -> list[list[Any]]:
+    """
+    All populated rows of a tab.
+
+    Rows are never bounded by the cached gridProperties (rows added since the
+    metadata was fetched would be cut off): tabs up to `chunk_rows` tall are
+    one open-ended values().get() ('Tab'!A1:<col>). Taller tabs are read in
+    row chunks, the last one open-ended; each chunk is padded back to its
+    full height (the API drops trailing blank rows) so list index + 1 is
+    still the sheet row number, and reading stops after the chunk containing
+    END420. Width is the detected header's plus HEADER_WIDTH_MARGIN; a row
+    reaching that edge triggers a re-read at the full grid width.
+    """
+    from src.utils.sheet_helpers import get_col_letter
+
+    def _get(a1: str) -> list[list[Any]]:
+        return service.spreadsheets().values().get(
+            spreadsheetId=spreadsheet_id, range=a1,
+        ).execute().get('values', [])
+
+    grid = _grid_or_none(service, spreadsheet_id, tab)
+    if not grid or not grid['rows'] or not grid['cols']:
+        return _get(f'{a1_tab(tab)}!{LEGACY_TAB_RANGE}')
+
+    cols = _read_cols(spreadsheet_id, tab, grid)
+
+    def _rows(start: int, end: int | None = None) -> list[list[Any]]:
+        nonlocal cols
+        part = _get(f"{a1_tab(tab)}!A{start}:{get_col_letter(cols - 1)}{end or ''}")
+        if _reaches_edge(part, cols, grid):
+            cols = grid['cols']
+            part = _get(f"{a1_tab(tab)}!A{start}:{get_col_letter(cols - 1)}{end or ''}")
+        return part
+
+    total = grid['rows']
+    chunk = max(int(chunk_rows or _chunk_rows), 1)
+    if total <= chunk:
+        return _rows(1)
+
+    values: list[list[Any]] = []
+    start = 1
+    while True:
+        last = start + chunk - 1 >= total
+        part = _rows(start, None if last else start + chunk - 1)
+        hit_marker = any(STOP_MARKER in ' '.join(str(c) for c in row).upper() for row in part)
+        values.extend(part)
+        if hit_marker or last:
+            break
+        values.extend([[]] * (chunk - len(part)))
+        start += chunk
+    print(f"[SHEETS-ACCESS] '{tab}': read {len(values)} rows (grid {total}) in chunks of {chunk}")
+    while values and not values[-1]:
+        values.pop()
+    return values
+
+
+def read_tabs_values(service: Any, spreadsheet_id: str,
+                     tabs: list[str]) -> dict[str, list[list[Any]]]:
+    """
+    read_tab_values() for several tabs. Every tab that fits in one chunk goes
+    into a single values().batchGet() (open-ended ranges); taller tabs, and
+    tabs whose rows reach a narrowed read's edge, are read individually.
+    """
+    from src.utils.sheet_helpers import get_col_letter
+
+    single: dict[str, str] = {}
+    narrowed: dict[str, tuple[int, dict]] = {}
+    paged:  list[str] = []
+    for tab in tabs:
+        grid = _grid_or_none(service, spreadsheet_id, tab)
+        if not grid or not grid['rows'] or not grid['cols']:
+            single[tab] = f'{a1_tab(tab)}!{LEGACY_TAB_RANGE}'
+        elif grid['rows'] <= _chunk_rows:
+            cols = _read_cols(spreadsheet_id, tab, grid)
+            narrowed[tab] = (cols, grid)
+            single[tab] = f"{a1_tab(tab)}!A1:{get_col_letter(cols - 1)}"
+        else:
+            paged.append(tab)
+
+    out = dict(zip(single, batch_get(service, spreadsheet_id, list(single.values()))))
+    paged += [tab for tab, (cols, grid) in narrowed.items() if _reaches_edge(out.get(tab, []), cols, grid)]
+    for tab in paged:
+        out[tab] = read_tab_values(service, spreadsheet_id, tab)
+    return {tab: out.get(tab, []) for tab in tabs}
+
+
+def get_header(service: Any, spreadsheet_id: str, tab: str) -> tuple[int, list[Any]] | None:
+    """
+    (header_row_idx, header cells) for write-back routes. Reuses the header the
+    last fetch_google_sheet_data() detected; otherwise reads only the first
+    HEADER_SCAN_ROWS rows, as wide as the grid. None if the tab is empty.
+    A cached header can be stale: callers pass the label they matched as
+    CellWrite.header, and the write-back queue re-checks it before writing.
+    """
+    from src.integrations.sheet_cache import get_tab_cache
+    from src.utils.sheet_helpers import detect_header_row, get_col_letter
+
+    cache  = get_tab_cache()
+    cached = cache.get_header(spreadsheet_id, tab)
+    if cached is not None:
+        return cached
+
+    grid     = _grid_or_none(service, spreadsheet_id, tab)
+    last_col = get_col_letter(grid['cols'] - 1) if grid and grid['cols'] else 'BZ'
+    values = service.spreadsheets().values().get(
+        spreadsheetId=spreadsheet_id,
+        range=f'{a1_tab(tab)}!A1:{last_col}{HEADER_SCAN_ROWS}',
+    ).execute().get('values', [])
+    if not values:
+        return None
+    header_row_idx = detect_header_row(values)
+    header = values[header_row_idx]
+    cache.remember_header(spreadsheet_id, tab, header_row_idx, header)
+    return header_row_idx, list(header)
+
+
+def tab_rows(bundle: dict, tab: str | None, limit: int | None = None) -> list[list[Any]]:
+    """Rows for a tab held in a settings bundle (None/unknown → [])."""
+    if not tab:
+        return []
+    if tab == bundle.get('brand_tab'):
+        rows = bundle.get('brand_rows', [])
+    elif tab == bundle.get('settings_tab'):
+        rows = bundle.get('settings_rows', [])
+    else:
+        rows = []
+    return rows[:limit] if limit else rows
+
+
+# ── Housekeeping ──────────────────────────────────────────────────────────────
+
+def invalidate(spreadsheet_id: str | None = None) -> None:
+    """Forget cached metadata / bundles (one spreadsheet or all)."""
+    with _lock:
+        if spreadsheet_id is None:
+            _metadata.clear()
+            _bundles.clear()
+        else:
+            _metadata.pop(spreadsheet_id, None)
+            _bundles.pop(spreadsheet_id, None)
+
+
+def stats() -> dict[str, Any]:
+    with _lock:
+        return {
+            'calls':              dict(_calls),
+            'cached_metadata':    len(_metadata),
+            'cached_bundles':     len(_bundles),
+            'metadata_ttl':       _metadata_ttl,
+            'settings_ttl':       _settings_ttl,
+            'chunk_rows':         _chunk_rows,
+        }
@@ -0,0 +1,347 @@
+# src/integrations/sheets_service.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Sheets service + credential lifecycle manager.
+#
+# authenticate_google_sheets() re-reads the token file, may refresh, and runs
+# a full discovery build('sheets', 'v4') every call (hundreds of ms).
+# load_brand_settings / _build_brand_aw_set called it per request, and
+# fetch_google_sheet_data called it again after any OSError. Every route also
+# shared ONE service object — and with it one httplib2.Http, which is not
+# thread-safe under the threaded server / job runner.
+#
+# SheetsServiceManager:
+#   • credentials loaded once per profile (token file); the interactive OAuth
+#     flow stays in authenticate_google_sheets() and is only used when the
+#     token is missing or cannot be refreshed
+#   • discovery document cached on disk (config/cache/discovery/sheets.v4.json)
+#     → services are built with build_from_document(), no network, no re-parse
+#   • per-thread services: each thread gets its own AuthorizedHttp transport
+#     over the shared credentials
+#   • background refresher renews the access token SHEETS_TOKEN_REFRESH_MARGIN_S
+#     before expiry and writes it back to the token file
+#
+# session.get_sheets_service() returns a ThreadLocalService proxy, so every
+# existing caller (`service.spreadsheets()…`) transparently uses the calling
+# thread's transport.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+PROJECT_ROOT            = Path(__file__).resolve().parent.parent.parent
+DEFAULT_DISCOVERY_DIR   = PROJECT_ROOT / 'config' / 'cache' / 'discovery'
+DEFAULT_REFRESH_MARGIN  = 300.0   # refresh when < 5 min of token life remains
+DEFAULT_CHECK_INTERVAL  = 60.0
+
+API_NAME, API_VERSION = 'sheets', 'v4'
+
+
+# ── Default (google library) hooks — replaced in tests ───────────────────────
+
+def _load_credentials(token_file: Path, scopes: list[str]) -> Any | None:
+    from google.oauth2.credentials import Credentials
+    if not token_file.exists():
+        return None
+    return Credentials.from_authorized_user_file(str(token_file), scopes)
+
+
+def _refresh_credentials(creds: Any) -> None:
+    from google.auth.transport.requests import Request
+    creds.refresh(Request())
+
+
+def _fetch_discovery_doc() -> dict:
+    """Bundled static document (google-api-python-client ≥ 2), else the network."""
+    try:
+        from googleapiclient.discovery_cache import get_static_doc
+        doc = get_static_doc(API_NAME, API_VERSION)
+        if doc:
+            return json.loads(doc)
+    except ImportError:
+        pass
+    import requests
+    url = f'https://{API_NAME}.googleapis.com/$discovery/rest?version={API_VERSION}'
+    resp = requests.get(url, timeout=15)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _build_service(doc: dict, creds: Any) -> Any:
+    import google_auth_httplib2
+    import httplib2
+    from googleapiclient.discovery import build_from_document
+    http = google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http(timeout=60))
+    return build_from_document(doc, http=http)
+
+
+class ThreadLocalService:
+    """Drop-in for a Sheets service; every attribute resolves on the calling thread's service."""
+
+    def __init__(self, manager: 'SheetsServiceManager') -> None:
+        self._manager = manager
+
+    def __getattr__(self, name: str) -> Any:
+        service = self._manager.for_thread()
+        if service is None:
+            raise RuntimeError('Sheets service not available')
+        return getattr(service, name)
+
+    def __bool__(self) -> bool:
+        return self._manager.available()
+
+
+class SheetsServiceManager:
+    def __init__(
+        self,
+        discovery_dir: Path = DEFAULT_DISCOVERY_DIR,
+        refresh_margin_s: float = DEFAULT_REFRESH_MARGIN,
+        check_interval_s: float = DEFAULT_CHECK_INTERVAL,
+        load_credentials: Callable[[Path, list[str]], Any] = _load_credentials,
+        refresh_credentials: Callable[[Any], None] = _refresh_credentials,
+        fetch_discovery: Callable[[], dict] = _fetch_discovery_doc,
+        build_service: Callable[[dict, Any], Any] = _build_service,
+        interactive_auth: Callable[[], Any] | None = None,
+    ) -> None:
+        self.discovery_dir    = Path(discovery_dir)
+        self.refresh_margin   = float(refresh_margin_s)
+        self.check_interval   = max(float(check_interval_s), 1.0)
+        self._load_creds      = load_credentials
+        self._refresh_creds   = refresh_credentials
+        self._fetch_discovery = fetch_discovery
+        self._build           = build_service
+        self._interactive     = interactive_auth
+
+        self._lock        = threading.RLock()
+        self._local       = threading.local()
+        self._creds: Any  = None
+        self._doc: dict | None = None
+        self._profile: Path | None = None
+        self._generation  = 0
+        self._refresher: threading.Thread | None = None
+        self._stop        = threading.Event()
+        self._counts      = {'credential_loads': 0, 'refreshes': 0, 'refresh_failures': 0,
+                             'builds': 0, 'discovery_fetches': 0, 'discovery_disk_hits': 0}
+        self.proxy        = ThreadLocalService(self)
+
+    # ── Public API ───────────────────────────────────────────────────────────
+
+    def get_service(self) -> ThreadLocalService | None:
+        """Proxy for session.set_sheets_service(); None when no profile can authenticate."""
+        return self.proxy if self.available() else None
+
+    def available(self) -> bool:
+        try:
+            return self._ensure_credentials() is not None
+        except Exception as e:
+            print(f"[SHEETS-SVC] Credentials unavailable: {e}")
+            return False
+
+    def for_thread(self) -> Any | None:
+        """This thread's service, built on first use (and again after reset/profile change)."""
+        creds = self._ensure_credentials()
+        if creds is None:
+            return None
+        local = self._local
+        if getattr(local, 'generation', None) != self._generation:
+            local.service    = self._build(self._discovery_doc(), creds)
+            local.generation = self._generation
+            with self._lock:
+                self._counts['builds'] += 1
+        return local.service
+
+    def reset_thread(self) -> None:
+        """Drop only the calling thread's transport (stale connection); creds are kept."""
+        self._local.generation = None
+
+    def reset(self) -> None:
+        """Forget credentials + every thread's service (profile switch, auth failure)."""
+        with self._lock:
+            self._creds   = None
+            self._profile = None
+            self._generation += 1
+        print("[SHEETS-SVC] Reset — services rebuild on next use")
+
+    def refresh_now(self) -> bool:
+        """Refresh the access token if it is inside the refresh margin. True if refreshed."""
+        with self._lock:
+            creds = self._creds
+            if creds is None or not self._needs_refresh(creds):
+                return False
+            try:
+                self._refresh_creds(creds)
+                self._counts['refreshes'] += 1
+                self._save_token(creds)
+                print(f"[SHEETS-SVC] Token refreshed (expires {getattr(creds, 'expiry', None)})")
+                return True
+            except Exception as e:
+                self._counts['refresh_failures'] += 1
+                print(f"[SHEETS-SVC] Token refresh failed: {e}")
+                return False
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            expiry = getattr(self._creds, 'expiry', None)
+            return {
+                'profile':          str(self._profile) if self._profile else None,
+                'has_credentials':  self._creds is not None,
+                'token_expiry':     expiry.isoformat() if expiry else None,
+                'generation':       self._generation,
+                'refresher_alive':  bool(self._refresher and self._refresher.is_alive()),
+                'refresh_margin_s': self.refresh_margin,
+                'counts':           dict(self._counts),
+            }
+
+    def shutdown(self) -> None:
+        self._stop.set()
+
+    # ── Credentials ──────────────────────────────────────────────────────────
+
+    def _token_file(self) -> tuple[Path | None, list[str]]:
+        from src.integrations import google_sheets
+        return google_sheets.TOKEN_FILE, list(google_sheets.SCOPES)
+
+    def _ensure_credentials(self) -> Any | None:
+        token_file, scopes = self._token_file()
+        with self._lock:
+            if self._creds is not None and token_file == self._profile:
+                return self._creds
+            if token_file is None:
+                return None
+
+            creds = None
+            try:
+                creds = self._load_creds(token_file, scopes)
+            except Exception as e:
+                print(f"[SHEETS-SVC] Token unreadable: {e}")
+            if creds is not None and not getattr(creds, 'valid', True):
+                if getattr(creds, 'refresh_token', None):
+                    try:
+                        self._refresh_creds(creds)
+                        self._counts['refreshes'] += 1
+                        self._save_token(creds, token_file)
+                    except Exception as e:
+                        print(f"[SHEETS-SVC] Stored token could not be refreshed: {e}")
+                        creds = None
+                else:
+                    creds = None
+
+            if creds is None and self._interactive is not None:
+                # Consent flow lives in authenticate_google_sheets(); it writes the token file
+                if self._interactive() is not None:
+                    creds = self._load_creds(token_file, scopes)
+            if creds is None:
+                return None
+
+            if self._profile is not None and token_file != self._profile:
+                print(f"[SHEETS-SVC] Profile changed → {token_file.name}")
+            self._creds   = creds
+            self._profile = token_file
+            self._generation += 1
+            self._counts['credential_loads'] += 1
+            self._start_refresher()
+            return creds
+
+    def _needs_refresh(self, creds: Any) -> bool:
+        expiry = getattr(creds, 'expiry', None)
+        if expiry is None:
+            return not getattr(creds, 'valid', True)
+        if expiry.tzinfo is None:              # google-auth uses naive UTC
+            expiry = expiry.replace(tzinfo=timezone.utc)
+        return (expiry - datetime.now(timezone.utc)).total_seconds() < self.refresh_margin
+
+    def _save_token(self, creds: Any, token_file: Path | None = None) -> None:
+        path = token_file or self._profile
+        to_json = getattr(creds, 'to_json', None)
+        if path is None or to_json is None:
+            return
+        try:
+            Path(path).write_text(to_json(), encoding='utf-8')
+        except OSError as e:
+            print(f"[SHEETS-SVC] Could not persist refreshed token: {e}")
+
+    def _start_refresher(self) -> None:
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        self._stop.clear()
+
+        def _loop() -> None:
+            while not self._stop.wait(self.check_interval):
+                self.refresh_now()
+
+        self._refresher = threading.Thread(target=_loop, name='sheets-token-refresh', daemon=True)
+        self._refresher.start()
+
+    # ── Discovery document ───────────────────────────────────────────────────
+
+    def _discovery_doc(self) -> dict:
+        if self._doc is not None:
+            return self._doc
+        with self._lock:
+            if self._doc is not None:
+                return self._doc
+            path = self.discovery_dir / f'{API_NAME}.{API_VERSION}.json'
+            if path.exists():
+                try:
+                    self._doc = json.loads(path.read_text(encoding='utf-8'))
+                    self._counts['discovery_disk_hits'] += 1
+                    return self._doc
+                except (OSError, ValueError) as e:
+                    print(f"[SHEETS-SVC] Discovery cache unreadable ({e}); refetching")
+            t0 = time.perf_counter()
+            doc = self._fetch_discovery()
+            self._counts['discovery_fetches'] += 1
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(json.dumps(doc), encoding='utf-8')
+            except OSError as e:
+                print(f"[SHEETS-SVC] Could not cache discovery document: {e}")
+            print(f"[SHEETS-SVC] Discovery document loaded in "
+                  f"{(time.perf_counter() - t0) * 1000:.0f} ms → {path}")
+            self._doc = doc
+            return doc
+
+
+# Singleton — rebuilt by init_sheets_service() from the app factory
+sheets_service: SheetsServiceManager | None = None
+
+
+def init_sheets_service(config: Any) -> SheetsServiceManager:
+    """
+    Config keys (settings.json or app.config):
+        SHEETS_DISCOVERY_CACHE_DIR      = config/cache/discovery
+        SHEETS_TOKEN_REFRESH_MARGIN_S   = 300   refresh this long before expiry
+        SHEETS_TOKEN_CHECK_INTERVAL_S   = 60    background refresher period
+    """
+    global sheets_service
+    if sheets_service is not None:
+        sheets_service.shutdown()
+
+    def _interactive() -> Any:
+        from src.integrations.google_sheets import authenticate_google_sheets
+        return authenticate_google_sheets()
+
+    sheets_service = SheetsServiceManager(
+        discovery_dir=Path(config.get('SHEETS_DISCOVERY_CACHE_DIR') or DEFAULT_DISCOVERY_DIR),
+        refresh_margin_s=float(config.get('SHEETS_TOKEN_REFRESH_MARGIN_S', DEFAULT_REFRESH_MARGIN)),
+        check_interval_s=float(config.get('SHEETS_TOKEN_CHECK_INTERVAL_S', DEFAULT_CHECK_INTERVAL)),
+        interactive_auth=_interactive,
+    )
+    return sheets_service
+
+
+def get_sheets_service_manager() -> SheetsServiceManager:
+    global sheets_service
+    if sheets_service is None:
+        sheets_service = init_sheets_service({})
+    return sheets_service
+
+
+def get_service() -> ThreadLocalService | None:
+    """The shared per-thread Sheets service, or None (no profile / not authenticated)."""
+    return get_sheets_service_manager().get_service()
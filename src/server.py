@@ -0,0 +1,209 @@
+# src/server.py — v1.0
+# ─────────────────────────────────────────────────────────────────────────────
+# Serving layer. run.py calls serve(app) — this module decides HOW to serve.
+#
+#   SERVER_MODE = 'development' (default) → Werkzeug app.run(threaded=True)
+#   SERVER_MODE = 'production'            → waitress (embedded, pure-Python WSGI)
+#
+# Production mode gives a bounded worker pool (WSGI_THREADS), a listen
+# backlog, idle-connection timeouts and a graceful SIGINT/SIGTERM shutdown:
+# stop accepting, let in-flight requests drain for WSGI_SHUTDOWN_TIMEOUT
+# seconds, then stop the job runner.
+#
+# Everything still runs in ONE process (threads only), so the session
+# singleton, Selenium driver and background_validation_monitor thread are
+# shared exactly as under the dev server. Never swap in a pre-fork server.
+#
+# waitress is optional: `pip install waitress`. If it is missing, production
+# mode logs a warning and falls back to the threaded dev server.
+#
+# The drain (_run_until_drained) steps waitress's loop itself and reads its
+# internals — server._map, task_dispatcher.queue / active_count, channel
+# requests / total_outbufs_len — because the public server.close() cancels
+# queued tasks and stops the loop before in-flight responses are flushed, and
+# waitress 3.0 has no shutdown-timeout option. requirements.txt pins 3.0.x and
+# TestWaitressInternals fails if any of those names change.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import os
+import signal
+import threading
+import time
+from typing import Any, Mapping
+
+from flask import Flask
+
+try:
+    import waitress
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+# key → (env var, default, cast)
+_SERVER_OPTIONS: dict[str, tuple[str, Any, type]] = {
+    'SERVER_MODE':           ('FLASK_SERVER_MODE',     'development', str),
+    'WSGI_THREADS':          ('WSGI_THREADS',          8,             int),
+    'WSGI_BACKLOG':          ('WSGI_BACKLOG',          1024,          int),
+    'WSGI_CONNECTION_LIMIT': ('WSGI_CONNECTION_LIMIT', 200,           int),
+    'WSGI_CHANNEL_TIMEOUT':  ('WSGI_CHANNEL_TIMEOUT',  120,           int),
+    'WSGI_SHUTDOWN_TIMEOUT': ('WSGI_SHUTDOWN_TIMEOUT', 10,            float),
+}
+
+
+def resolve_server_options(config: Mapping[str, Any],
+                           environ: Mapping[str, str] | None = None) -> dict[str, Any]:
+    """
+    Merge serving options. Priority: environment → settings.json/app.config → default.
+    SERVER_MODE is normalised to 'production' or 'development'.
+    """
+    environ = os.environ if environ is None else environ
+    opts: dict[str, Any] = {}
+    for key, (env_key, default, cast) in _SERVER_OPTIONS.items():
+        raw = environ.get(env_key) or config.get(key, default)
+        try:
+            opts[key] = cast(raw)
+        except (TypeError, ValueError):
+            print(f"[SERVER] Invalid {key}={raw!r} — using {default!r}")
+            opts[key] = default
+    mode = str(opts['SERVER_MODE']).strip().lower()
+    opts['SERVER_MODE'] = 'production' if mode in ('production', 'prod', 'waitress') else 'development'
+    return opts
+
+
+def serve(app: Flask, host: str, port: int, debug: bool = False) -> None:
+    """Serve the app with the configured mode. Blocks until shutdown."""
+    opts = resolve_server_options(app.config)
+
+    if opts['SERVER_MODE'] == 'production' and not debug:
+        if WAITRESS_AVAILABLE:
+            _serve_waitress(app, host, port, opts)
+            return
+        print("[SERVER] ⚠ SERVER_MODE=production but waitress is not installed "
+              "(pip install waitress) — falling back to the dev server")
+
+    print(f"[SERVER] Development server (Werkzeug, threaded) on {host}:{port}")
+    app.run(host=host, port=port, debug=debug, use_reloader=False, threaded=True)
+
+
+# ── Production (waitress) ─────────────────────────────────────────────────────
+
+def _serve_waitress(app: Flask, host: str, port: int, opts: dict[str, Any]) -> None:
+    server = waitress.create_server(
+        app,
+        host=host,
+        port=port,
+        threads=opts['WSGI_THREADS'],
+        backlog=opts['WSGI_BACKLOG'],
+        connection_limit=opts['WSGI_CONNECTION_LIMIT'],
+        channel_timeout=opts['WSGI_CHANNEL_TIMEOUT'],
+        ident='TAT-MIS-Architect',
+    )
+    print(f"[SERVER] Production server (waitress) on {host}:{port} — "
+          f"threads={opts['WSGI_THREADS']} backlog={opts['WSGI_BACKLOG']} "
+          f"conn_limit={opts['WSGI_CONNECTION_LIMIT']} idle_timeout={opts['WSGI_CHANNEL_TIMEOUT']}s")
+
+    stopping = threading.Event()
+
+    def _on_signal(signum: int, _frame: Any) -> None:
+        # Only flag it: the listener is closed by the loop thread between
+        # polls, never under a select() that is still watching its fd.
+        if stopping.is_set():
+            raise KeyboardInterrupt  # second signal — stop now
+        stopping.set()
+        print(f"[SERVER] Signal {signum} — no longer accepting connections, "
+              f"draining for up to {opts['WSGI_SHUTDOWN_TIMEOUT']:.0f}s")
+
+    for sig in (signal.SIGINT, getattr(signal, 'SIGTERM', None)):
+        if sig is not None:
+            signal.signal(sig, _on_signal)
+
+    try:
+        _run_until_drained(server, stopping, opts['WSGI_SHUTDOWN_TIMEOUT'])
+    except KeyboardInterrupt:
+        pass
+    finally:
+        _shutdown_background_work()
+        print("[SERVER] Shutdown complete")
+
+
+def _run_until_drained(server: Any, stopping: threading.Event, drain_timeout: float) -> None:
+    """
+    waitress's own loop, one poll at a time. Once `stopping` is set: close
+    the listening sockets, keep polling until every request has been answered
+    and flushed (or drain_timeout passes), then stop the task threads.
+    Relies on waitress 3.0.x internals (see the module header).
+    """
+    from waitress import wasyncore
+    from waitress.channel import HTTPChannel
+    from waitress.server import BaseWSGIServer
+
+    socket_map = getattr(server, '_map', None) or server.map
+    adj        = server.adj
+    deadline: float | None = None
+
+    def drained() -> bool:
+        dispatcher = server.task_dispatcher
+        if dispatcher.queue or dispatcher.active_count:
+            return False
+        return not any(ch.requests or ch.total_outbufs_len
+                       for ch in list(socket_map.values()) if isinstance(ch, HTTPChannel))
+
+    while socket_map:
+        wasyncore.loop(timeout=adj.asyncore_loop_timeout, map=socket_map,
+                       use_poll=adj.asyncore_use_poll, count=1)
+        if not stopping.is_set():
+            continue
+        if deadline is None:
+            deadline = time.time() + drain_timeout
+            for listener in [d for d in list(socket_map.values()) if isinstance(d, BaseWSGIServer)]:
+                listener.accepting = False
+                wasyncore.dispatcher.close(listener)   # listening socket only; trigger stays
+        if drained() or time.time() >= deadline:
+            break
+
+    remaining = max(0.0, deadline - time.time()) if deadline is not None else 0.0
+    server.task_dispatcher.shutdown(timeout=remaining)
+
+
+def _shutdown_background_work() -> None:
+    """
+    Stop the job runner so queued work is cancelled rather than orphaned,
+    push any sheet write-backs still waiting in the debounce window, and stop
+    the Sheets token and settings-cache refreshers. Pending tab mirror writes
+    are finished.
+    """
+    try:
+        from src.core.jobs import job_runner
+        if job_runner is not None:
+            job_runner.shutdown(wait=False)
+    except Exception as e:
+        print(f"[SERVER] Job runner shutdown warning: {e}")
+
+    try:
+        from src.integrations.sheet_writer import write_queue
+        if write_queue is not None:
+            write_queue.shutdown(flush=True)
+    except Exception as e:
+        print(f"[SERVER] Write-back flush warning: {e}")
+
+    try:
+        from src.integrations.sheets_service import sheets_service
+        if sheets_service is not None:
+            sheets_service.shutdown()
+    except Exception as e:
+        print(f"[SERVER] Sheets token refresher shutdown warning: {e}")
+
+    try:
+        from src.integrations.settings_cache import settings_cache
+        settings_cache.shutdown()
+    except Exception as e:
+        print(f"[SERVER] Settings cache shutdown warning: {e}")
+
+    try:
+        from src.integrations.sheet_mirror import sheet_mirror
+        if sheet_mirror is not None:
+            sheet_mirror.shutdown()
+    except Exception as e:
+        print(f"[SERVER] Sheet mirror shutdown warning: {e}")
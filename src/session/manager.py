@@ -24,7 +24,7 @@ import json
 import sqlite3
 import threading
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import pandas as pd
 
@@ -88,6 +88,8 @@ class SessionManager:
             'mis_df':                 None,
             'google_df':              None,
         }
+        self._browser_listeners: list[Callable[[Any], None]] = []
+        self._browser_detach_listeners: list[Callable[[Any], None]] = []
         self._backend.init()
 
     # ── Core KV Interface ────────────────────────────────────────────────────
@@ -134,8 +136,33 @@ class SessionManager:
 
     def set_browser(self, driver: Any) -> None:
         with self._lock:
+            previous = self._volatile.get('browser_instance')
             self._volatile['browser_instance'] = driver
             self._volatile_set_ready(driver is not None)
+            listeners = list(self._browser_listeners)
+            detach_listeners = list(self._browser_detach_listeners)
+        if previous is not None and previous is not driver:
+            for listener in detach_listeners:
+                try:
+                    listener(previous)
+                except Exception as e:
+                    print(f"[SESSION] Browser detach listener failed: {e}")
+        if driver is not None:
+            for listener in listeners:
+                try:
+                    listener(driver)
+                except Exception as e:
+                    print(f"[SESSION] Browser listener failed: {e}")
+
+    def add_browser_listener(self, listener: Callable[[Any], None]) -> None:
+        """Call listener(driver) every time a browser is attached via set_browser()."""
+        with self._lock:
+            self._browser_listeners.append(listener)
+
+    def add_browser_detach_listener(self, listener: Callable[[Any], None]) -> None:
+        """Call listener(old_driver) when set_browser() replaces or clears a browser."""
+        with self._lock:
+            self._browser_detach_listeners.append(listener)
 
     def _volatile_set_ready(self, ready: bool) -> None:
         """Internal — called only from set_browser to keep ready flag consistent."""
@@ -33,6 +33,7 @@ from src.utils.brand_helpers import (
     resolve_brand_for_match,   # ARCHITECTURE RULE: Settings tab always wins
     manage_brand_list,
     load_brand_settings,
+    load_brand_aw_list,
     get_brand_for_mis_id,
     parse_multi_brand,
     is_multi_brand,
@@ -66,7 +67,7 @@ __all__ = [
     'format_location_set', 'format_location_display', 'format_csv_locations',
     'resolve_location_columns', 'find_locations_value', 'convert_store_name_to_data_cy',
     # brand
-    'resolve_brand_for_match', 'manage_brand_list', 'load_brand_settings',
+    'resolve_brand_for_match', 'manage_brand_list', 'load_brand_settings', 'load_brand_aw_list',
     'get_brand_for_mis_id', 'parse_multi_brand', 'is_multi_brand',
     'get_brand_from_mis_id', 'match_mis_ids_to_brands', 'format_brand_mis_ids',
     'update_tagged_mis_cell',
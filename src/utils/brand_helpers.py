@@ -1,7 +1,9 @@
 # src/utils/brand_helpers.py
 # ─────────────────────────────────────────────────────────────────────────────
 # Brand utility helpers extracted from main_-_bloat.py.
-# GLOBAL_DATA references replaced with authenticate_google_sheets() (Issue C-1).
+# GLOBAL_DATA references replaced with the shared Sheets service (Issue C-1).
+# load_brand_settings / load_brand_aw_list are the live readers behind the
+# settings cache (src/integrations/settings_cache.py).
 # ─────────────────────────────────────────────────────────────────────────────
 
 from __future__ import annotations
@@ -49,48 +51,37 @@ def manage_brand_list(mis_df: pd.DataFrame) -> List[str]:
 
 # ── Monolith: line 6208 ───────────────────────────────────────────────────────
 
-def load_brand_settings(spreadsheet_id: str) -> Dict[str, str]:
+def load_brand_settings(spreadsheet_id: str, service: Any = None) -> Dict[str, str]:
     """
     Read the 'Brand Rebate Agreements' (or 'Settings') tab to build
     a map of Brand → Linked Brand.
-    GLOBAL_DATA['sheets_service'] replaced with authenticate_google_sheets().
+    GLOBAL_DATA['sheets_service'] replaced with the shared Sheets service
+    (src/integrations/sheets_service.py — built once per profile).
     Monolith: line 6208.
     """
     settings_map: Dict[str, str] = {}
     try:
-        from src.integrations.google_sheets import authenticate_google_sheets
-        service = authenticate_google_sheets()
+        if service is None:
+            from src.integrations.sheets_service import get_service
+            service = get_service()
         if not service:
             return {}
 
-        metadata     = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-        settings_tab = None
+        from src.integrations import sheets_access
+        bundle       = sheets_access.get_settings_bundle(service, spreadsheet_id)
+        settings_tab = bundle['brand_tab'] or bundle['settings_tab']
 
         print("\n[DEBUG] --- Loading Brand Settings ---")
-        for s in metadata.get('sheets', []):
-            title = s['properties']['title']
-            if 'brand rebate' in title.lower() or 'rebate agreement' in title.lower():
-                settings_tab = title
-                print(f"[DEBUG] Found Brand Rebate Agreements tab: '{title}'")
-                break
-
-        if not settings_tab:
-            for s in metadata.get('sheets', []):
-                title = s['properties']['title']
-                if 'setting' in title.lower():
-                    settings_tab = title
-                    print(f"[DEBUG] Fallback to settings tab: '{title}'")
-                    break
+        if bundle['brand_tab']:
+            print(f"[DEBUG] Found Brand Rebate Agreements tab: '{settings_tab}'")
+        elif settings_tab:
+            print(f"[DEBUG] Fallback to settings tab: '{settings_tab}'")
 
         if not settings_tab:
             print("[WARN] Could not find 'Brand Rebate Agreements' or 'Settings' tab.")
             return {}
 
-        result = service.spreadsheets().values().get(
-            spreadsheetId=spreadsheet_id,
-            range=f"'{settings_tab}'!A1:Z1000"
-        ).execute()
-        rows = result.get('values', [])
+        rows = sheets_access.tab_rows(bundle, settings_tab)
         if not rows:
             return {}
 
@@ -135,6 +126,105 @@ def load_brand_settings(spreadsheet_id: str) -> Dict[str, str]:
         return {}
 
 
+# ── Monolith: v12.28 (Brand → After Wholesale set) ───────────────────────────
+
+def load_brand_aw_list(spreadsheet_id: str, service: Any = None) -> List[str]:
+    """
+    v12.28 (corrected): Return sorted list of lowercase brand names that
+    require the After Wholesale toggle ON.
+
+    Reads directly from the Brand Rebate Agreements tab (Settings tab as
+    fallback) — independent of whether the matcher has been run.
+    Returns empty list on any error so the validation degrades gracefully.
+    Moved from api/mis_automation._build_brand_aw_set, which now serves the
+    result from the settings cache.
+
+    Column detection (case-insensitive, scans first 10 rows for header):
+      Brand col : contains 'brand', NOT 'linked', NOT 'contribution'
+      AW flag   : contains 'after' AND 'wholesale'
+    """
+    try:
+        if service is None:
+            from src.integrations.sheets_service import get_service
+            service = get_service()
+        if not service:
+            print("[BRAND-AW-SET] No sheets service — skipping")
+            return []
+
+        if not spreadsheet_id:
+            print("[BRAND-AW-SET] No spreadsheet_id — skipping")
+            return []
+
+        # ── Find the right tab (shared settings bundle — no extra API calls) ──
+        from src.integrations import sheets_access
+        bundle   = sheets_access.get_settings_bundle(service, spreadsheet_id)
+        tab_name = bundle['brand_tab'] or bundle['settings_tab']
+        if not tab_name:
+            print("[BRAND-AW-SET] No Brand Rebate Agreements or Settings tab found")
+            return []
+
+        print(f"[BRAND-AW-SET] Reading tab: '{tab_name}'")
+
+        rows = sheets_access.tab_rows(bundle, tab_name)
+        if not rows:
+            return []
+
+        # ── Detect header row ─────────────────────────────────────────────────
+        header: list[str] = []
+        header_row_idx = -1
+        for i, row in enumerate(rows[:10]):
+            rl = [str(c).strip().lower() for c in row]
+            has_brand = any('brand' in c and 'linked' not in c and 'contribution' not in c for c in rl)
+            has_aw    = any('after' in c and 'wholesale' in c for c in rl)
+            if has_brand and has_aw:
+                header = rl
+                header_row_idx = i
+                break
+
+        if header_row_idx == -1:
+            print("[BRAND-AW-SET] Header with brand + after-wholesale columns not found")
+            return []
+
+        brand_idx = next(
+            (ci for ci, h in enumerate(header)
+             if 'brand' in h and 'linked' not in h and 'contribution' not in h),
+            -1
+        )
+        aw_idx = next(
+            (ci for ci, h in enumerate(header) if 'after' in h and 'wholesale' in h),
+            -1
+        )
+
+        if brand_idx == -1 or aw_idx == -1:
+            print(f"[BRAND-AW-SET] Columns not found — brand_idx={brand_idx}, aw_idx={aw_idx}")
+            return []
+
+        print(f"[BRAND-AW-SET] Cols: brand='{header[brand_idx]}', aw='{header[aw_idx]}'")
+
+        brands: set = set()
+        for row in rows[header_row_idx + 1:]:
+            if len(row) <= brand_idx:
+                continue
+            brand_val = str(row[brand_idx]).strip()
+            if not brand_val:
+                continue
+            aw_raw = str(row[aw_idx]).strip().upper() if len(row) > aw_idx else ''
+            if aw_raw in ('TRUE', 'YES', '1', 'X', '✔', 'CHECKED'):
+                for b in brand_val.split(','):
+                    b = b.strip()
+                    if b:
+                        brands.add(b.lower())
+
+        result = sorted(brands)
+        print(f"[BRAND-AW-SET] {len(result)} brands require after_wholesale: {result}")
+        return result
+
+    except Exception as e:
+        print(f"[BRAND-AW-SET] Error: {e}")
+        traceback.print_exc()
+        return []
+
+
 # ── Monolith: line 32644 ──────────────────────────────────────────────────────
 
 def parse_multi_brand(brand_str: str) -> List[str]:
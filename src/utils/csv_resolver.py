@@ -13,6 +13,8 @@ from typing import TYPE_CHECKING
 
 import pandas as pd
 
+from src.utils.metrics import timed
+
 if TYPE_CHECKING:
     from src.session.manager import SessionManager
 
@@ -31,6 +33,7 @@ def _load_mis_csv(path: Path | str) -> pd.DataFrame | None:
         return None
 
 
+@timed()
 def resolve_mis_csv_for_route(
     csv_file_obj=None,
     session: "SessionManager | None" = None,
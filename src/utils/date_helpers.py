@@ -2,6 +2,7 @@
 # src/utils/date_helpers.py
 # Step 3: Pure utility extraction from main_-_bloat.py — zero logic changes.
 # Contains: get_monthly_day_of_month, parse_end_date, parse_tab_month_year, expand_weekday_to_dates, parse_monthly_dates, parse_sale_dates, get_all_weekdays_for_multiday_group, filter_mis_by_date, parse_monthly_ordinals, parse_sale_dates_for_validation, calculate_expected_dates, check_mis_weekday_active
+#           + month_slices, clip_to_window, months_in_window (multi-month date windows)
 # =============================================================================
 import re
 from pathlib import Path
@@ -510,3 +511,35 @@ def normalize_date(date_str: str | None) -> str:
         except ValueError:
             continue
     return date_str  # Return as-is if we can't parse it
+
+
+# ── Multi-month date windows ─────────────────────────────────────────────────
+# sections_data for the conflict audit / split planner is either one tab's
+# {'weekly', 'monthly', 'sale'} dict or a list of (tab, month, year, sections)
+# slices from src/integrations/multi_tab.py.
+
+def month_slices(
+    sections_data: Any, target_month: int | None, target_year: int | None
+) -> List[Tuple[Optional[str], int, int, Dict[str, pd.DataFrame]]]:
+    """Normalise either form to [(tab | None, month, year, sections), ...]."""
+    if isinstance(sections_data, dict):
+        return [(None, int(target_month), int(target_year), sections_data)]
+    return [(tab, int(m), int(y), secs) for tab, m, y, secs in sections_data]
+
+
+def clip_to_window(dates: List[date], window: Optional[Tuple[date, date]]) -> List[date]:
+    """Keep dates inside the inclusive (start, end) window; no window keeps all."""
+    if not window:
+        return dates
+    start, end = window
+    return [d for d in dates if start <= d <= end]
+
+
+def months_in_window(start: date, end: date) -> List[Tuple[int, int]]:
+    """(month, year) pairs covered by start..end, in order."""
+    out: List[Tuple[int, int]] = []
+    y, m = start.year, start.month
+    while (y, m) <= (end.year, end.month):
+        out.append((m, y))
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+    return out
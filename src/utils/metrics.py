@@ -0,0 +1,199 @@
+# src/utils/metrics.py
+# ─────────────────────────────────────────────────────────────────────────────
+# In-process latency / throughput metrics. Zero dependencies.
+#
+#   HTTP layer : src/app.py before/after_request hooks call record_request()
+#   Engines    : @timed('name') on a function, or `with span('name'):`
+#   Export     : render_prometheus() → GET /metrics (text format 0.0.4)
+#                snapshot()          → 'metrics' block in GET /health
+#
+# Percentiles come from a bounded reservoir of the most recent samples per
+# series (RESERVOIR_SIZE), so memory stays flat no matter how long the app
+# runs. Counts / sums / bytes are exact lifetime totals.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+RESERVOIR_SIZE = 2048
+QUANTILES: tuple[float, ...] = (0.5, 0.95, 0.99)
+
+
+class _Series:
+    """One latency series: exact count/sum/max + recent-sample reservoir."""
+
+    __slots__ = ('count', 'total', 'max', 'errors', 'bytes_out', 'samples')
+
+    def __init__(self) -> None:
+        self.count:     int   = 0
+        self.total:     float = 0.0
+        self.max:       float = 0.0
+        self.errors:    int   = 0
+        self.bytes_out: int   = 0
+        self.samples: deque[float] = deque(maxlen=RESERVOIR_SIZE)
+
+    def add(self, seconds: float, error: bool = False, nbytes: int = 0) -> None:
+        self.count     += 1
+        self.total     += seconds
+        self.max        = max(self.max, seconds)
+        self.errors    += int(error)
+        self.bytes_out += nbytes
+        self.samples.append(seconds)
+
+    def quantiles(self) -> dict[float, float]:
+        if not self.samples:
+            return {q: 0.0 for q in QUANTILES}
+        ordered = sorted(self.samples)
+        last    = len(ordered) - 1
+        return {q: ordered[min(last, int(round(q * last)))] for q in QUANTILES}
+
+    def summary(self) -> dict[str, Any]:
+        qs = self.quantiles()
+        return {
+            'count':     self.count,
+            'errors':    self.errors,
+            'p50_ms':    round(qs[0.5]  * 1000, 1),
+            'p95_ms':    round(qs[0.95] * 1000, 1),
+            'p99_ms':    round(qs[0.99] * 1000, 1),
+            'max_ms':    round(self.max * 1000, 1),
+            'avg_ms':    round(self.total / self.count * 1000, 1) if self.count else 0.0,
+            'bytes_out': self.bytes_out,
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe store for HTTP route series and engine span series."""
+
+    def __init__(self) -> None:
+        self._lock     = threading.Lock()
+        self._routes:  dict[tuple[str, str], _Series] = {}
+        self._status:  dict[tuple[str, str, int], int] = {}
+        self._spans:   dict[str, _Series] = {}
+        self.started_at = time.time()
+
+    # ── Recording ────────────────────────────────────────────────────────────
+
+    def record_request(self, method: str, route: str, status: int,
+                       seconds: float, nbytes: int = 0) -> None:
+        with self._lock:
+            series = self._routes.setdefault((method, route), _Series())
+            series.add(seconds, error=status >= 500, nbytes=nbytes)
+            key = (method, route, status)
+            self._status[key] = self._status.get(key, 0) + 1
+
+    def record_span(self, name: str, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            self._spans.setdefault(name, _Series()).add(seconds, error=error)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self._status.clear()
+            self._spans.clear()
+            self.started_at = time.time()
+
+    # ── Export ───────────────────────────────────────────────────────────────
+
+    def snapshot(self) -> dict[str, Any]:
+        """JSON-friendly summary (used by /health)."""
+        with self._lock:
+            routes = {f'{m} {r}': s.summary() for (m, r), s in self._routes.items()}
+            spans  = {n: s.summary() for n, s in self._spans.items()}
+            total  = sum(s.count for s in self._routes.values())
+        uptime = max(time.time() - self.started_at, 1e-9)
+        return {
+            'uptime_sec':     round(uptime, 1),
+            'requests_total': total,
+            'requests_per_s': round(total / uptime, 3),
+            'routes':         routes,
+            'spans':          spans,
+        }
+
+    def render_prometheus(self, prefix: str = 'tat') -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            routes = [((m, r), s.quantiles(), s.count, s.total, s.bytes_out)
+                      for (m, r), s in self._routes.items()]
+            status = dict(self._status)
+            spans  = [(n, s.quantiles(), s.count, s.total, s.errors)
+                      for n, s in self._spans.items()]
+
+        out: list[str] = []
+
+        name = f'{prefix}_http_request_duration_seconds'
+        out += [f'# HELP {name} Flask request latency by route.', f'# TYPE {name} summary']
+        for (method, route), qs, count, total, _ in routes:
+            labels = f'method="{_esc(method)}",route="{_esc(route)}"'
+            for q, v in qs.items():
+                out.append(f'{name}{{{labels},quantile="{q}"}} {v:.6f}')
+            out.append(f'{name}_sum{{{labels}}} {total:.6f}')
+            out.append(f'{name}_count{{{labels}}} {count}')
+
+        name = f'{prefix}_http_requests_total'
+        out += [f'# HELP {name} Requests by route and status code.', f'# TYPE {name} counter']
+        for (method, route, code), n in sorted(status.items()):
+            out.append(f'{name}{{method="{_esc(method)}",route="{_esc(route)}",status="{code}"}} {n}')
+
+        name = f'{prefix}_http_response_bytes_total'
+        out += [f'# HELP {name} Response body bytes sent by route.', f'# TYPE {name} counter']
+        for (method, route), _, _, _, nbytes in routes:
+            out.append(f'{name}{{method="{_esc(method)}",route="{_esc(route)}"}} {nbytes}')
+
+        name = f'{prefix}_span_duration_seconds'
+        out += [f'# HELP {name} Engine / integration call latency.', f'# TYPE {name} summary']
+        for span_name, qs, count, total, _ in spans:
+            labels = f'span="{_esc(span_name)}"'
+            for q, v in qs.items():
+                out.append(f'{name}{{{labels},quantile="{q}"}} {v:.6f}')
+            out.append(f'{name}_sum{{{labels}}} {total:.6f}')
+            out.append(f'{name}_count{{{labels}}} {count}')
+
+        name = f'{prefix}_span_errors_total'
+        out += [f'# HELP {name} Spans that raised.', f'# TYPE {name} counter']
+        for span_name, _, _, _, errors in spans:
+            out.append(f'{name}{{span="{_esc(span_name)}"}} {errors}')
+
+        name = f'{prefix}_uptime_seconds'
+        out += [f'# TYPE {name} gauge', f'{name} {time.time() - self.started_at:.1f}']
+        return '\n'.join(out) + '\n'
+
+
+def _esc(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Singleton — shared by the app hooks and every @timed function
+metrics = MetricsRegistry()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a block: `with span('fetch_google_sheet_data'): ...`"""
+    t0 = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        metrics.record_span(name, time.perf_counter() - t0, error=failed)
+
+
+def timed(name: str | None = None) -> Callable:
+    """Decorator form of span(). Defaults to the function's __name__."""
+    def decorator(func: Callable) -> Callable:
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,199 @@
+# src/utils/profiler.py
+# ─────────────────────────────────────────────────────────────────────────────
+# Opt-in, per-request cProfile capture for reproducing "MAudit took 40s"
+# reports against real sheets.
+#
+#   Gate    : PROFILING_ENABLED = true   (settings.json / app.config; off by default)
+#   Trigger : header `X-Profile: 1`  or  query `?profile=1`
+#   Output  : reports/PROFILES/<stamp>_<route>.prof  (pstats — snakeviz / pstats)
+#                                     .txt           (top functions, cumulative)
+#                                     .json          (route, tab, row counts, timing)
+#   Listing : /api/diagnostics/profiles  (src/api/diagnostics.py)
+#
+# cProfile is per-thread and Python allows only one active profiler at a time,
+# so captures are serialized: a second concurrent request asking for a profile
+# runs normally and gets `X-Profile-Status: busy`.
+# Work submitted with ?async=1 runs on a job worker and is not captured.
+# ─────────────────────────────────────────────────────────────────────────────
+
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import pstats
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from flask import Flask, g, request
+
+_PROJECT_ROOT        = Path(__file__).resolve().parent.parent.parent
+DEFAULT_PROFILE_DIR  = _PROJECT_ROOT / 'reports' / 'PROFILES'
+DEFAULT_PROFILE_KEEP = 50
+TOP_N                = 60
+
+_TRUTHY = ('1', 'true', 'yes', 'on')
+_capture_lock = threading.Lock()
+
+# Profile file stems are generated here; downloads must match this shape.
+PROFILE_NAME_RE = re.compile(r'^\d{8}_\d{6}_\d{3}_[A-Za-z0-9_\-]+$')
+
+
+def profile_dir(config: Any) -> Path:
+    raw = config.get('PROFILE_DIR')
+    return Path(raw) if raw else DEFAULT_PROFILE_DIR
+
+
+def _wants_profile() -> bool:
+    return (str(request.headers.get('X-Profile', '')).lower() in _TRUTHY
+            or str(request.args.get('profile', '')).lower() in _TRUTHY)
+
+
+def _route_slug(rule: str) -> str:
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', rule).strip('_')
+    return (slug or 'root')[:80]
+
+
+def _request_tab() -> str:
+    tab = request.args.get('tab') or request.form.get('tab', '')
+    if not tab and request.is_json:
+        body = request.get_json(silent=True)
+        if isinstance(body, dict):
+            tab = body.get('tab') or body.get('tab_name') or ''
+    if not tab:
+        try:
+            from src.session import session
+            tab = session.get_mis_current_sheet()
+        except Exception:
+            tab = ''
+    return str(tab or '')
+
+
+def _row_counts() -> dict[str, int]:
+    """Row counts of the frames the request most likely worked on."""
+    counts: dict[str, int] = {}
+    try:
+        from src.session import session
+        for key, getter in (('mis_df', session.get_mis_df),
+                            ('google_df', session.get_google_df),
+                            ('blaze_df', session.get_blaze_df)):
+            df = getter()
+            if df is not None:
+                counts[key] = int(len(df))
+        sections = session.get_sections_data() or {}
+        for name, rows in sections.items():
+            if isinstance(rows, list):
+                counts[f'section_{name}'] = len(rows)
+    except Exception:
+        pass
+    return counts
+
+
+def register_profiling(app: Flask) -> None:
+    """Install before/after/teardown_request hooks. No-op per request unless gated on + asked."""
+
+    @app.before_request
+    def _start_profile():
+        if not _wants_profile():
+            return
+        if not app.config.get('PROFILING_ENABLED', False):
+            g._profile_status = 'disabled'
+            return
+        if not _capture_lock.acquire(blocking=False):
+            g._profile_status = 'busy'
+            return
+        g._profile_locked = True       # released in teardown, even if the view raises
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError:  # another profiler active in this interpreter
+            g._profile_status = 'busy'
+            return
+        g._profile = prof
+        g._profile_t0 = time.perf_counter()
+
+    @app.after_request
+    def _finish_profile(response):
+        prof = g.pop('_profile', None)
+        status = g.pop('_profile_status', None)
+        if prof is None:
+            if status:
+                response.headers['X-Profile-Status'] = status
+            return response
+        try:
+            prof.disable()
+            elapsed = time.perf_counter() - g.pop('_profile_t0', time.perf_counter())
+            name = save_profile(prof, app.config, elapsed, response.status_code)
+            response.headers['X-Profile-Status'] = 'saved'
+            response.headers['X-Profile-Id'] = name
+        except Exception as e:
+            print(f"[PROFILE] Could not save profile: {e}")
+            response.headers['X-Profile-Status'] = 'error'
+        return response
+
+    @app.teardown_request
+    def _release_profile(_exc):
+        # after_request is skipped when the request raises; teardown always runs.
+        prof = g.pop('_profile', None)
+        if prof is not None:
+            prof.disable()
+        if g.pop('_profile_locked', False):
+            _capture_lock.release()
+
+
+def save_profile(prof: cProfile.Profile, config: Any, elapsed: float, status_code: int) -> str:
+    """Write .prof / .txt / .json for the current request. Returns the file stem."""
+    out_dir = profile_dir(config)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    rule  = request.url_rule.rule if request.url_rule else request.path
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]
+    stem  = f'{stamp}_{_route_slug(rule)}'
+
+    prof.dump_stats(str(out_dir / f'{stem}.prof'))
+
+    buf = io.StringIO()
+    pstats.Stats(prof, stream=buf).sort_stats('cumulative').print_stats(TOP_N)
+    (out_dir / f'{stem}.txt').write_text(buf.getvalue(), encoding='utf-8')
+
+    meta = {
+        'id':          stem,
+        'route':       rule,
+        'path':        request.path,
+        'method':      request.method,
+        'status':      status_code,
+        'tab':         _request_tab(),
+        'row_counts':  _row_counts(),
+        'elapsed_sec': round(elapsed, 3),
+        'created':     datetime.now().isoformat(timespec='seconds'),
+    }
+    (out_dir / f'{stem}.json').write_text(json.dumps(meta, indent=2), encoding='utf-8')
+    print(f"[PROFILE] Saved {stem} ({elapsed:.2f}s, tab='{meta['tab']}')")
+
+    _prune(out_dir, int(config.get('PROFILE_KEEP', DEFAULT_PROFILE_KEEP)))
+    return stem
+
+
+def list_profiles(config: Any) -> list[dict]:
+    """Metadata for saved profiles, newest first."""
+    out_dir = profile_dir(config)
+    if not out_dir.exists():
+        return []
+    items: list[dict] = []
+    for meta_file in sorted(out_dir.glob('*.json'), reverse=True):
+        try:
+            items.append(json.loads(meta_file.read_text(encoding='utf-8')))
+        except Exception:
+            continue
+    return items
+
+
+def _prune(out_dir: Path, keep: int) -> None:
+    stems = sorted({p.stem for p in out_dir.glob('*.json')}, reverse=True)
+    for stem in stems[max(keep, 1):]:
+        for ext in ('.prof', '.txt', '.json'):
+            (out_dir / f'{stem}{ext}').unlink(missing_ok=True)
@@ -2,6 +2,8 @@
 # ─────────────────────────────────────────────────────────────────────────────
 # Google Sheet parsing helpers.
 # Extracted from monolith (main_-_bloat.py) lines 4709, 25669, 32843, 32953.
+# split_section_rows: block-sliced replacement for the row walk in
+# fetch_google_sheet_data (same output, see tests/test_section_splitter.py).
 # ─────────────────────────────────────────────────────────────────────────────
 
 from __future__ import annotations
@@ -28,6 +30,97 @@ def detect_header_row(sheet_data: List[List[str]]) -> int:
     return 0
 
 
+# Section flags written in the sheet. Matched anywhere in a row, case-insensitively;
+# when a row carries several, END420 wins, then MONTHLYSTART, SALESTART, BREAK420.
+_SECTION_MARKERS = ('END420', 'MONTHLYSTART', 'SALESTART', 'BREAK420')
+
+
+def _marker_rows(values: List[List[Any]], start: int) -> list[tuple[int, str]]:
+    """
+    (row index, marker) for every row at/after start that carries a section flag.
+    The rows are joined into one upper-cased string and each flag is located
+    with str.find; a hit's row is the number of row separators before it.
+    """
+    rows = values[start:]
+    try:
+        text = '\x1e'.join(map('\x1f'.join, rows))    # Sheets returns str cells
+    except TypeError:
+        text = '\x1e'.join('\x1f'.join(map(str, r)) for r in rows)
+    text = text.upper()
+
+    found: dict[int, set[str]] = {}
+    for marker in _SECTION_MARKERS:
+        pos = text.find(marker)
+        while pos != -1:
+            found.setdefault(text.count('\x1e', 0, pos), set()).add(marker)
+            pos = text.find(marker, pos + 1)
+    return [(start + k, next(m for m in _SECTION_MARKERS if m in found[k]))
+            for k in sorted(found)]
+
+
+def split_section_rows(
+    values: List[List[Any]], header_row_idx: int, columns: List[str]
+) -> Dict[str, pd.DataFrame]:
+    """
+    Split raw tab values below the header into weekly / monthly / sale frames.
+
+    Same rules as the monolith's row walk (fetch_google_sheet_data): parsing
+    stops at END420; MONTHLYSTART / SALESTART switch section and skip the
+    next row (the section's header); BREAK420 rows are dropped; a data row
+    needs a non-blank second cell. Rows are padded / cut to len(columns) - 1
+    cells and the 1-based sheet row number goes in the last column.
+
+    Marker rows are located once up front (one find per flag over the whole
+    tab), the rows between them are taken as blocks, and each frame is built
+    from a single padded block.
+    """
+    n     = len(values)
+    start = header_row_idx + 1
+    spans: list[tuple[str, int, int]] = []
+    section, pos = 'weekly', start
+    for i, marker in _marker_rows(values, start):
+        if i < pos:                         # header row skipped after a *START flag
+            continue
+        spans.append((section, pos, i))
+        if marker == 'END420':
+            print(f"[SHEET-PARSE] Found END420 at row {i+1}, stopping parse")
+            pos = n
+            break
+        if marker == 'BREAK420':
+            pos = i + 1
+            continue
+        section = 'monthly' if marker == 'MONTHLYSTART' else 'sale'
+        print(f"[SHEET-PARSE] Found {marker} at row {i+1}, switching to {section} section")
+        pos = i + 2
+    if pos < n:
+        spans.append((section, pos, n))
+
+    picked: dict[str, list[int]] = {'weekly': [], 'monthly': [], 'sale': []}
+    for sec, lo, hi in spans:
+        picked[sec].extend(i for i in range(lo, hi)
+                           if len(values[i]) >= 2 and str(values[i][1]).strip())
+    print(f"[SHEET-PARSE] Section summary: weekly={len(picked['weekly'])}, "
+          f"monthly={len(picked['monthly'])}, sale={len(picked['sale'])}")
+
+    # One padded block per section. pandas turns a list of equal-width rows
+    # into a preallocated 2-D object array in a single C pass — measured
+    # faster than numpy slice assignment row by row.
+    cells = len(columns) - 1
+    pad   = [''] * cells
+    out: dict[str, pd.DataFrame] = {}
+    for sec, idx in picked.items():
+        if not idx:
+            out[sec] = pd.DataFrame(columns=columns)
+            continue
+        block = []
+        for i in idx:
+            row = values[i]
+            n_cells = len(row)
+            block.append((row[:cells] if n_cells >= cells else row + pad[n_cells:]) + [i + 1])
+        out[sec] = pd.DataFrame(block, columns=columns)
+    return out
+
+
 def get_col_letter(n: int) -> str:
     """
     Convert a zero-based column index to a spreadsheet column letter.
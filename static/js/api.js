@@ -16,7 +16,7 @@ async function apiPost(endpoint, body = {}, isFormData = false) {
         }
         const resp = await fetch(endpoint, opts);
         if (!resp.ok) throw new Error(`HTTP ${resp.status}: ${resp.statusText}`);
-        return await resp.json();
+        return noteOfflineSheet(await resp.json());
     } catch (err) {
         console.error(`[API] POST ${endpoint} failed:`, err);
         return { success: false, error: err.message };
@@ -27,13 +27,41 @@ async function apiGet(endpoint) {
     try {
         const resp = await fetch(endpoint);
         if (!resp.ok) throw new Error(`HTTP ${resp.status}: ${resp.statusText}`);
-        return await resp.json();
+        return noteOfflineSheet(await resp.json());
     } catch (err) {
         console.error(`[API] GET ${endpoint} failed:`, err);
         return { success: false, error: err.message };
     }
 }
 
+// Sheet-reading routes answer from the local mirror when the Sheets API fails
+// ({offline: true, mirrored_at}); warn so stale data is never taken as live.
+function noteOfflineSheet(data) {
+    if (data && data.offline) {
+        showToast(`Google Sheets unavailable — showing the local copy from ${data.mirrored_at}`, 'warning');
+    }
+    return data;
+}
+
+// Apply routes return a write-back ticket ({queued: true, ticket}) before the
+// cells are written. Poll it until the batch is written or fails, so the UI
+// never reports "applied" for a flush that failed (403, 429 retries exhausted).
+async function awaitWriteback(data, timeoutMs = 120000) {
+    if (!data || !data.success || !data.queued || !data.ticket) return data;
+    const deadline = Date.now() + timeoutMs;
+    let lastError = null;   // set while a failed flush is queued again for retry
+    while (Date.now() < deadline) {
+        const st = await api.matcher.writebackStatus(data.ticket);
+        lastError = st.error || lastError;
+        if (!st.success) return { ...data, success: false, error: st.error || 'Write-back status unavailable' };
+        if (st.status === 'done') return { ...data, queued: false, values: st.values || {} };
+        if (st.status === 'failed') return { ...data, success: false, error: st.error || 'Write-back failed' };
+        await new Promise(resolve => setTimeout(resolve, 500));
+    }
+    return { ...data, success: false, error: 'Write-back still pending after ' + (timeoutMs / 1000) + 's'
+                                             + (lastError ? ' (' + lastError + ')' : '') };
+}
+
 // ── Typed API namespace ───────────────────────────────────────────────────────
 const api = {
 
@@ -77,6 +105,8 @@ const api = {
         applyMatches:  (body)  => apiPost('/api/mis/apply-matches', body),
         applyBlaze:    (body)  => apiPost('/api/mis/apply-blaze-titles', body),
         applySplitId:        (body)  => apiPost('/api/mis/apply-split-id', body),
+        writebackStatus:     (id)    => apiGet(id ? `/api/mis/writeback/${id}` : '/api/mis/writeback'),
+        writebackFlush:      ()      => apiPost('/api/mis/writeback/flush'),
         generateNewsletter:  (body)  => apiPost('/api/mis/generate-newsletter', body),
     },
 
@@ -116,6 +146,19 @@ const api = {
         reinject:         ()     => apiPost('/api/mis/inject-validation'),
     },
 
+    // ── Background jobs ───────────────────────────────────────────────────────
+    jobs: {
+        list:      (kind)  => apiGet(kind ? `/api/jobs?kind=${encodeURIComponent(kind)}` : '/api/jobs'),
+        status:    (id)    => apiGet(`/api/jobs/${id}`),
+        result:    (id)    => apiGet(`/api/jobs/${id}/result`),
+        cancel:    (id)    => apiPost(`/api/jobs/${id}/cancel`),
+    },
+
+    // ── Pooled / API-driven automation ────────────────────────────────────────
+    automation: {
+        zombieDisable:      (ids)   => apiPost('/api/automation/zombie-disable', { promo_ids: ids }),
+    },
+
     // ── Blaze ─────────────────────────────────────────────────────────────────
     blaze: {
         refresh:            ()      => apiGet('/api/blaze/refresh'),
@@ -845,7 +845,7 @@ return;
 try {
         // Direct fetch with FormData — api.matcher.run sends JSON which breaks form parsing
         const response = await fetch('/api/mis/match', { method: 'POST', body: formData });
-        const data = await response.json();
+        const data = noteOfflineSheet(await response.json());
         
         if (data.success) {
             matchesData = data.matches;
@@ -221,6 +221,9 @@ function showToast(message, type = 'info') {
     } else if (type === 'error') {
         toast.style.background = 'linear-gradient(135deg, #dc3545 0%, #c82333 100%)';
         toast.style.color = 'white';
+    } else if (type === 'warning') {
+        toast.style.background = 'linear-gradient(135deg, #ffc107 0%, #e0a800 100%)';
+        toast.style.color = '#212529';
     } else {
         toast.style.background = 'linear-gradient(135deg, #17a2b8 0%, #138496 100%)';
         toast.style.color = 'white';
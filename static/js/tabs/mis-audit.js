@@ -1487,30 +1487,45 @@ const btn = document.getElementById('zombieCleanupBtn');
 btn.innerHTML = '<span class="spin"></span> Processing...';
 btn.disabled = true;
 
-// Process each zombie
+// Bulk disable through the Blaze API when BLAZE_API_BULK_DISABLE is on (the
+// route answers {enabled: false} otherwise); the rest go through the UI flow
 const total = zombieCleanupState.zombieIds.length;
+document.getElementById('zombieProgressText').textContent =
+    `Disabling ${total} zombie deal(s)...`;
+const bulk = await api.automation.zombieDisable(zombieCleanupState.zombieIds);
+const remaining = bulk.success ? bulk.failed : zombieCleanupState.zombieIds;
+if (bulk.success) {
+    document.getElementById('zombieProgressFill').style.width =
+        Math.round(((total - remaining.length) / total) * 100) + '%';
+}
+if (remaining.length && bulk.enabled !== false) {
+    console.warn(`[ZOMBIE] ${remaining.length} deal(s) left for the browser flow`, bulk.error || '');
+}
+const failedIds = [];
 
-for (let i = 0; i < total; i++) {
+for (let i = 0; i < remaining.length; i++) {
 zombieCleanupState.currentIndex = i;
-const promoId = zombieCleanupState.zombieIds[i];
+const promoId = remaining[i];
 
 // Update progress
-const percent = Math.round(((i + 1) / total) * 100);
+const percent = Math.round(((total - remaining.length + i + 1) / total) * 100);
 document.getElementById('zombieProgressFill').style.width = percent + '%';
 document.getElementById('zombieProgressText').textContent = 
-    `Processing ${i + 1} of ${total}: ID ${promoId}`;
+    `Browser fallback ${i + 1} of ${remaining.length}: ID ${promoId}`;
 
 try {
     const result = await api.blaze.zombieDisable({ promo_id: promoId });
     
     
     if (!result.success) {
+        failedIds.push(promoId);
         console.error(`Failed to disable ${promoId}: ${result.error}`);
         document.getElementById('zombieProgressText').textContent = 
             `[!] ⚠️❌ Error on ID ${promoId}: ${result.error}. Continuing...`;
         await new Promise(r => setTimeout(r, 2000));
     }
 } catch (e) {
+    failedIds.push(promoId);
     console.error(`Error disabling ${promoId}:`, e);
     document.getElementById('zombieProgressText').textContent = 
         `[!] ⚠️⚠️ Network error on ID ${promoId}. Continuing...`;
@@ -1522,10 +1537,12 @@ await new Promise(r => setTimeout(r, 500));
 }
 
 // Complete
-document.getElementById('zombieProgressText').textContent = 
-`[OK]✅ Completed! Disabled ${total} zombie deal(s).`;
+const disabled = total - failedIds.length;
+document.getElementById('zombieProgressText').textContent = failedIds.length
+    ? `[!] ⚠️ Completed with errors: disabled ${disabled} of ${total}; failed: ${failedIds.join(', ')}`
+    : `[OK]✅ Completed! Disabled ${total} zombie deal(s).`;
 document.getElementById('zombieProgressFill').style.width = '100%';
-document.getElementById('zombieProgressFill').style.background = '#28a745';
+document.getElementById('zombieProgressFill').style.background = failedIds.length ? '#ffc107' : '#28a745';
 
 // Wait 2 seconds then finish
 await new Promise(r => setTimeout(r, 2000));
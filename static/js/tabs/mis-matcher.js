@@ -3481,7 +3481,7 @@ async function applyMatches(mode = 'all') {
         
         // Apply MIS IDs if mode is 'mis' or 'all'
         if ((mode === 'mis' || mode === 'all') && hasMisIds) {
-            const data = await api.matcher.applyMatches({matches: approvedMatches});
+            const data = await awaitWriteback(await api.matcher.applyMatches({matches: approvedMatches}));
             if (data.success) {
                 misUpdated = data.updated || 0;
             } else {
@@ -3491,7 +3491,7 @@ async function applyMatches(mode = 'all') {
         
         // Apply Blaze Titles if mode is 'blaze' or 'all'
         if ((mode === 'blaze' || mode === 'all') && hasBlazeTitles) {
-            const blazeData = await api.matcher.applyBlaze({matches: approvedMatches});
+            const blazeData = await awaitWriteback(await api.matcher.applyBlaze({matches: approvedMatches}));
             if (blazeData.success) {
                 blazeUpdated = blazeData.updated || 0;
             } else {
@@ -1237,15 +1237,15 @@ async function applySplitIdToSheet(splitIdx, stepIdx) {
     
     try {
         // Call API to apply with tag
-        var response = await api.matcher.applySplitId({
+        // flush: written (or failed) before we answer — no queued ticket to poll
+        var data = await api.matcher.applySplitId({
                 google_row: parseInt(approvedData.google_row),
                 new_mis_id: approvedData.mis_id,
                 tag: tag,
-                append: true
+                append: true,
+                flush: true
             });
         
-        var data = await response.json();
-        
         if (data.success) {
             alert('Part ' + partNumber + ' applied!\n\nRow: ' + approvedData.google_row + '\nMIS ID: ' + approvedData.mis_id);
             
@@ -1300,12 +1300,12 @@ async function applyGapIdToSheet(splitIdx, stepIdx) {
     var applyBtn = document.getElementById('apply-gap-btn-' + splitIdx + '-' + stepIdx);
     if (applyBtn) { applyBtn.disabled = true; applyBtn.textContent = 'Applying...'; }
     try {
-        const data = await api.matcher.applySplitId({ google_row: parseInt(approvedData.google_row), new_mis_id: approvedData.mis_id, tag: 'gap', append: true });
+        const data = await api.matcher.applySplitId({ google_row: parseInt(approvedData.google_row), new_mis_id: approvedData.mis_id, tag: 'gap', append: true, flush: true });
         if (data.success) {
-            alert('[OK] MIS ID applied successfully!\n\nRow: ' + approvedData.google_row + '\nNew Value: ' + data.new_value);
+            alert('[OK] MIS ID applied successfully!\n\nRow: ' + approvedData.google_row + '\nNew Value: ' + data.updated_value);
             if (applyBtn) { applyBtn.textContent = '[OK] Applied'; applyBtn.className = 'btn btn-outline-success btn-sm'; }
             var inputEl = document.getElementById('split-gap-id-' + splitIdx + '-' + stepIdx);
-            if (inputEl && inputEl.parentNode) inputEl.parentNode.innerHTML = renderClickableMisId(data.new_value);
+            if (inputEl && inputEl.parentNode) inputEl.parentNode.innerHTML = renderClickableMisId(approvedData.mis_id);
         } else {
             alert('Error: ' + data.error);
             if (applyBtn) { applyBtn.disabled = false; applyBtn.textContent = 'Apply'; }
@@ -1340,12 +1340,12 @@ async function applyPatchIdToSheet(splitIdx, stepIdx) {
     var applyBtn = document.getElementById('apply-patch-btn-' + splitIdx + '-' + stepIdx);
     if (applyBtn) { applyBtn.disabled = true; applyBtn.textContent = 'Applying...'; }
     try {
-        const data = await api.matcher.applySplitId({ google_row: parseInt(approvedData.google_row), new_mis_id: approvedData.mis_id, tag: 'patch', append: true });
+        const data = await api.matcher.applySplitId({ google_row: parseInt(approvedData.google_row), new_mis_id: approvedData.mis_id, tag: 'patch', append: true, flush: true });
         if (data.success) {
-            alert('[OK] MIS ID applied successfully!\n\nRow: ' + approvedData.google_row + '\nNew Value: ' + data.new_value);
+            alert('[OK] MIS ID applied successfully!\n\nRow: ' + approvedData.google_row + '\nNew Value: ' + data.updated_value);
             if (applyBtn) { applyBtn.textContent = '[OK] Applied'; applyBtn.className = 'btn btn-outline-success btn-sm'; }
             var inputEl = document.getElementById('split-patch-id-' + splitIdx + '-' + stepIdx);
-            if (inputEl && inputEl.parentNode) inputEl.parentNode.innerHTML = renderClickableMisId(data.new_value);
+            if (inputEl && inputEl.parentNode) inputEl.parentNode.innerHTML = renderClickableMisId(approvedData.mis_id);
         } else {
             alert('Error: ' + data.error);
             if (applyBtn) { applyBtn.disabled = false; applyBtn.textContent = 'Apply'; }
@@ -1743,16 +1743,15 @@ async function approvePhase2Suggestion(splitIdx, actionIdx, googleRow) {
     const finalValue = prefix + misId;
     
     try {
-        const response = await api.matcher.applySplitId({
+        const data = await api.matcher.applySplitId({
                 google_row: googleRow,
                 new_mis_id: finalValue,
-                append: true
+                append: true,
+                flush: true
             });
         
-        const data = await response.json();
-        
         if (data.success) {
-            alert('Applied MIS ID to row ' + googleRow + ': ' + data.new_value);
+            alert('Applied MIS ID to row ' + googleRow + ': ' + data.updated_value);
             inputEl.style.backgroundColor = '#c3e6cb';
             inputEl.disabled = true;
         } else {
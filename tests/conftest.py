@@ -2,6 +2,9 @@
 # pytest-flask is NOT required — we use the Flask test client directly.
 
 from __future__ import annotations
+import tempfile
+from pathlib import Path
+
 import pytest
 from src.app import create_app
 
@@ -14,6 +17,8 @@ def app():
         'SECRET_KEY':     'test-secret-key',
         'WTF_CSRF_ENABLED': False,
         'VERSION':        'v12.test',
+        'SETTINGS_CACHE_DIR': '',          # keep the settings cache in memory
+        'SHEET_MIRROR_DB_PATH': str(Path(tempfile.mkdtemp()) / 'sheet_mirror.db'),
     })
     return app
 
@@ -0,0 +1,59 @@
+# tests/test_benchmarks.py — synthetic data generator + benchmark runner smoke
+from __future__ import annotations
+
+import pandas as pd
+
+from benchmarks.run_benchmarks import compare_reports, main, run_benchmarks
+from benchmarks.synthetic import make_mis_csv, make_sheet_sections
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Generator
+# ─────────────────────────────────────────────────────────────────────────────
+class TestSynthetic:
+    def test_same_seed_same_frames(self):
+        a = make_sheet_sections(rows_per_section=8, seed=3)
+        b = make_sheet_sections(rows_per_section=8, seed=3)
+        for sec in ('weekly', 'monthly', 'sale'):
+            pd.testing.assert_frame_equal(a.sections[sec], b.sections[sec])
+        pd.testing.assert_frame_equal(make_mis_csv(a, mis_rows=20, seed=1),
+                                      make_mis_csv(b, mis_rows=20, seed=1))
+
+    def test_sizes_and_bracket_headers(self):
+        sheet = make_sheet_sections(rows_per_section=12, seed=5)
+        assert all(len(df) >= 12 for df in sheet.sections.values())
+        assert sheet.bracket_map['[Brand]'] in sheet.sections['weekly'].columns
+        mis = make_mis_csv(sheet, mis_rows=30)
+        assert len(mis) == 30
+        assert {'ID', 'Brand', 'Start date', 'End date'} <= set(mis.columns)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Runner
+# ─────────────────────────────────────────────────────────────────────────────
+class TestRunner:
+    # `app` first so engines bind the app's session singleton, not a scratch one
+    def test_smoke_all_engines(self, app):
+        report = run_benchmarks(scales=(1,), base_rows=3, repeat=1)
+        engines = {r['engine'] for r in report['results']}
+        assert 'enhanced_match_mis_ids' in engines and 'location_helpers' in engines
+        assert all('error' not in r for r in report['results']), report['results']
+        assert report['meta']['seed'] == 42
+
+    def test_repeats_never_hit_the_row_cache(self, app):
+        from src.core.row_cache import get_row_cache
+        before = get_row_cache().stats()['counts'].get('run_maudit', {}).get('hits', 0)
+        run_benchmarks(scales=(1,), base_rows=3, repeat=3, only=['run_maudit'])
+        assert get_row_cache().stats()['counts']['run_maudit']['hits'] == before
+
+    def test_compare_flags_regression(self):
+        old = {'results': [{'engine': 'x', 'scale': 1, 'median_s': 1.0}]}
+        new = {'results': [{'engine': 'x', 'scale': 1, 'median_s': 1.5}]}
+        (row,) = compare_reports(old, new, threshold=0.2)
+        assert row['regression'] is True and row['ratio'] == 1.5
+
+    def test_cli_writes_json(self, app, tmp_path):
+        out = tmp_path / 'bench.json'
+        assert main(['--scales', '1', '--base-rows', '2', '--repeat', '1',
+                     '--only', 'location_helpers', '--out', str(out)]) == 0
+        assert out.exists()
@@ -0,0 +1,183 @@
+# tests/test_blaze_auth.py — Blaze token validation cache + re-acquiring API client
+from __future__ import annotations
+
+import json
+import threading
+
+import pytest
+
+from src.integrations import blaze_auth
+from src.integrations.blaze_auth import BlazeApiClient, TokenValidationCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Resp:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+
+
+class _Http:
+    """requests.Session stand-in: 401 for tokens in `expired`, 403 for '/forbidden' paths."""
+
+    def __init__(self, expired: set[str]) -> None:
+        self.expired = expired
+        self.calls: list[tuple[str, str, str]] = []
+
+    def request(self, method, url, headers=None, **kwargs):
+        token = headers['Authorization'].split(' ', 1)[1]
+        self.calls.append((method, url, token))
+        if token in self.expired:
+            return _Resp(401)
+        return _Resp(403 if url.endswith('/forbidden') else 200)
+
+
+def _client(token: str = 'old', expired: set[str] | None = None, new: str | None = 'new'):
+    state = {'token': token, 'reacquired': 0}
+
+    def reacquire():
+        state['reacquired'] += 1
+        state['token'] = new
+        return new
+
+    validations: list[str] = []
+    cache = TokenValidationCache(ttl_s=60, validator=lambda t: validations.append(t) or t != 'bad',
+                                 clock=_Clock())
+    client = BlazeApiClient(cache=cache, base_url='http://stub', token_source=lambda: state['token'],
+                            reacquire=reacquire)
+    client._session = _Http(expired if expired is not None else {'old'})
+    return client, state, validations
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Validation cache
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestCache:
+    def test_validated_once_inside_ttl(self):
+        clock, seen = _Clock(), []
+        cache = TokenValidationCache(ttl_s=60, validator=lambda t: seen.append(t) or True, clock=clock)
+        assert cache.is_valid('t') and cache.is_valid('t')
+        assert seen == ['t'] and cache.stats()['hits'] == 1
+        clock.now += 61
+        assert cache.is_valid('t') and seen == ['t', 't']
+
+    def test_failed_validation_not_remembered(self):
+        seen = []
+        cache = TokenValidationCache(validator=lambda t: seen.append(t) or False)
+        assert not cache.is_valid('t') and not cache.is_valid('t')
+        assert len(seen) == 2 and not cache.is_valid(None)
+
+    def test_confirm_and_invalidate(self):
+        cache = TokenValidationCache(validator=lambda t: False)
+        cache.confirm('t')
+        assert cache.is_valid('t')
+        cache.invalidate('t')
+        assert not cache.fresh('t') and cache.stats()['invalidations'] == 1
+        assert 't' not in str(cache.stats()['tokens'])               # fingerprints only
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# API client
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestClient:
+    def test_success_confirms_token_so_no_validation_follows(self):
+        client, _, validations = _client(token='good', expired=set())
+        assert client.get('/api/v1/mgmt/shops').status_code == 200
+        assert client.valid_token() == 'good' and validations == []
+        assert client._session.calls == [('GET', 'http://stub/api/v1/mgmt/shops', 'good')]
+
+    def test_401_reacquires_and_retries_once(self):
+        client, state, _ = _client()
+        assert client.request('PUT', 'api/v1/x', json={}).status_code == 200
+        assert [c[2] for c in client._session.calls] == ['old', 'new']
+        assert state['reacquired'] == 1 and client.cache.fresh('new') and not client.cache.fresh('old')
+
+    def test_reacquire_failure_returns_the_401(self):
+        client, _, _ = _client(new=None)
+        assert client.get('/x').status_code == 401 and len(client._session.calls) == 1
+        client, _, _ = _client(expired={'old', 'new'})
+        assert client.get('/x').status_code == 401 and not client.cache.fresh('new')
+
+    def test_403_returned_without_reacquire(self):
+        client, state, _ = _client(token='good', expired=set())
+        client.cache.confirm('good')
+        for _ in range(3):
+            assert client.get('/forbidden').status_code == 403
+        assert state['reacquired'] == 0 and len(client._session.calls) == 3
+        assert client.cache.fresh('good')                        # still trusted
+
+    def test_concurrent_401s_share_one_reacquire(self):
+        client, state, _ = _client()
+        barrier = threading.Barrier(4, timeout=5)
+
+        def call():
+            barrier.wait()
+            return client.get('/x', token='old').status_code
+
+        results: list[int] = []
+        threads = [threading.Thread(target=lambda: results.append(call())) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+        assert results == [200] * 4 and state['reacquired'] == 1
+
+    def test_valid_token_reacquires_when_rejected(self):
+        client, state, validations = _client(token='bad')
+        assert client.valid_token() == 'new' and validations == ['bad'] and state['reacquired'] == 1
+
+
+class TestSyncPaths:
+    def test_get_token_skips_live_validation_inside_ttl(self, monkeypatch, tmp_path):
+        pytest.importorskip('requests')
+        from src.integrations.blaze_api import BlazeTokenManager
+        token_file = tmp_path / 'token.json'
+        token_file.write_text(json.dumps({'token': 'cached'}))
+        cache = TokenValidationCache(ttl_s=60, validator=lambda t: pytest.fail('live validation'))
+        cache.confirm('cached')
+        monkeypatch.setattr(BlazeTokenManager, 'TOKEN_FILE', token_file)
+        monkeypatch.setattr(blaze_auth, 'blaze_client', BlazeApiClient(cache=cache))
+        assert BlazeTokenManager.get_token() == 'cached'
+        assert cache.stats()['hits'] == 1
+
+    def test_sync_401_drops_the_token_from_the_cache(self, monkeypatch):
+        pytest.importorskip('requests')
+        from src.integrations import blaze_api
+        cache = TokenValidationCache(ttl_s=60, validator=lambda t: False)
+        cache.confirm('revoked')
+        monkeypatch.setattr(blaze_auth, 'blaze_client', BlazeApiClient(cache=cache))
+        monkeypatch.setattr(blaze_api.requests, 'get', lambda *a, **k: type('R', (), {
+            'status_code': 401, 'ok': False, 'text': 'Unauthorized'})())
+        assert blaze_api.get_api_data('revoked') == ({}, {}, [])
+        assert not cache.fresh('revoked')
+        assert blaze_api.BlazeTokenManager.fetch_global_brands('revoked') == {}
+
+    def test_note_status(self, monkeypatch):
+        cache = TokenValidationCache(ttl_s=60, validator=lambda t: False)
+        monkeypatch.setattr(blaze_auth, 'blaze_client', BlazeApiClient(cache=cache))
+        blaze_auth.note_status('t', 200)
+        assert cache.fresh('t')
+        blaze_auth.note_status('t', 403)
+        assert cache.fresh('t')                                   # permission, not expiry
+        blaze_auth.note_status('t', 401)
+        assert not cache.fresh('t')
+
+
+class TestWiring:
+    def test_init_from_config(self, monkeypatch):
+        monkeypatch.setattr(blaze_auth, 'blaze_client', blaze_auth.blaze_client)
+        client = blaze_auth.init_blaze_auth({'BLAZE_TOKEN_TTL_SECONDS': '30', 'BLAZE_API_BASE': 'http://x/'})
+        assert blaze_auth.get_blaze_client() is client
+        assert client.cache.ttl_s == 30 and client.url('/a') == 'http://x/a'
+
+    def test_diagnostics_route(self, client):
+        data = client.get('/api/diagnostics/blaze-auth').get_json()
+        assert data['success'] is True and 'ttl_s' in data['cache']
@@ -0,0 +1,227 @@
+# tests/test_blaze_promotions.py — bulk promotion status updates via the Blaze API
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from src.integrations.blaze_auth import BlazeApiClient, RateLimiter, TokenValidationCache
+from src.integrations.blaze_promotions import bulk_set_active, patch_promotions_frame, set_promotion_active
+
+
+class _Resp:
+    def __init__(self, status_code: int, body: object = None) -> None:
+        self.status_code = status_code
+        self._body = body
+
+    def json(self):
+        if self._body is None:
+            raise ValueError('no body')
+        return self._body
+
+
+class _BlazeApi:
+    """requests.Session stand-in for /mgmt/company/promotions/<id>."""
+
+    def __init__(self, promos: dict[str, dict], sticky: set[str] = frozenset(), echo: bool = True) -> None:
+        self.promos   = promos
+        self.sticky   = sticky          # PUT accepted, status not changed
+        self.echo     = echo            # PUT answers with the saved body
+        self.calls: list[tuple[str, str]] = []
+        self.inflight = 0
+        self.peak     = 0
+        self._lock    = threading.Lock()
+
+    def request(self, method, url, headers=None, json=None, **kwargs):
+        promo_id = url.rsplit('/', 1)[1]
+        with self._lock:
+            self.calls.append((method, promo_id))
+            self.inflight += 1
+            self.peak = max(self.peak, self.inflight)
+        try:
+            time.sleep(0.01)
+            promo = self.promos.get(promo_id)
+            if promo is None:
+                return _Resp(404, {'message': 'not found'})
+            if method == 'GET':
+                return _Resp(200, dict(promo))
+            if promo_id not in self.sticky:
+                promo.update(json)
+            return _Resp(200, dict(promo) if self.echo else None)
+        finally:
+            with self._lock:
+                self.inflight -= 1
+
+
+def _client(api: _BlazeApi, workers: int = 4, rate: float = 0) -> BlazeApiClient:
+    client = BlazeApiClient(cache=TokenValidationCache(validator=lambda t: True), base_url='http://stub',
+                            workers=workers, rate_per_s=rate, token_source=lambda: 'tok',
+                            reacquire=lambda: None)
+    client._session = api
+    return client
+
+
+class _Session:
+    def __init__(self, df: pd.DataFrame | None) -> None:
+        self.df = df
+        self.values: dict = {}
+
+    def get_blaze_df(self):
+        return self.df
+
+    def set(self, key, value):
+        self.values[key] = value
+
+
+@pytest.fixture
+def frame(monkeypatch):
+    import src.session
+    df = pd.DataFrame({'ID': ['1', '2', '3'], 'Name': ['a', 'b', 'c'], 'Status': ['Active'] * 3})
+    monkeypatch.setattr(src.session, 'session', _Session(df))
+    return df
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Single promotion
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestSingle:
+    def test_flips_active_and_keeps_the_rest_of_the_body(self):
+        api = _BlazeApi({'1': {'id': '1', 'name': 'Kiva 20%', 'active': True}})
+        assert set_promotion_active(_client(api), '1', False) == \
+            {'id': '1', 'ok': True, 'changed': True, 'status': 'Inactive'}
+        assert api.promos['1'] == {'id': '1', 'name': 'Kiva 20%', 'active': False}
+        assert api.calls == [('GET', '1'), ('PUT', '1')]
+
+    def test_already_inactive_is_not_written(self):
+        api = _BlazeApi({'1': {'id': '1', 'active': False}})
+        assert set_promotion_active(_client(api), 1, False)['changed'] is False
+        assert api.calls == [('GET', '1')]
+
+    def test_verified_by_reread_when_put_has_no_body(self):
+        api = _BlazeApi({'1': {'id': '1', 'active': True}}, echo=False)
+        assert set_promotion_active(_client(api), '1', False)['ok'] is True
+        assert api.calls == [('GET', '1'), ('PUT', '1'), ('GET', '1')]
+
+    def test_unverified_or_missing_is_a_failure(self):
+        api = _BlazeApi({'1': {'id': '1', 'active': True}}, sticky={'1'})
+        assert 'old status' in set_promotion_active(_client(api), '1', False)['error']
+        assert '404' in set_promotion_active(_client(api), '9', False)['error']
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Bulk
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestBulk:
+    def test_bulk_patches_frame_and_reports_failures(self, frame):
+        api = _BlazeApi({'1': {'active': True}, '2': {'active': False}, '3': {'active': True}}, sticky={'3'})
+        out = bulk_set_active(['1', '2', '3', '4', '1'], client=_client(api))
+        assert [r['id'] for r in out['results']] == ['1', '2', '3', '4']        # input order, deduped
+        assert (out['changed'], out['unchanged'], out['failed']) == (1, 1, ['3', '4'])
+        assert list(frame['Status']) == ['Inactive', 'Inactive', 'Active'] and out['patched'] == 2
+
+    def test_concurrency_is_bounded(self, frame):
+        api = _BlazeApi({str(i): {'active': True} for i in range(20)})
+        out = bulk_set_active([str(i) for i in range(20)], client=_client(api, workers=3))
+        assert out['changed'] == 20 and api.peak <= 3
+
+    def test_rate_limit_spaces_requests(self):
+        now, slept = [0.0], []
+        limiter = RateLimiter(10, sleep=lambda s: slept.append(round(s, 3)), clock=lambda: now[0])
+        for _ in range(3):
+            limiter.acquire()
+        assert slept == [0.1, 0.2]
+        assert RateLimiter(0).interval == 0.0
+
+    def test_no_token_fails_everything_without_requests(self, frame):
+        api = _BlazeApi({'1': {'active': True}})
+        client = _client(api)
+        client.cache = TokenValidationCache(validator=lambda t: False)
+        out = bulk_set_active(['1'], client=client)
+        assert out['failed'] == ['1'] and api.calls == []
+
+    def test_patch_signals_refresh_only_when_rows_change(self, monkeypatch):
+        import src.session
+        fake = _Session(None)
+        monkeypatch.setattr(src.session, 'session', fake)
+        assert patch_promotions_frame({'1': 'Inactive'}) == 0
+        fake.df = pd.DataFrame({'ID': [7], 'Status': ['Active']})
+        assert patch_promotions_frame({'8': 'Inactive'}) == 0 and fake.values == {}
+        assert patch_promotions_frame({'7': 'Inactive'}) == 1 and 'blaze_last_update_ts' in fake.values
+
+
+class TestRoute:
+    def test_requires_ids(self, client):
+        assert client.post('/api/automation/zombie-disable', json={}).get_json()['success'] is False
+
+    def test_off_by_default(self, client, monkeypatch):
+        from src.integrations import blaze_promotions
+        monkeypatch.setattr(blaze_promotions, 'bulk_set_active',
+                            lambda ids, active: pytest.fail('Blaze API called while off'))
+        data = client.post('/api/automation/zombie-disable', json={'promo_ids': ['1']}).get_json()
+        assert (data['success'], data['enabled']) == (False, False)
+
+    def test_bulk_route(self, app, client, monkeypatch):
+        from src.integrations import blaze_promotions
+        monkeypatch.setitem(app.config, 'BLAZE_API_BULK_DISABLE', True)
+        monkeypatch.setattr(blaze_promotions, 'bulk_set_active',
+                            lambda ids, active: {'results': [], 'failed': ids[1:], 'changed': 1})
+        data = client.post('/api/automation/zombie-disable', json={'promo_ids': ['1', '2']}).get_json()
+        assert data['success'] is True and data['failed'] == ['2']
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Stub Blaze API over HTTP (pooled requests.Session)
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _StubBlaze(BaseHTTPRequestHandler):
+    promos: dict[str, dict] = {}
+    auth: list[str] = []
+
+    def _reply(self, status: int, body: dict) -> None:
+        raw = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _promo(self) -> tuple[str, dict | None]:
+        promo_id = self.path.rsplit('/', 1)[1]
+        type(self).auth.append(self.headers.get('Authorization', ''))
+        return promo_id, type(self).promos.get(promo_id)
+
+    def do_GET(self):
+        _, promo = self._promo()
+        self._reply(200 if promo else 404, promo or {})
+
+    def do_PUT(self):
+        _, promo = self._promo()
+        promo.update(json.loads(self.rfile.read(int(self.headers['Content-Length']))))
+        self._reply(200, promo)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_bulk_against_stub_api(frame):
+    pytest.importorskip('requests')
+    _StubBlaze.promos = {str(i): {'id': str(i), 'active': True} for i in range(1, 4)}
+    _StubBlaze.auth = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubBlaze)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = BlazeApiClient(cache=TokenValidationCache(validator=lambda t: True),
+                                base_url=f'http://127.0.0.1:{server.server_port}',
+                                token_source=lambda: 'tok', reacquire=lambda: None)
+        out = bulk_set_active(['1', '2', '3'], client=client)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert out['changed'] == 3 and not any(p['active'] for p in _StubBlaze.promos.values())
+    assert set(_StubBlaze.auth) == {'Token tok'} and list(frame['Status']) == ['Inactive'] * 3
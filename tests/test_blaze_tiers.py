@@ -0,0 +1,134 @@
+# tests/test_blaze_tiers.py — tier promotion tags through the Blaze API
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from src.integrations.blaze_auth import BlazeApiClient, TokenValidationCache
+from src.integrations.blaze_tiers import run_tier_update, tag_names, tier_candidates
+
+FRAME = pd.DataFrame([
+    {'ID': 'p1', 'Name': 'T1 Bag Day',       'Locations': 'All Locations'},
+    {'ID': 'p2', 'Name': 'T2 BAG DAY',       'Locations': 'Sacramento, Davis'},
+    {'ID': 'p3', 'Name': 'T3 BAG DAY',       'Locations': 'Davis, Dixon'},      # excluded stores only
+    {'ID': 'p4', 'Name': 'Kiva 20% Off',     'Locations': 'Sacramento'},        # not a tier promo
+    {'ID': 'p5', 'Name': 'T3 BAG DAY',       'Locations': 'Roseville'},
+])
+
+
+class _StubBlaze(BaseHTTPRequestHandler):
+    """/api/v1/mgmt/company/promotions/<id> — GET and PUT."""
+    promos: dict[str, dict] = {}
+    sticky: set[str] = set()
+    puts: list[str] = []
+
+    def _reply(self, status: int, body: dict) -> None:
+        raw = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self):
+        promo = type(self).promos.get(self.path.rsplit('/', 1)[1])
+        self._reply(200 if promo else 404, promo or {})
+
+    def do_PUT(self):
+        promo_id = self.path.rsplit('/', 1)[1]
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        type(self).puts.append(promo_id)
+        if promo_id not in type(self).sticky:
+            type(self).promos[promo_id] = body
+        self._reply(200, type(self).promos[promo_id])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_api():
+    pytest.importorskip('requests')
+    _StubBlaze.promos = {
+        'p1': {'id': 'p1', 'name': 'T1 Bag Day', 'productTags': ['Promo', 'promo']},
+        'p2': {'id': 'p2', 'name': 'T2 BAG DAY', 'productTags': [{'name': 'Old'}], 'active': True},
+        'p5': {'id': 'p5', 'name': 'T3 BAG DAY', 'productTags': []},
+    }
+    _StubBlaze.sticky, _StubBlaze.puts = set(), []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubBlaze)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield BlazeApiClient(cache=TokenValidationCache(validator=lambda t: True),
+                         base_url=f'http://127.0.0.1:{server.server_port}', rate_per_s=0,
+                         token_source=lambda: 'tok', reacquire=lambda: None)
+    server.shutdown()
+    server.server_close()
+
+
+def _by_id(result: dict) -> dict[str, dict]:
+    return {c['id']: c for c in result['changes']}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Planning
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestPlan:
+    def test_candidates_match_names_and_skip_excluded_only_stores(self):
+        assert [c.id for c in tier_candidates(FRAME)] == ['p1', 'p2', 'p5']
+        assert tier_candidates(None) == [] and tier_candidates(pd.DataFrame()) == []
+
+    def test_tag_names(self):
+        assert tag_names(['Promo', {'name': 'promo'}, {'id': 1}, ' ', None]) == ['Promo', 'promo']
+
+    def test_dry_run_diff_writes_nothing(self, stub_api):
+        result = run_tier_update(dry_run=True, client=stub_api, df=FRAME)
+        changes = _by_id(result)
+        assert changes['p1']['action'] == 'unchanged'
+        assert (changes['p2']['before'], changes['p2']['after']) == (['Old'], ['Promo', 'promo'])
+        assert changes['p2']['action'] == changes['p5']['action'] == 'update'
+        assert result['summary'] == {'promotions': 3, 'unchanged': 1, 'update': 2}
+        assert _StubBlaze.puts == []
+
+    def test_requires_loaded_promotions(self, monkeypatch):
+        import src.session
+
+        class _NoData:
+            def get_blaze_df(self):
+                return None
+        monkeypatch.setattr(src.session, 'session', _NoData())
+        with pytest.raises(RuntimeError, match='refresh Blaze data'):
+            run_tier_update()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Apply + verify
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestApply:
+    def test_applies_only_differences_and_keeps_other_fields(self, stub_api):
+        result = run_tier_update(dry_run=False, client=stub_api, df=FRAME)
+        assert sorted(_StubBlaze.puts) == ['p2', 'p5']
+        assert result['summary'] == {'promotions': 3, 'unchanged': 1, 'updated': 2}
+        assert _StubBlaze.promos['p2'] == {'id': 'p2', 'name': 'T2 BAG DAY',
+                                           'productTags': ['Promo', 'promo'], 'active': True}
+
+    def test_rejected_update_and_missing_promotion_fail(self, stub_api):
+        _StubBlaze.sticky = {'p5'}
+        del _StubBlaze.promos['p1']
+        changes = _by_id(run_tier_update(dry_run=False, client=stub_api, df=FRAME))
+        assert changes['p5']['action'] == 'failed' and 'old tags' in changes['p5']['error']
+        assert changes['p1']['action'] == 'failed' and '404' in changes['p1']['error']
+        assert changes['p2']['action'] == 'updated'
+
+
+class TestRoute:
+    def test_api_dry_run_answers_directly(self, client, monkeypatch):
+        from src.integrations import blaze_tiers
+        monkeypatch.setattr(blaze_tiers, 'run_tier_update',
+                            lambda dry_run: {'dry_run': dry_run, 'changes': [], 'summary': {'promotions': 0}})
+        data = client.post('/api/automation/tier-promotion', json={'engine': 'api', 'dry_run': True}).get_json()
+        assert data['success'] is True and data['dry_run'] is True
@@ -0,0 +1,182 @@
+# tests/test_blaze_token.py — Blaze token capture from the first API request
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from src.automation import blaze_token
+from src.automation.blaze_token import NetworkTokenListener, acquire_blaze_token, token_from_header
+
+
+def _event(method: str, **params) -> dict:
+    """A chromedriver performance-log entry."""
+    return {'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+
+def _request(request_id: str, url: str, auth: str | None = None) -> dict:
+    headers = {'Authorization': auth} if auth else {}
+    return _event('Network.requestWillBeSent', requestId=request_id,
+                  request={'url': url, 'headers': headers})
+
+
+class _SwitchTo:
+    def __init__(self, driver: '_Chrome') -> None:
+        self.driver = driver
+
+    def window(self, handle: str) -> None:
+        self.driver.current_window_handle = handle
+
+
+class _Chrome:
+    """
+    Driver whose Blaze app fires its API requests a few polls after load.
+    `events` are performance-log batches returned one per get_log call.
+    """
+
+    def __init__(self, events: list[list[dict]] | None = None, page_token: str | None = None,
+                 login: bool = False) -> None:
+        self.events         = list(events or [])
+        self.page_token     = page_token
+        self.login          = login
+        self.current_window_handle = 'user'
+        self.current_url    = 'about:blank'
+        self.switch_to      = _SwitchTo(self)
+        self.cdp: list[str] = []
+        self.typed: list[str] = []
+        self.page_polls     = 0
+
+    def execute_cdp_cmd(self, cmd: str, params: dict) -> dict:
+        self.cdp.append(cmd)
+        if cmd == 'Target.createTarget':
+            assert params['background'] is True
+            return {'targetId': 'blaze-tab'}
+        return {'identifier': '1'}
+
+    def get(self, url: str) -> None:
+        self.current_url = 'https://retail.blaze.me/login' if self.login else url
+
+    def get_log(self, kind: str) -> list[dict]:
+        if self.events is None:
+            raise RuntimeError('log type not found')
+        return self.events.pop(0) if self.events else []
+
+    def execute_script(self, script: str, *args):
+        if 'querySelector' in script:
+            return {'element': 'email'}
+        self.page_polls += 1
+        return self.page_token if self.page_polls > 2 else None
+
+    def find_element(self, by, name):
+        driver = self
+
+        class _Field:
+            def send_keys(self, value):
+                driver.typed.append(f'{name}:{value}')
+        return _Field()
+
+
+@pytest.fixture
+def stored(monkeypatch):
+    saved: list[str] = []
+    monkeypatch.setattr(blaze_token, '_validate', lambda token: token != 'expired')
+    monkeypatch.setattr(blaze_token, '_store', saved.append)
+    return saved
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Listener
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestListener:
+    def test_first_api_request_with_token(self):
+        listener = NetworkTokenListener()
+        assert listener.feed([
+            _request('1', 'https://retail.blaze.me/static/app.js'),
+            _request('2', 'https://cdn.other.com/x', 'Token nope'),
+            _request('3', 'https://api.blaze.me/api/v1/mgmt/shops', 'Token abc123'),
+            _request('4', 'https://api.blaze.me/api/v1/mgmt/promotions', 'Token later'),
+        ]) == 'abc123'
+
+    def test_extra_info_headers_matched_by_request_id(self):
+        listener = NetworkTokenListener()
+        assert listener.feed([_request('7', 'https://api.blaze.me/api/v1/session')]) is None
+        assert listener.feed([
+            _event('Network.requestWillBeSentExtraInfo', requestId='8', headers={'authorization': 'Token x'}),
+            _event('Network.requestWillBeSentExtraInfo', requestId='7', headers={'authorization': 'Token t7'}),
+        ]) == 't7'
+
+    def test_malformed_entries_skipped(self):
+        assert NetworkTokenListener().feed([{'message': 'not json'}, 'x', {'message': '{}'}]) is None
+        assert token_from_header('Bearer abc') is None and token_from_header('Token ') is None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# acquire_blaze_token
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestAcquire:
+    def test_network_capture_resolves_without_fixed_sleeps(self, stored, monkeypatch):
+        monkeypatch.setattr(blaze_token.time, 'sleep', lambda s: pytest.fail('fixed sleep'))
+        driver = _Chrome(events=[[], [], [_request('1', 'https://api.blaze.me/api/v1/x', 'Token net')]])
+        result = acquire_blaze_token(driver=driver, timeout=5)
+        assert result['success'] is True and (result['token'], result['source']) == ('net', 'network')
+        assert stored == ['net']
+        assert driver.cdp[:2] == ['Target.createTarget', 'Page.addScriptToEvaluateOnNewDocument']
+        assert driver.cdp[-1] == 'Target.closeTarget'            # background tab closed
+        assert driver.current_window_handle == 'user'            # focus handed back
+
+    def test_page_interceptor_when_no_performance_log(self, stored):
+        driver = _Chrome(page_token='pg')
+        driver.events = None
+        result = acquire_blaze_token(driver=driver, timeout=5)
+        assert (result['success'], result['source']) == (True, 'page') and stored == ['pg']
+
+    def test_login_redirect_submits_credentials(self, stored):
+        pytest.importorskip('selenium')
+        driver = _Chrome(events=[[_request('1', 'https://api.blaze.me/a', 'Token fresh')]], login=True)
+        assert acquire_blaze_token('me@x.com', 'pw', driver=driver, timeout=5)['token'] == 'fresh'
+        assert driver.typed[-1].startswith('password:pw')
+
+    def test_failures_reported_not_raised(self, stored):
+        assert 'no credentials' in acquire_blaze_token(driver=_Chrome(login=True), timeout=1)['error']
+        result = acquire_blaze_token(driver=_Chrome(), timeout=0.05)
+        assert result['success'] is False and 'within' in result['error']
+        rejected = acquire_blaze_token(driver=_Chrome(page_token='expired'), timeout=5)
+        assert 'rejected' in rejected['error'] and stored == []
+
+    def test_background_tab_closed_on_every_attempt(self, stored):
+        drivers = [_Chrome(login=True), _Chrome(), _Chrome(page_token='tok')]
+        for driver in drivers:
+            acquire_blaze_token(driver=driver, timeout=0.05 if driver.page_token is None else 5)
+        assert [d.cdp.count('Target.closeTarget') for d in drivers] == [1, 1, 1]
+
+    def test_shared_driver_fallback_holds_the_browser_lock(self, stored, monkeypatch):
+        from contextlib import contextmanager
+        from src.core import jobs
+        held: list[str] = []
+        driver = _Chrome(page_token='pg')
+
+        class _Runner:
+            @contextmanager
+            def hold(self, lock):
+                held.append(lock)
+                assert driver.cdp == []                          # taken before the tab opens
+                yield
+                held.append('released')
+
+        monkeypatch.setattr(jobs, 'get_job_runner', lambda: _Runner())
+        monkeypatch.setattr(blaze_token, '_listener_driver', lambda: (driver, False))
+        assert acquire_blaze_token(timeout=5)['token'] == 'pg'
+        assert held == ['browser', 'released']
+        held.clear()
+        monkeypatch.setattr(blaze_token, '_listener_driver', lambda: (_Chrome(page_token='pg'), True))
+        acquire_blaze_token(timeout=5)
+        assert held == []                                        # own attached session: no lock
+
+    def test_route_never_returns_the_token(self, client, monkeypatch):
+        monkeypatch.setattr(blaze_token, 'acquire_blaze_token',
+                            lambda email, password, timeout: {'success': True, 'token': 's3cret',
+                                                              'source': 'network', 'elapsed_sec': 0.4})
+        data = client.post('/api/automation/blaze-token', json={'timeout': 3}).get_json()
+        assert data == {'success': True, 'source': 'network', 'elapsed_sec': 0.4}
@@ -0,0 +1,181 @@
+# tests/test_browser_pool.py — background browser worker pool
+from __future__ import annotations
+
+import itertools
+import threading
+
+import pytest
+
+from src.automation import browser_pool
+from src.automation.browser_pool import BrowserPool, BrowserWorker, PoolUnavailable, execute_pooled
+
+
+_TARGET_IDS = itertools.count(1)
+
+
+class _SwitchTo:
+    def __init__(self, driver: '_FakeChrome') -> None:
+        self.driver = driver
+
+    def window(self, handle: str) -> None:
+        if handle not in self.driver.tabs:
+            raise RuntimeError('no such window')
+        self.driver.current = handle
+        self.driver.switches.append(handle)
+
+
+class _FakeChrome:
+    """One attached WebDriver session; the browser's tabs are shared across sessions."""
+
+    def __init__(self, tabs: list[str]) -> None:
+        self.tabs     = tabs
+        self.current  = tabs[0]
+        self.switches: list[str] = []
+        self.targets: list[dict] = []
+        self.switch_to = _SwitchTo(self)
+
+    @property
+    def window_handles(self) -> list[str]:
+        return list(self.tabs)
+
+    def execute_cdp_cmd(self, cmd: str, params: dict) -> dict:
+        assert cmd == 'Target.createTarget'
+        self.targets.append(params)
+        handle = f'T{next(_TARGET_IDS)}'
+        self.tabs.append(handle)
+        return {'targetId': handle}
+
+
+@pytest.fixture
+def chrome(monkeypatch):
+    """Launcher Chrome with the user's tab; every attach gets its own session on it."""
+    tabs = ['user']
+    sessions: list[_FakeChrome] = []
+
+    def attach():
+        sessions.append(_FakeChrome(tabs))
+        return sessions[-1]
+
+    monkeypatch.setattr(BrowserWorker, '_prepare', lambda self, view, creds: None)
+    return {'tabs': tabs, 'sessions': sessions, 'attach': attach}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Workers / tabs
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestWorkers:
+    def test_operation_runs_on_its_own_background_tab(self, chrome):
+        pool = BrowserPool({'mis': 1}, chrome['attach'])
+        handles, current = pool.submit('mis', lambda d: (d.window_handles, d.current)).result(timeout=5)
+        assert handles == [current] and current != 'user'
+        session = chrome['sessions'][0]
+        assert session.targets[0]['background'] is True
+        assert 'user' not in session.switches
+        pool.shutdown()
+
+    def test_tab_reused_then_rebuilt_when_closed(self, chrome):
+        pool = BrowserPool({'blaze': 1}, chrome['attach'])
+        first = pool.submit('blaze', lambda d: d.current).result(timeout=5)
+        assert pool.submit('blaze', lambda d: d.current).result(timeout=5) == first
+
+        def close_tab(d):
+            chrome['tabs'].remove(d.current)
+            raise RuntimeError('target window already closed')
+
+        with pytest.raises(RuntimeError):
+            pool.submit('blaze', close_tab).result(timeout=5)
+        assert pool.submit('blaze', lambda d: d.current).result(timeout=5) not in (first, 'user')
+        assert pool.stats()['lanes']['blaze'][0]['failed'] == 1
+        pool.shutdown()
+
+    def test_long_work_leaves_quick_lookups_a_free_tab(self, chrome):
+        pool = BrowserPool({'mis': 2}, chrome['attach'])
+        release = threading.Event()
+        long_job = pool.submit('mis', lambda d: release.wait(5), long=True)
+        quick = pool.submit('mis', lambda d: 'looked up')
+        assert quick.result(timeout=5) == 'looked up'        # not stuck behind the long run
+        assert not long_job.done()
+        assert (long_job.worker, quick.worker) == ('mis-1', 'mis-0')
+        release.set()
+        assert long_job.result(timeout=5) is True
+        pool.shutdown()
+
+    def test_lanes_run_concurrently(self, chrome):
+        pool = BrowserPool({'mis': 1, 'blaze': 1}, chrome['attach'])
+        barrier = threading.Barrier(2, timeout=5)
+        futures = [pool.submit(lane, lambda d: barrier.wait()) for lane in ('mis', 'blaze')]
+        assert sorted(f.result(timeout=5) for f in futures) == [0, 1]
+        assert len(chrome['sessions']) == 2
+        pool.shutdown()
+
+    def test_unknown_lane_or_disabled(self, chrome):
+        with pytest.raises(PoolUnavailable):
+            BrowserPool({'mis': 1}, chrome['attach']).submit('sheets', lambda d: None)
+        with pytest.raises(PoolUnavailable):
+            BrowserPool({'mis': 1}, chrome['attach'], enabled=False).submit('mis', lambda d: None)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# execute_pooled
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestExecutePooled:
+    def test_same_contract_as_execute_in_background(self, chrome, monkeypatch):
+        monkeypatch.setattr(browser_pool, 'browser_pool', BrowserPool({'mis': 1}, chrome['attach']))
+        ok = execute_pooled('mis', lambda d, x, y=0: x + y, 2, y=3, gui_username='u', gui_password='p')
+        assert ok == {'success': True, 'result': 5, 'worker': 'mis-0'}
+        err = execute_pooled('mis', lambda d: 1 / 0)
+        assert err['success'] is False and 'division' in err['error']
+        browser_pool.browser_pool.shutdown()
+
+    def test_falls_back_to_shared_driver_when_attach_fails(self, monkeypatch):
+        from src.automation import browser
+
+        def no_chrome():
+            raise PoolUnavailable('Could not attach to Chrome on port 9222')
+
+        calls = []
+        monkeypatch.setattr(browser_pool, 'browser_pool', BrowserPool({'mis': 1}, no_chrome))
+        monkeypatch.setattr(browser, 'execute_in_background',
+                            lambda tab, fn, *a, **k: calls.append((tab, k)) or {'success': True, 'result': 'shared'})
+        assert execute_pooled('mis', lambda d: 'pool', gui_username='u')['result'] == 'shared'
+        assert calls == [('mis', {'gui_username': 'u', 'gui_password': ''})]
+
+    def test_fallback_waits_for_browser_locked_jobs(self, monkeypatch):
+        from src.automation import browser
+        from src.core import jobs
+
+        def no_chrome():
+            raise PoolUnavailable('Could not attach to Chrome on port 9222')
+
+        runner = jobs.JobRunner(max_workers=2)
+        monkeypatch.setattr(jobs, 'job_runner', runner)
+        monkeypatch.setattr(browser_pool, 'browser_pool', BrowserPool({'mis': 1}, no_chrome))
+        order: list[str] = []
+        monkeypatch.setattr(browser, 'execute_in_background',
+                            lambda tab, fn, *a, **k: order.append('fallback') or {'success': True, 'result': 1})
+        gate, started = threading.Event(), threading.Event()
+
+        def batch(job):
+            started.set()
+            gate.wait(2)
+            order.append('batch')
+
+        batch_id = runner.submit('batch', batch, lock='browser')
+        assert started.wait(2)
+        pull_id = runner.submit('pull', lambda job: execute_pooled('mis', lambda d: 0), lock='mis_report')
+        threading.Timer(0.3, gate.set).start()
+        for job_id in (batch_id, pull_id):
+            while runner.get(job_id).status not in jobs.FINISHED_STATES:
+                threading.Event().wait(0.01)
+        assert order == ['batch', 'fallback']
+        runner.shutdown(wait=True)
+
+
+class TestRoutes:
+    def test_pool_stats(self, client):
+        data = client.get('/api/diagnostics/browser-pool').get_json()
+        assert data['success'] is True
+        assert [w['name'] for w in data['lanes']['mis']] == ['mis-0', 'mis-1']
+        assert data['lanes']['blaze'][0]['attached'] is False       # attached lazily
@@ -0,0 +1,236 @@
+# tests/test_jobs.py — Background job runner + /api/jobs routes
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from src.core.jobs import (
+    CANCELLED,
+    DONE,
+    FAILED,
+    JobQueueFull,
+    JobRunner,
+    current_job,
+    report_progress,
+)
+
+
+def _wait(runner: JobRunner, job_id: str, timeout: float = 5.0) -> str:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = runner.get(job_id)
+        if job and job.status in (DONE, FAILED, CANCELLED):
+            return job.status
+        time.sleep(0.01)
+    raise AssertionError(f'job {job_id} did not finish')
+
+
+@pytest.fixture
+def runner():
+    r = JobRunner(max_workers=2, max_pending=4, ttl_seconds=60)
+    yield r
+    r.shutdown(wait=True)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# JobRunner
+# ─────────────────────────────────────────────────────────────────────────────
+class TestJobRunner:
+    def test_submit_returns_id_and_result(self, runner):
+        job_id = runner.submit('unit', lambda job: {'rows': 3})
+        assert _wait(runner, job_id) == DONE
+        job = runner.get(job_id)
+        assert job.result == {'rows': 3}
+        assert job.percent == 100.0
+
+    def test_exception_marks_failed(self, runner):
+        def boom(job):
+            raise ValueError('bad sheet')
+        job_id = runner.submit('unit', boom)
+        assert _wait(runner, job_id) == FAILED
+        assert 'bad sheet' in runner.get(job_id).error
+
+    def test_progress_and_current_job(self, runner):
+        seen = {}
+
+        def work(job):
+            seen['job'] = current_job()
+            report_progress(40, 'halfway-ish')
+            seen['percent'] = job.percent
+            return None
+
+        job_id = runner.submit('unit', work)
+        _wait(runner, job_id)
+        assert seen['job'].id == job_id
+        assert seen['percent'] == 40
+        assert runner.get(job_id).message == 'halfway-ish'
+
+    def test_report_progress_outside_job_is_noop(self):
+        report_progress(50, 'ignored')
+        assert current_job() is None
+
+    def test_cancel_running_job_at_checkpoint(self, runner):
+        started = threading.Event()
+
+        def work(job):
+            started.set()
+            while True:
+                job.progress(10)
+                time.sleep(0.01)
+
+        job_id = runner.submit('unit', work)
+        assert started.wait(2)
+        assert runner.cancel(job_id) is True
+        assert _wait(runner, job_id) == CANCELLED
+
+    def test_cancel_finished_job_returns_false(self, runner):
+        job_id = runner.submit('unit', lambda job: 1)
+        _wait(runner, job_id)
+        assert runner.cancel(job_id) is False
+
+    def test_cancelled_not_swallowed_by_except_exception(self, runner):
+        def work(job):
+            while True:
+                try:
+                    job.progress(5)
+                except Exception:
+                    return 'swallowed'
+                time.sleep(0.01)
+
+        job_id = runner.submit('unit', work)
+        time.sleep(0.05)
+        runner.cancel(job_id)
+        assert _wait(runner, job_id) == CANCELLED
+
+    def test_queue_full_raises(self, runner):
+        gate = threading.Event()
+        for _ in range(4):
+            runner.submit('unit', lambda job: gate.wait(2))
+        with pytest.raises(JobQueueFull):
+            runner.submit('unit', lambda job: None)
+        gate.set()
+
+    def test_named_lock_serializes(self, runner):
+        active, peak = [0], [0]
+        guard = threading.Lock()
+
+        def work(job):
+            with guard:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with guard:
+                active[0] -= 1
+
+        ids = [runner.submit('unit', work, lock='browser') for _ in range(2)]
+        for jid in ids:
+            _wait(runner, jid)
+        assert peak[0] == 1
+
+    def test_lock_waiters_do_not_hold_workers(self, runner):
+        gate = threading.Event()
+        held = [runner.submit('unit', lambda job: gate.wait(2), lock='browser') for _ in range(3)]
+        other = runner.submit('unit', lambda job: 'free')
+        assert _wait(runner, other, timeout=1) == DONE
+        assert runner.cancel(held[2]) is True
+        assert runner.get(held[2]).status == CANCELLED
+        gate.set()
+        assert [_wait(runner, jid) for jid in held[:2]] == [DONE, DONE]
+
+    def test_hold_waits_behind_the_lock_and_is_reentrant(self, runner):
+        gate, order = threading.Event(), []
+        first = runner.submit('unit', lambda job: gate.wait(2) and order.append('job'), lock='browser')
+
+        def nested(job):
+            with runner.hold('browser'):          # already held by this job → no wait
+                return 'nested'
+
+        def other(job):
+            with runner.hold('browser'):
+                order.append('hold')
+
+        holder = runner.submit('unit', other, lock='mis_report')
+        time.sleep(0.1)
+        assert order == []
+        gate.set()
+        assert [_wait(runner, jid) for jid in (first, holder)] == [DONE, DONE]
+        assert order == ['job', 'hold']
+        reentrant = runner.submit('unit', nested, lock='browser')
+        assert _wait(runner, reentrant) == DONE and runner.get(reentrant).result == 'nested'
+
+    def test_cancel_while_holding_wait(self, runner):
+        gate = threading.Event()
+        runner.submit('unit', lambda job: gate.wait(2), lock='browser')
+
+        def other(job):
+            with runner.hold('browser'):
+                return 'ran'
+
+        holder = runner.submit('unit', other)
+        time.sleep(0.1)
+        assert runner.cancel(holder) is True
+        assert _wait(runner, holder) == CANCELLED
+        gate.set()
+        assert _wait(runner, runner.submit('unit', lambda job: 'free', lock='browser')) == DONE
+
+    def test_ttl_purges_finished_jobs(self):
+        r = JobRunner(max_workers=1, ttl_seconds=0)
+        try:
+            job_id = r.submit('unit', lambda job: 1)
+            job = None
+            deadline = time.time() + 2
+            while time.time() < deadline:
+                with r._lock:
+                    job = r._jobs.get(job_id)
+                if job is not None and job.finished_at:
+                    break
+                time.sleep(0.01)
+            time.sleep(0.01)
+            assert r.purge_expired() >= 1
+            assert r.get(job_id) is None
+        finally:
+            r.shutdown(wait=True)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# /api/jobs routes
+# ─────────────────────────────────────────────────────────────────────────────
+class TestJobRoutes:
+    def test_list_jobs_200(self, client):
+        resp = client.get('/api/jobs')
+        data = resp.get_json()
+        assert resp.status_code == 200
+        assert data['success'] is True
+        assert isinstance(data['jobs'], list)
+
+    def test_unknown_job_404(self, client):
+        resp = client.get('/api/jobs/doesnotexist')
+        assert resp.status_code == 404
+        assert resp.get_json()['success'] is False
+
+    def test_cancel_unknown_job_404(self, client):
+        resp = client.post('/api/jobs/doesnotexist/cancel')
+        assert resp.status_code == 404
+
+    def test_match_async_returns_job_and_result(self, client):
+        from src.core.jobs import get_job_runner
+
+        resp = client.post('/api/mis/match?async=1', json={})
+        assert resp.status_code == 202
+        data = resp.get_json()
+        assert data['success'] is True
+        job_id = data['job_id']
+
+        _wait(get_job_runner(), job_id)
+        result = client.get(f'/api/jobs/{job_id}/result').get_json()
+        assert result['status'] == DONE
+        # The route's own JSON is replayed verbatim as the job result
+        assert result['result']['status_code'] == 200
+        assert 'success' in result['result']['body']
+
+    def test_match_without_flag_stays_synchronous(self, client):
+        resp = client.post('/api/mis/match', json={})
+        assert resp.status_code == 200
+        assert 'job_id' not in resp.get_json()
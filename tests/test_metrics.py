@@ -0,0 +1,85 @@
+# tests/test_metrics.py — request timing + span metrics (src/utils/metrics.py)
+from __future__ import annotations
+
+import pytest
+
+from src.utils.metrics import MetricsRegistry, metrics, span, timed
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# MetricsRegistry
+# ─────────────────────────────────────────────────────────────────────────────
+class TestMetricsRegistry:
+    def test_quantiles_from_samples(self):
+        reg = MetricsRegistry()
+        for ms in range(1, 101):
+            reg.record_span('engine', ms / 1000)
+        s = reg.snapshot()['spans']['engine']
+        assert s['count'] == 100
+        assert 49 <= s['p50_ms'] <= 51
+        assert 94 <= s['p95_ms'] <= 96
+        assert s['p99_ms'] >= 98
+        assert s['max_ms'] == 100.0
+
+    def test_request_bytes_and_errors(self):
+        reg = MetricsRegistry()
+        reg.record_request('POST', '/api/mis/match', 200, 0.2, nbytes=1500)
+        reg.record_request('POST', '/api/mis/match', 500, 0.1, nbytes=40)
+        r = reg.snapshot()['routes']['POST /api/mis/match']
+        assert r['count'] == 2
+        assert r['errors'] == 1
+        assert r['bytes_out'] == 1540
+
+    def test_prometheus_format(self):
+        reg = MetricsRegistry()
+        reg.record_request('GET', '/health', 200, 0.01, nbytes=10)
+        reg.record_span('run_maudit', 0.5)
+        text = reg.render_prometheus()
+        assert '# TYPE tat_http_request_duration_seconds summary' in text
+        assert 'tat_http_request_duration_seconds_count{method="GET",route="/health"} 1' in text
+        assert 'tat_http_requests_total{method="GET",route="/health",status="200"} 1' in text
+        assert 'tat_http_response_bytes_total{method="GET",route="/health"} 10' in text
+        assert 'tat_span_duration_seconds{span="run_maudit",quantile="0.5"}' in text
+
+    def test_label_escaping(self):
+        reg = MetricsRegistry()
+        reg.record_span('a"b', 0.1)
+        assert 'span="a\\"b"' in reg.render_prometheus()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# span / timed
+# ─────────────────────────────────────────────────────────────────────────────
+class TestSpans:
+    def test_timed_decorator_records_and_preserves_name(self):
+        @timed('unit_span_ok')
+        def work(x):
+            return x * 2
+
+        assert work(3) == 6
+        assert work.__name__ == 'work'
+        assert metrics.snapshot()['spans']['unit_span_ok']['count'] >= 1
+
+    def test_span_counts_errors(self):
+        with pytest.raises(ValueError):
+            with span('unit_span_err'):
+                raise ValueError('x')
+        assert metrics.snapshot()['spans']['unit_span_err']['errors'] >= 1
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# /metrics + /health
+# ─────────────────────────────────────────────────────────────────────────────
+class TestMetricsRoutes:
+    def test_metrics_endpoint_prometheus_text(self, client):
+        client.get('/health')
+        resp = client.get('/metrics')
+        assert resp.status_code == 200
+        assert resp.mimetype == 'text/plain'
+        assert 'route="/health"' in resp.get_data(as_text=True)
+
+    def test_health_includes_metrics(self, client):
+        client.get('/api/jobs')
+        data = client.get('/health').get_json()
+        assert 'metrics' in data
+        assert 'GET /api/jobs' in data['metrics']['routes']
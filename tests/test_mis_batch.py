@@ -0,0 +1,161 @@
+# tests/test_mis_batch.py — batch MIS deal entry on one warm page
+from __future__ import annotations
+
+import json
+
+from src.automation import mis_entry
+from src.automation.mis_batch import item_kind, run_mis_batch
+
+
+def _deal(brand: str, **extra) -> dict:
+    return {'brand': brand, 'start_date': '03/01/2026', 'end_date': '03/09/2026',
+            'action': 'CREATE_PART1', **extra}
+
+
+class _Mis:
+    """Stands in for the mis_entry Selenium primitives; records every call."""
+
+    def __init__(self, fail_brands: tuple = (), reject_save: tuple = (), warm: bool = True,
+                 unfilled: tuple = ()) -> None:
+        self.fail_brands = set(fail_brands)
+        self.unfilled    = set(unfilled)
+        self.reject_save = set(reject_save)
+        self.warm        = warm
+        self.calls: list[tuple] = []
+        self.current     = ''
+
+    def install(self, monkeypatch) -> '_Mis':
+        monkeypatch.setattr(mis_entry, '_load_saved_creds', lambda: {})
+        monkeypatch.setattr(mis_entry, 'ensure_mis_ready', lambda d, u='', p='': self.calls.append(('ready',)))
+        monkeypatch.setattr(mis_entry, 'mis_page_warm', lambda d: self.warm)
+        monkeypatch.setattr(mis_entry, 'fill_deal_form', self.fill)
+        monkeypatch.setattr(mis_entry, 'update_mis_end_date', self.end_date)
+        monkeypatch.setattr(mis_entry, 'save_deal_form', self.save)
+        monkeypatch.setattr(mis_entry, 'dismiss_modal', lambda d: self.calls.append(('dismiss',)) or True)
+        return self
+
+    def fill(self, driver, payload, ensure_ready=True):
+        assert ensure_ready is False
+        self.current = payload['brand']
+        self.calls.append(('fill', payload['brand']))
+        if payload['brand'] in self.fail_brands:
+            return {'success': False, 'error': f'Brand "{payload["brand"]}" not found'}
+        if payload['brand'] in self.unfilled:
+            return {'success': True, 'warnings': ['locations not filled ("Davis")'],
+                    'fill_mode': 'mixed', 'failed_fields': ['locations']}
+        return {'success': True, 'warnings': [], 'fill_mode': 'bulk'}
+
+    def end_date(self, driver, payload, ensure_ready=True):
+        assert ensure_ready is False
+        self.current = payload['mis_id']
+        self.calls.append(('end_date', payload['mis_id']))
+        return {'success': True, 'mis_id': payload['mis_id']}
+
+    def save(self, driver):
+        self.calls.append(('save', self.current))
+        if self.current in self.reject_save:
+            return {'success': False, 'error': 'The end date must be after the start date.'}
+        return {'success': True}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Pipeline
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestPipeline:
+    def test_item_kinds(self):
+        assert item_kind(_deal('Kiva')) == 'create'
+        assert item_kind({'mis_id': '123', 'new_date': '03/31/2026'}) == 'end_date'
+        assert item_kind({'action': 'GAP', 'brand': 'Kiva', 'start_date': 'x'}) is None
+        assert item_kind({'brand': 'Kiva'}) is None
+        assert item_kind({'sheet_data': {'brand': 'Kiva'}, 'start_date': '03/01/2026'}) == 'create'
+
+    def test_one_readiness_check_for_the_whole_batch(self, monkeypatch):
+        mis = _Mis().install(monkeypatch)
+        items = [_deal('Kiva'), {'mis_id': '777', 'new_date': '03/31/2026'}, _deal('Wyld')]
+        out = run_mis_batch(object(), items)
+        assert out['success'] is True and out['saved'] == 3
+        assert out['readiness_checks'] == 1
+        assert mis.calls == [('ready',), ('fill', 'Kiva'), ('save', 'Kiva'),
+                             ('end_date', '777'), ('save', '777'),
+                             ('fill', 'Wyld'), ('save', 'Wyld')]
+        assert [s['status'] for s in out['items']] == ['saved'] * 3
+        assert out['items'][0]['fill_mode'] == 'bulk'
+
+    def test_cold_page_is_readied_again(self, monkeypatch):
+        mis = _Mis(warm=False).install(monkeypatch)
+        out = run_mis_batch(object(), [_deal('Kiva'), _deal('Wyld')])
+        assert out['readiness_checks'] == 2
+        assert mis.calls.count(('ready',)) == 2
+
+    def test_failures_go_to_retry_without_aborting(self, monkeypatch):
+        mis = _Mis(fail_brands=('Ghost',), reject_save=('Wyld',)).install(monkeypatch)
+        items = [_deal('Ghost'), _deal('Wyld'), _deal('Kiva')]
+        out = run_mis_batch(object(), items)
+        assert out['success'] is False
+        assert (out['saved'], out['failed']) == (1, 2)
+        assert out['retry'] == [items[0], items[1]]
+        assert 'not found' in out['items'][0]['error']
+        assert 'end date' in out['items'][1]['error']
+        assert mis.calls.count(('dismiss',)) == 2
+        assert ('save', 'Kiva') in mis.calls
+
+    def test_unfilled_fallback_field_fails_the_item_unsaved(self, monkeypatch):
+        mis = _Mis(unfilled=('Kiva',)).install(monkeypatch)
+        out = run_mis_batch(object(), [_deal('Kiva'), _deal('Wyld')])
+        assert [s['status'] for s in out['items']] == ['failed', 'saved']
+        assert 'locations not filled' in out['items'][0]['error']
+        assert ('save', 'Kiva') not in mis.calls and ('dismiss',) in mis.calls
+
+    def test_gap_rows_skipped_and_dry_run_never_saves(self, monkeypatch):
+        mis = _Mis().install(monkeypatch)
+        out = run_mis_batch(object(), [{'action': 'GAP', 'dates': '03/05'}, _deal('Kiva')], dry_run=True)
+        assert [s['status'] for s in out['items']] == ['skipped', 'filled']
+        assert not any(c[0] == 'save' for c in mis.calls)
+        assert ('dismiss',) in mis.calls
+
+    def test_progress_reported_per_item(self, monkeypatch):
+        _Mis().install(monkeypatch)
+
+        class _Job:
+            def __init__(self):
+                self.seen = []
+
+            def progress(self, pct, msg=''):
+                self.seen.append((round(pct), msg))
+
+        job = _Job()
+        run_mis_batch(object(), [_deal('Kiva'), _deal('Wyld')], job=job)
+        assert job.seen == [(0, '1/2: Kiva'), (50, '2/2: Wyld')]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Routes
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestRoutes:
+    def test_rejects_empty_batch(self, client):
+        assert client.post('/api/mis/batch-entry', json={'items': []}).get_json()['success'] is False
+
+    def test_batch_job_and_stream(self, client, monkeypatch):
+        from src.session import session
+        _Mis(fail_brands=('Ghost',)).install(monkeypatch)
+        monkeypatch.setattr(session, 'get_browser', lambda: object())
+        monkeypatch.setattr('src.api.mis_automation.BATCH_STREAM_POLL_S', 0.01)
+
+        resp = client.post('/api/mis/batch-entry', json={'items': [_deal('Kiva'), _deal('Ghost')]})
+        assert resp.status_code == 202
+        data = resp.get_json()
+        assert data['total'] == 2
+
+        lines = [json.loads(l) for l in client.get(data['stream_url']).get_data(as_text=True).splitlines()]
+        assert lines[-1]['type'] == 'done' and lines[-1]['status'] == 'done'
+        final = {l['index']: l['status'] for l in lines if l['type'] == 'item'}
+        assert final == {0: 'saved', 1: 'failed'}
+        assert lines[-1]['result']['retry'] == [_deal('Ghost')]
+
+        status = client.get(data['status_url']).get_json()
+        assert [s['status'] for s in status['meta']['items']] == ['saved', 'failed']
+
+    def test_stream_unknown_job(self, client):
+        assert client.get('/api/mis/batch-entry/nope/stream').status_code == 404
@@ -0,0 +1,158 @@
+# tests/test_mis_bulk_fill.py — one-call MIS modal fill + per-field fallback
+from __future__ import annotations
+
+import pytest
+
+from src.automation import mis_entry
+from src.automation.mis_entry import (
+    MASTER_STORE_LIST,
+    _bulk_fill_form,
+    _bulk_fill_specs,
+    _resolve_target_stores,
+)
+
+FIELDS = {
+    'brand': 'Stiiizy', 'linked_brand': '', 'rebate_type': 'Wholesale',
+    'discount': '20%', 'vendor_contrib': '50', 'after_wholesale': '',
+    'start_date': '03/01/2026', 'end_date': '03/31/2026',
+    'weekday': 'Monday, Friday', 'categories': ['Flower', 'Vapes'],
+    'locations': 'All Locations Except: Davis, Dixon',
+}
+
+
+class _Driver:
+    """Records execute_script calls; returns a canned per-field verification."""
+
+    def __init__(self, result: dict | None = None, fail: bool = False) -> None:
+        self.result = result
+        self.fail   = fail
+        self.calls: list[tuple] = []
+
+    def execute_script(self, script: str, *args):
+        self.calls.append((script, args))
+        if self.fail:
+            raise RuntimeError('javascript error: jQuery is not defined')
+        return self.result
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Specs
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestSpecs:
+    def test_fields_map_to_the_per_field_element_ids(self):
+        specs = {s['key']: s for s in _bulk_fill_specs(FIELDS)}
+        assert specs['brand'] == {'key': 'brand', 'kind': 'select', 'id': 'brand_id', 'value': 'Stiiizy'}
+        assert specs['rebate_type']['id'] == 'daily_discount_type_id'
+        assert specs['discount'] == {'key': 'discount', 'kind': 'input', 'id': 'discount_rate', 'value': '20'}
+        assert specs['vendor_contrib']['id'] == 'vendor_rebate'
+        assert specs['start_date']['id'] == 'start_date'
+        assert specs['weekday'] == {'key': 'weekday', 'kind': 'multi', 'id': 'weekday_ids',
+                                    'values': ['Monday', 'Friday']}
+        assert specs['categories']['values'] == ['Flower', 'Vapes']
+
+    def test_empty_fields_are_skipped(self):
+        keys = [s['key'] for s in _bulk_fill_specs(FIELDS)]
+        assert 'linked_brand' not in keys and 'after_wholesale' not in keys
+        assert _bulk_fill_specs({}) == []
+
+    def test_store_resolution_matches_per_field_path(self):
+        stores = next(s for s in _bulk_fill_specs(FIELDS) if s['key'] == 'locations')['values']
+        assert stores == [s for s in MASTER_STORE_LIST if s not in ('Davis', 'Dixon')]
+        assert _resolve_target_stores('All Locations') == MASTER_STORE_LIST
+        assert _resolve_target_stores('Davis, Fresno') == ['Davis', 'Fresno']
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# One round trip
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestBulkFill:
+    def test_single_execute_script_call(self):
+        verified = {'brand': {'ok': True, 'actual': ['Stiiizy']}}
+        driver = _Driver(verified)
+        assert _bulk_fill_form(driver, FIELDS) == verified
+        assert len(driver.calls) == 1
+        assert driver.calls[0][1][0] == _bulk_fill_specs(FIELDS)
+
+    def test_script_failure_falls_back_entirely(self):
+        assert _bulk_fill_form(_Driver(fail=True), FIELDS) == {}
+
+    def test_nothing_to_fill_makes_no_call(self):
+        driver = _Driver({})
+        assert _bulk_fill_form(driver, {}) == {}
+        assert driver.calls == []
+
+
+def _fill_with_fallback(monkeypatch, unverified: set[str], stores_ok: bool = True,
+                        bulk: dict | None = None) -> tuple[dict, list]:
+    """
+    fill_deal_form with the bulk path verifying all but `unverified` (`bulk`
+    overrides individual results); per-field calls recorded.
+    """
+    pytest.importorskip('selenium')
+    from src.session import session
+    calls: list[tuple] = []
+    monkeypatch.setattr(mis_entry, 'ensure_mis_ready', lambda *a, **k: True)
+    monkeypatch.setattr(mis_entry, '_load_saved_creds', lambda: {})
+    monkeypatch.setattr(mis_entry, '_select2_pick', lambda d, l, v, f: calls.append(('pick', f)) or True)
+    monkeypatch.setattr(mis_entry, '_fill_numeric', lambda d, i, v, l: calls.append(('num', l)) or True)
+    monkeypatch.setattr(mis_entry, '_fill_date', lambda d, i, v, l: calls.append(('date', l)) or True)
+    monkeypatch.setattr(mis_entry, '_atomic_multi_select', lambda d, l, v, f: calls.append(('multi', f, v)) or True)
+    monkeypatch.setattr(mis_entry, '_select_stores', lambda d, v: calls.append(('stores', v)) or stores_ok)
+    monkeypatch.setattr(mis_entry, '_bulk_fill_form', lambda d, f: {
+        **{k: {'ok': k not in unverified} for k in ('brand', 'rebate_type', 'discount', 'vendor_contrib',
+                                                    'start_date', 'end_date', 'weekday', 'categories',
+                                                    'locations')},
+        **(bulk or {})})
+    monkeypatch.setattr(session, 'set_automation_in_progress', lambda flag: None)
+
+    class _Button:
+        def click(self):
+            pass
+
+    class _Page:
+        def find_element(self, *a):
+            return _Button()
+
+        def execute_script(self, *a):
+            return True
+
+    monkeypatch.setattr('selenium.webdriver.support.ui.WebDriverWait.until', lambda self, cond: _Button())
+    return mis_entry.fill_deal_form(_Page(), dict(FIELDS)), calls
+
+
+class TestFallback:
+    def test_only_unverified_fields_use_per_field_path(self, monkeypatch):
+        result, calls = _fill_with_fallback(monkeypatch, {'brand'})
+        assert result['success'] is True
+        assert result['fill_mode'] == 'mixed' and result['fallback_fields'] == ['brand']
+        assert calls == [('pick', 'Brand')]
+        assert result['failed_fields'] == [] and result['warnings'] == []
+
+    def test_failed_fallback_field_is_reported(self, monkeypatch):
+        result, calls = _fill_with_fallback(monkeypatch, {'locations'}, stores_ok=False)
+        assert calls == [('stores', FIELDS['locations'])]
+        assert result['failed_fields'] == ['locations']
+        assert result['warnings'] and 'locations' in result['warnings'][0]
+
+    def test_multi_select_fallback_clicks_only_unselected_values(self, monkeypatch):
+        result, calls = _fill_with_fallback(monkeypatch, set(), bulk={
+            'weekday':    {'ok': False, 'actual': ['Monday'], 'missing': ['Friday']},
+            'categories': {'ok': False, 'actual': ['Flower'], 'missing': []},
+        })
+        assert calls == [('multi', 'Weekday', ['Friday']), ('multi', 'Category', ['Vapes'])]
+        assert result['failed_fields'] == []
+
+
+class TestUnverifiedValues:
+    def test_missing_list_wins(self):
+        assert mis_entry._unverified_values('Monday, Friday', {'missing': ['Friday']}) == ['Friday']
+
+    def test_read_back_excludes_selected_values(self):
+        result = {'ok': False, 'actual': ['  monday ', 'Pre-Roll Flower'], 'missing': []}
+        assert mis_entry._unverified_values(['Monday', 'Flower', 'Vapes'], result) == ['Vapes']
+
+    def test_no_result_or_error_means_all_values(self):
+        assert mis_entry._unverified_values('A, B', None) == ['A', 'B']
+        assert mis_entry._unverified_values('A, B', {'ok': False, 'error': 'no #x'}) == ['A', 'B']
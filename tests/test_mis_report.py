@@ -0,0 +1,213 @@
+# tests/test_mis_report.py — direct HTTP MIS report pull on the browser's session
+from __future__ import annotations
+
+import csv
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.automation import mis_entry, mis_report
+from src.automation.mis_report import REQUIRED_COLUMNS, MisReportClient, cell_text, json_report_to_csv
+
+COLUMNS = [
+    {'data': 'id', 'title': 'ID'},
+    {'data': 'brand.name', 'title': 'Brand'},
+    {'data': 'discount_rate', 'title': 'Daily Deal Discount'},
+    {'data': 'actions', 'title': ''},                   # button column — not exported
+]
+
+ROWS = [
+    {'id': 101, 'brand': {'name': 'Kiva'}, 'discount_rate': '<span class="badge">20</span>',
+     'actions': '<a>Edit</a>'},
+    {'id': 102, 'brand': {'name': 'Wyld &amp; Co'}, 'discount_rate': '15', 'actions': ''},
+]
+
+
+# What the stub MIS table exposes: every CSV-button title the matcher reads
+REPORT_COLUMNS = COLUMNS[:3] + [{'data': key, 'title': title} for key, title in (
+    ('weekday', 'Weekday'), ('vendor', 'Discount paid by vendor'), ('category', 'Category'),
+    ('start', 'Start date'), ('end', 'End date'), ('store', 'Store'))] + COLUMNS[3:]
+FULL_CSV = (','.join(REQUIRED_COLUMNS) + '\n101,Kiva,Monday,20,50,Flower,03/01/2026,03/31/2026,Davis\n').encode()
+
+
+def _read_csv(path) -> list[list[str]]:
+    with open(path, newline='', encoding='utf-8') as fh:
+        return list(csv.reader(fh))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# JSON → CSV
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestConversion:
+    def test_titles_and_stripped_cells(self, tmp_path):
+        dest = tmp_path / 'r.csv'
+        assert json_report_to_csv({'data': ROWS}, COLUMNS, 'data', dest) == 2
+        assert _read_csv(dest) == [['ID', 'Brand', 'Daily Deal Discount'],
+                                   ['101', 'Kiva', '20'],
+                                   ['102', 'Wyld & Co', '15']]
+
+    def test_array_rows_and_custom_data_src(self, tmp_path):
+        dest = tmp_path / 'r.csv'
+        cols = [{'data': 0, 'title': 'ID'}, {'data': 1, 'title': 'Brand'}]
+        assert json_report_to_csv({'result': {'rows': [['7', 'Kiva']]}}, cols, 'result.rows', dest) == 1
+        assert json_report_to_csv([['8', 'Wyld']], cols, '', dest) == 1
+        assert _read_csv(dest)[1] == ['8', 'Wyld']
+
+    def test_missing_rows_are_unavailable(self, tmp_path):
+        with pytest.raises(mis_report.ReportUnavailable):
+            json_report_to_csv({'error': 'denied'}, COLUMNS, 'data', tmp_path / 'r.csv')
+
+    def test_cell_text(self):
+        assert cell_text(None) == ''
+        assert cell_text('<b>Kiva</b>\n <i>Gummies</i>') == 'Kiva Gummies'
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Fallback wiring
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _Page:
+    """Driver stand-in: the table-source script returns `source`."""
+
+    def __init__(self, source: dict | None) -> None:
+        self.source = source
+
+    def execute_script(self, script, *args):
+        return self.source
+
+    def get_cookies(self):
+        return [{'name': 'laravel_session', 'value': 'abc123', 'domain': '127.0.0.1'},
+                {'name': 'XSRF-TOKEN', 'value': 'xyz', 'domain': '127.0.0.1'}]
+
+
+class TestFallback:
+    def test_no_ajax_source_is_reported_not_raised(self, tmp_path):
+        ok, error, name = MisReportClient().download(_Page(None), tmp_path)
+        assert (ok, name) == (False, '') and 'ajax source' in error
+        assert list(tmp_path.iterdir()) == []
+
+    def test_direct_success_skips_browser_export(self, monkeypatch, tmp_path):
+        client = MisReportClient(enabled=True)
+        monkeypatch.setattr(mis_report, 'mis_report_client', client)
+        monkeypatch.setattr(client, 'download', lambda d, dest: (True, str(tmp_path / 'x.csv'), 'x.csv'))
+        assert mis_entry.pull_mis_csv_report_background(_Page(None)) == (True, str(tmp_path / 'x.csv'), 'x.csv')
+
+    def test_disabled_or_forced_off_never_tries_http(self, monkeypatch):
+        client = MisReportClient(enabled=False)
+        monkeypatch.setattr(mis_report, 'mis_report_client', client)
+        monkeypatch.setattr(client, 'download', lambda d, dest: pytest.fail('direct pull attempted'))
+        monkeypatch.setattr(mis_entry.time, 'sleep', lambda s: None)
+        assert mis_entry.pull_mis_csv_report_background(_Page(None))[0] is False
+        client.enabled = True
+        assert mis_entry.pull_mis_csv_report_background(_Page(None), direct=False)[0] is False
+
+    def test_init_from_config(self, monkeypatch):
+        monkeypatch.setattr(mis_report, 'mis_report_client', mis_report.mis_report_client)
+        assert mis_report.init_mis_report({}).enabled is False         # off until checked against MIS
+        client = mis_report.init_mis_report({'MIS_REPORT_DIRECT': False, 'MIS_REPORT_POOL_SIZE': '8'})
+        assert mis_report.get_mis_report_client() is client
+        assert client.enabled is False and client.pool_size == 8
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Stub MIS server
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _StubMis(BaseHTTPRequestHandler):
+    mode = 'json'
+    seen: list[dict] = []
+
+    def _reply(self, status: int, ctype: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', ctype)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, query: str) -> None:
+        type(self).seen.append({'query': parse_qs(query), 'cookie': self.headers.get('Cookie', ''),
+                                'xhr': self.headers.get('X-Requested-With'),
+                                'csrf': self.headers.get('X-CSRF-TOKEN')})
+        if 'laravel_session=abc123' not in self.headers.get('Cookie', '') or self.mode == 'login':
+            self._reply(200, 'text/html', b'<html><form id="login"></form></html>')
+        elif self.mode == 'csv':
+            self._reply(200, 'text/csv', FULL_CSV)
+        elif self.mode == 'short_csv':
+            self._reply(200, 'text/csv', b'ID,Brand\n101,Kiva\n')
+        else:
+            self._reply(200, 'application/json', json.dumps({'draw': 1, 'data': ROWS}).encode())
+
+    def do_GET(self):
+        self._handle(urlparse(self.path).query)
+
+    def do_POST(self):
+        self._handle(self.rfile.read(int(self.headers['Content-Length'])).decode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_mis():
+    pytest.importorskip('requests')
+    _StubMis.mode, _StubMis.seen = 'json', []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubMis)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+
+
+def _source(base: str, method: str = 'GET') -> dict:
+    return {'page_url': f'{base}/daily-discount', 'url': f'{base}/daily-discount/data',
+            'method': method, 'query': 'draw=3&start=0&length=-1&search%5Bvalue%5D=',
+            'data_src': 'data', 'csrf': 'tok', 'user_agent': 'UA', 'columns': REPORT_COLUMNS}
+
+
+class TestStubServer:
+    def test_json_report_streamed_and_converted(self, stub_mis, tmp_path):
+        ok, path, name = MisReportClient().download(_Page(_source(stub_mis)), tmp_path)
+        assert ok is True and name.startswith('MIS_CSV_REPORT_')
+        header, *rows = _read_csv(path)
+        assert sorted(header) == sorted(REQUIRED_COLUMNS)
+        assert [r[:3] for r in rows] == [['101', 'Kiva', '20'], ['102', 'Wyld & Co', '15']]
+        req = _StubMis.seen[0]
+        assert req['query']['length'] == ['-1'] and req['xhr'] == 'XMLHttpRequest' and req['csrf'] == 'tok'
+        assert 'XSRF-TOKEN=xyz' in req['cookie']
+        assert [p.name for p in tmp_path.iterdir()] == [name]            # no .part left behind
+
+    def test_post_source_and_csv_passthrough(self, stub_mis, tmp_path):
+        _StubMis.mode = 'csv'
+        ok, path, _ = MisReportClient().download(_Page(_source(stub_mis, 'POST')), tmp_path)
+        assert ok is True
+        assert _read_csv(path) == [list(REQUIRED_COLUMNS), FULL_CSV.decode().split('\n')[1].split(',')]
+        assert _StubMis.seen[0]['query']['draw'] == ['3']
+
+    def test_missing_mis_columns_means_fallback(self, stub_mis, tmp_path):
+        _StubMis.mode = 'short_csv'
+        ok, error, _ = MisReportClient().download(_Page(_source(stub_mis)), tmp_path)
+        assert ok is False and 'Start date' in error
+        assert list(tmp_path.iterdir()) == []
+
+        _StubMis.mode = 'json'
+        source = {**_source(stub_mis), 'columns': COLUMNS}            # titles the CSV button would not use
+        ok, error, _ = MisReportClient().download(_Page(source), tmp_path)
+        assert ok is False and 'Weekday' in error
+        assert list(tmp_path.iterdir()) == []
+
+    def test_login_page_means_fallback(self, stub_mis, tmp_path):
+        _StubMis.mode = 'login'
+        ok, error, _ = MisReportClient().download(_Page(_source(stub_mis)), tmp_path)
+        assert ok is False and 'session expired' in error
+        assert list(tmp_path.iterdir()) == []
+
+    def test_connection_reused_across_pulls(self, stub_mis, tmp_path):
+        client = MisReportClient()
+        client.download(_Page(_source(stub_mis)), tmp_path)
+        http = client._http()
+        client.download(_Page(_source(stub_mis)), tmp_path)
+        assert client._http() is http and len(_StubMis.seen) == 2
@@ -0,0 +1,261 @@
+# tests/test_multi_tab.py — multi-month tab loader + date-window audits
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.integrations import sheets_access
+from src.integrations.multi_tab import (
+    MonthTab,
+    parse_window,
+    resolve_month_tabs,
+    tab_month,
+)
+from src.utils.date_helpers import clip_to_window, months_in_window
+
+COLS = ['Weekday', 'Brand', 'Deal Discount', 'Brand Contribution % (Credit)',
+        'Locations (Discount Applies at)', 'Location Exceptions', 'MIS ID',
+        'Contracted Duration (MM/DD/YY - MM/DD/YY)']
+
+
+def _df(rows: list[dict], start_row: int = 3) -> pd.DataFrame:
+    recs = [{**{c: '' for c in COLS}, **r, '_SHEET_ROW_NUM': start_row + i}
+            for i, r in enumerate(rows)]
+    return pd.DataFrame(recs, columns=COLS + ['_SHEET_ROW_NUM'])
+
+
+def _sections(weekly=(), monthly=(), sale=()) -> dict[str, pd.DataFrame]:
+    return {'weekly': _df(list(weekly)), 'monthly': _df(list(monthly), 20),
+            'sale': _df(list(sale), 40)}
+
+
+STIIIZY_MONDAY = {'Weekday': 'Monday', 'Brand': 'Stiiizy', 'Deal Discount': '20%',
+                  'Locations (Discount Applies at)': 'All Locations', 'MIS ID': '1001'}
+# Listed on the March tab but starts in February (02/23/26 is a Monday)
+STIIIZY_SALE = {'Weekday': '02/23/26 - 03/02/26', 'Brand': 'Stiiizy', 'Deal Discount': '30%',
+                'Locations (Discount Applies at)': 'All Locations', 'MIS ID': '2002',
+                'Contracted Duration (MM/DD/YY - MM/DD/YY)': '02/23/26 - 03/02/26'}
+
+
+def _quarter() -> list[MonthTab]:
+    return [
+        MonthTab('February 2026', 2, 2026, _sections(weekly=[STIIIZY_MONDAY])),
+        MonthTab('March 2026', 3, 2026, _sections(sale=[STIIIZY_SALE])),
+    ]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Tab resolution / windows
+# ─────────────────────────────────────────────────────────────────────────────
+class TestResolution:
+    def test_tab_month(self):
+        assert tab_month('January 2026') == (1, 2026)
+        assert tab_month('Feb 2026') == (2, 2026)
+        assert tab_month('Settings') is None
+
+    def test_resolve_orders_and_dedupes(self):
+        titles = ['Settings', 'March 2026', 'Jan 2026', 'February 2026', 'January 2026', 'April 2026']
+        tabs = resolve_month_tabs(titles, date(2026, 1, 15), date(2026, 3, 1))
+        assert tabs == [('Jan 2026', 1, 2026), ('February 2026', 2, 2026), ('March 2026', 3, 2026)]
+
+    def test_months_in_window_crosses_year(self):
+        assert months_in_window(date(2025, 11, 30), date(2026, 1, 2)) == [(11, 2025), (12, 2025), (1, 2026)]
+
+    def test_parse_window(self):
+        assert parse_window({}) is None
+        assert parse_window({'start': '2026-02-01', 'end': '03/31/2026'}) == (date(2026, 2, 1), date(2026, 3, 31))
+        assert parse_window({'start': '2026-02-01'}) == (date(2026, 2, 1), date(2026, 2, 1))
+        with pytest.raises(ValueError):
+            parse_window({'start': '2026-03-01', 'end': '2026-02-01'})
+        with pytest.raises(ValueError):
+            parse_window({'start': 'soon'})
+
+    def test_clip_to_window(self):
+        ds = [date(2026, 2, d) for d in (1, 10, 20)]
+        assert clip_to_window(ds, None) == ds
+        assert clip_to_window(ds, (date(2026, 2, 5), date(2026, 2, 15))) == [date(2026, 2, 10)]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Engines across tabs
+# ─────────────────────────────────────────────────────────────────────────────
+@pytest.mark.usefixtures('app')          # engines read alias maps from the session
+class TestCrossMonthEngines:
+    def test_conflict_audit_sees_sale_from_next_tab(self):
+        from src.core.auditor import run_conflict_audit_sheet_vs_mis
+        single = run_conflict_audit_sheet_vs_mis(_quarter()[0].sections, 2, 2026)
+        assert single['total_date_conflicts'] == 0
+
+        result = run_conflict_audit_sheet_vs_mis(_quarter())
+        dates = [c['date'] for c in result['date_conflicts']]
+        assert dates == ['2026-02-23']
+        assert {e['tab'] for e in result['date_conflicts'][0]['entries']} == {'February 2026', 'March 2026'}
+        assert result['tabs'] == ['February 2026', 'March 2026']
+
+    def test_window_drops_dates_outside(self):
+        from src.core.auditor import run_conflict_audit_sheet_vs_mis
+        result = run_conflict_audit_sheet_vs_mis(
+            _quarter(), date_window=(date(2026, 2, 1), date(2026, 2, 22)))
+        assert result['total_date_conflicts'] == 0
+        assert result['section_counts'] == {'weekly': 1, 'monthly': 0, 'sale': 0}
+        assert result['date_window'] == ['2026-02-01', '2026-02-22']
+
+    def test_deal_repeated_on_two_tabs_counted_once(self):
+        from src.core.auditor import run_conflict_audit_sheet_vs_mis
+        tabs = [MonthTab('February 2026', 2, 2026, _sections(sale=[STIIIZY_SALE])),
+                MonthTab('March 2026', 3, 2026, _sections(sale=[STIIIZY_SALE]))]
+        result = run_conflict_audit_sheet_vs_mis(tabs)
+        assert result['section_counts']['sale'] == 1
+        assert result['total_date_conflicts'] == 0
+
+    def test_recurring_weekly_row_keeps_next_tab_dates(self):
+        from src.core.auditor import run_conflict_audit_sheet_vs_mis
+        april_sale = {**STIIIZY_SALE, 'Weekday': '04/06/26 - 04/08/26',
+                      'Contracted Duration (MM/DD/YY - MM/DD/YY)': '04/06/26 - 04/08/26'}
+        tabs = [MonthTab('March 2026', 3, 2026, _sections(weekly=[STIIIZY_MONDAY])),
+                MonthTab('April 2026', 4, 2026, _sections(weekly=[STIIIZY_MONDAY], sale=[april_sale]))]
+        result = run_conflict_audit_sheet_vs_mis(tabs)
+        assert result['section_counts']['weekly'] == 1
+        assert result['total_date_conflicts'] == 1
+        conflict = result['date_conflicts'][0]
+        assert conflict['date'] == '2026-04-06'
+        weekly = next(e for e in conflict['entries'] if e['section'] == 'weekly')
+        assert (weekly['tab'], weekly['google_row']) == ('April 2026', 3)   # April's row, not March's
+
+    def test_recurring_monthly_row_keeps_next_tab_dates(self):
+        from src.core.updown_planner import build_split_plan
+        first = {'Brand': 'Kiva', 'Deal Discount': '15%', 'Locations (Discount Applies at)': 'Davis',
+                 'Contracted Duration (MM/DD/YY - MM/DD/YY)': '1st'}
+        tabs = [MonthTab('March 2026', 3, 2026, _sections(monthly=[first])),
+                MonthTab('April 2026', 4, 2026, _sections(monthly=[first]))]
+        plan = build_split_plan(tabs)
+        by_tab = {d['tab']: [x.strftime('%Y-%m-%d') for x in d['expanded_dates']] for d in plan['tier1_deals']}
+        assert by_tab == {'March 2026': ['2026-03-01'], 'April 2026': ['2026-04-01']}
+
+    def test_repeated_sale_dates_placed_once(self):
+        from src.core.updown_planner import build_split_plan
+        tabs = [MonthTab('February 2026', 2, 2026, _sections(sale=[STIIIZY_SALE])),
+                MonthTab('March 2026', 3, 2026, _sections(sale=[STIIIZY_SALE]))]
+        plan = build_split_plan(tabs)
+        dates = [d for deal in plan['tier1_deals'] for d in deal['expanded_dates']]
+        assert len(dates) == len(set(dates))
+
+    def test_split_plan_across_tabs(self):
+        from src.core.updown_planner import build_split_plan
+        single = build_split_plan(_quarter()[0].sections, 2, 2026)
+        assert single['splits_required'] == []
+
+        plan = build_split_plan(_quarter(), date_window=(date(2026, 2, 1), date(2026, 3, 31)))
+        assert plan['date_context'] == 'February 2026 – March 2026'
+        assert len(plan['splits_required']) == 1
+        split = plan['splits_required'][0]
+        assert split['tab'] == 'February 2026'
+        assert split['conflict_dates'] == ['02/23']
+        assert split['interrupting_deal']['tab'] == 'March 2026'
+
+    def test_single_tab_output_unchanged(self):
+        from src.core.updown_planner import build_split_plan
+        plan = build_split_plan(_quarter()[0].sections, 2, 2026)
+        assert 'tab' not in plan['weekly_deals'][0]
+        assert plan['date_context'] == 'February 2026'
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Loader
+# ─────────────────────────────────────────────────────────────────────────────
+HEADER = ['Weekday', 'Brand', 'Deal Discount', 'Locations (Discount Applies at)', 'MIS ID']
+RAW = {
+    'January 2026':  [HEADER, ['Monday', 'Kiva', '15%', 'Davis', '']],
+    'February 2026': [HEADER, ['Monday', 'Stiiizy', '20%', 'All Locations', '1001'],
+                      ['Tuesday', 'Raw Garden', '10%', 'Dixon', '']],
+    'March 2026':    [HEADER, ['Friday', 'Wyld', '25%', 'Davis', '']],
+}
+
+
+class _Exec:
+    def __init__(self, payload: dict) -> None:
+        self.payload = payload
+
+    def execute(self) -> dict:
+        return self.payload
+
+
+class _FakeService:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, **kwargs):
+        if 'range' in kwargs:
+            self.calls.append('get')
+            return _Exec({'values': []})
+        self.calls.append('meta')
+        return _Exec({'sheets': [
+            {'properties': {'sheetId': i, 'title': t, 'index': i,
+                            'gridProperties': {'rowCount': 50, 'columnCount': 5}}}
+            for i, t in enumerate(['Settings', *RAW])
+        ]})
+
+    def batchGet(self, **kwargs):
+        self.calls.append('batchGet')
+        return _Exec({'valueRanges': [{'values': RAW[r.split('!')[0].strip("'")]}
+                                      for r in kwargs['ranges']]})
+
+
+@pytest.fixture
+def fake_sheet(app, monkeypatch):
+    import src.integrations.google_sheets as google_sheets
+    from src.integrations.sheet_cache import get_tab_cache
+    from src.session import session
+    monkeypatch.setattr(google_sheets, 'session', session)
+    sheets_access.invalidate()
+    get_tab_cache().invalidate()
+    svc = _FakeService()
+    monkeypatch.setattr(session, 'get_sheets_service', lambda: svc)
+    monkeypatch.setattr(session, 'get_spreadsheet_id', lambda: 'sid')
+    session.set_mis_current_sheet('March 2026')
+    yield svc
+    sheets_access.invalidate()
+    get_tab_cache().invalidate()
+
+
+class TestLoader:
+    def test_window_loads_all_tabs_in_one_batch(self, fake_sheet):
+        from src.integrations.multi_tab import load_date_window
+        tabs = load_date_window(date(2026, 1, 1), date(2026, 2, 28))
+        assert [t.tab for t in tabs] == ['January 2026', 'February 2026']
+        assert [len(t.sections['weekly']) for t in tabs] == [1, 2]
+        assert fake_sheet.calls.count('batchGet') == 1
+        assert 'get' not in fake_sheet.calls
+
+    def test_second_load_served_from_tab_cache(self, fake_sheet):
+        from src.integrations.multi_tab import load_date_window
+        load_date_window(date(2026, 1, 1), date(2026, 3, 31))
+        load_date_window(date(2026, 1, 1), date(2026, 3, 31))
+        assert fake_sheet.calls.count('batchGet') == 1
+
+    def test_current_sheet_is_left_alone(self, fake_sheet):
+        from src.integrations.multi_tab import load_date_window
+        from src.session import session
+        load_date_window(date(2026, 1, 1), date(2026, 2, 28))
+        load_date_window(date(2026, 1, 1), date(2026, 2, 28))
+        assert session.get_mis_current_sheet() == 'March 2026'
+
+    def test_no_tabs_in_window(self, fake_sheet):
+        from src.integrations.multi_tab import load_date_window
+        with pytest.raises(ValueError):
+            load_date_window(date(2027, 1, 1), date(2027, 2, 1))
+
+    def test_conflict_route_with_window(self, client, fake_sheet):
+        r = client.post('/api/mis/gsheet-conflict-audit',
+                        json={'start': '2026-01-01', 'end': '2026-03-31'})
+        data = r.get_json()
+        assert data['success'] is True
+        assert data['tabs'] == ['January 2026', 'February 2026', 'March 2026']
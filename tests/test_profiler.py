@@ -0,0 +1,91 @@
+# tests/test_profiler.py — opt-in request profiling + /api/diagnostics/profiles
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture
+def profiling_on(app, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, 'PROFILING_ENABLED', True)
+    monkeypatch.setitem(app.config, 'PROFILE_DIR', str(tmp_path))
+    monkeypatch.setitem(app.config, 'PROFILE_KEEP', 2)
+    return tmp_path
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Capture
+# ─────────────────────────────────────────────────────────────────────────────
+class TestProfileCapture:
+    def test_disabled_by_default(self, client):
+        resp = client.get('/health?profile=1')
+        assert resp.headers.get('X-Profile-Status') == 'disabled'
+        assert 'X-Profile-Id' not in resp.headers
+
+    def test_not_requested_no_header(self, client, profiling_on):
+        resp = client.get('/health')
+        assert 'X-Profile-Status' not in resp.headers
+        assert list(profiling_on.iterdir()) == []
+
+    def test_query_flag_writes_files(self, client, profiling_on):
+        resp = client.post('/api/mis/match?profile=1', json={'tab': 'March 2026'})
+        assert resp.headers.get('X-Profile-Status') == 'saved'
+        stem = resp.headers['X-Profile-Id']
+        for ext in ('prof', 'txt', 'json'):
+            assert (profiling_on / f'{stem}.{ext}').exists()
+
+    def test_header_trigger_and_metadata(self, client, profiling_on):
+        resp = client.post('/api/mis/match', json={'tab': 'March 2026'},
+                           headers={'X-Profile': '1'})
+        stem = resp.headers['X-Profile-Id']
+        listing = client.get('/api/diagnostics/profiles').get_json()
+        meta = next(p for p in listing['profiles'] if p['id'] == stem)
+        assert meta['route'] == '/api/mis/match'
+        assert meta['tab'] == 'March 2026'
+        assert 'row_counts' in meta
+
+    def test_prune_keeps_newest(self, client, profiling_on):
+        for _ in range(4):
+            client.get('/health?profile=1')
+        assert len(list(profiling_on.glob('*.json'))) == 2
+
+    def test_lock_released_when_request_raises(self, tmp_path):
+        from flask import Flask
+
+        from src.utils.profiler import _capture_lock, register_profiling
+        app = Flask(__name__)
+        app.config.update(TESTING=True, PROFILING_ENABLED=True, PROFILE_DIR=str(tmp_path))
+        register_profiling(app)
+
+        @app.route('/boom')
+        def boom():
+            raise RuntimeError('boom')
+
+        with pytest.raises(RuntimeError):
+            app.test_client().get('/boom?profile=1')
+        assert not _capture_lock.locked()
+        assert app.test_client().get('/boom-missing?profile=1').headers['X-Profile-Status'] == 'saved'
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# /api/diagnostics/profiles
+# ─────────────────────────────────────────────────────────────────────────────
+class TestProfileRoutes:
+    def test_list_shape(self, client, profiling_on):
+        data = client.get('/api/diagnostics/profiles').get_json()
+        assert data['success'] is True
+        assert data['enabled'] is True
+        assert isinstance(data['profiles'], list)
+
+    def test_download_txt(self, client, profiling_on):
+        stem = client.get('/health?profile=1').headers['X-Profile-Id']
+        resp = client.get(f'/api/diagnostics/profiles/{stem}?format=txt')
+        assert resp.status_code == 200
+        assert 'cumulative' in resp.get_data(as_text=True)
+
+    def test_download_rejects_bad_id(self, client, profiling_on):
+        resp = client.get('/api/diagnostics/profiles/..%2Fsettings?format=json')
+        assert resp.status_code in (400, 404)
+
+    def test_download_missing_404(self, client, profiling_on):
+        resp = client.get('/api/diagnostics/profiles/20260101_000000_000_health')
+        assert resp.status_code == 404
@@ -0,0 +1,168 @@
+# tests/test_row_cache.py — per-row result cache for CSV generation, MAudit and matching
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_mis_csv, make_sheet_sections
+from src.core import row_cache
+from src.core.auditor import run_maudit
+from src.core.matcher import enhanced_match_mis_ids, generate_mis_csv_with_multiday
+from src.core.row_cache import RowResultCache, frame_version, row_keys
+
+SECTIONS = ('weekly', 'monthly', 'sale')
+
+
+@pytest.fixture(scope='module')
+def sheet():
+    return make_sheet_sections(rows_per_section=30, seed=11)
+
+
+@pytest.fixture(scope='module')
+def mis(sheet):
+    return make_mis_csv(sheet, mis_rows=80)
+
+
+@pytest.fixture
+def cache(monkeypatch) -> RowResultCache:
+    c = RowResultCache()
+    monkeypatch.setattr(row_cache, 'row_cache', c)
+    return c
+
+
+def _gen(df: pd.DataFrame, s) -> list[dict]:
+    rows, summary = generate_mis_csv_with_multiday(df, 'weekly', '', s.bracket_map, s.prefix_map)
+    # SPLIT_GROUP_ID carries a timestamp; everything else must be identical
+    return [{k: v for k, v in r.items() if k != 'SPLIT_GROUP_ID'} for r in rows], summary
+
+
+def _match(df: pd.DataFrame, mis_df: pd.DataFrame, s, sec: str = 'weekly') -> list[dict]:
+    return enhanced_match_mis_ids(df, mis_df, section_type=sec, bracket_map=s.bracket_map,
+                                  prefix_map=s.prefix_map, tab_name=s.tab_name)
+
+
+def _misses(c: RowResultCache, engine: str) -> int:
+    return c.stats()['counts'].get(engine, {}).get('misses', 0)
+
+
+def _edit(df: pd.DataFrame, pos: int, column: str) -> pd.DataFrame:
+    edited = df.copy()
+    edited.iloc[pos, edited.columns.get_loc(column)] = f'{edited.iloc[pos][column]} (edited)'
+    return edited
+
+
+def _deal_column(df: pd.DataFrame) -> str:
+    return next(c for c in df.columns if 'Discount' in c and 'vendor' not in c.lower())
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Keys
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestKeys:
+    def test_row_keys_follow_content(self, sheet):
+        df = sheet.sections['weekly']
+        keys = row_keys(df)
+        assert len(keys) == len(df) and len(set(keys)) == len(df)
+        edited = row_keys(_edit(df, 3, 'Deal Information'))
+        assert [a != b for a, b in zip(keys, edited)].count(True) == 1
+        assert row_keys(df.copy()) == keys
+
+    def test_frame_version(self, mis):
+        assert frame_version(mis) == frame_version(mis.copy())
+        changed = mis.copy()
+        changed.iloc[0, 0] = 'changed'
+        assert frame_version(changed) != frame_version(mis)
+        assert frame_version(None) == ''
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Engines — identical output, only changed rows recomputed
+# ─────────────────────────────────────────────────────────────────────────────
+
+@pytest.mark.usefixtures('app')                               # resolve_location_columns reads the session
+class TestEngines:
+    def test_outputs_match_uncached(self, cache, sheet, mis):
+        df = sheet.sections['weekly']
+        cache.enabled = False
+        expected = (_gen(df, sheet), _match(df, mis, sheet),
+                    [run_maudit(sheet.sections[sec], mis, sec, sheet.bracket_map, sheet.prefix_map)
+                     for sec in SECTIONS])
+        cache.enabled = True
+        for _ in range(2):                                     # cold, then warm
+            assert _gen(df, sheet) == expected[0]
+            assert _match(df, mis, sheet) == expected[1]
+            assert [run_maudit(sheet.sections[sec], mis, sec, sheet.bracket_map, sheet.prefix_map)
+                    for sec in SECTIONS] == expected[2]
+        assert cache.stats()['counts']['run_maudit']['hits'] > 0
+
+    def test_one_edit_recomputes_one_row(self, cache, sheet, mis):
+        df = sheet.sections['sale']
+        run_maudit(df, mis, 'sale', sheet.bracket_map, sheet.prefix_map)
+        before = _misses(cache, 'run_maudit')
+        edited = _edit(df, 2, _deal_column(df))
+        fresh = run_maudit(edited, mis, 'sale', sheet.bracket_map, sheet.prefix_map)
+        assert _misses(cache, 'run_maudit') == before + 1
+        cache.enabled = False
+        assert fresh == run_maudit(edited, mis, 'sale', sheet.bracket_map, sheet.prefix_map)
+
+    def test_multi_day_edit_recomputes_group(self, cache, sheet):
+        from src.core.matcher import detect_multi_day_groups
+        df = sheet.sections['weekly']
+        groups, _ = detect_multi_day_groups(df, 'weekly', sheet.bracket_map, sheet.prefix_map)
+        group = next(g for g in groups.values() if len(g['rows']) > 1)
+        expected_rows, _ = _gen(df, sheet)
+        before = _misses(cache, 'generate_mis_csv_with_multiday')
+
+        pos = df.index[df['_SHEET_ROW_NUM'] == group['rows'][-1]][0]
+        edited = df.copy()
+        spare = next(d for d in ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday',
+                                 'Sunday') if d not in group['weekdays'])
+        edited.loc[pos, 'Weekday [Weekday]'] = spare           # same group, new day
+        rows, _ = _gen(edited, sheet)
+        # the whole group is one unit: one recompute, and its output changed
+        assert _misses(cache, 'generate_mis_csv_with_multiday') == before + 1
+        assert rows != expected_rows
+        cache.enabled = False
+        assert rows == _gen(edited, sheet)[0]
+
+    def test_mis_change_invalidates(self, cache, sheet, mis):
+        df = sheet.sections['weekly']
+        _match(df, mis, sheet)
+        before = _misses(cache, 'enhanced_match_mis_ids')
+        _match(df, mis.copy(), sheet)                          # same content → all hits
+        assert _misses(cache, 'enhanced_match_mis_ids') == before
+        changed = mis.iloc[1:].reset_index(drop=True)
+        _match(df, changed, sheet)
+        assert _misses(cache, 'enhanced_match_mis_ids') >= before + len(df) // 2
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Store
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestStore:
+    def test_lru_bound(self):
+        c = RowResultCache(max_entries=3)
+        for i in range(5):
+            c.put('e', 'ctx', i, i)
+        assert c.stats()['entries'] == 3
+        assert c.get('e', 'ctx', 0) is row_cache.MISS
+        assert c.get('e', 'ctx', 4) == 4
+
+    def test_returned_values_are_copies(self):
+        c = RowResultCache()
+        c.memo('e', 'ctx', 'k', lambda: {'rows': [1]})['rows'].append(2)
+        assert c.memo('e', 'ctx', 'k', lambda: None) == {'rows': [1]}
+
+    def test_clear_by_engine(self):
+        c = RowResultCache()
+        c.put('a', 'ctx', 1, 1); c.put('b', 'ctx', 1, 1)
+        assert c.clear('a') == 1
+        assert c.stats()['per_engine'] == {'b': 1}
+
+    def test_diagnostics_routes(self, client, cache):
+        cache.put('run_maudit', 'ctx', 'k', {})
+        data = client.get('/api/diagnostics/row-cache').get_json()
+        assert data['success'] is True and data['entries'] == 1
+        assert client.post('/api/diagnostics/row-cache/clear').get_json()['cleared'] == 1
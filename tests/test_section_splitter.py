@@ -0,0 +1,117 @@
+# tests/test_section_splitter.py — block-sliced section splitter vs the monolith row walk
+from __future__ import annotations
+
+import random
+
+import pandas as pd
+import pytest
+
+from src.utils.sheet_helpers import split_section_rows
+
+HEADER = ['Weekday', 'Brand', 'Deal Discount', 'Locations', 'MIS ID']
+COLS   = HEADER + ['_SHEET_ROW_NUM']
+
+
+def _monolith_split(values, header_row_idx, columns):
+    """The row walk fetch_google_sheet_data used before split_section_rows (verbatim logic)."""
+    expected_cols = len(columns)
+    sections = {'weekly': [], 'monthly': [], 'sale': []}
+    current_section = 'weekly'
+    i = header_row_idx + 1
+    while i < len(values):
+        row = values[i]
+        row_str = " ".join([str(cell).strip() for cell in row]).upper()
+        if "END420" in row_str:
+            break
+        if "MONTHLYSTART" in row_str:
+            current_section = 'monthly'
+            i += 2
+            continue
+        if "SALESTART" in row_str:
+            current_section = 'sale'
+            i += 2
+            continue
+        if "BREAK420" in row_str:
+            i += 1
+            continue
+        if len(row) >= 2 and str(row[1]).strip():
+            padded_row = row + [''] * (expected_cols - len(row))
+            padded_row = padded_row[:expected_cols - 1]
+            padded_row.append(i + 1)
+            sections[current_section].append(padded_row)
+        i += 1
+    return {sec: pd.DataFrame(rows, columns=columns) if rows else pd.DataFrame(columns=columns)
+            for sec, rows in sections.items()}
+
+
+def _assert_same(values, header_row_idx=0, columns=COLS):
+    expected = _monolith_split(values, header_row_idx, columns)
+    actual   = split_section_rows(values, header_row_idx, columns)
+    assert actual.keys() == expected.keys()
+    for sec in expected:
+        pd.testing.assert_frame_equal(actual[sec], expected[sec])
+    return actual
+
+
+def _tab() -> list[list]:
+    return [
+        HEADER,
+        ['Monday', 'Stiiizy', '20%', 'All Locations', 'W1: 123'],
+        ['Tuesday', 'Kiva'],                                       # short row → padded
+        ['', '', '', '', ''],                                      # blank brand → dropped
+        ['Wednesday', 'Wyld', '10%', 'Davis', '', 'extra', 'x'],   # long row → cut
+        ['BREAK420'],
+        ['Friday', 'Camino', '5%', 'Dixon', ''],
+        ['monthlystart', ''],                                      # case-insensitive flag
+        HEADER,
+        ['', 'Raw Garden', '15%', 'All Locations', 'M1: 456'],
+        ['SALESTART'],
+        ['Weekday', 'Brand', 'SALESTART'],                         # skipped header, even with a flag
+        ['03/01/26 - 03/07/26', 'Jeeter', '30%', 'All Locations', ''],
+        ['note', 'END420 below this line'],
+        ['Saturday', 'Ignored', '1%', 'All Locations', ''],
+    ]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Equivalence with the monolith walk
+# ─────────────────────────────────────────────────────────────────────────────
+class TestEquivalence:
+    def test_markers_padding_and_row_numbers(self):
+        out = _assert_same(_tab())
+        assert out['weekly']['Brand'].tolist() == ['Stiiizy', 'Kiva', 'Wyld', 'Camino']
+        assert out['weekly']['_SHEET_ROW_NUM'].tolist() == [2, 3, 5, 7]
+        assert out['monthly']['Brand'].tolist() == ['Raw Garden']
+        assert out['sale']['_SHEET_ROW_NUM'].tolist() == [13]
+        assert out['weekly'].loc[1, 'MIS ID'] == ''
+
+    def test_no_markers(self):
+        _assert_same([HEADER, ['Monday', 'Stiiizy', '20%', 'All', '']])
+
+    def test_header_only_and_empty_sections(self):
+        out = _assert_same([HEADER])
+        assert all(df.empty and list(df.columns) == COLS for df in out.values())
+
+    def test_header_not_first_row(self):
+        values = [['title'], ['', 'subtitle'], *_tab()]
+        _assert_same(values, header_row_idx=2)
+
+    def test_flag_on_last_row(self):
+        _assert_same([HEADER, ['Monday', 'Stiiizy', '', '', ''], ['SALESTART']])
+
+    def test_numeric_cells_keep_dtypes(self):
+        _assert_same([HEADER, ['Monday', 'Stiiizy', 20, 'All', 123],
+                      ['Tuesday', 'Kiva', 15, 'All', 456]])
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_randomised_tabs(self, seed):
+        rng  = random.Random(seed)
+        pool = [['BREAK420'], ['MONTHLYSTART'], ['SALESTART'], ['x', 'y', 'End420'], [], ['']]
+        values = [HEADER]
+        for _ in range(300):
+            if rng.random() < 0.04:
+                values.append(list(rng.choice(pool)))
+            else:
+                width = rng.randint(0, 8)
+                values.append([rng.choice(['', 'a', 'Brand', ' ', 'b c']) for _ in range(width)])
+        _assert_same(values)
@@ -0,0 +1,154 @@
+# tests/test_server.py — serving-mode selection (src/server.py)
+from __future__ import annotations
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+import pytest
+
+import src.server as server
+from src.server import resolve_server_options
+
+
+class TestResolveServerOptions:
+    def test_defaults_to_development(self):
+        opts = resolve_server_options({}, environ={})
+        assert opts['SERVER_MODE'] == 'development'
+        assert opts['WSGI_THREADS'] == 8
+
+    def test_settings_json_values_used(self):
+        opts = resolve_server_options({'SERVER_MODE': 'production', 'WSGI_THREADS': 12}, environ={})
+        assert opts['SERVER_MODE'] == 'production'
+        assert opts['WSGI_THREADS'] == 12
+
+    def test_env_overrides_config(self):
+        opts = resolve_server_options(
+            {'SERVER_MODE': 'development', 'WSGI_BACKLOG': 64},
+            environ={'FLASK_SERVER_MODE': 'prod', 'WSGI_BACKLOG': '2048'},
+        )
+        assert opts['SERVER_MODE'] == 'production'
+        assert opts['WSGI_BACKLOG'] == 2048
+
+    def test_invalid_number_falls_back_to_default(self):
+        opts = resolve_server_options({'WSGI_THREADS': 'lots'}, environ={})
+        assert opts['WSGI_THREADS'] == 8
+
+
+class TestServeFallback:
+    def test_production_without_waitress_uses_dev_server(self, monkeypatch):
+        calls = {}
+
+        class _App:
+            config = {'SERVER_MODE': 'production'}
+
+            def run(self, **kwargs):
+                calls.update(kwargs)
+
+        monkeypatch.setattr(server, 'WAITRESS_AVAILABLE', False)
+        monkeypatch.delenv('FLASK_SERVER_MODE', raising=False)
+        server.serve(_App(), host='127.0.0.1', port=5999)
+        assert calls['port'] == 5999
+        assert calls['threaded'] is True
+        assert calls['use_reloader'] is False
+
+
+_SLOW_APP = '''
+import sys, time
+from flask import Flask
+from src.server import serve
+
+app = Flask(__name__)
+app.config.update(SERVER_MODE='production', WSGI_SHUTDOWN_TIMEOUT=5)
+
+@app.route('/slow')
+def slow():
+    time.sleep(1.0)
+    return 'drained'
+
+serve(app, host='127.0.0.1', port=int(sys.argv[1]))
+'''
+
+
+class TestGracefulShutdown:
+    def test_sigint_drains_in_flight_request(self, tmp_path):
+        pytest.importorskip('waitress')
+        if os.name == 'nt':
+            pytest.skip('POSIX signals only')
+
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            port = s.getsockname()[1]
+        script = tmp_path / 'slow_app.py'
+        script.write_text(_SLOW_APP)
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = {**os.environ, 'PYTHONPATH': root, 'FLASK_SERVER_MODE': 'production'}
+        proc = subprocess.Popen([sys.executable, str(script), str(port)], cwd=root, env=env,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        try:
+            deadline = time.time() + 15
+            while time.time() < deadline:
+                try:
+                    socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+                    break
+                except OSError:
+                    time.sleep(0.05)
+            reply = {}
+
+            def call():
+                with urllib.request.urlopen(f'http://127.0.0.1:{port}/slow', timeout=10) as resp:
+                    reply['status'], reply['body'] = resp.status, resp.read()
+
+            t = threading.Thread(target=call)
+            t.start()
+            time.sleep(0.3)
+            proc.send_signal(signal.SIGINT)
+            t.join(10)
+            out, _ = proc.communicate(timeout=15)
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+        assert reply == {'status': 200, 'body': b'drained'}, out
+        assert proc.returncode == 0 and 'Bad file descriptor' not in out, out
+        assert 'Shutdown complete' in out
+
+
+class TestWaitressInternals:
+    """_run_until_drained reads these waitress internals — fail loudly if an upgrade moves them."""
+
+    def test_drain_loop_attributes_exist(self):
+        waitress = pytest.importorskip('waitress')
+        import inspect
+        from waitress import wasyncore
+        from waitress.channel import HTTPChannel
+        from waitress.server import BaseWSGIServer
+
+        srv = waitress.create_server(lambda environ, start_response: [], host='127.0.0.1', port=0, threads=1)
+        socket_map = getattr(srv, '_map', None) or srv.map
+        client = socket.create_connection(('127.0.0.1', srv.effective_port))
+        try:
+            assert isinstance(srv, BaseWSGIServer) and srv in socket_map.values()
+            assert isinstance(srv.adj.asyncore_loop_timeout, (int, float))
+            assert isinstance(srv.adj.asyncore_use_poll, bool)
+            assert len(srv.task_dispatcher.queue) == 0 and isinstance(srv.task_dispatcher.active_count, int)
+            assert 'timeout' in inspect.signature(srv.task_dispatcher.shutdown).parameters
+            assert 'count' in inspect.signature(wasyncore.loop).parameters
+            assert hasattr(srv, 'accepting') and callable(wasyncore.dispatcher.close)
+
+            channels: list = []
+            for _ in range(50):
+                wasyncore.loop(timeout=0.05, map=socket_map, count=1)
+                channels = [c for c in socket_map.values() if isinstance(c, HTTPChannel)]
+                if channels:
+                    break
+            assert channels, 'no HTTPChannel in the socket map after a connect'
+            assert channels[0].requests == [] and channels[0].total_outbufs_len == 0
+        finally:
+            client.close()
+            srv.task_dispatcher.shutdown(timeout=1)
+            wasyncore.close_all(socket_map)
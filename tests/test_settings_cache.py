@@ -0,0 +1,246 @@
+# tests/test_settings_cache.py — versioned Settings / Brand Rebate cache
+from __future__ import annotations
+
+import json
+import threading
+
+import pytest
+
+from src.integrations.settings_cache import SettingsCache, build_settings
+
+SETTINGS = {
+    'brand_settings': {'stiiizy': 'Stiiizy Parent'},
+    'dropdowns':      {'stores': ['Davis'], 'categories': ['Flower'],
+                       'brand_linked_map': {'stiiizy': 'Stiiizy Parent'}},
+    'brand_aw_list':  ['kiva'],
+}
+
+
+class _Source:
+    """Builder + revision probe over a mutable 'sheet'."""
+
+    def __init__(self) -> None:
+        self.data     = json.loads(json.dumps(SETTINGS))
+        self.revision: str | None = '1'
+        self.builds   = 0
+        self.probes   = 0
+        self.fail     = False
+
+    def build(self, service, spreadsheet_id):
+        if self.fail:
+            raise OSError('sheets down')
+        self.builds += 1
+        return json.loads(json.dumps(self.data))
+
+    def probe(self, service, spreadsheet_id):
+        self.probes += 1
+        return self.revision
+
+
+@pytest.fixture
+def source() -> _Source:
+    return _Source()
+
+
+@pytest.fixture
+def make_cache(tmp_path, source):
+    caches: list[SettingsCache] = []
+
+    def factory(**kwargs) -> SettingsCache:
+        kwargs.setdefault('cache_dir', tmp_path / 'settings')
+        kwargs.setdefault('check_seconds', 3600)
+        kwargs.setdefault('background', False)
+        c = SettingsCache(service_getter=lambda: object(), builder=source.build,
+                          revision_probe=source.probe, **kwargs)
+        caches.append(c)
+        return c
+
+    yield factory
+    for c in caches:
+        c.shutdown()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Serving
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestServing:
+    def test_first_get_builds_then_serves_from_memory(self, make_cache, source):
+        cache = make_cache()
+        for _ in range(5):
+            assert cache.brand_settings('sid') == {'stiiizy': 'Stiiizy Parent'}
+        assert cache.brand_aw_list('sid') == ['kiva']
+        assert cache.dropdowns('sid')['stores'] == ['Davis']
+        assert source.builds == 1
+        assert cache.stats()['counts']['hit'] >= 6
+
+    def test_returned_values_are_copies(self, make_cache):
+        cache = make_cache()
+        cache.dropdowns('sid')['stores'].append('Dixon')
+        cache.brand_settings('sid')['kiva'] = 'x'
+        assert cache.dropdowns('sid')['stores'] == ['Davis']
+        assert 'kiva' not in cache.brand_settings('sid')
+
+    def test_no_service_and_nothing_cached(self, tmp_path, source):
+        cache = SettingsCache(cache_dir=tmp_path, service_getter=lambda: None,
+                              builder=source.build, revision_probe=source.probe, background=False)
+        assert cache.get('sid') is None
+        assert cache.brand_settings('sid') == {}
+        assert cache.dropdowns('sid') == {'stores': [], 'categories': [], 'brand_linked_map': {}}
+
+    def test_disabled_reads_live_every_time(self, make_cache, source):
+        cache = make_cache(enabled=False)
+        cache.get('sid'); cache.get('sid')
+        assert source.builds == 2
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Persistence
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestPersistence:
+    def test_restart_serves_from_disk_without_building(self, make_cache, source, tmp_path):
+        make_cache().get('sid')
+        assert (tmp_path / 'settings' / 'sid.json').exists()
+
+        source.fail = True                        # Sheets unreachable after restart
+        restarted = make_cache()
+        entry = restarted.get('sid')
+        assert entry is not None and entry.version == 1
+        assert entry.brand_aw_list == ['kiva']
+        assert restarted.stats()['counts']['disk_load'] == 1
+
+    def test_unreadable_file_is_rebuilt(self, make_cache, source, tmp_path):
+        (tmp_path / 'settings').mkdir()
+        (tmp_path / 'settings' / 'sid.json').write_text('{broken')
+        assert make_cache().get('sid').version == 1
+        assert source.builds == 1
+
+    def test_memory_only(self, make_cache, tmp_path):
+        make_cache(cache_dir=None).get('sid')
+        assert not (tmp_path / 'settings').exists()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Revalidation / versioning
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestRefresh:
+    def test_same_revision_skips_rebuild(self, make_cache, source):
+        cache = make_cache()
+        cache.get('sid')
+        cache.refresh('sid')
+        assert source.builds == 1
+        assert cache.stats()['counts']['revision_skip'] == 1
+
+    def test_new_revision_same_content_keeps_version(self, make_cache, source):
+        cache = make_cache()
+        cache.get('sid')
+        source.revision = '2'
+        entry = cache.refresh('sid')
+        assert source.builds == 2
+        assert entry.version == 1 and entry.revision == '2'
+
+    def test_content_change_bumps_version(self, make_cache, source):
+        cache = make_cache()
+        cache.get('sid')
+        source.revision = '2'
+        source.data['brand_aw_list'] = ['kiva', 'wyld']
+        assert cache.refresh('sid').version == 2
+        assert cache.brand_aw_list('sid') == ['kiva', 'wyld']
+
+    def test_checksum_mode_uses_max_age(self, make_cache, source):
+        source.revision = None
+        cache = make_cache(max_age_seconds=3600)
+        cache.get('sid')
+        cache.refresh('sid')
+        assert source.builds == 1
+        cache.max_age_seconds = 0
+        cache.refresh('sid')
+        assert source.builds == 2
+
+    def test_failed_refresh_keeps_last_good_entry(self, make_cache, source):
+        cache = make_cache()
+        cache.get('sid')
+        source.fail = True
+        assert cache.refresh('sid', force=True).brand_aw_list == ['kiva']
+        assert cache.stats()['counts']['errors'] == 1
+
+    def test_stale_entry_revalidated_in_background(self, make_cache, source):
+        cache = make_cache(check_seconds=0, background=True)
+        cache.get('sid')
+        source.revision = '2'
+        source.data['brand_settings'] = {'kiva': 'Kiva Parent'}
+        assert cache.get('sid').version == 1           # served immediately
+        for _ in range(200):
+            if cache.get('sid').version == 2:
+                break
+            threading.Event().wait(0.01)
+        assert cache.brand_settings('sid') == {'kiva': 'Kiva Parent'}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Real loaders / routes
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _Exec:
+    def __init__(self, payload: dict) -> None:
+        self.payload = payload
+
+    def execute(self) -> dict:
+        return self.payload
+
+
+class _SettingsSheet:
+    BRAND = [['Brand', 'Linked Brand', 'After Wholesale'],
+             ['Stiiizy', 'Stiiizy Parent', 'TRUE'], ['Kiva', '', 'FALSE']]
+    SETTINGS = [['Store Name', 'x', 'Category'], ['Davis', '', 'Flower'], ['Dixon', '', 'Edible']]
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, **kwargs):
+        self.calls.append('meta')
+        return _Exec({'sheets': [{'properties': {'sheetId': i, 'title': t, 'index': i}}
+                                 for i, t in enumerate(['Settings', 'Brand Rebate Agreements'])]})
+
+    def batchGet(self, **kwargs):
+        self.calls.append('batchGet')
+        return _Exec({'valueRanges': [{'values': self.SETTINGS}, {'values': self.BRAND}]})
+
+
+class TestLoaders:
+    def test_build_settings_one_round_trip(self, app):
+        from src.integrations import sheets_access
+        sheets_access.invalidate()
+        svc = _SettingsSheet()
+        data = build_settings(svc, 'sid-build')
+        assert data['brand_settings'] == {'stiiizy': 'Stiiizy Parent', 'kiva': ''}
+        assert data['dropdowns']['stores'] == ['Davis', 'Dixon']
+        assert data['brand_aw_list'] == ['stiiizy']
+        assert svc.calls == ['meta', 'batchGet']
+        sheets_access.invalidate()
+
+    def test_dropdown_route_served_from_cache(self, client, monkeypatch):
+        from src.integrations import settings_cache, sheets_access
+        from src.session import session
+        sheets_access.invalidate()
+        svc = _SettingsSheet()
+        cache = SettingsCache(cache_dir=None, service_getter=lambda: svc,
+                              revision_probe=lambda s, sid: None, background=False)
+        monkeypatch.setattr(settings_cache, 'settings_cache', cache)
+        monkeypatch.setattr(session, 'get_spreadsheet_id', lambda: 'sid-route')
+        first  = client.get('/api/get-settings-dropdowns').get_json()
+        second = client.get('/api/get-settings-dropdowns').get_json()
+        assert first == second
+        assert first['success'] is True
+        assert first['brand_aw_list'] == ['stiiizy']
+        assert first['settings_version'] == 1
+        assert svc.calls == ['meta', 'batchGet']
+        sheets_access.invalidate()
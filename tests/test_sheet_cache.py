@@ -0,0 +1,207 @@
+# tests/test_sheet_cache.py — revision-aware tab snapshot cache
+from __future__ import annotations
+
+import pytest
+
+from src.integrations import sheet_cache
+from src.integrations.sheet_cache import TabSnapshotCache
+
+VALUES = [
+    ['Weekday', 'Brand', 'Deal Discount', 'Locations', 'MIS ID'],
+    ['Monday', 'Stiiizy', '20%', 'All Locations', ''],
+    ['Tuesday', 'Kiva', '15%', 'Davis', ''],
+]
+
+
+class _Req:
+    def __init__(self, owner: '_FakeSheets') -> None:
+        self.owner = owner
+
+    def execute(self) -> dict:
+        self.owner.calls += 1
+        return {'values': [list(r) for r in self.owner.rows]}
+
+
+class _FakeSheets:
+    """Minimal stand-in for the googleapiclient Sheets resource; counts value reads."""
+
+    def __init__(self, rows: list[list[str]]) -> None:
+        self.rows   = rows
+        self.calls  = 0
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):  # noqa: D401 — mirrors the client chain
+        return self
+
+    def get(self, **kwargs):
+        if 'range' not in kwargs:       # masked metadata lookup (grid size unknown here)
+            return _Meta()
+        return _Req(self)
+
+
+class _Meta:
+    def execute(self) -> dict:
+        return {'sheets': []}
+
+
+def fetch_google_sheet_data(tab_name: str):
+    from src.integrations.google_sheets import fetch_google_sheet_data as fetch
+    return fetch(tab_name)
+
+
+@pytest.fixture
+def fake_sheet(app, monkeypatch):
+    import src.integrations.google_sheets as google_sheets
+    from src.integrations import sheets_access
+    from src.session import session
+    sheets_access.invalidate()
+    fake = _FakeSheets(VALUES)
+    cache = TabSnapshotCache(revalidate_seconds=60)
+    monkeypatch.setattr(sheet_cache, 'tab_cache', cache)
+    monkeypatch.setattr(google_sheets, 'session', session)
+    monkeypatch.setattr(session, 'get_sheets_service', lambda: fake)
+    monkeypatch.setattr(session, 'get_spreadsheet_id', lambda: 'sheet-abc')
+    return fake, cache
+
+
+
+class _Creds:
+    def __init__(self, scopes):
+        self.scopes = scopes
+
+
+class _Service:
+    def __init__(self, creds):
+        self._http = type('_Http', (), {'credentials': creds})()
+
+
+class _HttpError(Exception):
+    def __init__(self, status, content):
+        super().__init__(status)
+        self.resp = type('_Resp', (), {'status': status})()
+        self.content = content
+
+
+class _Drive:
+    """drive.files().get(...).execute() replaying the given answers."""
+
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.calls = 0
+
+    def files(self):
+        return self
+
+    def get(self, **kwargs):
+        return self
+
+    def execute(self):
+        self.calls += 1
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+# ─────────────────────────────────────────────────────────────────────────────
+# fetch_google_sheet_data integration
+# ─────────────────────────────────────────────────────────────────────────────
+class TestFetchCaching:
+    def test_second_fetch_skips_network(self, fake_sheet):
+        fake, cache = fake_sheet
+        first  = fetch_google_sheet_data('March 2026')
+        second = fetch_google_sheet_data('March 2026')
+        assert fake.calls == 1
+        assert len(second['weekly']) == len(first['weekly']) == 2
+        assert cache.stats()['counts']['hit_fresh'] == 1
+
+    def test_hit_returns_copies(self, fake_sheet):
+        first = fetch_google_sheet_data('March 2026')['weekly']
+        first.loc[0, 'Brand'] = 'MUTATED'
+        again = fetch_google_sheet_data('March 2026')
+        assert 'MUTATED' not in again['weekly']['Brand'].tolist()
+
+    def test_unchanged_values_skip_parse(self, fake_sheet):
+        fake, cache = fake_sheet
+        cache.revalidate_seconds = 0
+        fetch_google_sheet_data('March 2026')
+        fetch_google_sheet_data('March 2026')
+        assert fake.calls == 2
+        assert cache.stats()['counts']['hit_checksum'] == 1
+
+    def test_changed_values_reparse(self, fake_sheet):
+        fake, cache = fake_sheet
+        cache.revalidate_seconds = 0
+        fetch_google_sheet_data('March 2026')
+        fake.rows = VALUES + [['Friday', 'Wyld', '10%', 'Dixon', '']]
+        assert len(fetch_google_sheet_data('March 2026')['weekly']) == 3
+
+    def test_invalidate_forces_refetch(self, fake_sheet):
+        fake, cache = fake_sheet
+        fetch_google_sheet_data('March 2026')
+        assert cache.invalidate('sheet-abc', 'March 2026') == 1
+        fetch_google_sheet_data('March 2026')
+        assert fake.calls == 2
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Revision probe
+# ─────────────────────────────────────────────────────────────────────────────
+class TestRevision:
+    def test_same_revision_is_hit_without_values_call(self, fake_sheet, monkeypatch):
+        fake, cache = fake_sheet
+        cache.revalidate_seconds = 0
+        monkeypatch.setattr(cache, 'probe_revision', lambda svc, sid: '41')
+        fetch_google_sheet_data('March 2026')
+        fetch_google_sheet_data('March 2026')
+        assert fake.calls == 1
+        assert cache.stats()['counts']['hit_revision'] == 1
+
+    def test_new_revision_refetches(self, fake_sheet, monkeypatch):
+        fake, cache = fake_sheet
+        cache.revalidate_seconds = 0
+        revs = iter(['41', '42'])
+        monkeypatch.setattr(cache, 'probe_revision', lambda svc, sid: next(revs))
+        fetch_google_sheet_data('March 2026')
+        fetch_google_sheet_data('March 2026')
+        assert fake.calls == 2
+
+    def test_probe_without_credentials_falls_back(self):
+        cache = TabSnapshotCache()
+        assert cache.probe_revision(object(), 'sheet-xyz') is None
+        assert 'sheet-xyz' in cache.stats()['revision_probe']['retrying']
+
+    def test_spreadsheets_only_token_skips_drive(self, monkeypatch):
+        cache = TabSnapshotCache()
+        monkeypatch.setattr(cache, '_drive_for', lambda creds: pytest.fail('Drive called'))
+        assert cache.probe_revision(_Service(_Creds(['https://www.googleapis.com/auth/spreadsheets'])),
+                                    'sheet-xyz') is None
+        assert 'sheet-xyz' in cache._drive_unavailable
+
+    def test_scope_403_disables_but_transient_error_retries(self, monkeypatch):
+        cache = TabSnapshotCache()
+        drive = _Drive([_HttpError(429, b'rateLimitExceeded'), {'version': '7'},
+                        _HttpError(403, b'{"reason": "insufficientPermissions"}')])
+        monkeypatch.setattr(cache, '_drive_for', lambda creds: drive)
+        service = _Service(_Creds(['https://www.googleapis.com/auth/drive.metadata.readonly']))
+        assert cache.probe_revision(service, 's1') is None
+        assert 's1' not in cache._drive_unavailable
+        cache._probe_retry_at['s1'] = 0
+        assert cache.probe_revision(service, 's1') == '7'
+        assert cache.probe_revision(service, 's1') is None
+        assert 's1' in cache._drive_unavailable
+        assert drive.calls == 3
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# /api/diagnostics/sheet-cache
+# ─────────────────────────────────────────────────────────────────────────────
+class TestCacheRoutes:
+    def test_stats_and_clear(self, client, fake_sheet):
+        fetch_google_sheet_data('March 2026')
+        stats = client.get('/api/diagnostics/sheet-cache').get_json()
+        assert stats['success'] is True
+        assert stats['tabs'][0]['tab'] == 'March 2026'
+        cleared = client.post('/api/diagnostics/sheet-cache/clear', json={}).get_json()
+        assert cleared['cleared'] == 1
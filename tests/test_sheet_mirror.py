@@ -0,0 +1,175 @@
+# tests/test_sheet_mirror.py — local SQLite mirror of parsed sheet tabs
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.integrations import sheet_mirror
+from src.integrations.sheet_mirror import SheetMirror
+
+TAB = 'March 2026'
+
+WEEKLY = pd.DataFrame({
+    'Weekday':        ['Monday', 'Tuesday, Friday', 'Wednesday'],
+    'Brand':          ['Stiiizy', 'Kiva', 'Wyld'],
+    'Deal Discount':  ['20%', '15%', '10%'],
+    'MIS ID':         ['W1: 12345', '', '67890, 67891'],
+    '_SHEET_ROW_NUM': [3, 4, 5],
+})
+
+
+def _sections(weekly: pd.DataFrame = WEEKLY) -> dict[str, pd.DataFrame]:
+    return {'weekly': weekly.copy(), 'monthly': pd.DataFrame(), 'sale': pd.DataFrame()}
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    m = SheetMirror(db_path=tmp_path / 'mirror.db', background=False)
+    yield m
+    m.shutdown()
+
+
+def _sync(m: SheetMirror, sections: dict[str, pd.DataFrame], checksum: str, tab: str = TAB) -> None:
+    m.sync('sid', tab, sections, checksum, '7', 1, {'Brand': '[Brand]'}, {}, ['Retail?'])
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Sync
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestSync:
+    def test_round_trip(self, mirror):
+        _sync(mirror, _sections(), 'c1')
+        sections, info = mirror.load_sections('sid', TAB)
+        assert sections['weekly']['Brand'].tolist() == ['Stiiizy', 'Kiva', 'Wyld']
+        assert list(sections['weekly'].columns) == list(WEEKLY.columns)
+        assert sections['monthly'].empty
+        assert info['header_row_idx'] == 1
+        assert info['bracket_map'] == {'Brand': '[Brand]'}
+        assert info['rebate_type_columns'] == ['Retail?']
+
+    def test_unchanged_checksum_writes_nothing(self, mirror):
+        _sync(mirror, _sections(), 'c1')
+        _sync(mirror, _sections(), 'c1')
+        counts = mirror.stats()['counts']
+        assert counts['rows_written'] == 3
+        assert counts['unchanged_tabs'] == 1
+
+    def test_only_changed_rows_rewritten(self, mirror):
+        _sync(mirror, _sections(), 'c1')
+        edited = WEEKLY.copy()
+        edited.loc[1, 'Deal Discount'] = '25%'
+        _sync(mirror, _sections(edited.iloc[:2]), 'c2')    # one edit, one row gone
+        counts = mirror.stats()['counts']
+        assert counts['rows_written'] == 3 + 1
+        assert counts['rows_deleted'] == 1
+        sections, _ = mirror.load_sections('sid', TAB)
+        assert sections['weekly']['Deal Discount'].tolist() == ['20%', '25%']
+        assert mirror.query('sid', mis_id='67890') == []
+
+    def test_background_sync(self, tmp_path):
+        m = SheetMirror(db_path=tmp_path / 'bg.db')
+        _sync(m, _sections(), 'c1')
+        m.flush()
+        assert m.load_sections('sid', TAB) is not None
+        m.shutdown()
+
+    def test_disabled(self, tmp_path):
+        m = SheetMirror(db_path=tmp_path / 'off.db', enabled=False)
+        _sync(m, _sections(), 'c1')
+        assert m.load_sections('sid', TAB) is None
+        assert not (tmp_path / 'off.db').exists()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Query
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestQuery:
+    def test_by_mis_id(self, mirror):
+        _sync(mirror, _sections(), 'c1')
+        hits = mirror.query('sid', mis_id='67891')
+        assert [h['brand'] for h in hits] == ['Wyld']
+        assert hits[0]['mis_ids'] == ['67890', '67891']
+        assert hits[0]['sheet_row'] == 5
+        assert hits[0]['row']['Deal Discount'] == '10%'
+
+    def test_by_brand_and_weekday(self, mirror):
+        _sync(mirror, _sections(), 'c1')
+        assert [h['brand'] for h in mirror.query('sid', brand='kiv')] == ['Kiva']
+        assert [h['brand'] for h in mirror.query('sid', weekday='friday')] == ['Kiva']
+
+    def test_by_date(self, mirror):
+        _sync(mirror, _sections(), 'c1')
+        # 2 March 2026 is a Monday; 6 March a Friday
+        assert [h['brand'] for h in mirror.query('sid', on_date=date(2026, 3, 2))] == ['Stiiizy']
+        assert [h['brand'] for h in mirror.query('sid', on_date=date(2026, 3, 6))] == ['Kiva']
+
+    def test_scoped_by_tab(self, mirror):
+        _sync(mirror, _sections(), 'c1')
+        _sync(mirror, _sections(), 'c1', tab='April 2026')
+        assert len(mirror.query('sid', brand='Stiiizy')) == 2
+        assert len(mirror.query('sid', brand='Stiiizy', tab='April 2026')) == 1
+        assert mirror.query('other-sid', brand='Stiiizy') == []
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Offline fallback / routes
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _Down:
+    def spreadsheets(self):
+        raise OSError('network unreachable')
+
+
+class TestOffline:
+    def test_failed_fetch_served_from_mirror(self, app, mirror, monkeypatch):
+        import src.integrations.google_sheets as google_sheets
+        from src.integrations import sheet_cache, sheets_access
+        from src.integrations.sheet_cache import TabSnapshotCache
+        from src.session import session
+        sheets_access.invalidate()
+        _sync(mirror, _sections(), 'c1')
+        monkeypatch.setattr(sheet_mirror, 'sheet_mirror', mirror)
+        monkeypatch.setattr(sheet_cache, 'tab_cache', TabSnapshotCache(revalidate_seconds=60))
+        monkeypatch.setattr(google_sheets, 'session', session)
+        monkeypatch.setattr(session, 'get_sheets_service', lambda: _Down())
+        monkeypatch.setattr(session, 'get_spreadsheet_id', lambda: 'sid')
+
+        sections = google_sheets.fetch_google_sheet_data(TAB)
+        assert sections['weekly']['Brand'].tolist() == ['Stiiizy', 'Kiva', 'Wyld']
+        assert session.get_mis_header_row_idx() == 1
+        assert mirror.stats()['counts']['offline_serves'] == 1
+        marker = sheet_mirror.offline_marker(sections)
+        assert marker['offline'] is True and marker['mirrored_at'].startswith(str(date.today().year))
+        assert sheet_mirror.offline_marker(_sections()) == {}
+        sheets_access.invalidate()
+
+    def test_route_flags_offline_data(self, client, mirror, monkeypatch):
+        from src.integrations import sheet_cache, sheets_access
+        from src.integrations.sheet_cache import TabSnapshotCache
+        from src.session import session
+        sheets_access.invalidate()
+        _sync(mirror, _sections(), 'c1')
+        monkeypatch.setattr(sheet_mirror, 'sheet_mirror', mirror)
+        monkeypatch.setattr(sheet_cache, 'tab_cache', TabSnapshotCache(revalidate_seconds=60))
+        monkeypatch.setattr(session, 'get_sheets_service', lambda: _Down())
+        monkeypatch.setattr(session, 'get_spreadsheet_id', lambda: 'sid')
+
+        data = client.post('/api/mis/generate-csv', json={'tab': TAB}).get_json()
+        assert data['success'] is True and data['total_rows']
+        assert data['offline'] is True and data['mirrored_at']
+        sheets_access.invalidate()
+
+    def test_query_route(self, client, mirror, monkeypatch):
+        from src.session import session
+        _sync(mirror, _sections(), 'c1')
+        monkeypatch.setattr(sheet_mirror, 'sheet_mirror', mirror)
+        monkeypatch.setattr(session, 'get_spreadsheet_id', lambda: 'sid')
+        data = client.get('/api/mis/sheet-mirror/query?mis_id=12345').get_json()
+        assert data['success'] is True
+        assert data['count'] == 1 and data['rows'][0]['brand'] == 'Stiiizy'
+        stats = client.get('/api/diagnostics/sheet-mirror').get_json()
+        assert stats['tabs'][0]['rows'] == 3
@@ -0,0 +1,333 @@
+# tests/test_sheet_writer.py — debounced / coalesced sheet write-back queue
+from __future__ import annotations
+
+import pytest
+
+from src.integrations.sheet_writer import (
+    CellWrite,
+    WriteBackQueue,
+    WriteQuotaError,
+)
+
+
+class _HttpError(Exception):
+    """Shape of googleapiclient.errors.HttpError as far as the queue cares."""
+
+    def __init__(self, status: int) -> None:
+        super().__init__(f'HTTP {status}')
+        self.resp = type('Resp', (), {'status': status})()
+
+
+class _Req:
+    def __init__(self, fn) -> None:
+        self.fn = fn
+
+    def execute(self):
+        return self.fn()
+
+
+class _FakeSheets:
+    """Records batchGet / batchUpdate calls; `cells` maps A1 → current value."""
+
+    def __init__(self, cells: dict[str, str] | None = None, fail_with: list[int] | None = None) -> None:
+        self.cells     = dict(cells or {})
+        self.fail_with = list(fail_with or [])
+        self.updates: list[list[dict]] = []
+        self.gets:    list[list[str]]  = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):  # noqa: D401 — mirrors the client chain
+        return self
+
+    def batchGet(self, spreadsheetId, ranges, **kwargs):
+        def run():
+            self.gets.append(list(ranges))
+            return {'valueRanges': [{'values': [[self.cells[r]]]} if self.cells.get(r) else {}
+                                    for r in ranges]}
+        return _Req(run)
+
+    def batchUpdate(self, spreadsheetId, body):
+        def run():
+            if self.fail_with:
+                raise _HttpError(self.fail_with.pop(0))
+            self.updates.append(body['data'])
+            for d in body['data']:
+                self.cells[d['range']] = d['values'][0][0]
+            return {'totalUpdatedCells': len(body['data'])}
+        return _Req(run)
+
+
+@pytest.fixture
+def sleeps() -> list[float]:
+    return []
+
+
+@pytest.fixture
+def make_queue(sleeps):
+    queues: list[WriteBackQueue] = []
+
+    def factory(service, **kwargs) -> WriteBackQueue:
+        kwargs.setdefault('debounce_ms', 20)
+        kwargs.setdefault('max_delay_ms', 200)
+        q = WriteBackQueue(service_getter=lambda: service, sleep=sleeps.append, **kwargs)
+        queues.append(q)
+        return q
+
+    yield factory
+    for q in queues:
+        q.shutdown(flush=False)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Coalescing
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestCoalescing:
+    def test_many_enqueues_become_one_batch_update(self, make_queue):
+        svc = _FakeSheets()
+        q = make_queue(svc, debounce_ms=10_000, max_delay_ms=10_000)
+        tickets = [q.enqueue('sid', [CellWrite('Tab', r, 4, f'ID{r}')]) for r in range(2, 12)]
+        q.flush('sid')
+        assert len(svc.updates) == 1
+        assert len(svc.updates[0]) == 10
+        assert all(t.status == 'done' for t in tickets)
+
+    def test_later_plain_write_replaces_earlier(self, make_queue):
+        svc = _FakeSheets()
+        q = make_queue(svc, debounce_ms=10_000, max_delay_ms=10_000)
+        q.enqueue('sid', [CellWrite('Tab', 5, 0, 'old')])
+        q.enqueue('sid', [CellWrite('Tab', 5, 0, 'new')])
+        q.flush('sid')
+        assert svc.updates == [[{'range': "'Tab'!A5", 'values': [['new']]}]]
+
+    def test_debounce_flushes_in_background(self, make_queue):
+        svc = _FakeSheets()
+        q = make_queue(svc)
+        ticket = q.enqueue('sid', [CellWrite('Tab', 2, 1, 'x')])
+        assert ticket.done.wait(5)
+        assert ticket.status == 'done'
+        assert svc.cells["'Tab'!B2"] == 'x'
+
+    def test_flush_invalidates_tab_cache(self, make_queue, monkeypatch):
+        from src.integrations import sheet_cache
+        seen: list[tuple] = []
+        monkeypatch.setattr(sheet_cache.tab_cache, 'invalidate', lambda sid=None, tab=None, **kw: seen.append((sid, tab)))
+        q = make_queue(_FakeSheets(), debounce_ms=10_000, max_delay_ms=10_000)
+        q.enqueue('sid', [CellWrite('Tab', 2, 1, 'x')])
+        q.flush('sid')
+        assert ('sid', 'Tab') in seen
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Tagged MIS ID cells
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestTaggedCells:
+    def test_tag_merges_into_current_cell_content(self, make_queue):
+        svc = _FakeSheets({"'Tab'!E7": 'W1: 111'})
+        q = make_queue(svc, debounce_ms=10_000, max_delay_ms=10_000)
+        t = q.enqueue('sid', [CellWrite('Tab', 7, 4, '222', tag='w2', append=True)])
+        q.flush('sid')
+        assert svc.gets == [["'Tab'!E7"]]
+        assert svc.cells["'Tab'!E7"] == 'W1: 111\nW2: 222'
+        assert t.values == {"'Tab'!E7": 'W1: 111\nW2: 222'}
+
+    def test_several_tags_on_one_cell_fold_in_order(self, make_queue):
+        svc = _FakeSheets({"'Tab'!E7": 'W1: 111'})
+        q = make_queue(svc, debounce_ms=10_000, max_delay_ms=10_000)
+        q.enqueue('sid', [CellWrite('Tab', 7, 4, '222', tag='w2', append=True)])
+        q.enqueue('sid', [CellWrite('Tab', 7, 4, '333', tag='wp', append=True)])
+        q.flush('sid')
+        assert len(svc.updates) == 1
+        assert svc.cells["'Tab'!E7"] == 'W1: 111\nW2: 222\nWP: 333'
+
+    def test_resent_append_does_not_duplicate(self, make_queue):
+        svc = _FakeSheets({"'Tab'!E7": 'W1: 111\nW2: 222'})
+        q = make_queue(svc, debounce_ms=10_000, max_delay_ms=10_000)
+        q.enqueue('sid', [CellWrite('Tab', 7, 4, '222', tag='w2', append=True)])
+        q.flush('sid')
+        assert svc.cells["'Tab'!E7"] == 'W1: 111\nW2: 222'
+
+    def test_replace_mode_overwrites_the_cell(self, make_queue):
+        svc = _FakeSheets({"'Tab'!E7": 'W1: 111\nW2: 222'})
+        q = make_queue(svc, debounce_ms=10_000, max_delay_ms=10_000)
+        q.enqueue('sid', [CellWrite('Tab', 7, 4, '999', tag='gap', append=False)])
+        q.flush('sid')
+        assert svc.cells["'Tab'!E7"] == 'GAP: 999'
+
+
+class TestHeaderCheck:
+    def test_header_read_in_the_same_batch_get(self, make_queue):
+        svc = _FakeSheets({"'Tab'!E1": 'MIS ID', "'Tab'!E7": 'W1: 111'})
+        q = make_queue(svc, debounce_ms=10_000, max_delay_ms=10_000)
+        t = q.enqueue('sid', [CellWrite('Tab', 7, 4, '222', tag='w2', append=True, header=(1, 'MIS ID')),
+                              CellWrite('Tab', 8, 4, '333', header=(1, 'MIS ID'))])
+        q.flush('sid')
+        assert t.status == 'done'
+        assert svc.gets == [["'Tab'!E7", "'Tab'!E1"]]
+
+    def test_moved_column_writes_nothing_and_forgets_the_header(self, make_queue, monkeypatch):
+        from src.integrations import sheet_cache
+        dropped: list[tuple] = []
+        monkeypatch.setattr(sheet_cache.tab_cache, 'invalidate',
+                            lambda sid=None, tab=None, headers=False: dropped.append((sid, tab, headers)))
+        svc = _FakeSheets({"'Tab'!E1": 'Notes', "'Tab'!F1": 'MIS ID'})   # a column was inserted
+        q = make_queue(svc, debounce_ms=10_000, max_delay_ms=10_000)
+        t = q.enqueue('sid', [CellWrite('Tab', 8, 4, '333', header=(1, 'MIS ID'))])
+        q.flush('sid')
+        assert t.status == 'failed'
+        assert "now reads 'Notes'" in t.error
+        assert svc.updates == []
+        assert ('sid', 'Tab', True) in dropped
+        assert q.summary()['pending_cells'] == 0                       # not re-queued
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Retry / failure
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestRetry:
+    def test_429_is_retried_with_backoff(self, make_queue, sleeps):
+        svc = _FakeSheets(fail_with=[429, 429])
+        q = make_queue(svc, debounce_ms=10_000, max_delay_ms=10_000)
+        t = q.enqueue('sid', [CellWrite('Tab', 2, 0, 'x')])
+        q.flush('sid')
+        assert t.status == 'done'
+        assert len(sleeps) == 2
+        assert 1.0 <= sleeps[0] <= 1.5 and 2.0 <= sleeps[1] <= 3.0   # exponential + jitter
+        assert q.summary()['counts']['retries'] == 2
+
+    def test_requeued_after_max_retries(self, make_queue, sleeps):
+        svc = _FakeSheets(fail_with=[429] * 3)
+        q = make_queue(svc, debounce_ms=10_000, max_delay_ms=10_000, max_retries=2)
+        t = q.enqueue('sid', [CellWrite('Tab', 2, 0, 'x')])
+        q.flush('sid')
+        assert t.status == 'queued'
+        assert 'after 2 retries' in t.error and 'queued again' in t.error
+        assert t.attempts == 1
+        assert len(sleeps) == 2
+        assert q.summary()['pending'] == {'sid': 1}
+        q.flush('sid')
+        assert t.status == 'done'
+        assert svc.cells["'Tab'!A2"] == 'x'
+
+    def test_requeued_batch_merges_with_newer_writes(self, make_queue):
+        svc = _FakeSheets({"'Tab'!E7": 'W1: 111'}, fail_with=[503])
+        q = make_queue(svc, debounce_ms=10_000, max_delay_ms=10_000, max_retries=0)
+        first = q.enqueue('sid', [CellWrite('Tab', 2, 0, 'old'),
+                                  CellWrite('Tab', 7, 4, '222', tag='w2', append=True)])
+        q.flush('sid')
+        assert first.status == 'queued'
+        second = q.enqueue('sid', [CellWrite('Tab', 2, 0, 'new'),
+                                   CellWrite('Tab', 7, 4, '333', tag='gap', append=True)])
+        q.flush('sid')
+        assert first.status == 'done' and second.status == 'done'
+        assert len(svc.updates) == 1
+        assert svc.cells["'Tab'!A2"] == 'new'
+        assert svc.cells["'Tab'!E7"] == 'W1: 111\nW2: 222\nGAP: 333'
+
+    def test_requeue_delay_grows(self, make_queue):
+        q = make_queue(_FakeSheets(fail_with=[503] * 2), debounce_ms=10_000,
+                       max_delay_ms=10_000, max_retries=0, requeue_sec=30)
+        t = q.enqueue('sid', [CellWrite('Tab', 2, 0, 'x')])
+        q.flush('sid')
+        assert 'in 30s' in t.error
+        q.flush('sid')
+        assert 'in 60s' in t.error
+        assert q.summary()['counts']['requeued'] == 2
+
+    def test_non_retryable_error_fails_immediately(self, make_queue, sleeps):
+        svc = _FakeSheets(fail_with=[400])
+        q = make_queue(svc, debounce_ms=10_000, max_delay_ms=10_000)
+        t = q.enqueue('sid', [CellWrite('Tab', 2, 0, 'x')])
+        q.flush('sid')
+        assert t.status == 'failed'
+        assert sleeps == []
+
+    def test_quota_error_type(self, make_queue):
+        q = make_queue(_FakeSheets(), max_retries=0)
+        with pytest.raises(WriteQuotaError):
+            q._call(lambda: (_ for _ in ()).throw(_HttpError(429)))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Status / routes
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestStatus:
+    def test_ticket_status_and_summary(self, make_queue):
+        q = make_queue(_FakeSheets(), debounce_ms=10_000, max_delay_ms=10_000)
+        t = q.enqueue('sid', [CellWrite('Tab', 2, 0, 'x'), CellWrite('Tab', 3, 0, 'y')])
+        assert q.status(t.id)['status'] == 'queued'
+        assert q.summary()['pending'] == {'sid': 2}
+        q.flush('sid')
+        assert q.status(t.id)['status'] == 'done'
+        assert q.summary()['pending_cells'] == 0
+        assert q.status('nope') is None
+
+
+class TestRoutes:
+    @pytest.fixture
+    def sheet(self, app, monkeypatch):
+        from src.integrations import sheets_access
+        from src.integrations.sheet_writer import get_write_queue
+        from src.session import session
+        svc = _FakeSheets({"'Tab'!E1": 'MIS ID', "'Tab'!E7": 'W1: 111'})
+        monkeypatch.setattr(session, 'get_sheets_service', lambda: svc)
+        monkeypatch.setattr(session, 'get_spreadsheet_id', lambda: 'sid')
+        monkeypatch.setattr(session, 'get_mis_current_sheet', lambda: 'Tab')
+        monkeypatch.setattr(sheets_access, 'get_header',
+                            lambda *a, **k: (0, ['Weekday', 'Brand', 'Discount', 'Locations', 'MIS ID']))
+        yield svc
+        get_write_queue().flush()
+
+    def test_apply_split_id_with_flush(self, client, sheet):
+        r = client.post('/api/mis/apply-split-id',
+                        json={'google_row': 7, 'new_mis_id': '222', 'tag': 'w2', 'flush': True})
+        data = r.get_json()
+        assert data['success'] is True
+        assert data['queued'] is False
+        assert data['updated_value'] == 'W1: 111\nW2: 222'
+
+    def test_apply_split_id_keeps_the_tag_text(self, client, sheet):
+        for tag, mis_id in (('part2', '222'), ('gap', '333')):
+            client.post('/api/mis/apply-split-id', json={'google_row': 7, 'new_mis_id': mis_id, 'tag': tag})
+        data = client.post('/api/mis/apply-split-id', json={'google_row': 7, 'new_mis_id': '444',
+                                                             'tag': 'patch', 'flush': True}).get_json()
+        assert data['updated_value'] == 'W1: 111\nPART2: 222\nGAP: 333\nPATCH: 444'
+        data = client.post('/api/mis/apply-split-id', json={'google_row': 7, 'new_mis_id': '555', 'tag': 'w1',
+                                                             'append': False, 'flush': True}).get_json()
+        assert data['updated_value'] == 'W1: 555'
+
+    def test_flush_failure_keeps_the_write_queued(self, client, sheet, monkeypatch):
+        from src.integrations.sheet_writer import get_write_queue
+        monkeypatch.setattr(get_write_queue(), 'max_retries', 0)
+        sheet.fail_with = [503]
+        data = client.post('/api/mis/apply-split-id',
+                           json={'google_row': 7, 'new_mis_id': '222', 'tag': 'w2', 'flush': True}).get_json()
+        assert data['success'] is False and data['queued'] is True
+        assert 'queued again' in data['error']
+        assert get_write_queue().summary()['pending'] == {'sid': 1}
+
+    def test_stale_cached_header_is_caught_at_flush(self, client, sheet):
+        sheet.cells["'Tab'!E1"] = 'Locations'          # column inserted after the header was cached
+        data = client.post('/api/mis/apply-split-id',
+                           json={'google_row': 7, 'new_mis_id': '222', 'tag': 'w2', 'flush': True}).get_json()
+        assert data['success'] is False and data['queued'] is False
+        assert 'columns changed' in data['error']
+        assert sheet.cells["'Tab'!E7"] == 'W1: 111'
+
+    def test_apply_matches_returns_ticket(self, client, sheet):
+        r = client.post('/api/mis/apply-matches', json={'matches': {'3': '100', '4': '101'}})
+        data = r.get_json()
+        assert data['success'] is True and data['queued'] is True and data['updated'] == 2
+        status = client.get(data['status_url']).get_json()
+        assert status['success'] is True
+        assert status['status'] in ('queued', 'flushing', 'done')
+        assert client.post('/api/mis/writeback/flush').get_json()['success'] is True
+        assert sheet.cells["'Tab'!E3"] == '100'
+
+    def test_unknown_ticket_is_404(self, client):
+        assert client.get('/api/mis/writeback/doesnotexist').status_code == 404
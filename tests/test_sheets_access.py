@@ -0,0 +1,267 @@
+# tests/test_sheets_access.py — masked metadata cache + batchGet settings bundle
+from __future__ import annotations
+
+import pytest
+
+from src.integrations import sheets_access
+
+TABS = ['March 2026', 'Settings', 'Brand Rebate Agreements']
+SETTINGS_ROWS = [
+    ['Store Name', 'Notes', 'Categories'],
+    ['Davis', '', 'Flower'],
+    ['Dixon', '', 'Vapes'],
+    ['All Locations', '', 'All Categories'],
+]
+BRAND_ROWS = [
+    ['Brand', 'Linked Brand', 'After Wholesale'],
+    ['Stiiizy', 'Stiiizy Parent', 'TRUE'],
+    ['Kiva', '', 'FALSE'],
+]
+
+
+class _Exec:
+    def __init__(self, payload: dict) -> None:
+        self.payload = payload
+
+    def execute(self) -> dict:
+        return self.payload
+
+
+class _FakeService:
+    """Records spreadsheets().get / values().batchGet / values().get calls."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, dict]] = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return _Values(self)
+
+    def get(self, **kwargs):
+        self.calls.append(('meta', kwargs))
+        return _Exec({'properties': {'title': 'Deals'}, 'sheets': [
+            {'properties': {'sheetId': 100 + i, 'title': t, 'index': i,
+                            'gridProperties': {'rowCount': 1000, 'columnCount': 26}}}
+            for i, t in enumerate(TABS)
+        ]})
+
+
+class _Values:
+    def __init__(self, owner: _FakeService) -> None:
+        self.owner = owner
+
+    def batchGet(self, **kwargs):
+        self.owner.calls.append(('batchGet', kwargs))
+        rows = {'Settings': SETTINGS_ROWS, 'Brand Rebate Agreements': BRAND_ROWS}
+        return _Exec({'valueRanges': [
+            {'range': r, 'values': rows[r.split('!')[0].strip("'")]} for r in kwargs['ranges']
+        ]})
+
+    def get(self, **kwargs):
+        self.owner.calls.append(('get', kwargs))
+        return _Exec({'values': []})
+
+
+@pytest.fixture
+def svc():
+    sheets_access.invalidate()
+    yield _FakeService()
+    sheets_access.invalidate()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Metadata
+# ─────────────────────────────────────────────────────────────────────────────
+class TestMetadata:
+    def test_fields_mask_and_cache(self, svc):
+        assert sheets_access.get_tab_titles(svc, 'sid') == TABS
+        assert sheets_access.get_gid(svc, 'sid', 'Settings') == '101'
+        assert sheets_access.get_grid(svc, 'sid', 'March 2026') == {'rows': 1000, 'cols': 26, 'frozen': 0}
+        metas = [c for c in svc.calls if c[0] == 'meta']
+        assert len(metas) == 1
+        assert 'gridProperties' in metas[0][1]['fields']
+
+    def test_unknown_tab(self, svc):
+        assert sheets_access.get_gid(svc, 'sid', 'Nope') is None
+        assert sheets_access.get_grid(svc, 'sid', 'Nope') is None
+
+    def test_invalidate_refetches(self, svc):
+        sheets_access.get_tab_titles(svc, 'sid')
+        sheets_access.invalidate('sid')
+        sheets_access.get_tab_titles(svc, 'sid')
+        assert [c[0] for c in svc.calls] == ['meta', 'meta']
+
+    def test_a1_quoting(self):
+        assert sheets_access.a1_tab("O'Brien") == "'O''Brien'"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Settings bundle + loaders
+# ─────────────────────────────────────────────────────────────────────────────
+class TestSettingsBundle:
+    def test_two_calls_then_cached(self, svc):
+        b1 = sheets_access.get_settings_bundle(svc, 'sid')
+        b2 = sheets_access.get_settings_bundle(svc, 'sid')
+        assert b1 is b2
+        assert [c[0] for c in svc.calls] == ['meta', 'batchGet']
+        assert b1['settings_tab'] == 'Settings'
+        assert b1['brand_tab'] == 'Brand Rebate Agreements'
+        assert b1['brand_rows'] == BRAND_ROWS
+
+    def test_settings_tab_title_rules(self):
+        find = sheets_access.find_settings_tabs
+        assert find(['Brand Rebate Settings', 'Settings']) == ('Settings', 'Brand Rebate Settings')
+        assert find(['Brand Rebate Settings']) == (None, 'Brand Rebate Settings')
+        assert find(['Rebate Agreements', 'Brand Rebate 2']) == (None, 'Rebate Agreements')
+        assert find(['Settings', 'Old Settings']) == ('Settings', None)
+
+    def test_dropdown_loader_uses_bundle(self, svc):
+        from src.integrations.google_sheets import load_settings_dropdown_data
+        data = load_settings_dropdown_data('sid', svc)
+        assert data['stores'] == ['Davis', 'Dixon']
+        assert data['categories'] == ['Flower', 'Vapes']
+        assert data['brand_linked_map'] == {'stiiizy': 'Stiiizy Parent', 'kiva': ''}
+        assert not [c for c in svc.calls if c[0] == 'get']
+
+    def test_loaders_share_one_round_trip(self, svc, monkeypatch):
+        import src.integrations.sheets_service as sheets_service
+        from src.utils.brand_helpers import load_brand_settings
+        from src.integrations.google_sheets import load_settings_dropdown_data
+        monkeypatch.setattr(sheets_service, 'get_service', lambda: svc)
+        load_settings_dropdown_data('sid', svc)
+        assert load_brand_settings('sid') == {'stiiizy': 'Stiiizy Parent', 'kiva': ''}
+        assert [c[0] for c in svc.calls] == ['meta', 'batchGet']
+
+
+class _GridService:
+    """Backed by a row list; values().get honours 'Tab'!A<start>:<col><end> like the API."""
+
+    def __init__(self, rows: list[list[str]], grid_rows: int, grid_cols: int = 6) -> None:
+        self.rows      = rows
+        self.grid_rows = grid_rows
+        self.grid_cols = grid_cols
+        self.ranges: list[str] = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, spreadsheetId: str, range: str | None = None, fields: str | None = None):
+        if range is None:   # metadata
+            return _Exec({'sheets': [{'properties': {
+                'sheetId': 7, 'title': 'Big', 'index': 0,
+                'gridProperties': {'rowCount': self.grid_rows, 'columnCount': self.grid_cols}}}]})
+        self.ranges.append(range)
+        import re
+        m = re.search(r'!A(\d+):([A-Z]+)(\d*)$', range)
+        start, end = int(m.group(1)), int(m.group(3) or len(self.rows))
+        width = sum((ord(ch) - 64) * 26 ** i for i, ch in enumerate(reversed(m.group(2))))
+        part = [list(r)[:width] for r in self.rows[start - 1:end]]
+        while part and not part[-1]:
+            part.pop()
+        return _Exec({'values': part})
+
+
+def _big_rows(n: int, marker_at: int | None = None) -> list[list[str]]:
+    rows = [['Weekday', 'Brand', 'Deal', 'Discount', 'Location', 'MIS ID']]
+    for i in range(2, n + 1):
+        if marker_at and i == marker_at:
+            rows.append(['END420'])
+        elif i % 7 == 0:
+            rows.append([])                       # blank rows inside the data
+        else:
+            rows.append(['Monday', f'Brand{i}', 'x', '10%', 'Davis', ''])
+    return rows
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Grid-sized / chunked reads
+# ─────────────────────────────────────────────────────────────────────────────
+class TestReadTabValues:
+    def test_single_call_sized_to_grid(self, svc):
+        g = _GridService(_big_rows(40), grid_rows=40)
+        values = sheets_access.read_tab_values(g, 'sid-g', 'Big')
+        assert g.ranges == ["'Big'!A1:F"]
+        assert len(values) == 40
+
+    def test_rows_added_after_metadata_are_read(self, svc):
+        g = _GridService(_big_rows(40), grid_rows=40)
+        sheets_access.read_tab_values(g, 'sid-g', 'Big')
+        g.rows = _big_rows(75)                        # grid grew; metadata still cached
+        assert len(sheets_access.read_tab_values(g, 'sid-g', 'Big')) == 75
+        assert len(sheets_access.read_tab_values(g, 'sid-g', 'Big', chunk_rows=30)) == 75
+
+    def test_width_follows_detected_header(self, svc, monkeypatch):
+        from src.integrations import sheet_cache
+        cache = sheet_cache.TabSnapshotCache()
+        monkeypatch.setattr(sheet_cache, 'tab_cache', cache)
+        g = _GridService(_big_rows(40), grid_rows=40, grid_cols=26)
+        cache.remember_header('sid-g', 'Big', 0, ['Weekday', 'Brand'])
+        values = sheets_access.read_tab_values(g, 'sid-g', 'Big')
+        assert g.ranges == ["'Big'!A1:G"]                 # 2 header columns + margin
+        assert values[1] == _big_rows(2)[1]
+
+    def test_row_reaching_narrowed_edge_rereads_full_width(self, svc, monkeypatch):
+        from src.integrations import sheet_cache
+        cache = sheet_cache.TabSnapshotCache()
+        monkeypatch.setattr(sheet_cache, 'tab_cache', cache)
+        rows = _big_rows(10)
+        rows[3] = [f'c{i}' for i in range(12)]            # a column added past the margin
+        g = _GridService(rows, grid_rows=10, grid_cols=26)
+        cache.remember_header('sid-g', 'Big', 0, ['Weekday', 'Brand'])
+        values = sheets_access.read_tab_values(g, 'sid-g', 'Big')
+        assert g.ranges == ["'Big'!A1:G", "'Big'!A1:Z"]
+        assert len(values[3]) == 12
+
+    def test_chunks_keep_row_numbers(self, svc):
+        rows = _big_rows(95)
+        rows[20:30] = [[] for _ in range(10)]        # blank tail inside chunk 1
+        g = _GridService(rows, grid_rows=95)
+        values = sheets_access.read_tab_values(g, 'sid-g', 'Big', chunk_rows=30)
+        assert len(g.ranges) == 4
+        assert values[49] == rows[49]                 # index + 1 == sheet row
+        assert values[-1] == rows[94]
+
+    def test_chunks_stop_at_marker(self, svc):
+        g = _GridService(_big_rows(200, marker_at=45), grid_rows=200)
+        values = sheets_access.read_tab_values(g, 'sid-g', 'Big', chunk_rows=30)
+        assert len(g.ranges) == 2
+        assert values[44] == ['END420']
+
+    def test_beyond_legacy_limit_not_truncated(self, svc):
+        g = _GridService(_big_rows(2600), grid_rows=2600)
+        values = sheets_access.read_tab_values(g, 'sid-g', 'Big', chunk_rows=1000)
+        assert len(values) == 2600
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Header reuse for write-back routes
+# ─────────────────────────────────────────────────────────────────────────────
+class TestHeaderReuse:
+    @pytest.fixture
+    def fresh_cache(self, app, monkeypatch):
+        from src.integrations import sheet_cache
+        cache = sheet_cache.TabSnapshotCache()
+        monkeypatch.setattr(sheet_cache, 'tab_cache', cache)
+        return cache
+
+    def test_header_fetched_once(self, svc, fresh_cache):
+        g = _GridService(_big_rows(40), grid_rows=40)
+        first  = sheets_access.get_header(g, 'sid-g', 'Big')
+        second = sheets_access.get_header(g, 'sid-g', 'Big')
+        assert first == second == (0, _big_rows(1)[0])
+        assert g.ranges == ["'Big'!A1:F20"]
+
+    def test_writeback_invalidate_keeps_header(self, svc, fresh_cache):
+        g = _GridService(_big_rows(40), grid_rows=40)
+        sheets_access.get_header(g, 'sid-g', 'Big')
+        fresh_cache.invalidate('sid-g', 'Big')
+        sheets_access.get_header(g, 'sid-g', 'Big')
+        assert len(g.ranges) == 1
+        fresh_cache.invalidate('sid-g', 'Big', headers=True)
+        sheets_access.get_header(g, 'sid-g', 'Big')
+        assert len(g.ranges) == 2
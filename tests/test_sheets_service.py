@@ -0,0 +1,228 @@
+# tests/test_sheets_service.py — per-profile Sheets service + token refresh
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.integrations.sheets_service import SheetsServiceManager, ThreadLocalService
+
+DOC = {'name': 'sheets', 'version': 'v4'}
+
+
+class _Creds:
+    def __init__(self, expires_in: float = 3600, valid: bool = True, refresh_token: str = 'r') -> None:
+        self.expiry        = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=expires_in)
+        self.valid         = valid
+        self.refresh_token = refresh_token
+
+    def to_json(self) -> str:
+        return json.dumps({'expiry': self.expiry.isoformat()})
+
+
+class _Service:
+    def __init__(self, creds) -> None:
+        self.creds  = creds
+        self.thread = threading.get_ident()
+
+    def spreadsheets(self):
+        return 'spreadsheets'
+
+
+class _Google:
+    """Stand-ins for the google-auth / googleapiclient hooks, with call counts."""
+
+    def __init__(self, creds: _Creds | None = None) -> None:
+        self.creds     = creds if creds is not None else _Creds()
+        self.loads     = 0
+        self.refreshes = 0
+        self.fetches   = 0
+        self.builds: list[_Service] = []
+
+    def load(self, token_file, scopes):
+        self.loads += 1
+        return self.creds
+
+    def refresh(self, creds):
+        self.refreshes += 1
+        creds.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=1)
+        creds.valid  = True
+
+    def fetch(self):
+        self.fetches += 1
+        return DOC
+
+    def build(self, doc, creds):
+        assert doc == DOC
+        svc = _Service(creds)
+        self.builds.append(svc)
+        return svc
+
+
+@pytest.fixture
+def token_file(tmp_path, monkeypatch):
+    from src.integrations import google_sheets
+    path = tmp_path / 'token_alice.json'
+    path.write_text('{}')
+    monkeypatch.setattr(google_sheets, 'TOKEN_FILE', path)
+    return path
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    managers: list[SheetsServiceManager] = []
+
+    def factory(google: _Google, **kwargs) -> SheetsServiceManager:
+        kwargs.setdefault('check_interval_s', 3600)
+        m = SheetsServiceManager(
+            discovery_dir=tmp_path / 'discovery',
+            load_credentials=google.load, refresh_credentials=google.refresh,
+            fetch_discovery=google.fetch, build_service=google.build, **kwargs)
+        managers.append(m)
+        return m
+
+    yield factory
+    for m in managers:
+        m.shutdown()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Build once / per thread
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestBuild:
+    def test_built_once_per_thread(self, token_file, make_manager):
+        g = _Google()
+        m = make_manager(g)
+        proxy = m.get_service()
+        assert isinstance(proxy, ThreadLocalService)
+        for _ in range(5):
+            assert proxy.spreadsheets() == 'spreadsheets'
+        assert g.loads == 1 and g.fetches == 1 and len(g.builds) == 1
+
+    def test_each_thread_gets_its_own_service(self, token_file, make_manager):
+        g = _Google()
+        m = make_manager(g)
+        main = m.for_thread()
+        seen: list = []
+        t = threading.Thread(target=lambda: seen.append(m.for_thread()))
+        t.start(); t.join()
+        assert seen[0] is not main
+        assert seen[0].creds is main.creds          # shared credentials
+        assert g.fetches == 1                       # one discovery document
+
+    def test_reset_thread_rebuilds_transport_only(self, token_file, make_manager):
+        g = _Google()
+        m = make_manager(g)
+        first = m.for_thread()
+        m.reset_thread()
+        assert m.for_thread() is not first
+        assert g.loads == 1
+
+    def test_no_profile_means_no_service(self, make_manager, monkeypatch):
+        from src.integrations import google_sheets
+        monkeypatch.setattr(google_sheets, 'TOKEN_FILE', None)
+        m = make_manager(_Google())
+        assert m.get_service() is None
+        assert not m.proxy
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Discovery document cache
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestDiscovery:
+    def test_document_cached_on_disk(self, token_file, make_manager, tmp_path):
+        make_manager(_Google()).for_thread()
+        assert json.loads((tmp_path / 'discovery' / 'sheets.v4.json').read_text()) == DOC
+
+        g = _Google()
+        m = make_manager(g)
+        m.for_thread()
+        assert g.fetches == 0
+        assert m.stats()['counts']['discovery_disk_hits'] == 1
+
+    def test_corrupt_cache_is_refetched(self, token_file, make_manager, tmp_path):
+        (tmp_path / 'discovery').mkdir()
+        (tmp_path / 'discovery' / 'sheets.v4.json').write_text('{not json')
+        g = _Google()
+        make_manager(g).for_thread()
+        assert g.fetches == 1
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Credentials / refresh
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestCredentials:
+    def test_expired_token_refreshed_on_load_and_saved(self, token_file, make_manager):
+        g = _Google(_Creds(expires_in=-10, valid=False))
+        make_manager(g).for_thread()
+        assert g.refreshes == 1
+        assert 'expiry' in json.loads(token_file.read_text())
+
+    def test_unrefreshable_token_falls_back_to_interactive(self, token_file, make_manager):
+        g = _Google(_Creds(valid=False, refresh_token=''))
+        calls: list[int] = []
+
+        def interactive():
+            calls.append(1)
+            g.creds = _Creds()
+            return object()
+
+        assert make_manager(g, interactive_auth=interactive).get_service() is not None
+        assert calls == [1]
+
+    def test_refresh_now_only_inside_margin(self, token_file, make_manager):
+        g = _Google(_Creds(expires_in=3600))
+        m = make_manager(g, refresh_margin_s=300)
+        m.for_thread()
+        assert m.refresh_now() is False
+        g.creds.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=60)
+        assert m.refresh_now() is True
+        assert g.refreshes == 1
+        assert len(g.builds) == 1                   # same services keep working
+
+    def test_refresh_failure_is_counted_not_raised(self, token_file, make_manager):
+        g = _Google(_Creds(expires_in=10))
+
+        def boom(creds):
+            raise RuntimeError('network down')
+
+        m = make_manager(g, refresh_margin_s=300)
+        m.for_thread()
+        m._refresh_creds = boom
+        assert m.refresh_now() is False
+        assert m.stats()['counts']['refresh_failures'] == 1
+
+    def test_background_refresher(self, token_file, make_manager):
+        g = _Google(_Creds(expires_in=30))
+        m = make_manager(g, refresh_margin_s=300)
+        m.check_interval = 0.01                     # constructor clamps to ≥ 1 s
+        m.for_thread()
+        for _ in range(200):
+            if g.refreshes:
+                break
+            threading.Event().wait(0.01)
+        assert g.refreshes >= 1
+        assert m.stats()['refresher_alive'] is True
+
+    def test_profile_change_reloads(self, token_file, make_manager, tmp_path, monkeypatch):
+        from src.integrations import google_sheets
+        g = _Google()
+        m = make_manager(g)
+        m.for_thread()
+        other = tmp_path / 'token_bob.json'
+        monkeypatch.setattr(google_sheets, 'TOKEN_FILE', other)
+        m.for_thread()
+        assert g.loads == 2 and len(g.builds) == 2
+        assert m.stats()['profile'] == str(other)
+
+
+class TestRoute:
+    def test_diagnostics(self, client):
+        data = client.get('/api/diagnostics/sheets-service').get_json()
+        assert data['success'] is True
+        assert 'counts' in data and 'refresh_margin_s' in data
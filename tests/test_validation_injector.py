@@ -0,0 +1,129 @@
+# tests/test_validation_injector.py — MIS validators as CDP new-document scripts
+from __future__ import annotations
+
+from src.automation import validation_injector
+from src.automation.validation_injector import ValidationInjector, capture_script, document_script
+
+
+def _inject_validator(driver, expected_data=None):
+    if driver.execute_script("return window.VALIDATOR_V2_ACTIVE === true;"):
+        return
+    driver.execute_script("window.VALIDATOR_V2_ACTIVE = true;")
+
+
+def _inject_listeners(driver):
+    driver.execute_script("window.MIS_BROWSER_LISTENERS_ACTIVE = true;")
+
+
+def _injector(**kwargs) -> ValidationInjector:
+    return ValidationInjector(injectors=lambda: [_inject_validator, _inject_listeners], **kwargs)
+
+
+class _Chrome:
+    """Driver with CDP: records new-document registrations and direct scripts."""
+
+    def __init__(self, url: str = 'https://mis.theartisttree.com/daily-discount', handle: str = 'A') -> None:
+        self.current_url           = url
+        self.current_window_handle = handle
+        self.registered: list[str] = []
+        self.executed:   list[str] = []
+
+    def execute_cdp_cmd(self, cmd: str, params: dict) -> dict:
+        assert cmd == 'Page.addScriptToEvaluateOnNewDocument'
+        self.registered.append(params['source'])
+        return {'identifier': str(len(self.registered))}
+
+    def execute_script(self, script: str, *args):
+        self.executed.append(script)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Script capture
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestScript:
+    def test_capture_takes_the_full_injection_not_the_probe(self):
+        assert capture_script(_inject_validator) == "window.VALIDATOR_V2_ACTIVE = true;"
+
+    def test_wrapper_guards_page_frame_and_dom(self):
+        js = document_script('window.X = 1;')
+        assert '"daily-discount"' in js and 'window.top !== window' in js
+        assert 'DOMContentLoaded' in js and 'window.X = 1;' in js
+
+    def test_source_has_both_scripts_once(self):
+        src = _injector().source()
+        assert src.count('VALIDATOR_V2_ACTIVE = true') == 1
+        assert src.count('MIS_BROWSER_LISTENERS_ACTIVE = true') == 1
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Registration
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestInstall:
+    def test_registered_once_per_tab_and_run_now_on_mis(self):
+        injector, driver = _injector(), _Chrome()
+        assert injector.install(driver) is True
+        assert injector.install(driver) is True
+        assert len(driver.registered) == 1
+        assert driver.executed == driver.registered           # current page gets it immediately
+        driver.current_window_handle = 'B'
+        injector.install(driver)
+        assert len(driver.registered) == 2
+        assert injector.stats()['tabs'] == ['A', 'B']
+
+    def test_other_pages_register_without_running(self):
+        driver = _Chrome(url='https://app.blaze.me/')
+        assert _injector().install(driver) is True
+        assert driver.registered and driver.executed == []
+
+    def test_no_cdp_or_poll_mode_reports_fallback(self):
+        class _NoCdp:
+            current_url, current_window_handle = 'https://x/daily-discount', 'A'
+
+        assert _injector().install(_NoCdp()) is False
+        assert _injector(mode='poll').install(_Chrome()) is False
+
+    def test_cdp_error_counted(self):
+        driver = _Chrome()
+        driver.execute_cdp_cmd = lambda cmd, params: (_ for _ in ()).throw(RuntimeError('unknown command'))
+        injector = _injector()
+        assert injector.install(driver) is False
+        assert injector.stats()['fallbacks'] == 1 and 'unknown command' in injector.stats()['last_error']
+
+    def test_init_from_config(self, monkeypatch):
+        monkeypatch.setattr(validation_injector, 'validation_injector', validation_injector.validation_injector)
+        injector = validation_injector.init_validation_injector({'VALIDATION_INJECT_MODE': 'POLL'})
+        assert validation_injector.get_validation_injector() is injector and injector.mode == 'poll'
+
+
+class TestSessionHook:
+    def test_listeners_called_when_browser_attached(self, tmp_path):
+        from src.session.manager import SessionManager
+        sm = SessionManager(db_path=tmp_path / 'session.db')
+        injector, driver = _injector(), _Chrome()
+        sm.add_browser_listener(injector.install)
+        sm.add_browser_listener(lambda d: 1 / 0)              # a failing listener never breaks attach
+        sm.set_browser(None)
+        assert driver.registered == []
+        sm.set_browser(driver)
+        assert sm.get_browser() is driver and len(driver.registered) == 1
+
+    def test_diagnostics_route(self, client):
+        data = client.get('/api/diagnostics/validation-injector').get_json()
+        assert data['success'] is True and data['mode'] in ('cdp', 'poll')
+
+    def test_replaced_browser_is_forgotten(self, tmp_path):
+        from src.session.manager import SessionManager
+        sm = SessionManager(db_path=tmp_path / 'session.db')
+        injector, old, new = _injector(), _Chrome(), _Chrome()
+        sm.add_browser_listener(injector.install)
+        sm.add_browser_detach_listener(injector.forget)
+        sm.set_browser(old)
+        assert injector.stats()['tabs'] == ['A']
+        sm.set_browser(old)                                   # same driver again: kept
+        assert injector.stats()['tabs'] == ['A']
+        sm.set_browser(new)
+        assert injector.stats()['tabs'] == ['A'] and len(new.registered) == 1
+        sm.set_browser(None)
+        assert injector.stats()['tabs'] == []
@@ -0,0 +1,179 @@
+# tests/test_waits.py — condition-driven waits for the MIS form automation
+from __future__ import annotations
+
+import pytest
+
+from src.automation import waits
+from src.automation.waits import WaitEngine, WaitTimeout
+
+
+class _Clock:
+    """Fake monotonic clock advanced only by the engine's sleeps."""
+
+    def __init__(self) -> None:
+        self.now    = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class _Driver:
+    """execute_script driven by a fake page: each condition becomes ready at a set time."""
+
+    def __init__(self, clock: _Clock, ready_at: float = 0.0, value: object = True) -> None:
+        self.clock    = clock
+        self.ready_at = ready_at
+        self.value    = value
+        self.calls: list[tuple[str, tuple]] = []
+
+    def execute_script(self, script: str, *args):
+        self.calls.append((script, args))
+        return self.value if self.clock.now >= self.ready_at else None
+
+
+@pytest.fixture
+def clock() -> _Clock:
+    return _Clock()
+
+
+@pytest.fixture
+def engine(clock) -> WaitEngine:
+    return WaitEngine(timeout=2.0, min_interval=0.01, max_interval=0.2,
+                      sleep=clock.sleep, clock=clock)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Polling
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestPolling:
+    def test_ready_condition_returns_without_sleeping(self, engine, clock):
+        driver = _Driver(clock)
+        assert engine.until(driver, waits.select2_open(), 'select2_open') is True
+        assert clock.sleeps == [] and len(driver.calls) == 1
+
+    def test_returns_predicate_value(self, engine, clock):
+        option = object()
+        driver = _Driver(clock, ready_at=0.05, value=option)
+        assert engine.until(driver, waits.select2_option('Kiva'), 'select2_option') is option
+        assert driver.calls[0][1] == ('Kiva', False, False)
+
+    def test_waits_only_as_long_as_needed(self, engine, clock):
+        driver = _Driver(clock, ready_at=0.3)
+        engine.until(driver, waits.modal_shown(), 'modal_shown')
+        assert 0.3 <= clock.now < 0.5                     # was a fixed 2s sleep
+        assert clock.sleeps[0] == pytest.approx(0.01)
+        assert all(b >= a for a, b in zip(clock.sleeps, clock.sleeps[1:]))
+        assert max(clock.sleeps) <= 0.2
+
+    def test_timeout_raises_and_is_recorded(self, engine, clock):
+        driver = _Driver(clock, ready_at=99)
+        with pytest.raises(WaitTimeout, match='datatable_filtered'):
+            engine.until(driver, waits.datatable_filtered('daily-discount', '123'),
+                         'datatable_filtered', timeout=0.5)
+        assert clock.now == pytest.approx(0.5)
+        assert engine.recent()[0]['ok'] is False
+        assert engine.stats()['waits']['datatable_filtered']['timeouts'] == 1
+
+    def test_maybe_returns_none_on_timeout(self, engine, clock):
+        assert engine.maybe(_Driver(clock, ready_at=99), waits.modal_hidden(), 'modal_hidden', 0.1) is None
+
+    def test_predicate_errors_mean_not_ready(self, engine, clock):
+        state = {'n': 0}
+
+        def flaky(driver):
+            state['n'] += 1
+            if state['n'] < 3:
+                raise RuntimeError('stale element reference')
+            return True
+
+        def stale(driver):
+            raise RuntimeError('stale element reference')
+
+        assert engine.until(object(), flaky, 'flaky') is True
+        with pytest.raises(WaitTimeout, match='stale element'):
+            engine.until(object(), stale, 'always_stale', timeout=0.1)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Recording / adaptive intervals
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestRecording:
+    def test_durations_recorded(self, engine, clock):
+        from src.utils.metrics import metrics
+        engine.until(_Driver(clock, ready_at=0.25), waits.select2_open(), 'select2_open')
+        last = engine.recent(1)[0]
+        assert last['name'] == 'select2_open' and last['ok'] is True
+        assert last['seconds'] >= 0.25 and last['polls'] > 1
+        assert 'wait:select2_open' in metrics.snapshot()['spans']
+
+    def test_first_interval_follows_typical_duration(self, engine, clock):
+        engine.until(_Driver(clock, ready_at=0.4), waits.modal_shown(), 'modal_shown')
+        clock.sleeps.clear()
+        clock.now = 0.0
+        engine.until(_Driver(clock, ready_at=0.4), waits.modal_shown(), 'modal_shown')
+        assert clock.sleeps[0] > 0.05                     # starts near typical/4, not at 10ms
+        assert engine.stats()['typical_s']['modal_shown'] >= 0.4
+
+    def test_init_from_config(self, monkeypatch):
+        monkeypatch.setattr(waits, 'wait_engine', waits.wait_engine)
+        engine = waits.init_wait_engine({'MIS_WAIT_TIMEOUT': '3', 'MIS_WAIT_MAX_INTERVAL': 0.1})
+        assert waits.get_wait_engine() is engine
+        assert engine.timeout == 3.0 and engine.max_interval == 0.1
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# mis_entry primitives
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _Field:
+    def __init__(self) -> None:
+        self.value = ''
+
+
+class _FormDriver:
+    """Applies the JS value injection to a fake field; value checks read it back."""
+
+    def __init__(self) -> None:
+        self.scripts: list[str] = []
+
+    def execute_script(self, script: str, *args):
+        self.scripts.append(script)
+        if 'el.value = txt' in script:
+            args[0].value = args[1]
+            return None
+        if 'arguments[0].value === arguments[1]' in script:
+            return args[0].value == args[1]
+        return True
+
+
+class TestMisEntry:
+    def test_fast_type_waits_for_value_not_fixed_sleep(self, engine, clock, monkeypatch):
+        from src.automation import mis_entry
+        monkeypatch.setattr(waits, 'wait_engine', engine)
+        monkeypatch.setattr(mis_entry.time, 'sleep', lambda s: pytest.fail('fixed sleep'))
+        driver, field = _FormDriver(), _Field()
+        assert mis_entry._fast_type(driver, field, '03/01/26', 'Start Date') is True
+        assert field.value == '03/01/26'
+        assert clock.sleeps == []
+        assert engine.recent(1)[0]['name'] == 'field_value'
+
+    def test_click_backdrop_waits_for_select2_close(self, engine, clock, monkeypatch):
+        from src.automation import mis_entry
+        monkeypatch.setattr(waits, 'wait_engine', engine)
+
+        class _Backdrop:
+            def click(self):
+                page.ready_at = clock.now + 0.05          # dropdown closes 50ms later
+
+        page = _Driver(clock, ready_at=99)
+        page.find_element = lambda by, css: _Backdrop()
+        mis_entry._click_backdrop(page)
+        assert 0.05 <= clock.now < 0.2
+        assert 'select2-container--open' in page.calls[-1][0]